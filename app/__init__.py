@@ -17,6 +17,13 @@ from flask_login import LoginManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf.csrf import CSRFProtect
 
+from app.utils.jobs import JobQueue
+from app.utils.response_cache import ResponseCache
+from app.utils.serializers import install_json_provider
+from app.utils.sql_stats import SqlStats
+from app.utils.thumbnails import ImageVariants
+from app.utils.view_counter import ViewCounter
+
 # ---------------------------------------------------------------------------
 # DB 확장 객체 (모듈 레벨)
 # 기능: Flask-SQLAlchemy 확장. create_app() 내에서 init_app(app)으로 앱에 연결합니다.
@@ -41,6 +48,7 @@ def create_app():
     video_folder = os.path.join(project_root, "uploads", "videos")
     thumbnail_folder = os.path.join(project_root, "uploads", "thumbnails")
     profile_folder = os.path.join(project_root, "uploads", "profiles")
+    variant_folder = os.path.join(project_root, "uploads", "variants")
 
     # ----- 3) 설정(config) 등록 -----
     # 기능: DB URI, 업로드 폴더·용량·확장자, 기본 user_id 등을 앱 설정에 넣습니다.
@@ -50,7 +58,8 @@ def create_app():
     default_db_uri = "sqlite:///" + os.path.normpath(default_db_path).replace("\\", "/")
     # DATABASE_URL이 PA 등 다른 환경 경로일 때, 로컬에서는 해당 경로가 없으면 기본 경로 사용
     db_uri = os.environ.get("DATABASE_URL", default_db_uri)
-    if db_uri.startswith("sqlite:///"):
+    # sqlite:///:memory: (테스트 기본값)는 파일 경로가 아니므로 그대로 사용
+    if db_uri.startswith("sqlite:///") and db_uri != "sqlite:///:memory:":
         db_file_path = db_uri.replace("sqlite:///", "").replace("/", os.sep)
         db_dir = os.path.dirname(db_file_path)
         if not os.path.exists(db_dir):
@@ -66,6 +75,7 @@ def create_app():
         VIDEO_FOLDER=video_folder,
         THUMBNAIL_FOLDER=thumbnail_folder,
         PROFILE_IMAGE_FOLDER=profile_folder,
+        THUMBNAIL_VARIANT_FOLDER=variant_folder,  # 썸네일·프로필 이미지 축소본 (원본 해시별 캐시)
         # 업로드 제한 (바이트)
         MAX_VIDEO_SIZE=2 * 1024 * 1024 * 1024,  # 2GB
         MAX_THUMBNAIL_SIZE=5 * 1024 * 1024,  # 5MB
@@ -75,8 +85,86 @@ def create_app():
         ALLOWED_THUMBNAIL_EXTENSIONS={"jpg", "jpeg", "png", "gif", "webp"},
         ALLOWED_PROFILE_IMAGE_EXTENSIONS={"jpg", "jpeg", "png", "gif", "webp"},
         ALLOWED_IMAGE_EXTENSIONS={"jpg", "jpeg", "png", "gif", "webp"},  # validate_image_file 호환
+        # 업로드 이미지 최대 해상도(가로×세로 픽셀, 압축 폭탄 차단. app/utils/image.py)
+        MAX_IMAGE_PIXELS=40_000_000,
         # 로그인 미연동 시 업로드에 사용할 user_id (기본 1)
         DEFAULT_USER_ID=1,
+        # 조회수 버퍼: 증가분을 모았다가 주기적으로 일괄 UPDATE (app/utils/view_counter.py)
+        VIEW_COUNT_BUFFERED=os.environ.get("VIEW_COUNT_BUFFERED", "1").strip().lower() not in ("0", "false", "no"),
+        VIEW_COUNT_FLUSH_INTERVAL=5.0,
+        VIEW_COUNT_FLUSH_SIZE=500,
+        VIEW_COUNT_STORE_PATH=os.environ.get("VIEW_COUNT_STORE_PATH") or None,
+        # 전문 검색: SQLite FTS5(videos_fts) 사용. False 또는 비 SQLite DB면 ILIKE 검색 (app/utils/search_index.py)
+        SEARCH_FTS_ENABLED=True,
+        # 목록 전체 개수(COUNT) 캐시 유지 시간(초). 목록 자체는 keyset 조회 (app/utils/pagination.py)
+        PAGINATION_COUNT_TTL=30,
+        # 인기 태그(상위 50개) 메모리 캐시 유지 시간(초). 0이면 매번 조회 (app/utils/tag_stats.py)
+        POPULAR_TAGS_CACHE_TTL=60,
+        # 관련 동영상: 비디오별 미리 계산해 둘 개수, 목록 유효 시간(초), 새 태그 공유 비디오 무효화 상한
+        # (태그당 비디오 수가 이 값 이하일 때만 즉시 무효화, 그 외는 유효 시간 경과 후 재계산. app/utils/related.py)
+        RELATED_VIDEOS_K=10,
+        RELATED_VIDEOS_MAX_AGE=86400,
+        RELATED_INVALIDATE_MAX_TAG=200,
+        RELATED_MAX_POSTING=5000,  # 이보다 많은 비디오가 달린 태그는 유사 후보 생성에서 제외
+        # 좋아요 상태: 사용자별 좋아요 video_id 목록 메모리 캐시 유지 시간(초, 0이면 매번 조회)·최대 사용자 수·
+        # 사용자당 최대 항목 수 (넘으면 캐시 없이 단건 조회. app/utils/likes.py)
+        LIKED_CACHE_TTL=300,
+        LIKED_CACHE_SIZE=10000,
+        LIKED_CACHE_MAX_ITEMS=5000,
+        # 작업 큐(jobs 테이블): 앱 내 워커 스레드 수(0이면 scripts/run_jobs.py 로만 실행), 대기 주기(초),
+        # 최대 시도 횟수, 재시도 간격(초, 시도마다 2배·최대값), 실행 중 잠금 만료(초). app/utils/jobs.py
+        JOB_WORKER_THREADS=int(os.environ.get("JOB_WORKER_THREADS", "2")),
+        JOB_POLL_INTERVAL=5.0,
+        JOB_MAX_ATTEMPTS=5,
+        JOB_BACKOFF_BASE=10.0,
+        JOB_BACKOFF_MAX=3600.0,
+        JOB_LOCK_TIMEOUT=1800.0,
+        # 미디어 서빙(/media/...): 프록시 오프로드 방식(None | "x-accel" nginx | "x-sendfile" Apache),
+        # X-Accel-Redirect 경로 접두사(nginx internal location), uuid 파일명·그 외 파일 캐시 시간(초). app/utils/media.py
+        MEDIA_OFFLOAD=(os.environ.get("MEDIA_OFFLOAD") or "").strip().lower() or None,
+        MEDIA_ACCEL_PREFIX=os.environ.get("MEDIA_ACCEL_PREFIX", "/_protected_media"),
+        MEDIA_IMMUTABLE_MAX_AGE=31536000,
+        MEDIA_MAX_AGE=3600,
+        # 이미지 변형(srcset): 생성 너비(px), 형식(Pillow 지원 시 "avif" 추가 가능), 인코딩 품질,
+        # 생성 프로세스 수(0이면 요청 처리 중 바로 생성), 생성 실패한 원본 재시도 대기(초). app/utils/thumbnails.py
+        THUMBNAIL_VARIANT_WIDTHS=(320, 640, 1280),
+        THUMBNAIL_VARIANT_FORMATS=("webp",),
+        THUMBNAIL_VARIANT_QUALITY=80,
+        THUMBNAIL_WORKERS=int(os.environ.get("THUMBNAIL_WORKERS", "2")),
+        THUMBNAIL_FAILED_TTL=600,
+        # 댓글: watch 페이지·'댓글 더보기' 한 번에 보여 줄 최상위 댓글 수, '답글 보기' 한 번에 보여 줄 답글 수.
+        # app/utils/comments.py
+        COMMENTS_PER_PAGE=20,
+        COMMENT_REPLIES_PER_PAGE=10,
+        # 업로드 MP4/MOV 의 moov 가 파일 끝이면 작업 큐에서 앞으로 옮겨 저장 (바로 재생. 기존 파일은 scripts/faststart_videos.py).
+        # app/utils/faststart.py, app/utils/media_jobs.py
+        VIDEO_FASTSTART=True,
+        # 구독 피드: 구독자 수가 이 값 이상인 채널은 업로드 시 구독자 inbox(feed_items)에 넣지 않고 조회 때 합침,
+        # 구독 시·재구성 시 inbox 에 넣는 채널별 최근 영상 수. app/utils/feed.py
+        FEED_FANOUT_MAX_SUBSCRIBERS=1000,
+        FEED_BACKFILL_LIMIT=100,
+        # 사용자 행 캐시: 로그인 사용자 로드·사용자명 조회용 User 컬럼 값 메모리 캐시 유지 시간(초, 0이면 매번 조회)·
+        # 최대 사용자 수, 요청별 SQL 문 수 응답 헤더(X-Query-Count) 여부. app/utils/request_cache.py
+        USER_CACHE_TTL=60,
+        USER_CACHE_SIZE=10000,
+        QUERY_COUNT_HEADER=False,
+        # 응답 캐시: 비로그인 홈·태그 페이지와 목록 API 응답 보관 시간(초, 0이면 사용 안 함)·프로세스 내 최대 항목 수,
+        # 지정 시 같은 호스트의 여러 워커가 공유하는 SQLite 파일. app/utils/response_cache.py
+        RESPONSE_CACHE_TTL=30,
+        RESPONSE_CACHE_SIZE=256,
+        RESPONSE_CACHE_PATH=os.environ.get("RESPONSE_CACHE_PATH") or None,
+        # JSON 응답을 orjson 으로 인코딩 (설치돼 있을 때만, 없으면 Flask 기본 인코더). app/utils/serializers.py
+        API_JSON_ORJSON=True,
+        # 목록·상세 조회에서 뷰별 로더(app/utils/loading.py)에 없는 관계를 읽어 SQL 이 나가면 예외 (N+1 발견용).
+        # None 이면 DEBUG 일 때만
+        LOADER_RAISE=None,
+        # SQL 계측: SQL 지문별 호출 수·시간 누적(관리자 /admin/sql), 느린 쿼리 기준(ms)·로그 파일(지정 시, 크기 넘으면 교체),
+        # 보관할 지문 수, 응답 헤더 Server-Timing(db·app 시간, None 이면 DEBUG 일 때만). app/utils/sql_stats.py
+        SQL_STATS_ENABLED=True,
+        SQL_SLOW_QUERY_MS=100,
+        SQL_SLOW_QUERY_LOG=os.environ.get("SQL_SLOW_QUERY_LOG") or None,
+        SQL_STATS_MAX_FINGERPRINTS=500,
+        SQL_SERVER_TIMING=None,
     )
 
     # ----- 4) 업로드·DB용 디렉터리 생성 -----
@@ -84,6 +172,7 @@ def create_app():
     os.makedirs(app.config["VIDEO_FOLDER"], exist_ok=True)
     os.makedirs(app.config["THUMBNAIL_FOLDER"], exist_ok=True)
     os.makedirs(app.config["PROFILE_IMAGE_FOLDER"], exist_ok=True)
+    os.makedirs(app.config["THUMBNAIL_VARIANT_FOLDER"], exist_ok=True)
     instance_path = os.path.join(project_root, "instance")
     os.makedirs(instance_path, exist_ok=True)
 
@@ -107,13 +196,32 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(user_id):
-        """세션에서 사용자 ID로 유저 객체 반환."""
-        from app.models import User
+        """세션에서 사용자 ID로 유저 객체 반환 (사용자 캐시에 있으면 SELECT 없음)."""
+        from app.utils.request_cache import get_user
         try:
-            return db.session.get(User, int(user_id)) if user_id else None
+            return get_user(int(user_id)) if user_id else None
         except (ValueError, TypeError):
             return None
 
+    # ----- 5-2) 조회수 버퍼 (앱마다 1개, 백그라운드 flusher는 첫 조회 시 시작) -----
+    ViewCounter(app)
+
+    # ----- 5-3) 작업 큐 (Cloudinary 업로드·원격 삭제 등, 워커 스레드는 첫 작업 커밋 시 시작) -----
+    JobQueue(app)
+    from app.utils import media_jobs  # noqa: F401  작업 처리 함수 등록
+
+    # ----- 5-4) 썸네일 변형 생성기 (WebP 축소본, 생성 프로세스 풀은 첫 생성 시 시작) -----
+    ImageVariants(app)
+
+    # ----- 5-5) JSON 인코더 (orjson 사용 가능하면 교체) -----
+    install_json_provider(app)
+
+    # ----- 5-6) 응답 캐시 (목록 페이지·API, 무효화 이벤트는 아래 7) 에서 등록) -----
+    ResponseCache(app)
+
+    # ----- 5-7) SQL 계측 (SQL 지문별 시간·느린 쿼리, 엔진 이벤트는 아래 7) 에서 등록) -----
+    SqlStats(app)
+
     # ----- 6) Blueprint 등록 -----
     # 기능: URL 접두사별로 라우트를 묶어 등록. / → main, /auth → auth, /studio → studio, /admin → admin.
     from app.routes.main import main_bp
@@ -132,6 +240,15 @@ def create_app():
     app.register_blueprint(admin_bp)
     app.register_blueprint(api_bp)
 
+    # 템플릿 필터: 재생 시간 표시 (초 → "4:05", "1:02:03")
+    @app.template_filter("duration")
+    def duration_filter(seconds):
+        if not seconds:
+            return ""
+        minutes, sec = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{sec:02d}" if hours else f"{minutes}:{sec:02d}"
+
     # 템플릿 필터: 상대 시간 표시 (예: "방금 전", "3일 전")
     @app.template_filter("timesince")
     def timesince_filter(dt):
@@ -178,6 +295,46 @@ def create_app():
                     db.session.commit()
         except Exception:
             db.session.rollback()
+        # videos 테이블에 미디어 정보 컬럼 없으면 추가 (app/utils/media_probe.py, 기존 파일은 scripts/probe_videos.py)
+        try:
+            from sqlalchemy import text
+            insp = db.inspect(db.engine)
+            existing = {c["name"] for c in insp.get_columns("videos")} if "videos" in insp.get_table_names() else set()
+            for col, col_type in (
+                ("width", "INTEGER"), ("height", "INTEGER"), ("video_codec", "VARCHAR(32)"),
+                ("audio_codec", "VARCHAR(32)"), ("bitrate", "INTEGER"), ("faststart", "BOOLEAN"),
+            ):
+                if col not in existing:
+                    db.session.execute(text(f"ALTER TABLE videos ADD COLUMN {col} {col_type}"))
+                    db.session.commit()
+        except Exception:
+            db.session.rollback()
+        # videos 테이블에 comment_count 컬럼 없으면 추가 후 comments 기준으로 채움, 댓글 페이지(등록순·인기순) 조회 인덱스
+        try:
+            from sqlalchemy import text
+            insp = db.inspect(db.engine)
+            if "videos" in insp.get_table_names():
+                video_cols = {c["name"] for c in insp.get_columns("videos")}
+                if "comment_count" not in video_cols:
+                    db.session.execute(text("ALTER TABLE videos ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0"))
+                    db.session.commit()
+                    from app.utils.comments import repair_comment_counts
+                    repair_comment_counts(db)
+            if "comments" in insp.get_table_names():
+                db.session.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_comments_video_parent_created "
+                    "ON comments (video_id, parent_id, created_at, id)"
+                ))
+                db.session.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_comments_parent_created ON comments (parent_id, created_at, id)"
+                ))
+                db.session.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_comments_video_parent_likes "
+                    "ON comments (video_id, parent_id, likes, id)"
+                ))
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
         # users 테이블에 is_admin 컬럼 없으면 추가 (기존 DB 마이그레이션)
         try:
             from sqlalchemy import text
@@ -189,6 +346,97 @@ def create_app():
                     db.session.commit()
         except Exception:
             db.session.rollback()
+        # users 테이블에 feed_pull 컬럼 없으면 추가, 구독 피드 조회 인덱스 (app/utils/feed.py)
+        try:
+            from sqlalchemy import text
+            insp = db.inspect(db.engine)
+            if "users" in insp.get_table_names():
+                user_cols = {c["name"] for c in insp.get_columns("users")}
+                if "feed_pull" not in user_cols:
+                    db.session.execute(text("ALTER TABLE users ADD COLUMN feed_pull BOOLEAN NOT NULL DEFAULT 0"))
+                    db.session.commit()
+            if "videos" in insp.get_table_names():
+                db.session.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_videos_user_created ON videos (user_id, created_at, id)"
+                ))
+            if "subscriptions" in insp.get_table_names():
+                db.session.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_subscriptions_subscribed_to "
+                    "ON subscriptions (subscribed_to_id, subscriber_id)"
+                ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+        # videos 테이블에 status 컬럼 없으면 추가 (Cloudinary 업로드 작업 상태, 기존 비디오는 ready)
+        try:
+            from sqlalchemy import text
+            insp = db.inspect(db.engine)
+            if "videos" in insp.get_table_names():
+                video_cols = {c["name"] for c in insp.get_columns("videos")}
+                if "status" not in video_cols:
+                    db.session.execute(
+                        text("ALTER TABLE videos ADD COLUMN status VARCHAR(20) NOT NULL DEFAULT 'ready'")
+                    )
+                    db.session.commit()
+        except Exception:
+            db.session.rollback()
+        # tags 테이블에 video_count 컬럼 없으면 추가 후 video_tags 기준으로 채움,
+        # name_key(casefold 비교 키) 컬럼 없으면 추가 후 채우고 유니크 인덱스 (기존 DB 마이그레이션)
+        try:
+            from sqlalchemy import text
+            insp = db.inspect(db.engine)
+            if "tags" in insp.get_table_names():
+                tag_cols = {c["name"] for c in insp.get_columns("tags")}
+                if "video_count" not in tag_cols:
+                    db.session.execute(text("ALTER TABLE tags ADD COLUMN video_count INTEGER NOT NULL DEFAULT 0"))
+                    db.session.execute(
+                        text("CREATE INDEX IF NOT EXISTS ix_tags_video_count ON tags (video_count)")
+                    )
+                    db.session.commit()
+                    from app.utils.tag_stats import repair_tag_counts
+                    repair_tag_counts(db)
+                if "name_key" not in tag_cols:
+                    from app.utils.tag_stats import repair_tag_counts
+                    from app.utils.tags import backfill_tag_keys
+
+                    db.session.execute(text("ALTER TABLE tags ADD COLUMN name_key VARCHAR(150)"))
+                    backfill_tag_keys(db.session)
+                    db.session.execute(
+                        text("CREATE UNIQUE INDEX IF NOT EXISTS ix_tags_name_key ON tags (name_key)")
+                    )
+                    # lower(name) 인덱스는 ASCII 만 접으므로 name_key 로 대체
+                    db.session.execute(text("DROP INDEX IF EXISTS ix_tags_name_lower"))
+                    db.session.commit()
+                    repair_tag_counts(db)
+        except Exception:
+            db.session.rollback()
+        # 태그 카운트 증감 이벤트 등록 (비디오 삭제 시 video_count 감소, 커밋 후 인기 태그 캐시 무효화)
+        from app.utils.tag_stats import install_listeners as install_tag_stats_listeners
+        install_tag_stats_listeners()
+        # 관련 동영상 목록(related_videos) 무효화 이벤트 등록 (비디오 삭제·카테고리 변경)
+        from app.utils.related import install_listeners as install_related_listeners
+        install_related_listeners()
+        # 비디오별 댓글 수(videos.comment_count) 증감 이벤트 등록
+        from app.utils.comments import install_listeners as install_comment_listeners
+        install_comment_listeners()
+        # 채널 통계(channel_stats) 쓰기 경로 이벤트·조회수 flush 훅 등록 (비어 있으면 기존 데이터로 채움)
+        from app.utils.channel_stats import init_channel_stats
+        init_channel_stats(app, db)
+        # 구독 피드 inbox(feed_items) fan-out·구독 이벤트 등록 (비어 있고 구독이 있으면 기존 데이터로 채움)
+        from app.utils.feed import init_feed
+        init_feed(app, db)
+        # 전문 검색 인덱스(videos_fts) 생성·동기화 이벤트 등록 (최초 생성 시 기존 비디오 backfill)
+        from app.utils.search_index import init_search_index
+        init_search_index(app, db)
+        # 요청 단위 메모·사용자 캐시 무효화 이벤트·요청별 쿼리 수 세기 등록
+        from app.utils.request_cache import init_request_cache
+        init_request_cache(app, db)
+        # 응답 캐시 무효화 이벤트(비디오 변경·조회수 flush) 등록
+        from app.utils.response_cache import init_response_cache
+        init_response_cache(app, db)
+        # 요청별 DB 시간·SQL 지문 통계·느린 쿼리 기록 (엔진 이벤트, Server-Timing 헤더) 등록
+        from app.utils.sql_stats import init_sql_stats
+        init_sql_stats(app, db)
         # user_id=1 이 없으면 업로드 시 DEFAULT_USER_ID(1)를 쓸 수 없으므로 기본 유저 생성
         # (이메일/username 중복 시 UNIQUE 오류 방지: 이미 있으면 스킵)
         default_exists = (
@@ -218,26 +466,8 @@ def create_app():
 
 
 # ---------------------------------------------------------------------------
-# 모듈 레벨 앱 인스턴스
-# flask run 시: FLASK_APP=app 이면 Flask CLI가 이 모듈(app/__init__.py)만 import.
-#               위 create_app() 실행 후 여기서 만든 app 을 가져다 WSGI 서버를 띄움. __main__.py 는 실행 안 함.
-# ---------------------------------------------------------------------------
-app = create_app()
-
-# ---------------------------------------------------------------------------
-# 직접 실행 시 진입점 (python -m app 또는 python app/__init__.py)
-# 차이점:
-#   - flask run: 이 블록은 실행되지 않음. Flask CLI가 app 객체만 로드하고 자체 서버로 기동.
-#   - python -m app: 패키지 app 로드 → __init__.py 실행(app 생성) → __main__.py 실행(app.run 호출).
-#   - python app/__init__.py: 이 파일을 스크립트로 실행 → __init__.py 전체 실행 → 아래 app.run() 실행.
+# 앱 인스턴스는 import 시 만들지 않음 (썸네일 작업 프로세스 등은 app 패키지만 import. app/utils/image_worker.py)
+#   - flask run: FLASK_APP=app 이면 Flask CLI가 이 모듈의 create_app() 을 찾아 호출.
+#   - python -m app: __main__.py 에서 create_app() 후 app.run().
+#   - WSGI 서버: wsgi.py 의 application = create_app().
 # ---------------------------------------------------------------------------
-if __name__ == "__main__":
-    db_uri = app.config["SQLALCHEMY_DATABASE_URI"]
-    # sqlite:///C:/path/to/wetube.db → 실제 파일 경로만 표시
-    if db_uri.startswith("sqlite:///"):
-        db_path = db_uri.replace("sqlite:///", "").replace("/", os.sep)
-        print(f"[DB] 사용 중: {db_path}")
-    print("등록된 라우트: / /auth/login /auth/register /auth/profile /studio ...")
-    print("중요: 5000 포트를 쓰는 다른 프로그램(기존 Flask 등)이 있으면 먼저 종료하세요.")
-    print("      그렇지 않으면 /studio/ 에서 404가 납니다.")
-    app.run(debug=True, host="127.0.0.1", port=5000)  # use_reloader 기본 True → 코드 변경 시 자동 재시작
@@ -2,10 +2,12 @@
 모델 패키지 – DB 모델 내보내기.
 from app.models import User, Video, Tag, Subscription 로 사용.
 """
+from app.models.channel_stats import ChannelStats
 from app.models.comment import Comment
+from app.models.job import Job
 from app.models.subscription import Subscription
 from app.models.tag import Tag
 from app.models.user import User
 from app.models.video import Video
 
-__all__ = ["Comment", "Subscription", "User", "Video", "Tag"]
+__all__ = ["ChannelStats", "Comment", "Job", "Subscription", "User", "Video", "Tag"]
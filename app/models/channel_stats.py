@@ -0,0 +1,27 @@
+"""
+채널 통계 모델 – channel_stats 테이블.
+사용자(채널)별 영상 수·총 조회수·총 좋아요·총 댓글·구독자 수 요약.
+업로드·삭제·조회수 flush·좋아요·구독·댓글 시 함께 갱신 (app/utils/channel_stats.py).
+"""
+from datetime import datetime, timezone
+
+from app import db
+
+
+def _utc_now():
+    """datetime.utcnow() deprecated 대체."""
+    return datetime.now(timezone.utc)
+
+
+class ChannelStats(db.Model):
+    """채널별 통계 1행 (user_id 기준)."""
+
+    __tablename__ = "channel_stats"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    video_count = db.Column(db.Integer, nullable=False, default=0)       # 업로드 영상 수
+    total_views = db.Column(db.Integer, nullable=False, default=0)       # 영상 조회수 합계
+    total_likes = db.Column(db.Integer, nullable=False, default=0)       # 영상 좋아요 합계
+    total_comments = db.Column(db.Integer, nullable=False, default=0)    # 영상에 달린 댓글 수
+    subscriber_count = db.Column(db.Integer, nullable=False, default=0)  # 구독자 수
+    updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)
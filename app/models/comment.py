@@ -1,6 +1,6 @@
 """
 댓글 모델 – comments 테이블.
-parent_id로 대댓글(답글) 구조 지원.
+parent_id로 대댓글(답글) 구조 지원. 비디오별 댓글 수는 videos.comment_count 에 유지.
 """
 
 from datetime import datetime, timezone
@@ -12,16 +12,41 @@ def _utc_now():
     return datetime.now(timezone.utc)
 
 
+# 댓글 좋아요·싫어요 중간 테이블 (table.sql 의 comment_likes / comment_dislikes).
+# 한 사용자는 댓글마다 둘 중 하나만 (app/utils/comment_reactions.py 에서 토글 시 반대쪽 삭제)
+comment_likes = db.Table(
+    "comment_likes",
+    db.Column("user_id", db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("comment_id", db.Integer, db.ForeignKey("comments.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("created_at", db.DateTime, default=_utc_now),
+)
+
+comment_dislikes = db.Table(
+    "comment_dislikes",
+    db.Column("user_id", db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("comment_id", db.Integer, db.ForeignKey("comments.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("created_at", db.DateTime, default=_utc_now),
+)
+
+
 class Comment(db.Model):
     """비디오 댓글 및 대댓글."""
 
     __tablename__ = "comments"
+    # 비디오별 최상위 댓글·댓글별 답글을 (created_at, id) 순 keyset 으로 조회 (app/utils/comments.py)
+    __table_args__ = (
+        db.Index("ix_comments_video_parent_created", "video_id", "parent_id", "created_at", "id"),
+        db.Index("ix_comments_parent_created", "parent_id", "created_at", "id"),
+        # 인기순(좋아요 많은 순) 최상위 댓글 keyset
+        db.Index("ix_comments_video_parent_likes", "video_id", "parent_id", "likes", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     content = db.Column(db.Text, nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     video_id = db.Column(db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False)
     parent_id = db.Column(db.Integer, db.ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
+    # 좋아요·싫어요 수 (comment_likes / comment_dislikes 행 수. 토글 시 같은 트랜잭션에서 ± 1)
     likes = db.Column(db.Integer, nullable=False, default=0)
     dislikes = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=_utc_now)
@@ -32,6 +57,7 @@ class Comment(db.Model):
     parent = db.relationship(
         "Comment",
         remote_side=[id],
-        backref=db.backref("replies", lazy="joined", order_by="Comment.created_at"),
+        # 답글은 댓글을 읽을 때마다 함께 JOIN 하지 않음 – 목록은 페이지 단위로 조회 (app/utils/comments.py)
+        backref=db.backref("replies", lazy="select", order_by="Comment.created_at"),
         foreign_keys=[parent_id],
     )
@@ -0,0 +1,34 @@
+"""
+작업 큐 모델 – jobs 테이블.
+요청 밖에서 처리할 작업(Cloudinary 업로드·원격 삭제 등) 1건 = 1행 (app/utils/jobs.py).
+idempotency_key 가 같은 작업은 한 번만 등록됨.
+"""
+from datetime import datetime, timezone
+
+from app import db
+
+
+def _utc_now():
+    """datetime.utcnow() deprecated 대체."""
+    return datetime.now(timezone.utc)
+
+
+class Job(db.Model):
+    """백그라운드 작업 1건. status: pending → running → done / failed."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (db.Index("ix_jobs_status_run_at", "status", "run_at"),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(50), nullable=False)                      # 처리 함수 이름 (예: cloudinary.destroy)
+    payload = db.Column(db.Text, nullable=False, default="{}")          # JSON 인자
+    idempotency_key = db.Column(db.String(255), unique=True, nullable=True)  # 중복 등록 방지 키
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)         # 실행 시도 횟수
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=_utc_now)    # 이 시각 이후 실행 (재시도 backoff)
+    locked_by = db.Column(db.String(100), nullable=True)                 # 실행 중인 워커
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=_utc_now)
+    finished_at = db.Column(db.DateTime, nullable=True)
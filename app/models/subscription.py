@@ -1,5 +1,5 @@
 """
-구독 모델 – subscriptions 테이블.
+구독 모델 – subscriptions 테이블, 구독 피드 inbox(feed_items) 테이블.
 subscriber_id: 구독하는 사용자, subscribed_to_id: 구독 대상 채널.
 """
 from datetime import datetime, timezone
@@ -15,6 +15,8 @@ class Subscription(db.Model):
     """구독 관계: subscriber_id가 subscribed_to_id 채널을 구독."""
 
     __tablename__ = "subscriptions"
+    # 채널별 구독자 조회 (업로드 시 피드 fan-out, 구독자 수)
+    __table_args__ = (db.Index("ix_subscriptions_subscribed_to", "subscribed_to_id", "subscriber_id"),)
 
     subscriber_id = db.Column(
         db.Integer,
@@ -29,3 +31,17 @@ class Subscription(db.Model):
         nullable=False,
     )
     created_at = db.Column(db.DateTime, default=_utc_now)
+
+
+# 구독 피드 inbox (app/utils/feed.py). 업로드 시 구독자마다 (user_id, video_id) 행 추가,
+# created_at 은 비디오 업로드 시각 복사본 → (user_id, created_at, video_id) 인덱스로 keyset 조회
+feed_items = db.Table(
+    "feed_items",
+    db.Column("user_id", db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("video_id", db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("channel_id", db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+    db.Column("created_at", db.DateTime, nullable=False),
+    db.Index("ix_feed_items_user_created", "user_id", "created_at", "video_id"),
+    db.Index("ix_feed_items_user_channel", "user_id", "channel_id"),
+    db.Index("ix_feed_items_video", "video_id"),
+)
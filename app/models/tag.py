@@ -4,7 +4,10 @@ Video와 N:M 관계 (video_tags 중간 테이블).
 """
 from datetime import datetime, timezone
 
+from sqlalchemy.orm import validates
+
 from app import db
+from app.utils.tags import tag_key
 
 
 def _utc_now():
@@ -12,6 +15,11 @@ def _utc_now():
     return datetime.now(timezone.utc)
 
 
+def _name_key_default(context):
+    """Core INSERT 에 name_key 가 없으면 name 으로 계산."""
+    return tag_key(context.get_current_parameters().get("name"))
+
+
 class Tag(db.Model):
     """태그 정보."""
 
@@ -19,4 +27,17 @@ class Tag(db.Model):
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(50), nullable=False, unique=True)
+    # 대소문자 무시 비교 키 (tag_key: 공백 정리 + casefold, 비ASCII 포함). 같은 키의 태그는 하나만
+    name_key = db.Column(db.String(150), nullable=False, default=_name_key_default)
     created_at = db.Column(db.DateTime, default=_utc_now)
+    # 연결된 비디오 수 (save_tags·비디오 삭제 시 증감, app/utils/tag_stats.py). 인기 태그 정렬용
+    video_count = db.Column(db.Integer, nullable=False, default=0, server_default="0", index=True)
+
+    @validates("name")
+    def _sync_name_key(self, key, value):
+        self.name_key = tag_key(value)
+        return value
+
+
+# 비교 키 유니크 인덱스 (app/utils/tags.py resolve_tags 조회·동시 생성 중복 방지)
+db.Index("ix_tags_name_key", Tag.name_key, unique=True)
@@ -34,6 +34,10 @@ class User(UserMixin, db.Model):
     # ----- 권한 -----
     is_admin = db.Column(db.Boolean, nullable=False, default=False)  # 관리자 여부 (기본값 False)
 
+    # ----- 구독 피드 -----
+    # True: 구독자가 많은 채널 – 업로드 시 구독자 inbox 에 넣지 않고 피드 조회 때 합침 (app/utils/feed.py)
+    feed_pull = db.Column(db.Boolean, nullable=False, default=False, server_default="0")
+
     # ----- 타임스탬프 -----
     created_at = db.Column(db.DateTime, default=_utc_now)                    # 최초 생성 시각
     updated_at = db.Column(db.DateTime, default=_utc_now, onupdate=_utc_now)  # 수정 시 자동 갱신
@@ -60,16 +64,21 @@ class User(UserMixin, db.Model):
         """입력한 비밀번호가 저장된 해시와 일치하는지 검증."""
         return check_password_hash(self.password_hash, password)
 
-    def get_profile_image_url(self):
+    def get_profile_image_url(self, width=None):
         """
         프로필 이미지 URL 반환.
         - Cloudinary: profile_image에 저장된 전체 URL 그대로 반환
         - 로컬: main.media_profile 경로 반환
+        - width 를 주면 해당 너비 축소본 URL (app/utils/thumbnails.py)
         """
         if not self.profile_image:
             return None
         from flask import url_for
 
+        if width:
+            from app.utils.thumbnails import variant_url
+            return variant_url("profiles", self.profile_image, width)
+
         # Cloudinary URL(전체 URL)이면 그대로 반환
         if self.profile_image.startswith(("http://", "https://")):
             return self.profile_image
@@ -29,12 +29,32 @@ video_likes = db.Table(
     db.Column("created_at", db.DateTime, default=_utc_now),
 )
 
+# 관련 동영상 미리 계산 결과 (app/utils/related.py). video_id 별 rank 순서로 related_id 저장
+related_videos = db.Table(
+    "related_videos",
+    db.Column("video_id", db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("rank", db.Integer, primary_key=True),
+    db.Column("related_id", db.Integer, db.ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True),
+    db.Column("score", db.Float, nullable=False, default=0.0),  # 태그 Jaccard 유사도
+    db.Column("computed_at", db.DateTime, default=_utc_now),
+)
+
+
+# 재생 시간 필터 (초): short 4분 미만, medium 4~20분, long 20분 초과 – (이상, 미만)
+LENGTH_FILTERS = {
+    "short": (None, 240),
+    "medium": (240, 1200),
+    "long": (1200, None),
+}
+
 
 class Video(db.Model):
     """업로드된 동영상 정보."""
 
     # 테이블명
     __tablename__ = "videos"
+    # 채널별 최신순 조회 (프로필 목록, 구독 피드의 대형 채널 merge-on-read. app/utils/feed.py)
+    __table_args__ = (db.Index("ix_videos_user_created", "user_id", "created_at", "id"),)
 
     # ----- 기본 키 -----
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -45,6 +65,14 @@ class Video(db.Model):
     category = db.Column(db.String(50), nullable=True)     # 카테고리 (미사용 가능)
     duration = db.Column(db.Integer, nullable=True)        # 재생 시간(초)
 
+    # ----- 미디어 정보 (업로드 시 컨테이너 헤더에서 추출. app/utils/media_probe.py) -----
+    width = db.Column(db.Integer, nullable=True)                  # 해상도(px)
+    height = db.Column(db.Integer, nullable=True)
+    video_codec = db.Column(db.String(32), nullable=True)         # 예: h264, vp9
+    audio_codec = db.Column(db.String(32), nullable=True)         # 예: aac, opus
+    bitrate = db.Column(db.Integer, nullable=True)                # 평균 비트레이트(bps)
+    faststart = db.Column(db.Boolean, nullable=True)              # MP4: moov 가 앞(바로 재생), WebM·미분석은 NULL
+
     # ----- 파일 경로/URL (로컬: 파일명, Cloudinary: secure_url) -----
     video_path = db.Column(db.String(500), nullable=False)       # 비디오 파일명(로컬) 또는 public_id
     thumbnail_path = db.Column(db.String(500), nullable=True)    # 썸네일 파일명(로컬)
@@ -53,9 +81,14 @@ class Video(db.Model):
     video_url = db.Column(db.String(512), nullable=True)         # Cloudinary secure_url (비디오)
     thumbnail_url = db.Column(db.String(512), nullable=True)      # Cloudinary secure_url (썸네일)
 
+    # ----- 처리 상태 (Cloudinary 업로드 작업: processing → ready / failed. app/utils/media_jobs.py) -----
+    status = db.Column(db.String(20), nullable=False, default="ready", server_default="ready")
+
     # ----- 통계 -----
     views = db.Column(db.Integer, nullable=False, default=0)   # 조회수
     likes = db.Column(db.Integer, nullable=False, default=0) # 좋아요 수
+    # 댓글 수 (답글 포함). 댓글 insert/delete 때 같은 트랜잭션에서 ± 1 (app/utils/comments.py)
+    comment_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     # ----- 작성자 (users.id 참조. 유저 삭제 시 해당 영상도 CASCADE 삭제) -----
     user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -73,6 +106,20 @@ class Video(db.Model):
         lazy="select",  # save_tags에서 목록 할당을 위해 select 사용
     )
 
+    @classmethod
+    def length_filter(cls, length):
+        """재생 시간 필터 이름(short|medium|long) → WHERE 조건. 모르는 값이면 None (재생 시간 모르는 비디오는 제외)."""
+        bounds = LENGTH_FILTERS.get(length or "")
+        if bounds is None:
+            return None
+        low, high = bounds
+        conditions = [cls.duration.isnot(None)]
+        if low is not None:
+            conditions.append(cls.duration >= low)
+        if high is not None:
+            conditions.append(cls.duration < high)
+        return db.and_(*conditions)
+
     def get_video_url(self):
         """비디오 재생 URL. Cloudinary URL이 있으면 반환, 없으면 로컬 media 경로."""
         if self.video_url:
@@ -80,38 +127,37 @@ class Video(db.Model):
         from flask import url_for
         return url_for("main.media_video", filename=self.video_path)
 
-    def get_thumbnail_url(self):
-        """썸네일 URL. Cloudinary URL이 있으면 반환, 없으면 로컬 media 경로. 없으면 None."""
+    def get_thumbnail_url(self, width=None):
+        """
+        썸네일 URL. Cloudinary URL이 있으면 반환, 없으면 로컬 media 경로. 없으면 None.
+        width 를 주면 해당 너비 축소본 URL (로컬: WebP 변형, Cloudinary: 변환 URL. app/utils/thumbnails.py)
+        """
+        source = self.thumbnail_url or self.thumbnail_path
+        if not source:
+            return None
+        if width:
+            from app.utils.thumbnails import variant_url
+            return variant_url("thumbnails", source, width)
         if self.thumbnail_url:
             return self.thumbnail_url
-        if not self.thumbnail_path:
-            return None
         from flask import url_for
         return url_for("main.media_thumbnail", filename=self.thumbnail_path)
 
+    def get_thumbnail_srcset(self, fmt=None):
+        """img srcset 값 ("<url> 320w, <url> 640w, ..."). 썸네일이 없으면 None."""
+        from app.utils.thumbnails import variant_srcset
+        return variant_srcset("thumbnails", self.thumbnail_url or self.thumbnail_path, fmt)
+
     def save_tags(self, tag_string, commit=True):
         """
         콤마로 구분된 태그 문자열을 파싱해 Tag 객체로 변환 후 비디오에 연결.
         예: "태그1, 태그2, 태그3" -> [Tag(태그1), Tag(태그2), Tag(태그3)]
         기존 태그 연결은 새 태그 목록으로 교체됨.
+        이름은 정규화(공백 정리, 대소문자 무시) 후 IN 쿼리 1번으로 조회·없으면 일괄 생성하고,
+        추가·제거된 태그만 tags.video_count 를 ± 1 (app/utils/tags.py retag_videos).
         """
-        from app.models.tag import Tag
-
-        if not tag_string or not isinstance(tag_string, str):
-            tag_names = []
-        else:
-            tag_names = [name.strip() for name in tag_string.split(",") if name.strip()]
-
-        tag_objects = []
-        for name in tag_names:
-            if len(name) > 50:
-                continue
-            tag = Tag.query.filter_by(name=name).first()
-            if tag is None:
-                tag = Tag(name=name)
-                db.session.add(tag)
-            tag_objects.append(tag)
-
-        self.tags = tag_objects
-        if commit:
-            db.session.commit()
+        from app.utils.tags import retag_videos
+
+        if self.id is None:
+            db.session.flush()
+        retag_videos(db.session, {self.id: tag_string if isinstance(tag_string, str) else None}, commit=commit)
@@ -4,10 +4,13 @@ from pathlib import Path
 
 from flask import Blueprint, current_app, flash, redirect, render_template, request, send_file, url_for
 from flask_login import current_user, login_required
-from sqlalchemy.orm import joinedload
 
 from app import db
 from app.models import Comment, User, Video
+from app.utils.loading import loader_options
+from app.utils.pagination import keyset_paginate, sort_keys
+from app.utils.sql_stats import get_sql_stats
+from app.utils.tags import retag_videos
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
@@ -47,16 +50,13 @@ def index():
     # 통합 관리용 목록 (각 최근 20건)
     users_list = User.query.order_by(User.created_at.desc()).limit(20).all()
     videos_list = (
-        Video.query.options(joinedload(Video.user))
+        Video.query.options(*loader_options("video_list"))
         .order_by(Video.created_at.desc())
         .limit(20)
         .all()
     )
     comments_list = (
-        Comment.query.options(
-            joinedload(Comment.user),
-            joinedload(Comment.video),
-        )
+        Comment.query.options(*loader_options("admin_comments"))
         .order_by(Comment.created_at.desc())
         .limit(20)
         .all()
@@ -157,6 +157,31 @@ def video_delete(video_id):
     return redirect(url_for("admin.index"))
 
 
+@admin_bp.route("/videos/retag", methods=["POST"])
+@login_required
+@_admin_required
+def videos_retag():
+    """
+    관리자 태그 일괄 변경. video_ids(콤마 구분)의 비디오들에 tags 를
+    교체(mode=replace, 기본) 또는 추가(mode=add). 태그 조회·생성·연결은 일괄 처리.
+    """
+    raw_ids = (request.form.get("video_ids") or "").replace(" ", "").split(",")
+    ids = {int(x) for x in raw_ids if x.isdigit()}
+    tags_input = request.form.get("tags") or ""
+    replace = request.form.get("mode", "replace") != "add"
+    if ids:
+        ids = {vid for (vid,) in db.session.query(Video.id).filter(Video.id.in_(ids)).all()}
+    if not ids:
+        flash("태그를 변경할 동영상 번호를 입력하세요.", "error")
+        return redirect(url_for("admin.videos"))
+    result = retag_videos(db.session, {vid: tags_input for vid in ids}, replace=replace)
+    flash(
+        f"동영상 {len(ids)}개 태그 변경 (추가 {result['added']}건, 제거 {result['removed']}건).",
+        "success",
+    )
+    return redirect(url_for("admin.videos"))
+
+
 @admin_bp.route("/users")
 @login_required
 @_admin_required
@@ -179,8 +204,12 @@ def users():
                 User.nickname.ilike(pattern),
             )
         )
-    pagination = query.order_by(User.created_at.desc()).paginate(
-        page=page, per_page=15
+    pagination = keyset_paginate(
+        query,
+        [(User.created_at, True), (User.id, True)],
+        page=page,
+        per_page=15,
+        cursor=request.args.get("cursor"),
     )
     return render_template("admin/users.html", users=pagination)
 
@@ -197,7 +226,7 @@ def videos():
     if page < 1:
         page = 1
 
-    query = Video.query.options(joinedload(Video.user))
+    query = Video.query.options(*loader_options("video_list"))
     if q_param:
         pattern = f"%{q_param}%"
         query = query.join(Video.user).filter(
@@ -206,8 +235,8 @@ def videos():
                 User.username.ilike(pattern),
             )
         )
-    pagination = query.order_by(Video.created_at.desc()).paginate(
-        page=page, per_page=15
+    pagination = keyset_paginate(
+        query, sort_keys(Video, "latest"), page=page, per_page=15, cursor=request.args.get("cursor")
     )
     return render_template("admin/videos.html", videos=pagination)
 
@@ -224,10 +253,7 @@ def comments():
     if page < 1:
         page = 1
 
-    query = Comment.query.options(
-        joinedload(Comment.user),
-        joinedload(Comment.video),
-    ).order_by(Comment.created_at.desc())
+    query = Comment.query.options(*loader_options("admin_comments"))
 
     if q_param:
         pattern = f"%{q_param}%"
@@ -238,7 +264,13 @@ def comments():
             )
         )
 
-    pagination = query.paginate(page=page, per_page=15)
+    pagination = keyset_paginate(
+        query,
+        [(Comment.created_at, True), (Comment.id, True)],
+        page=page,
+        per_page=15,
+        cursor=request.args.get("cursor"),
+    )
     return render_template("admin/comments.html", comments=pagination)
 
 
@@ -294,6 +326,34 @@ def query():
     return render_template("admin/query.html")
 
 
+@admin_bp.route("/sql")
+@login_required
+@_admin_required
+def sql_stats():
+    """SQL 통계 – 지문(리터럴 정규화한 SQL)별 호출 수·시간 상위 목록, 최근 느린 쿼리. order: total | calls | avg | max."""
+    order = request.args.get("order", "total")
+    if order not in ("total", "calls", "avg", "max"):
+        order = "total"
+    stats = get_sql_stats()
+    return render_template(
+        "admin/sql.html",
+        fingerprints=stats.top(limit=50, order=order),
+        slow_queries=stats.slow_queries(),
+        since=stats.since,
+        order=order,
+        slow_ms=current_app.config.get("SQL_SLOW_QUERY_MS"),
+    )
+
+
+@admin_bp.route("/sql/reset", methods=["POST"])
+@login_required
+@_admin_required
+def sql_stats_reset():
+    get_sql_stats().reset()
+    flash("SQL 통계를 초기화했습니다.", "success")
+    return redirect(url_for("admin.sql_stats"))
+
+
 @admin_bp.route("/table/<table_name>")
 @login_required
 @_admin_required
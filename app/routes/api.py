@@ -2,127 +2,129 @@
 REST API 블루프린트 – 웹/모바일 앱용 JSON API.
 
 엔드포인트:
-  - GET /api/videos (목록, 페이지네이션·검색·정렬)
+  - GET /api/videos (목록, 페이지네이션(page 또는 cursor)·전문 검색·정렬)
+  - GET /api/videos?ids=1,2,3 (여러 비디오 일괄 조회, 조회수 증가 없음)
   - GET /api/videos/<id> (상세 + 관련 동영상)
   - GET /api/tags/popular (인기 태그)
   - GET /api/tags/<tag_name>/videos (태그별 비디오)
-  - GET /api/users/<username> (사용자 프로필 + 채널 통계)
+  - GET /api/users?ids=1,2,3 (여러 사용자 일괄 조회 + 구독자 수·현재 사용자의 구독 여부)
+  - GET /api/users/<username> (사용자 프로필 + 채널 통계 + 현재 사용자의 구독 여부)
+  - GET /api/channels/state?ids=1,2,3 (채널 여러 개의 구독자 수·현재 사용자의 구독 여부, 각각 쿼리 1번)
   - GET /api/users/<username>/videos (사용자 업로드 비디오)
+  - GET /api/videos/<id>/comments (최상위 댓글, cursor 페이지, 등록순·인기순)
+  - GET /api/comments/<id>/replies (답글, cursor 페이지)
 """
 
-from sqlalchemy import func, or_, and_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select
 
-from flask import abort, Blueprint, jsonify, request
+from flask import abort, Blueprint, current_app, jsonify, request
+from flask_login import current_user
 
 from app import db
-from app.models import Tag, User, Video
+from app.models import Comment, Tag, User, Video
 from app.models.video import video_tags
+from app.utils.channel_stats import get_channel_stats
+from app.utils.comment_reactions import get_reactions
+from app.utils.comments import replies_page, reply_counts, top_comments_page
+from app.utils.loading import loader_options
+from app.utils.pagination import keyset_paginate, sort_keys
+from app.utils.related import get_related
+from app.utils.request_cache import get_user_by_username
+from app.utils.response_cache import TAGS, VIDEOS, cached_response
+from app.utils.search_index import apply_search, relevance_keys
+from app.utils.serializers import VideoSerializer
+from app.utils.subscriptions import subscriber_counts, subscription_states
+from app.utils.tag_stats import get_popular_tags
+from app.utils.tags import tag_key
+from app.utils.view_counter import get_view_counter
 
 api_bp = Blueprint("api", __name__, url_prefix="/api")
 
+# /api/channels/state 한 번에 조회할 수 있는 최대 채널 수
+MAX_CHANNEL_IDS = 200
+# /api/videos?ids=, /api/users?ids= 한 번에 조회할 수 있는 최대 개수
+MAX_BATCH_IDS = 100
+
 
 # ---------------------------------------------------------------------------
-# 헬퍼: 비디오 → JSON 직렬화
+# 헬퍼: 비디오 → JSON 직렬화 (app/utils/serializers.py, fields= 로 응답 필드 선택)
 # ---------------------------------------------------------------------------
-def _video_to_dict(video):
-    """비디오 객체를 API 응답용 딕셔너리로 변환."""
+def _video_serializer():
+    """요청의 fields= 인자를 반영한 VideoSerializer."""
+    return VideoSerializer(request.args.get("fields", type=str))
+
+
+def _batch_ids():
+    """
+    ids= 값("1,2,3") → 중복 없는 id 목록 (요청 순서 유지). 숫자가 아닌 값은 무시.
+    MAX_BATCH_IDS 초과면 None (호출하는 쪽에서 400).
+    """
+    ids = list(dict.fromkeys(int(x) for x in request.args.get("ids", "").split(",") if x.strip().isdigit()))
+    return ids if len(ids) <= MAX_BATCH_IDS else None
+
+
+def _too_many_ids():
+    return jsonify({"success": False, "error": f"ids 는 최대 {MAX_BATCH_IDS}개까지 조회할 수 있습니다."}), 400
+
+
+def _comment_to_dict(comment, reply_count=0, reaction=None):
+    """
+    댓글 객체를 API 응답용 딕셔너리로 변환 (watch 페이지 '댓글 더보기'에서 그대로 그림).
+    my_reaction: 현재 사용자의 반응 ("like" | "dislike" | None).
+    """
+    user = comment.user
     return {
-        "id": video.id,
-        "title": video.title,
-        "description": video.description or "",
-        "category": video.category or "",
-        "duration": video.duration,
-        "views": video.views,
-        "likes": video.likes,
-        "created_at": video.created_at.isoformat() if video.created_at else None,
-        "video_url": video.get_video_url() if video.video_path else None,
-        "thumbnail_url": video.get_thumbnail_url(),
-        "channel": {
-            "id": video.user.id if video.user else None,
-            "username": video.user.username if video.user else "unknown",
+        "id": comment.id,
+        "video_id": comment.video_id,
+        "parent_id": comment.parent_id,
+        "content": comment.content,
+        "likes": comment.likes,
+        "dislikes": comment.dislikes,
+        "my_reaction": reaction,
+        "reply_count": reply_count,
+        "created_at": comment.created_at.isoformat() if comment.created_at else None,
+        "time_ago": current_app.jinja_env.filters["timesince"](comment.created_at),
+        "user": {
+            "id": user.id if user else None,
+            "username": user.username if user else "알 수 없음",
+            "profile_image_url": user.get_profile_image_url(320) if user else None,
         },
-        "tags": [t.name for t in video.tags] if video.tags else [],
+        "can_edit": bool(current_user.is_authenticated and current_user.id == comment.user_id),
     }
 
 
+def _comments_to_dicts(comments):
+    """댓글 목록 직렬화 – 답글 수·현재 사용자 반응은 목록 전체에 대해 각각 쿼리 1번."""
+    ids = [c.id for c in comments]
+    counts = reply_counts(ids)
+    user_id = current_user.id if current_user.is_authenticated else None
+    reactions = get_reactions(db.session, user_id, ids)
+    return [_comment_to_dict(c, counts.get(c.id, 0), reactions.get(c.id)) for c in comments]
+
+
+def _comments_per_page(config_key):
+    """per_page 파라미터 (1~100, 없거나 범위 밖이면 설정값)."""
+    default = current_app.config[config_key]
+    per_page = request.args.get("per_page", default, type=int)
+    return per_page if 1 <= per_page <= 100 else default
+
+
 def _pagination_meta(pagination):
-    """paginate() 결과에서 메타 정보 추출."""
-    return {
-        "total_pages": pagination.pages,
-        "current_page": pagination.page,
-        "per_page": pagination.per_page,
-        "total_items": pagination.total,
-        "has_next": pagination.has_next,
-        "has_prev": pagination.has_prev,
-    }
+    """keyset_paginate() 결과에서 메타 정보 추출 (total 은 캐시된 개수, next_cursor 포함)."""
+    return pagination.meta()
 
 
 # ---------------------------------------------------------------------------
-# 관련 동영상 추천 알고리즘
-# 1순위: 같은 태그, 2순위: 같은 카테고리, 3순위: 같은 작성자, 4순위: 인기순(조회수/좋아요)
+# 관련 동영상 추천 (미리 계산된 related_videos 조회, app/utils/related.py)
+# 순위: 태그 유사도(Jaccard) > 같은 카테고리 > 같은 작성자 > 인기순(조회수/좋아요)
 # 조건: 현재 비디오 제외, 중복 없이 limit개
 # ---------------------------------------------------------------------------
 def get_related_videos(video_id, limit=5):
     """
     상세 조회 시 함께 보여줄 추천 비디오 목록 반환.
-    우선순위: 같은 태그 > 같은 카테고리 > 같은 작성자 > 인기순.
+    비디오별로 저장해 둔 상위 목록을 한 번에 조회 (없거나 오래됐으면 그 비디오만 재계산).
     """
-    current = db.session.get(Video, video_id)
-    if not current:
-        return []
-
-    exclude_ids = {video_id}
-    result = []
-    seen_ids = set()
-
-    def add_videos(q, max_take=None):
-        """쿼리에서 limit 남은 개수만큼 추가 (중복·현재 비디오 제외)."""
-        nonlocal result, seen_ids
-        remaining = limit - len(result)
-        if remaining <= 0 or (max_take is not None and max_take <= 0):
-            return
-        q = q.filter(Video.id.notin_(exclude_ids)).options(
-            joinedload(Video.user), joinedload(Video.tags)
-        )
-        if seen_ids:
-            q = q.filter(Video.id.notin_(seen_ids))
-        take = min(remaining, limit) if max_take is None else min(remaining, max_take)
-        rows = q.limit(take).all()
-        for v in rows:
-            if len(result) >= limit:
-                break
-            if v.id not in seen_ids:
-                result.append(v)
-                seen_ids.add(v.id)
-
-    # 1순위: 같은 태그
-    tag_ids = [t.id for t in current.tags] if current.tags else []
-    if tag_ids:
-        subq = (
-            db.session.query(video_tags.c.video_id)
-            .filter(video_tags.c.tag_id.in_(tag_ids))
-            .filter(video_tags.c.video_id != video_id)
-        )
-        add_videos(Video.query.filter(Video.id.in_(subq)).order_by(Video.created_at.desc()))
-
-    # 2순위: 같은 카테고리 (태그로 못 채운 경우)
-    if len(result) < limit and current.category:
-        add_videos(
-            Video.query.filter(Video.category == current.category).order_by(Video.created_at.desc())
-        )
-
-    # 3순위: 같은 작성자
-    if len(result) < limit and current.user_id:
-        add_videos(
-            Video.query.filter(Video.user_id == current.user_id).order_by(Video.created_at.desc())
-        )
-
-    # 4순위: 인기순 (조회수, 좋아요)
-    if len(result) < limit:
-        add_videos(Video.query.order_by(Video.views.desc(), Video.likes.desc()))
-
-    return result[:limit]
+    return get_related(video_id, limit=limit, options=loader_options("video_detail"))
 
 
 # ===========================================================================
@@ -131,87 +133,128 @@ def get_related_videos(video_id, limit=5):
 
 
 @api_bp.route("/videos", methods=["GET"], strict_slashes=False)
+@cached_response(
+    VIDEOS, TAGS, args=("page", "per_page", "sort", "category", "search", "tag", "length", "cursor", "fields", "ids")
+)
 def list_videos():
     """
     비디오 목록. 페이지네이션, 정렬, 카테고리, 검색 지원.
-    파라미터: page, per_page, sort, category, search
+    파라미터: page, per_page, sort, category, search, cursor, length(short | medium | long, 재생 시간),
+    fields(응답 필드, 예: id,title,thumbnail_url).
+    sort: latest | popular | views | relevance(검색 점수순).
+    응답의 next_cursor 를 cursor 로 넘기면 OFFSET 없이 다음 페이지 조회 (page 는 표시용).
+    필요한 컬럼만 튜플로 조회 (ORM 객체 없음).
+    ids 가 있으면 일괄 조회 (_videos_by_ids).
     """
+    if "ids" in request.args:
+        return _videos_by_ids()
+
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 12, type=int)
     sort = request.args.get("sort", "latest", type=str).strip() or "latest"
     category = request.args.get("category", "", type=str).strip()
     search = request.args.get("search", "", type=str).strip()
     tag_name = request.args.get("tag", "", type=str).strip()
+    length = request.args.get("length", "", type=str).strip()
 
     if page < 1:
         page = 1
     if per_page < 1 or per_page > 100:
         per_page = 12
 
-    query = Video.query.options(joinedload(Video.user), joinedload(Video.tags))
+    serializer = _video_serializer()
+    query = serializer.query(db.session)
 
     # 태그 필터
     if tag_name:
-        tag_obj = Tag.query.filter_by(name=tag_name).first()
+        tag_obj = Tag.query.filter(Tag.name_key == tag_key(tag_name)).first()
         if tag_obj:
             query = query.join(video_tags).filter(video_tags.c.tag_id == tag_obj.id)
         else:
             query = query.filter(Video.id < 0)
 
-    # 검색: 제목 또는 설명에 검색어 포함
+    # 검색: 제목·설명 전문 검색 (FTS5, 사용 불가 시 ILIKE)
+    rank = None
     if search:
-        pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                Video.title.ilike(pattern),
-                and_(Video.description.isnot(None), Video.description.ilike(pattern)),
-            )
-        )
+        query, rank = apply_search(query, search, db)
 
     # 카테고리 필터 (all 또는 빈 값이면 필터 없음)
     if category and category != "all":
         query = query.filter(Video.category == category)
 
-    # 정렬
-    if sort == "popular":
-        query = query.order_by(Video.likes.desc(), Video.views.desc())
-    elif sort == "views":
-        query = query.order_by(Video.views.desc())
+    # 재생 시간 필터
+    length_condition = Video.length_filter(length)
+    if length_condition is not None:
+        query = query.filter(length_condition)
+
+    # 정렬 (relevance: 검색 점수순). cursor 가 있으면 keyset, 없으면 page 번호
+    if sort == "relevance" and rank is not None:
+        keys = relevance_keys(rank)
     else:
-        query = query.order_by(Video.created_at.desc())
+        keys = sort_keys(Video, sort)
 
-    pagination = query.paginate(page=page, per_page=per_page)
-    items = [_video_to_dict(v) for v in pagination.items]
+    pagination = keyset_paginate(
+        query, keys, page=page, per_page=per_page, cursor=request.args.get("cursor", type=str)
+    )
+    pending = get_view_counter().pending_many(row.id for row in pagination.items)
+    items = serializer.dump_rows(db.session, pagination.items, pending_views=pending)
 
     return jsonify(
         {
             "success": True,
             "items": items,
+            "next_cursor": pagination.next_cursor,
             "meta": _pagination_meta(pagination),
         }
     )
 
 
+def _videos_by_ids():
+    """
+    ids(쉼표 구분, 최대 MAX_BATCH_IDS 개) 비디오를 한 번에 조회. 피드 카드마다 상세 API 를 부르지 않도록.
+    상세 API 와 달리 조회수를 올리지 않고 관련 동영상도 없음 (읽기 전용).
+    비디오(+채널) IN 쿼리 1번, 태그 IN 쿼리 1번. items 는 ids 순서, 없는 id 는 missing 에.
+    """
+    ids = _batch_ids()
+    if ids is None:
+        return _too_many_ids()
+    serializer = _video_serializer()
+    rows = serializer.query(db.session).filter(Video.id.in_(ids)).all() if ids else []
+    pending = get_view_counter().pending_many(row.id for row in rows)
+    items = serializer.dump_rows(db.session, rows, pending_views=pending)
+    found = {row.id: item for row, item in zip(rows, items)}
+
+    return jsonify(
+        {
+            "success": True,
+            "items": [found[i] for i in ids if i in found],
+            "missing": [i for i in ids if i not in found],
+        }
+    )
+
+
 @api_bp.route("/videos/<int:video_id>", methods=["GET"], strict_slashes=False)
 def video_detail(video_id):
     """
     비디오 상세 조회. 조회수 +1, 관련 동영상 포함.
     """
-    video = Video.query.options(joinedload(Video.user), joinedload(Video.tags)).filter(Video.id == video_id).first()
+    video = Video.query.options(*loader_options("video_detail")).filter(Video.id == video_id).first()
     if not video:
         abort(404)
 
-    # 조회수 증가
-    video.views += 1
-    db.session.commit()
+    # 조회수 증가 (버퍼 누적, 표시값은 DB 값 + 미반영분)
+    counter = get_view_counter()
+    counter.increment(video.id)
 
     related = get_related_videos(video_id, limit=5)
-    related_items = [_video_to_dict(v) for v in related]
+    counter.apply_pending([video] + related)
+    serializer = _video_serializer()
+    related_items = [serializer.dump_video(v) for v in related]
 
     return jsonify(
         {
             "success": True,
-            "item": _video_to_dict(video),
+            "item": serializer.dump_video(video),
             "related_videos": related_items,
         }
     )
@@ -223,6 +266,7 @@ def video_detail(video_id):
 
 
 @api_bp.route("/tags/popular", methods=["GET"])
+@cached_response(TAGS, args=("limit",))
 def popular_tags():
     """
     비디오가 가장 많이 등록된 상위 N개 태그.
@@ -232,26 +276,20 @@ def popular_tags():
     if limit < 1 or limit > 50:
         limit = 10
 
-    tags = (
-        db.session.query(Tag)
-        .join(video_tags)
-        .group_by(Tag.id)
-        .order_by(func.count(video_tags.c.video_id).desc())
-        .limit(limit)
-        .all()
-    )
+    tags = get_popular_tags(limit)
 
-    items = [{"id": t.id, "name": t.name} for t in tags]
+    items = [{"id": t.id, "name": t.name, "video_count": t.video_count} for t in tags]
 
     return jsonify({"success": True, "items": items})
 
 
 @api_bp.route("/tags/<tag_name>/videos", methods=["GET"])
+@cached_response(VIDEOS, TAGS, args=("page", "per_page", "cursor", "fields"))
 def tag_videos(tag_name):
     """
-    특정 태그가 달린 비디오 목록. 최신순, 페이지네이션.
+    특정 태그가 달린 비디오 목록. 최신순, 페이지네이션 (page 또는 cursor), fields 로 응답 필드 선택.
     """
-    tag_obj = Tag.query.filter_by(name=tag_name).first_or_404()
+    tag_obj = Tag.query.filter(Tag.name_key == tag_key(tag_name)).first_or_404()
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 12, type=int)
     if page < 1:
@@ -259,20 +297,22 @@ def tag_videos(tag_name):
     if per_page < 1 or per_page > 100:
         per_page = 12
 
-    pagination = (
-        Video.query.options(joinedload(Video.user), joinedload(Video.tags))
-        .join(video_tags)
-        .filter(video_tags.c.tag_id == tag_obj.id)
-        .order_by(Video.created_at.desc())
-        .paginate(page=page, per_page=per_page)
+    serializer = _video_serializer()
+    pagination = keyset_paginate(
+        serializer.query(db.session).join(video_tags).filter(video_tags.c.tag_id == tag_obj.id),
+        sort_keys(Video, "latest"),
+        page=page,
+        per_page=per_page,
+        cursor=request.args.get("cursor", type=str),
     )
-    items = [_video_to_dict(v) for v in pagination.items]
+    items = serializer.dump_rows(db.session, pagination.items)
 
     return jsonify(
         {
             "success": True,
             "tag": {"id": tag_obj.id, "name": tag_obj.name},
             "items": items,
+            "next_cursor": pagination.next_cursor,
             "meta": _pagination_meta(pagination),
         }
     )
@@ -283,23 +323,58 @@ def tag_videos(tag_name):
 # ===========================================================================
 
 
+@api_bp.route("/users", methods=["GET"], strict_slashes=False)
+def users_by_ids():
+    """
+    ids(쉼표 구분, 최대 MAX_BATCH_IDS 개) 사용자를 한 번에 조회 (피드 카드의 채널 정보용).
+    사용자 IN 쿼리 1번 + 구독자 수 1번 + 현재 사용자의 구독 여부 1번 (로그인 시). items 는 ids 순서, 없는 id 는 missing 에.
+    채널 통계 전체·email 은 프로필 API(/api/users/<username>)에서.
+    """
+    ids = _batch_ids()
+    if ids is None:
+        return _too_many_ids()
+    rows = (
+        db.session.execute(
+            select(User.id, User.username, User.nickname, User.profile_image).where(User.id.in_(ids))
+        ).all()
+        if ids
+        else []
+    )
+    found = {row.id: row for row in rows}
+    viewer_id = current_user.id if current_user.is_authenticated else None
+    counts = subscriber_counts(db.session, found)
+    states = subscription_states(db.session, viewer_id, found)
+
+    return jsonify(
+        {
+            "success": True,
+            "items": [
+                {
+                    "id": row.id,
+                    "username": row.username,
+                    "nickname": row.nickname or row.username,
+                    "profile_image": row.profile_image,
+                    "subscriber_count": counts.get(row.id, 0),
+                    "is_subscribed": states.get(row.id, False),
+                }
+                for row in (found[i] for i in ids if i in found)
+            ],
+            "missing": [i for i in ids if i not in found],
+        }
+    )
+
+
 @api_bp.route("/users/<username>", methods=["GET"])
 def user_profile(username):
     """
     사용자 프로필 + 채널 통계 (총 조회수, 총 좋아요, 구독자 수).
+    subscriber_count 는 channel_stats 의 구독자 수, is_subscribed 는 현재 사용자의 구독 여부 (비로그인 False).
     """
-    user = User.query.filter_by(username=username).first_or_404()
-
-    stats_row = (
-        db.session.query(
-            func.coalesce(func.sum(Video.views), 0).label("total_views"),
-            func.coalesce(func.sum(Video.likes), 0).label("total_likes"),
-            func.count(Video.id).label("video_count"),
-        )
-        .filter(Video.user_id == user.id)
-        .first()
-    )
-    subscriber_count = user.subscribers_rel.count()
+    user = get_user_by_username(username) or abort(404)
+
+    stats = get_channel_stats(user.id)
+    viewer_id = current_user.id if current_user.is_authenticated else None
+    is_subscribed = viewer_id != user.id and subscription_states(db.session, viewer_id, [user.id])[user.id]
 
     return jsonify(
         {
@@ -310,23 +385,47 @@ def user_profile(username):
                 "nickname": user.nickname or user.username,
                 "email": user.email,
                 "profile_image": user.profile_image,
+                "subscriber_count": stats["subscriber_count"],
+                "is_subscribed": is_subscribed,
                 "stats": {
-                    "total_views": int(stats_row.total_views or 0),
-                    "total_likes": int(stats_row.total_likes or 0),
-                    "video_count": int(stats_row.video_count or 0),
-                    "subscriber_count": subscriber_count,
+                    "total_views": stats["total_views"],
+                    "total_likes": stats["total_likes"],
+                    "video_count": stats["video_count"],
+                    "subscriber_count": stats["subscriber_count"],
                 },
             },
         }
     )
 
 
+@api_bp.route("/channels/state", methods=["GET"])
+def channels_state():
+    """
+    ids(쉼표 구분, 최대 MAX_CHANNEL_IDS 개) 채널의 구독자 수·현재 사용자의 구독 여부.
+    목록 화면의 구독 배지·구독자 수를 채널 수와 관계없이 쿼리 2번으로. 응답 items: {"<채널 id>": {...}}.
+    """
+    raw = request.args.get("ids", "")
+    ids = [int(x) for x in raw.split(",") if x.strip().isdigit()][:MAX_CHANNEL_IDS]
+    viewer_id = current_user.id if current_user.is_authenticated else None
+    counts = subscriber_counts(db.session, ids)
+    states = subscription_states(db.session, viewer_id, ids)
+    return jsonify(
+        {
+            "success": True,
+            "items": {
+                str(cid): {"subscriber_count": counts.get(cid, 0), "is_subscribed": states.get(cid, False)}
+                for cid in counts
+            },
+        }
+    )
+
+
 @api_bp.route("/users/<username>/videos", methods=["GET"])
 def user_videos(username):
     """
-    해당 사용자가 업로드한 비디오 목록. 페이지네이션.
+    해당 사용자가 업로드한 비디오 목록. 페이지네이션 (page 또는 cursor), fields 로 응답 필드 선택.
     """
-    user = User.query.filter_by(username=username).first_or_404()
+    user = get_user_by_username(username) or abort(404)
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 12, type=int)
     if page < 1:
@@ -334,19 +433,72 @@ def user_videos(username):
     if per_page < 1 or per_page > 100:
         per_page = 12
 
-    pagination = (
-        Video.query.options(joinedload(Video.user), joinedload(Video.tags))
-        .filter(Video.user_id == user.id)
-        .order_by(Video.created_at.desc())
-        .paginate(page=page, per_page=per_page)
+    serializer = _video_serializer()
+    pagination = keyset_paginate(
+        serializer.query(db.session).filter(Video.user_id == user.id),
+        sort_keys(Video, "latest"),
+        page=page,
+        per_page=per_page,
+        cursor=request.args.get("cursor", type=str),
     )
-    items = [_video_to_dict(v) for v in pagination.items]
+    items = serializer.dump_rows(db.session, pagination.items)
 
     return jsonify(
         {
             "success": True,
             "user": {"id": user.id, "username": user.username},
             "items": items,
+            "next_cursor": pagination.next_cursor,
             "meta": _pagination_meta(pagination),
         }
     )
+
+
+# ===========================================================================
+# 4. 댓글 API
+# ===========================================================================
+
+
+@api_bp.route("/videos/<int:video_id>/comments", methods=["GET"])
+def video_comments(video_id):
+    """
+    비디오의 최상위 댓글. cursor 로 다음 페이지, 답글은 reply_count 만 포함.
+    sort: oldest (작성 시각 오름차순, 기본) | top (좋아요 많은 순). total 은 videos.comment_count (답글 포함).
+    """
+    video = db.session.get(Video, video_id)
+    if video is None:
+        abort(404)
+    page = top_comments_page(
+        video_id,
+        cursor=request.args.get("cursor", type=str),
+        per_page=_comments_per_page("COMMENTS_PER_PAGE"),
+        sort=request.args.get("sort", "oldest", type=str),
+    )
+    return jsonify(
+        {
+            "success": True,
+            "items": _comments_to_dicts(page.items),
+            "next_cursor": page.next_cursor,
+            "meta": {**page.meta(with_total=False), "total_comments": video.comment_count},
+        }
+    )
+
+
+@api_bp.route("/comments/<int:comment_id>/replies", methods=["GET"])
+def comment_replies(comment_id):
+    """댓글의 답글 (작성 시각 오름차순). cursor 로 다음 페이지."""
+    if db.session.get(Comment, comment_id) is None:
+        abort(404)
+    page = replies_page(
+        comment_id,
+        cursor=request.args.get("cursor", type=str),
+        per_page=_comments_per_page("COMMENT_REPLIES_PER_PAGE"),
+    )
+    return jsonify(
+        {
+            "success": True,
+            "items": _comments_to_dicts(page.items),
+            "next_cursor": page.next_cursor,
+            "meta": page.meta(with_total=False),
+        }
+    )
@@ -27,19 +27,20 @@ def _is_cloudinary_enabled():
 
 def _save_profile_image(profile_file, user):
     """
-    프로필 이미지를 Cloudinary 또는 로컬에 저장.
-    Cloudinary 사용 시: profile_image에 secure_url, profile_image_public_id에 public_id 저장.
-    로컬 사용 시: profile_image에 파일명 저장.
+    프로필 이미지를 로컬에 저장하고 profile_image에 파일명 저장.
+    Cloudinary 사용 시: 업로드 작업을 등록 → 작업이 profile_image를 secure_url로,
+    profile_image_public_id를 public_id로 교체 (app/utils/media_jobs.py). 커밋은 호출한 쪽에서.
     """
+    from app.utils.media_jobs import enqueue_destroy, enqueue_profile_upload
+    from app.utils.thumbnails import precompute_variants
+
     save_dir = current_app.config["PROFILE_IMAGE_FOLDER"]
 
-    # 기존 프로필 이미지 삭제 (로컬 파일 또는 Cloudinary)
+    # 기존 프로필 이미지 삭제 (로컬 파일 또는 Cloudinary 삭제 작업 등록)
     if user.profile_image:
         if user.profile_image.startswith(("http://", "https://")):
             # Cloudinary: public_id로 삭제
-            if user.profile_image_public_id:
-                from app.utils.cloudinary_upload import delete_cloudinary_resource
-                delete_cloudinary_resource(user.profile_image_public_id, "image")
+            enqueue_destroy(db.session, user.profile_image_public_id, "image")
         else:
             old_path = os.path.join(save_dir, user.profile_image)
             if os.path.isfile(old_path):
@@ -50,31 +51,27 @@ def _save_profile_image(profile_file, user):
         user.profile_image = None
         user.profile_image_public_id = None
 
-    if _is_cloudinary_enabled():
-        from app.utils.cloudinary_upload import upload_image
-        secure_url, public_id, err = upload_image(profile_file, folder="wetube/profiles")
-        if err:
-            flash(err, "error")
-            raise ValueError(err)
-        user.profile_image = secure_url
-        user.profile_image_public_id = public_id
+    base_name = secure_filename(profile_file.filename) or "profile"
+    if "." in base_name:
+        name_part, ext_part = base_name.rsplit(".", 1)
+        ext_part = ext_part.lower() if ext_part else "jpg"
     else:
-        base_name = secure_filename(profile_file.filename) or "profile"
-        if "." in base_name:
-            name_part, ext_part = base_name.rsplit(".", 1)
-            ext_part = ext_part.lower() if ext_part else "jpg"
-        else:
-            name_part, ext_part = base_name, "jpg"
-        timestamp_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = f"{timestamp_prefix}_{name_part}.{ext_part}".replace(" ", "_")
-        if not safe_name or safe_name.startswith("."):
-            safe_name = f"{timestamp_prefix}_profile.{ext_part}"
-        try:
-            profile_file.save(os.path.join(save_dir, safe_name))
-        except OSError as e:
-            flash(f"프로필 이미지 저장 실패: {e}", "error")
-            raise ValueError(str(e))
-        user.profile_image = safe_name
+        name_part, ext_part = base_name, "jpg"
+    timestamp_prefix = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_name = f"{timestamp_prefix}_{name_part}.{ext_part}".replace(" ", "_")
+    if not safe_name or safe_name.startswith("."):
+        safe_name = f"{timestamp_prefix}_profile.{ext_part}"
+    try:
+        profile_file.save(os.path.join(save_dir, safe_name))
+    except OSError as e:
+        flash(f"프로필 이미지 저장 실패: {e}", "error")
+        raise ValueError(str(e))
+    user.profile_image = safe_name
+    # 댓글 아바타 등에 쓸 축소본 미리 생성 (별도 프로세스, app/utils/thumbnails.py)
+    precompute_variants("profiles", safe_name)
+
+    if _is_cloudinary_enabled():
+        enqueue_profile_upload(db.session, user, safe_name)
 
 
 def _is_safe_redirect_url(url):
@@ -1,13 +1,20 @@
 """
-댓글 블루프린트 – 비디오 댓글·대댓글 CRUD.
+댓글 블루프린트 – 비디오 댓글·대댓글 CRUD + 좋아요/싫어요.
 작성/수정/삭제는 모두 로그인 필요, 수정/삭제는 본인만 가능.
+
+- POST /comments/<id>/like, /comments/<id>/dislike: 반응 토글 (JSON)
+- GET /comments/reactions?ids=1,2,3: 현재 사용자의 댓글별 반응 (여러 댓글을 쿼리 1번으로)
 """
 
-from flask import Blueprint, flash, redirect, request, url_for
+from flask import Blueprint, flash, jsonify, redirect, request, url_for
 from flask_login import current_user, login_required
 
 from app import db
 from app.models import Comment, Video
+from app.utils.comment_reactions import get_reactions, toggle_reaction
+
+# /comments/reactions 한 번에 조회할 수 있는 최대 댓글 수
+MAX_REACTION_IDS = 200
 
 comments_bp = Blueprint("comments", __name__, url_prefix="/comments")
 
@@ -108,3 +115,45 @@ def delete(comment_id):
     db.session.commit()
     flash("댓글이 삭제되었습니다.", "success")
     return redirect(_get_watch_url(video_id))
+
+
+# ----- 댓글 좋아요·싫어요 토글 -----
+def _toggle_reaction_response(comment_id, reaction):
+    comment = db.session.get(Comment, comment_id)
+    if comment is None:
+        return jsonify({"success": False, "error": "댓글을 찾을 수 없습니다."}), 404
+    current, likes, dislikes = toggle_reaction(db.session, comment, current_user.id, reaction)
+    return jsonify({
+        "success": True,
+        "reaction": current,
+        "likes_count": likes,
+        "dislikes_count": dislikes,
+    })
+
+
+@comments_bp.route("/<int:comment_id>/like", methods=["POST"])
+@login_required
+def like(comment_id):
+    """댓글 좋아요 토글 (싫어요 상태였으면 싫어요 해제). 카운터는 같은 트랜잭션에서 ± 1."""
+    return _toggle_reaction_response(comment_id, "like")
+
+
+@comments_bp.route("/<int:comment_id>/dislike", methods=["POST"])
+@login_required
+def dislike(comment_id):
+    """댓글 싫어요 토글 (좋아요 상태였으면 좋아요 해제)."""
+    return _toggle_reaction_response(comment_id, "dislike")
+
+
+# ----- 현재 사용자의 반응 일괄 조회 -----
+@comments_bp.route("/reactions", methods=["GET"])
+def reactions():
+    """
+    ids(쉼표 구분, 최대 MAX_REACTION_IDS 개) 댓글에 대한 현재 사용자 반응.
+    응답 reactions: {"<댓글 id>": "like" | "dislike"} (반응 없는 댓글은 빠짐, 비로그인은 빈 객체).
+    """
+    raw = request.args.get("ids", "")
+    ids = [int(x) for x in raw.split(",") if x.strip().isdigit()][:MAX_REACTION_IDS]
+    user_id = current_user.id if current_user.is_authenticated else None
+    found = get_reactions(db.session, user_id, ids)
+    return jsonify({"success": True, "reactions": {str(k): v for k, v in found.items()}})
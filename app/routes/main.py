@@ -1,75 +1,98 @@
 """메인 라우트 – DB·미디어 연동."""
 
-from sqlalchemy import and_, func, or_
-from sqlalchemy.orm import joinedload
-
-from flask import Blueprint, current_app, jsonify, redirect, render_template, request, send_from_directory, url_for
+from flask import Blueprint, abort, current_app, jsonify, redirect, render_template, request, url_for
+from flask_login import current_user
 
 from app import db
-from app.models import Comment, Subscription, Tag, User, Video
+from app.models import Tag, User, Video
 from app.models.video import video_tags
+from app.utils.channel_stats import get_channel_stats
+from app.utils.comment_reactions import get_reactions
+from app.utils.comments import reply_counts, top_comments_page
+from app.utils.feed import feed_page
+from app.utils.loading import loader_options
+from app.utils.media import is_immutable_name, serve_media
+from app.utils.pagination import empty_page, keyset_paginate, sort_keys
+from app.utils.related import get_related
+from app.utils.request_cache import forget, get_user, get_user_by_username, memoize
+from app.utils.response_cache import TAGS, VIDEOS, cached_response
+from app.utils.search_index import apply_search, relevance_keys
+from app.utils.subscriptions import subscription_states, toggle_subscription
+from app.utils.thumbnails import SOURCE_KINDS, get_image_variants
+from app.utils.tag_stats import get_popular_tags
+from app.utils.tags import tag_key
+from app.utils.view_counter import get_view_counter
 
 main_bp = Blueprint("main", __name__)
 
 
 def _get_popular_tags(limit=12):
-    """동영상이 연결된 태그를 비디오 수 기준으로 정렬해 반환."""
-    return (
-        db.session.query(Tag)
-        .join(video_tags)
-        .group_by(Tag.id)
-        .order_by(func.count(video_tags.c.video_id).desc())
-        .limit(limit)
-        .all()
-    )
+    """동영상이 연결된 태그를 비디오 수(tags.video_count) 기준으로 정렬해 반환 (TTL 캐시)."""
+    return get_popular_tags(limit)
 
 
-# ----- 업로드된 미디어 서빙 (비디오·썸네일 URL) -----
+# ----- 업로드된 미디어 서빙 (비디오·썸네일 URL, Range·ETag·캐시. app/utils/media.py) -----
 @main_bp.route("/media/videos/<path:filename>")
 def media_video(filename):
     """업로드된 비디오 파일 응답."""
-    return send_from_directory(current_app.config["VIDEO_FOLDER"], filename)
+    return serve_media("videos", filename)
 
 
 @main_bp.route("/media/thumbnails/<path:filename>")
 def media_thumbnail(filename):
     """업로드된 썸네일 이미지 응답."""
-    return send_from_directory(current_app.config["THUMBNAIL_FOLDER"], filename)
+    return serve_media("thumbnails", filename)
 
 
 @main_bp.route("/media/profiles/<path:filename>")
 def media_profile(filename):
     """업로드된 프로필 이미지 응답."""
-    return send_from_directory(current_app.config["PROFILE_IMAGE_FOLDER"], filename)
+    return serve_media("profiles", filename)
+
+
+@main_bp.route("/media/variants/<kind>/<fmt>/<int:width>/<path:filename>")
+def media_variant(kind, fmt, width, filename):
+    """썸네일·프로필 이미지 축소본 (srcset). 아직 생성 전이면 생성 요청 후 원본으로 redirect."""
+    try:
+        variant = get_image_variants().variant_for(kind, filename, width, fmt)
+    except LookupError:
+        abort(404)
+    if variant is None:
+        return redirect(url_for(SOURCE_KINDS[kind][1], filename=filename))
+    # URL 은 원본 파일명 기준 → 원본이 같은 이름으로 교체될 수 있으면(프로필 이미지 등) 장기 캐시하지 않음
+    return serve_media("variants", variant, immutable=is_immutable_name(filename))
 
 
 @main_bp.route("/")
+@cached_response(VIDEOS, TAGS, args=("category", "sort", "tag", "length", "page", "cursor"), anonymous_only=True)
 def index():
     category = (request.args.get("category") or "all").strip() or "all"
     sort = (request.args.get("sort") or "latest").strip() or "latest"
     tag_filter = request.args.get("tag", "").strip()
+    length = request.args.get("length", "").strip()
 
     page = request.args.get("page", 1, type=int)
     if page < 1:
         page = 1
     per_page = 12
-    q = Video.query.options(joinedload(Video.user))
+    q = Video.query.options(*loader_options("video_cards"))
     # category가 all 또는 비어 있으면 카테고리 필터 없음 (NULL/빈 카테고리 영상도 포함)
     if category and category != "all":
         q = q.filter(Video.category == category)
+    # 재생 시간 필터 (short | medium | long)
+    length_condition = Video.length_filter(length)
+    if length_condition is not None:
+        q = q.filter(length_condition)
     if tag_filter:
-        tag_obj = Tag.query.filter_by(name=tag_filter).first()
+        tag_obj = Tag.query.filter(Tag.name_key == tag_key(tag_filter)).first()
         if tag_obj:
             q = q.join(video_tags).filter(video_tags.c.tag_id == tag_obj.id)
         else:
             q = q.filter(Video.id < 0)
-    if sort == "popular":
-        q = q.order_by(Video.likes.desc(), Video.views.desc())
-    elif sort == "views":
-        q = q.order_by(Video.views.desc())
-    else:
-        q = q.order_by(Video.created_at.desc())
-    videos = q.paginate(page=page, per_page=per_page)
+    # 정렬 키(created_at·views·likes + id) 기준 keyset 페이지네이션, cursor 없으면 page 번호
+    videos = keyset_paginate(
+        q, sort_keys(Video, sort), page=page, per_page=per_page, cursor=request.args.get("cursor")
+    )
     popular_tags = _get_popular_tags()
     return render_template(
         "main/index.html",
@@ -82,29 +105,29 @@ def index():
 @main_bp.route("/watch/<int:video_id>")
 def watch(video_id):
     video = Video.query.get_or_404(video_id)
-    video.views += 1
-    db.session.commit()
-    user = db.session.get(User, video.user_id) if video.user_id else None
+    # 조회수: 버퍼에 누적 (주기적으로 일괄 UPDATE), 표시값은 DB 값 + 미반영분
+    counter = get_view_counter()
+    counter.increment(video.id)
+    # 관련 동영상: 미리 계산된 목록 조회 (app/utils/related.py, 재계산은 별도 연결로 저장)
+    related = get_related(video_id, limit=10)
+    counter.apply_pending([video] + related)
+    # 업로더: identity map·사용자 캐시 우선 (관련 동영상 로드로 이미 세션에 있으면 SELECT 없음)
+    user = get_user(video.user_id)
     channel_name = user.username if user else "default"
-    related = (
-        Video.query.options(joinedload(Video.user))
-        .filter(Video.id != video_id)
-        .order_by(Video.created_at.desc())
-        .limit(10)
-        .all()
-    )
     current = _get_subscriptions_user()
     is_subscribed = _is_subscribed(current.id if current else None, video.user_id)
-    subscriber_count = user.subscribers_rel.count() if user else 0
-
-    # 최상위 댓글만 작성 시간 오름차순으로 조회 (대댓글은 replies로 포함)
-    top_comments = (
-        Comment.query.filter_by(video_id=video_id, parent_id=None)
-        .options(db.joinedload(Comment.user), db.joinedload(Comment.replies).joinedload(Comment.user))
-        .order_by(Comment.created_at.asc())
-        .all()
+    subscriber_count = get_channel_stats(user.id)["subscriber_count"] if user else 0
+
+    # 최상위 댓글 첫 페이지만 조회 (등록순 또는 인기순. 다음 페이지·답글은 /api 로 이어서 조회)
+    comment_sort = "top" if request.args.get("comment_sort") == "top" else "oldest"
+    comments_page = top_comments_page(
+        video_id, per_page=current_app.config["COMMENTS_PER_PAGE"], sort=comment_sort
     )
-    total_comments = sum(1 + len(c.replies) for c in top_comments)
+    comment_ids = [c.id for c in comments_page.items]
+    comment_reply_counts = reply_counts(comment_ids)
+    # 현재 사용자의 댓글별 좋아요·싫어요 (페이지 전체를 쿼리 1번으로)
+    viewer_id = current_user.id if current_user.is_authenticated else None
+    comment_reactions = get_reactions(db.session, viewer_id, comment_ids)
 
     return render_template(
         "main/watch.html",
@@ -113,8 +136,12 @@ def watch(video_id):
         related_videos=related,
         is_subscribed=is_subscribed,
         subscriber_count=subscriber_count,
-        comments=top_comments,
-        total_comments=total_comments,
+        comments=comments_page.items,
+        comments_next_cursor=comments_page.next_cursor,
+        reply_counts=comment_reply_counts,
+        comment_reactions=comment_reactions,
+        comment_sort=comment_sort,
+        total_comments=video.comment_count,
     )
 
 
@@ -122,6 +149,7 @@ def watch(video_id):
 def search():
     """
     비디오 검색 – 키워드(q), 카테고리(category), 정렬(sort), 페이지(page) 지원.
+    sort: latest(기본) | popular | views | relevance(검색 점수순)
     """
     q_param = request.args.get("q", "").strip()
     category = request.args.get("category", "").strip()
@@ -134,31 +162,25 @@ def search():
     if not q_param:
         pagination = None
     else:
-        query = Video.query.options(joinedload(Video.user))
+        query = Video.query.options(*loader_options("video_list"))
 
-        # ➂ 복합 키워드 검색: 제목 또는 설명에 검색어 포함
-        pattern = f"%{q_param}%"
-        keyword_filter = or_(
-            Video.title.ilike(pattern),
-            and_(Video.description.isnot(None), Video.description.ilike(pattern)),
-        )
-        query = query.filter(keyword_filter)
+        # ➂ 복합 키워드 검색: 제목·설명 전문 검색 (FTS5, 사용 불가 시 ILIKE)
+        query, rank = apply_search(query, q_param, db)
 
         # ➃ 카테고리 필터
         if category:
             query = query.filter(Video.category == category)
 
-        # ➄ 동적 정렬
-        if sort == "popular":
-            query = query.order_by(Video.likes.desc(), Video.views.desc())
-        elif sort == "views":
-            query = query.order_by(Video.views.desc())
+        # ➄ 동적 정렬 (relevance: 검색 점수순, 그 외 latest·popular·views)
+        if sort == "relevance" and rank is not None:
+            keys = relevance_keys(rank)
         else:
-            # latest (기본값): 최신순
-            query = query.order_by(Video.created_at.desc())
+            keys = sort_keys(Video, sort)
 
-        # ➅ 페이지네이션 (한 페이지당 12개)
-        pagination = query.paginate(page=page, per_page=12)
+        # ➅ 페이지네이션 (한 페이지당 12개, keyset)
+        pagination = keyset_paginate(
+            query, keys, page=page, per_page=12, cursor=request.args.get("cursor")
+        )
 
     return render_template(
         "main/search.html",
@@ -170,24 +192,26 @@ def search():
 
 
 def _is_subscribed(subscriber_id, subscribed_to_id):
-    """구독 관계 여부 확인."""
+    """구독 관계 여부 확인, 요청 안에서는 한 번만 조회 (여러 채널은 subscription_states 로 한 번에)."""
     if not subscriber_id or not subscribed_to_id or subscriber_id == subscribed_to_id:
         return False
-    return (
-        Subscription.query.filter_by(
-            subscriber_id=subscriber_id,
-            subscribed_to_id=subscribed_to_id,
-        ).first()
-        is not None
+    return memoize(
+        "is_subscribed",
+        (subscriber_id, subscribed_to_id),
+        lambda: subscription_states(db.session, subscriber_id, [subscribed_to_id])[subscribed_to_id],
     )
 
 
 def _get_subscriptions_user():
     """
-    구독 피드에 사용할 사용자 반환.
+    구독 피드에 사용할 사용자 반환 (요청 안에서는 한 번만 결정).
     로그인 미구현: 첫 번째 사용자 사용 (테스트 편의).
     로그인 연동 시 current_user 반환으로 교체.
     """
+    return memoize("subscriptions_user", None, _load_subscriptions_user)
+
+
+def _load_subscriptions_user():
     try:
         if hasattr(current_app, "login_manager"):
             from flask_login import current_user
@@ -227,76 +251,57 @@ def login_required(f):
 @main_bp.route("/subscriptions")
 @login_required
 def subscriptions():
-    """구독한 채널의 영상만 모아보는 피드. 로그인 필요 (테스트 시 첫 사용자로 대체)."""
+    """
+    구독한 채널의 영상만 모아보는 피드. 로그인 필요 (테스트 시 첫 사용자로 대체).
+    inbox(feed_items) + 구독자 많은 채널 영상을 합쳐 최신순 keyset 페이지 (app/utils/feed.py).
+    """
     user = _get_subscriptions_user()
     if not user:
-        videos = Video.query.filter(Video.id < 0).paginate(page=1, per_page=12)
-        return render_template("main/subscriptions.html", videos=videos)
+        return render_template("main/subscriptions.html", videos=empty_page())
 
-    # 구독 중인 채널 ID 목록
-    subscribed_ids = [
-        s.subscribed_to_id for s in user.subscriptions_rel.all()
-    ]
     page = request.args.get("page", 1, type=int)
     if page < 1:
         page = 1
-
-    if not subscribed_ids:
-        videos = Video.query.filter(Video.id < 0).paginate(page=1, per_page=12)
-    else:
-        videos = (
-            Video.query.options(joinedload(Video.user))
-            .filter(Video.user_id.in_(subscribed_ids))
-            .order_by(Video.created_at.desc())
-            .paginate(page=page, per_page=12)
-        )
-
+    videos = feed_page(user.id, page=page, per_page=12, cursor=request.args.get("cursor"))
     return render_template("main/subscriptions.html", videos=videos)
 
 
 @main_bp.route("/user/<username>/subscribe", methods=["POST"])
 def subscribe_toggle(username):
-    """구독/구독해제 토글. DB 반영 후 JSON 응답."""
-    target = User.query.filter_by(username=username).first_or_404()
+    """
+    구독/구독해제 토글. DB 반영 후 JSON 응답.
+    사전 SELECT·구독자 COUNT 없이 행 추가·삭제 결과로 판별, 구독자 수는 channel_stats 원자적 증감 (app/utils/subscriptions.py).
+    """
+    target = get_user_by_username(username) or abort(404)
     current = _get_subscriptions_user()
     if not current:
         return jsonify({"ok": False, "error": "로그인이 필요합니다."}), 401
     if current.id == target.id:
         return jsonify({"ok": False, "error": "자기 자신은 구독할 수 없습니다."}), 400
 
-    sub = Subscription.query.filter_by(
-        subscriber_id=current.id,
-        subscribed_to_id=target.id,
-    ).first()
-
-    if sub:
-        db.session.delete(sub)
-        is_subscribed = False
-    else:
-        db.session.add(Subscription(subscriber_id=current.id, subscribed_to_id=target.id))
-        is_subscribed = True
-    db.session.commit()
-    subscriber_count = target.subscribers_rel.count()
+    is_subscribed, subscriber_count = toggle_subscription(db.session, current.id, target.id)
+    forget("is_subscribed")
 
     return jsonify({"ok": True, "is_subscribed": is_subscribed, "subscriber_count": subscriber_count})
 
 
 @main_bp.route("/tag/<tag_name>")
+@cached_response(VIDEOS, TAGS, anonymous_only=True)
 def tag(tag_name):
-    tag_obj = Tag.query.filter_by(name=tag_name).first()
+    tag_obj = Tag.query.filter(Tag.name_key == tag_key(tag_name)).first()
     if tag_obj is None:
         videos = []
         results_count = 0
     else:
         videos = (
-            Video.query.options(joinedload(Video.user))
+            Video.query.options(*loader_options("video_list"))
             .join(video_tags)
             .filter(video_tags.c.tag_id == tag_obj.id)
             .order_by(Video.created_at.desc())
             .limit(24)
             .all()
         )
-        results_count = tag_obj.videos.count()
+        results_count = tag_obj.video_count
     popular_tags = _get_popular_tags()
     return render_template(
         "main/tag.html",
@@ -309,35 +314,22 @@ def tag(tag_name):
 
 @main_bp.route("/user/<username>")
 def user_profile(username):
-    """사용자 프로필 – first_or_404, 채널 통계, 비디오 목록(페이지네이션)."""
-    user = User.query.filter_by(username=username).first_or_404()
-
-    # 채널 통계 (func.sum, func.count)
-    stats_row = (
-        db.session.query(
-            func.coalesce(func.sum(Video.views), 0).label("total_views"),
-            func.coalesce(func.sum(Video.likes), 0).label("total_likes"),
-            func.count(Video.id).label("video_count"),
-        )
-        .filter(Video.user_id == user.id)
-        .first()
-    )
-    subscriber_count = user.subscribers_rel.count()
-    stats = {
-        "total_views": stats_row.total_views or 0,
-        "total_likes": stats_row.total_likes or 0,
-        "video_count": stats_row.video_count or 0,
-        "subscriber_count": subscriber_count,
-    }
+    """사용자 프로필 – 없으면 404 (사용자 캐시 우선), 채널 통계, 비디오 목록(페이지네이션)."""
+    user = get_user_by_username(username) or abort(404)
+
+    # 채널 통계 (channel_stats 1행 조회)
+    stats = get_channel_stats(user.id)
 
     # 비디오 목록 최신순, 페이지네이션
     page = request.args.get("page", 1, type=int)
     if page < 1:
         page = 1
-    videos = (
-        Video.query.filter_by(user_id=user.id)
-        .order_by(Video.created_at.desc())
-        .paginate(page=page, per_page=12)
+    videos = keyset_paginate(
+        Video.query.options(*loader_options("channel_videos")).filter_by(user_id=user.id),
+        sort_keys(Video, "latest"),
+        page=page,
+        per_page=12,
+        cursor=request.args.get("cursor"),
     )
 
     current = _get_subscriptions_user()
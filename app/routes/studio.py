@@ -10,6 +10,9 @@ from sqlalchemy import func
 
 from app import db
 from app.models import Video
+from app.utils.channel_stats import get_channel_stats
+from app.utils.media_probe import probe_into
+from app.utils.thumbnails import precompute_variants
 
 studio_bp = Blueprint("studio", __name__, url_prefix="/studio")
 
@@ -34,22 +37,11 @@ def _require_video_owner(video):
 
 def _get_studio_stats(user_id):
     """
-    로그인한 사용자의 총 조회수 합계와 영상 개수를 DB 집계로 반환.
+    로그인한 사용자의 총 조회수 합계와 영상 개수 (channel_stats 1행 조회).
     반환: (total_views, video_count). 데이터 없으면 (0, 0).
     """
-    row = (
-        db.session.query(
-            func.coalesce(func.sum(Video.views), 0).label("total_views"),
-            func.count(Video.id).label("video_count"),
-        )
-        .filter(Video.user_id == user_id)
-        .first()
-    )
-    if row is None:
-        return 0, 0
-    total_views = int(row.total_views) if row.total_views is not None else 0
-    video_count = int(row.video_count) if row.video_count is not None else 0
-    return total_views, video_count
+    stats = get_channel_stats(user_id)
+    return stats["total_views"], stats["video_count"]
 
 
 def _get_studio_dashboard_data(user_id):
@@ -57,32 +49,11 @@ def _get_studio_dashboard_data(user_id):
     스튜디오 대시보드용 통계·최근 활동·인기 영상 데이터 반환.
     반환: dict (stats, recent_7d, recent_30d, top_videos)
     """
-    row = (
-        db.session.query(
-            func.count(Video.id).label("video_count"),
-            func.coalesce(func.sum(Video.views), 0).label("total_views"),
-            func.coalesce(func.sum(Video.likes), 0).label("total_likes"),
-        )
-        .filter(Video.user_id == user_id)
-        .first()
-    )
-    video_count = int(row.video_count or 0)
-    total_views = int(row.total_views or 0)
-    total_likes = int(row.total_likes or 0)
-    total_comments = 0
-    try:
-        from sqlalchemy import text
-
-        r = db.session.execute(
-            text(
-                "SELECT COUNT(*) FROM comments c "
-                "INNER JOIN videos v ON c.video_id = v.id WHERE v.user_id = :uid"
-            ),
-            {"uid": user_id},
-        ).scalar()
-        total_comments = int(r or 0)
-    except Exception:
-        pass
+    channel = get_channel_stats(user_id)
+    video_count = channel["video_count"]
+    total_views = channel["total_views"]
+    total_likes = channel["total_likes"]
+    total_comments = channel["total_comments"]
     avg_views = round(total_views / video_count, 1) if video_count else 0
     avg_likes = round(total_likes / video_count, 1) if video_count else 0.0
 
@@ -236,68 +207,43 @@ def upload():
         flash(f"동영상 크기는 최대 {max_video_size // (1024*1024)}MB까지 가능합니다.", "error")
         return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
 
-    # 비디오 업로드: Cloudinary 또는 로컬
+    # 비디오 저장: 항상 로컬 업로드 폴더에 먼저 저장.
+    # Cloudinary 사용 시 업로드는 작업 큐에서 처리 (status=processing 으로 바로 응답, app/utils/media_jobs.py)
+    use_cloudinary = _is_cloudinary_enabled()
     video_folder = current_app.config["VIDEO_FOLDER"]
-    video_url = None
-    video_public_id = None
-    video_filename = None
-
-    if _is_cloudinary_enabled():
-        from app.utils.cloudinary_upload import upload_video
-        video_url, video_public_id, video_err = upload_video(video_file)
-        if video_err:
-            flash(video_err, "error")
-            return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
-        video_filename = video_public_id or "cloud"
-    else:
-        video_filename, video_error = _save_upload_file(
-            video_file, video_folder, allowed_video, max_video_size
-        )
-        if video_error:
-            flash(video_error, "error")
-            return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
+    video_filename, video_error = _save_upload_file(
+        video_file, video_folder, allowed_video, max_video_size
+    )
+    if video_error:
+        flash(video_error, "error")
+        return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
 
-    # 썸네일(선택) 업로드: Cloudinary 또는 로컬
-    thumbnail_url = None
-    thumbnail_public_id = None
+    # 썸네일(선택) 저장
     thumbnail_filename = None
     if thumbnail_file and thumbnail_file.filename:
         thumb_folder = current_app.config["THUMBNAIL_FOLDER"]
         allowed_thumb = current_app.config["ALLOWED_THUMBNAIL_EXTENSIONS"]
         max_thumb_size = current_app.config["MAX_THUMBNAIL_SIZE"]
         if not _allowed_file(thumbnail_file.filename, allowed_thumb):
-            if not _is_cloudinary_enabled():
-                try:
-                    if video_filename and not video_url:
-                        os.remove(os.path.join(video_folder, video_filename))
-                except OSError:
-                    pass
+            try:
+                os.remove(os.path.join(video_folder, video_filename))
+            except OSError:
+                pass
             flash(f"허용되지 않는 썸네일 형식입니다. 허용: {', '.join(sorted(allowed_thumb))}", "error")
             return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
 
-        if _is_cloudinary_enabled():
-            from app.utils.cloudinary_upload import upload_image
-            thumbnail_url, thumbnail_public_id, thumb_err = upload_image(thumbnail_file)
-            if thumb_err:
-                if video_public_id:
-                    from app.utils.cloudinary_upload import delete_cloudinary_resource
-                    delete_cloudinary_resource(video_public_id, "video")
-                flash(thumb_err, "error")
-                return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
-            thumbnail_filename = thumbnail_public_id or "cloud"
-        else:
-            thumbnail_filename, thumb_error = _save_upload_file(
-                thumbnail_file, thumb_folder, allowed_thumb, max_thumb_size
-            )
-            if thumb_error:
-                try:
-                    os.remove(os.path.join(video_folder, video_filename))
-                except OSError:
-                    pass
-                flash(thumb_error, "error")
-                return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
-
-    # DB에 Video 저장
+        thumbnail_filename, thumb_error = _save_upload_file(
+            thumbnail_file, thumb_folder, allowed_thumb, max_thumb_size
+        )
+        if thumb_error:
+            try:
+                os.remove(os.path.join(video_folder, video_filename))
+            except OSError:
+                pass
+            flash(thumb_error, "error")
+            return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 400
+
+    # DB에 Video 저장 (+ 후처리 작업 등록, 같은 트랜잭션)
     user_id = _current_user_id()
     try:
         video = Video(
@@ -306,37 +252,47 @@ def upload():
             category=category_input,
             video_path=video_filename,
             thumbnail_path=thumbnail_filename,
-            video_url=video_url,
-            thumbnail_url=thumbnail_url,
-            video_public_id=video_public_id,
-            thumbnail_public_id=thumbnail_public_id,
             user_id=user_id,
         )
+        video_local_path = os.path.join(video_folder, video_filename)
+        # 재생 시간·해상도·코덱: 컨테이너 헤더만 읽어 채움 (분석 불가 파일은 비워 둠. app/utils/media_probe.py)
+        info = probe_into(video, video_local_path)
+        # moov 가 파일 끝에 있는 MP4 는 작업 큐에서 앞으로 옮김 (파일 전체 재작성이라 요청에서 하지 않음,
+        # 끝나면 Cloudinary 업로드 작업으로 이어짐. app/utils/media_jobs.py)
+        needs_faststart = bool(current_app.config.get("VIDEO_FASTSTART")) and info is not None and info.faststart is False
+        video.status = "processing" if use_cloudinary or needs_faststart else "ready"
         db.session.add(video)
+        if use_cloudinary or needs_faststart:
+            from app.utils.media_jobs import enqueue_video_faststart, enqueue_video_upload
+            db.session.flush()
+            if needs_faststart:
+                enqueue_video_faststart(db.session, video, upload=use_cloudinary)
+            else:
+                enqueue_video_upload(db.session, video)
         db.session.commit()
         if tags_input:
             video.save_tags(tags_input, commit=True)
     except Exception as e:
         db.session.rollback()
-        # 저장된 리소스 정리 (Cloudinary 또는 로컬)
-        if _is_cloudinary_enabled() and video_public_id:
-            from app.utils.cloudinary_upload import delete_cloudinary_resource
-            delete_cloudinary_resource(video_public_id, "video")
-            if thumbnail_public_id:
-                delete_cloudinary_resource(thumbnail_public_id, "image")
-        else:
+        # 저장된 로컬 파일 정리 (원격 업로드는 아직 시작 전)
+        try:
+            os.remove(os.path.join(video_folder, video_filename))
+        except OSError:
+            pass
+        if thumbnail_filename:
             try:
-                os.remove(os.path.join(video_folder, video_filename))
+                os.remove(os.path.join(current_app.config["THUMBNAIL_FOLDER"], thumbnail_filename))
             except OSError:
                 pass
-            if thumbnail_filename:
-                try:
-                    os.remove(os.path.join(current_app.config["THUMBNAIL_FOLDER"], thumbnail_filename))
-                except OSError:
-                    pass
         flash(f"DB 저장 중 오류가 발생했습니다: {e}", "error")
         return render_template("studio/upload.html", title=title, description=description, category=category_input, tags=tags_input), 500
 
+    if thumbnail_filename:
+        # srcset 용 WebP 축소본 미리 생성 (별도 프로세스, 요청은 기다리지 않음. app/utils/thumbnails.py)
+        precompute_variants("thumbnails", thumbnail_filename)
+    if use_cloudinary:
+        flash("동영상이 업로드되었습니다. 처리가 끝나면 Cloudinary에서 재생됩니다.", "success")
+        return redirect(url_for("studio.index"))
     flash("동영상이 업로드되었습니다.", "success")
     return redirect(url_for("studio.index"))
 
@@ -381,7 +337,7 @@ def edit(video_id):
 def delete(video_id):
     """
     동영상 삭제: DB 레코드 먼저 삭제 후, 성공 시 uploads/ 내 실제 파일 삭제.
-    파일이 없어도 DB 삭제는 완료 (고아 파일 방지).
+    파일이 없어도 DB 삭제는 완료 (고아 파일 방지). Cloudinary 리소스는 삭제 작업으로 등록.
     로그인 미구현: 소유자(DEFAULT_USER_ID)만 삭제 가능.
     """
     video = Video.query.get_or_404(video_id)
@@ -391,7 +347,12 @@ def delete(video_id):
     video_pid = video.video_public_id
     thumb_pid = video.thumbnail_public_id
 
+    # Cloudinary 리소스 삭제는 DB 삭제와 같은 트랜잭션에 작업으로 등록 (실패 시 재시도, app/utils/media_jobs.py)
+    from app.utils.media_jobs import enqueue_destroy
+
     db.session.delete(video)
+    enqueue_destroy(db.session, video_pid, "video")
+    enqueue_destroy(db.session, thumb_pid, "image")
     try:
         db.session.commit()
     except Exception as e:
@@ -399,26 +360,19 @@ def delete(video_id):
         flash(f"삭제 중 오류가 발생했습니다: {e}", "error")
         return redirect(url_for("studio.edit", video_id=video_id))
 
-    # DB 삭제 성공 후 리소스 삭제: Cloudinary 또는 로컬
-    if _is_cloudinary_enabled() and (video_pid or thumb_pid):
-        from app.utils.cloudinary_upload import delete_cloudinary_resource
-        if video_pid:
-            delete_cloudinary_resource(video_pid, "video")
-        if thumb_pid:
-            delete_cloudinary_resource(thumb_pid, "image")
-    else:
-        video_folder = current_app.config["VIDEO_FOLDER"]
-        thumb_folder = current_app.config["THUMBNAIL_FOLDER"]
-        if video_path:
-            try:
-                os.remove(os.path.join(video_folder, video_path))
-            except OSError:
-                pass
-        if thumbnail_path:
-            try:
-                os.remove(os.path.join(thumb_folder, thumbnail_path))
-            except OSError:
-                pass
+    # DB 삭제 성공 후 로컬 파일 삭제 (업로드 처리 전이라 로컬에 남아 있는 파일 포함)
+    video_folder = current_app.config["VIDEO_FOLDER"]
+    thumb_folder = current_app.config["THUMBNAIL_FOLDER"]
+    if video_path and video_path != video_pid:
+        try:
+            os.remove(os.path.join(video_folder, video_path))
+        except OSError:
+            pass
+    if thumbnail_path and thumbnail_path != thumb_pid:
+        try:
+            os.remove(os.path.join(thumb_folder, thumbnail_path))
+        except OSError:
+            pass
 
     flash("동영상이 삭제되었습니다.", "success")
     return redirect(url_for("studio.index"))
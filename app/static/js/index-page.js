@@ -12,7 +12,9 @@
     const category = grid.dataset.category || 'all';
     const sort = grid.dataset.sort || 'latest';
     const tag = grid.dataset.tag || '';
+    const length = grid.dataset.length || '';
     const nextPage = parseInt(loadMoreBtn.dataset.nextPage || '2', 10);
+    const nextCursor = loadMoreBtn.dataset.nextCursor || '';
 
     loadMoreBtn.disabled = true;
     loadMoreBtn.textContent = '로딩 중...';
@@ -24,6 +26,9 @@
     });
     if (category && category !== 'all') params.set('category', category);
     if (tag) params.set('tag', tag);
+    if (length) params.set('length', length);
+    // keyset 커서가 있으면 OFFSET 없이 이어서 조회
+    if (nextCursor) params.set('cursor', nextCursor);
 
     fetch(base + '?' + params.toString())
       .then(function (r) { return r.json(); })
@@ -36,6 +41,7 @@
         var meta = data.meta || {};
         if (meta.has_next) {
           loadMoreBtn.dataset.nextPage = String((meta.current_page || nextPage) + 1);
+          loadMoreBtn.dataset.nextCursor = data.next_cursor || '';
           loadMoreBtn.disabled = false;
           loadMoreBtn.textContent = '더 보기';
         } else {
@@ -53,6 +59,7 @@
     var thumb = v.thumbnail_url
       ? '<img src="' + escapeHtml(v.thumbnail_url) + '" alt="" class="video-card-thumb-img">'
       : '<span>📹</span>';
+    var duration = v.duration ? '<span class="video-card-duration">' + formatDuration(v.duration) + '</span>' : '';
     var channel = (v.channel && v.channel.username) || 'default';
     var profileUrl = '/user/' + encodeURIComponent(channel);
     var watchUrl = '/watch/' + (v.id || '');
@@ -66,7 +73,7 @@
     card.className = 'video-card';
     card.innerHTML =
       '<a href="' + watchUrl + '" class="video-card-link">' +
-        '<div class="video-card-thumb">' + thumb + '</div>' +
+        '<div class="video-card-thumb">' + thumb + duration + '</div>' +
         '<h3 class="video-card-title">' + escapeHtml(v.title || '') + '</h3>' +
       '</a>' +
       '<a href="' + profileUrl + '" class="video-card-channel">' + escapeHtml(channel) + '</a>' +
@@ -75,6 +82,16 @@
     return card;
   }
 
+  // 초 → "4:05" / "1:02:03" (템플릿 duration 필터와 같은 형식)
+  function formatDuration(seconds) {
+    var s = Math.floor(seconds);
+    var h = Math.floor(s / 3600);
+    var m = Math.floor((s % 3600) / 60);
+    var sec = s % 60;
+    var pad = function (n) { return (n < 10 ? '0' : '') + n; };
+    return h ? h + ':' + pad(m) + ':' + pad(sec) : m + ':' + pad(sec);
+  }
+
   function escapeHtml(s) {
     var d = document.createElement('div');
     d.textContent = s;
@@ -143,54 +143,217 @@
     });
   }
 
-  // 답글 버튼 – 클릭 시 답글 폼 표시
-  document.querySelectorAll('.comment-reply-btn').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const parentId = this.dataset.parentId;
-      const wrap = document.getElementById('reply-form-wrap-' + parentId);
-      if (!wrap) return;
-      wrap.style.display = wrap.style.display === 'none' ? 'block' : 'none';
-    });
-  });
-
-  // 답글 취소
-  document.querySelectorAll('.reply-cancel').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const parentId = this.dataset.parentId;
-      const wrap = document.getElementById('reply-form-wrap-' + parentId);
-      if (wrap) wrap.style.display = 'none';
-    });
-  });
-
-  // 수정 버튼 – 클릭 시 편집 폼 표시
-  document.querySelectorAll('.comment-edit-btn').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const commentId = this.dataset.commentId;
-      const textEl = document.querySelector('.comment-text[data-comment-id="' + commentId + '"]');
-      const formWrap = document.getElementById('edit-form-' + commentId);
-      if (!textEl || !formWrap) return;
-      textEl.style.display = 'none';
-      formWrap.style.display = 'block';
-    });
-  });
-
-  // 수정 취소
-  document.querySelectorAll('.comment-edit-cancel').forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      const commentId = this.dataset.commentId;
-      const textEl = document.querySelector('.comment-text[data-comment-id="' + commentId + '"]');
-      const formWrap = document.getElementById('edit-form-' + commentId);
-      if (textEl) textEl.style.display = '';
-      if (formWrap) formWrap.style.display = 'none';
+  // 답글·수정 버튼 – 이벤트 위임 (댓글 더보기·답글 보기로 나중에 추가된 댓글에도 동작)
+  const commentsList = document.getElementById('comments-list');
+  if (commentsList) {
+    commentsList.addEventListener('click', function (e) {
+      const target = e.target.closest('button');
+      if (!target) return;
+      const parentId = target.dataset.parentId;
+      const commentId = target.dataset.commentId;
+
+      // 답글 버튼 – 클릭 시 답글 폼 표시 / 답글 취소
+      if (target.classList.contains('comment-reply-btn') || target.classList.contains('reply-cancel')) {
+        const wrap = document.getElementById('reply-form-wrap-' + parentId);
+        if (!wrap) return;
+        wrap.style.display = target.classList.contains('comment-reply-btn') && wrap.style.display === 'none' ? 'block' : 'none';
+        return;
+      }
+
+      // 수정 버튼 – 클릭 시 편집 폼 표시 / 수정 취소
+      if (target.classList.contains('comment-edit-btn') || target.classList.contains('comment-edit-cancel')) {
+        const textEl = document.querySelector('.comment-text[data-comment-id="' + commentId + '"]');
+        const formWrap = document.getElementById('edit-form-' + commentId);
+        if (!textEl || !formWrap) return;
+        const editing = target.classList.contains('comment-edit-btn');
+        textEl.style.display = editing ? 'none' : '';
+        formWrap.style.display = editing ? 'block' : 'none';
+        return;
+      }
+
+      // 답글 보기 – /api/comments/<id>/replies 로 한 페이지씩 불러오기
+      if (target.classList.contains('comment-replies-toggle')) {
+        loadReplies(target);
+        return;
+      }
+
+      // 댓글 좋아요·싫어요 – POST /comments/<id>/like|dislike
+      if (target.classList.contains('comment-reaction-btn')) {
+        toggleReaction(target);
+      }
     });
-  });
-
-  // 정렬 버튼
-  const sortBtns = document.querySelectorAll('.sort-btn');
-  sortBtns.forEach(function (btn) {
-    btn.addEventListener('click', function () {
-      sortBtns.forEach(function (b) { b.classList.remove('active'); });
-      this.classList.add('active');
+  }
+
+  // 비로그인이면 버튼이 disabled 로 그려져 호출되지 않음 (reactionButtons·watch.html)
+  function toggleReaction(btn) {
+    if (btn.disabled) return;
+    const commentId = btn.dataset.commentId;
+    btn.disabled = true;
+    fetch('/comments/' + commentId + '/' + btn.dataset.reaction, {
+      method: 'POST',
+      headers: { 'X-Requested-With': 'XMLHttpRequest', 'X-CSRFToken': csrfToken() },
+      credentials: 'same-origin',
+    })
+      .then(function (r) {
+        if (r.redirected || r.status === 302) {
+          window.location.href = '/auth/login?next=' + encodeURIComponent(window.location.pathname);
+          return null;
+        }
+        return r.json();
+      })
+      .then(function (data) {
+        if (!data) return;
+        if (!data.success) {
+          alert(data.error || '오류가 발생했습니다.');
+          return;
+        }
+        // 같은 댓글의 좋아요·싫어요 버튼 상태를 함께 갱신
+        document.querySelectorAll('.comment-reaction-btn[data-comment-id="' + commentId + '"]').forEach(function (b) {
+          b.classList.toggle('active', b.dataset.reaction === data.reaction);
+          const countEl = b.querySelector('.comment-reaction-count');
+          if (countEl) countEl.textContent = data.likes_count || '';
+        });
+      })
+      .catch(function () { alert('요청 실패'); })
+      .finally(function () { btn.disabled = false; });
+  }
+
+  function reactionButtons(c, loggedIn) {
+    const attrs = function (title) {
+      return loggedIn ? ' title="' + title + '"' : ' disabled title="로그인 후 평가할 수 있습니다"';
+    };
+    return (
+      '<button type="button" class="comment-action comment-reaction-btn' + (c.my_reaction === 'like' ? ' active' : '') +
+      '" data-comment-id="' + c.id + '" data-reaction="like"' + attrs('좋아요') + '>👍 <span class="comment-reaction-count">' +
+      (c.likes || '') + '</span></button>' +
+      '<button type="button" class="comment-action comment-reaction-btn' + (c.my_reaction === 'dislike' ? ' active' : '') +
+      '" data-comment-id="' + c.id + '" data-reaction="dislike"' + attrs('싫어요') + '>👎</button>'
+    );
+  }
+
+  function csrfToken() {
+    const meta = document.querySelector('meta[name="csrf-token"]');
+    return meta ? meta.getAttribute('content') : '';
+  }
+
+  // 텍스트·속성값("…") 모두에 쓰므로 따옴표도 이스케이프 (innerHTML 은 < > & 만 바꿈)
+  function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text == null ? '' : String(text);
+    return div.innerHTML.replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+  }
+
+  // API 댓글 항목 → 서버 렌더링과 같은 마크업
+  function createCommentItem(c, isReply) {
+    const item = document.createElement('div');
+    item.className = 'comment-item' + (isReply ? ' comment-item--reply' : '');
+    item.dataset.commentId = c.id;
+    const username = c.user.username || '알 수 없음';
+    const avatar = c.user.profile_image_url
+      ? '<img src="' + escapeHtml(c.user.profile_image_url) + '" alt="" class="comment-avatar-img">'
+      : '<span>' + escapeHtml((username || 'U').charAt(0).toUpperCase()) + '</span>';
+    const token = '<input type="hidden" name="csrf_token" value="' + escapeHtml(csrfToken()) + '">';
+    const loggedIn = document.body.classList.contains('is-logged-in');
+    let editForm = '';
+    let footer = reactionButtons(c, loggedIn);
+    if (!isReply && loggedIn) {
+      footer += '<button type="button" class="comment-action comment-reply-btn" data-parent-id="' + c.id + '">답글</button>';
+    }
+    if (c.can_edit) {
+      editForm =
+        '<div class="comment-edit-form" id="edit-form-' + c.id + '" style="display: none;">' +
+        '<form method="post" action="/comments/' + c.id + '/edit">' + token +
+        '<input type="text" name="content" value="' + escapeHtml(c.content) + '" class="comment-edit-input">' +
+        '<button type="submit" class="btn btn--primary btn--small">저장</button>' +
+        '<button type="button" class="btn btn--outline btn--small comment-edit-cancel" data-comment-id="' + c.id + '">취소</button>' +
+        '</form></div>';
+      footer +=
+        '<button type="button" class="comment-action comment-edit-btn" data-comment-id="' + c.id + '">수정</button>' +
+        '<form method="post" action="/comments/' + c.id + '/delete" class="comment-delete-form" style="display: inline;">' + token +
+        '<button type="submit" class="comment-action comment-delete-btn" onclick="return confirm(\'댓글을 삭제할까요?\');">삭제</button>' +
+        '</form>';
+    }
+    let replies = '';
+    if (!isReply) {
+      replies = '<div class="comment-replies" id="replies-' + c.id + '">';
+      if (c.reply_count) {
+        replies += '<button type="button" class="comment-replies-toggle" data-comment-id="' + c.id +
+          '" data-reply-count="' + c.reply_count + '">답글 ' + c.reply_count + '개</button>';
+      }
+      replies += '<div class="comment-replies-list" id="replies-list-' + c.id + '"></div>';
+      if (loggedIn) {
+        replies +=
+          '<div class="reply-form-wrap" id="reply-form-wrap-' + c.id + '" style="display: none;">' +
+          '<form method="post" action="/comments/' + c.id + '/reply" class="reply-form">' + token +
+          '<input type="text" name="content" placeholder="답글 작성..." required maxlength="2000" class="comment-input">' +
+          '<button type="submit" class="btn btn--primary btn--small">답글</button>' +
+          '<button type="button" class="btn btn--outline btn--small reply-cancel" data-parent-id="' + c.id + '">취소</button>' +
+          '</form></div>';
+      }
+      replies += '</div>';
+    }
+    item.innerHTML =
+      '<div class="comment-avatar">' + avatar + '</div>' +
+      '<div class="comment-body">' +
+      '<div class="comment-header"><span class="comment-author">' + escapeHtml(username) + '</span>' +
+      '<span class="comment-time">' + escapeHtml(c.time_ago) + '</span></div>' +
+      '<div class="comment-content-wrap"><p class="comment-text" data-comment-id="' + c.id + '">' +
+      escapeHtml(c.content) + '</p>' + editForm + '</div>' +
+      '<div class="comment-footer">' + footer + '</div>' + replies +
+      '</div>';
+    return item;
+  }
+
+  // 답글 한 페이지 불러오기 (다음 페이지가 있으면 버튼이 '답글 더보기'로 남음)
+  function loadReplies(btn) {
+    if (btn.disabled) return;
+    const commentId = btn.dataset.commentId;
+    const list = document.getElementById('replies-list-' + commentId);
+    if (!list) return;
+    btn.disabled = true;
+    let url = '/api/comments/' + commentId + '/replies';
+    if (btn.dataset.cursor) url += '?cursor=' + encodeURIComponent(btn.dataset.cursor);
+    fetch(url, { credentials: 'same-origin' })
+      .then(function (r) { return r.json(); })
+      .then(function (data) {
+        if (!data.success) return;
+        data.items.forEach(function (c) { list.appendChild(createCommentItem(c, true)); });
+        if (data.next_cursor) {
+          btn.dataset.cursor = data.next_cursor;
+          btn.textContent = '답글 더보기';
+        } else {
+          btn.remove();
+        }
+      })
+      .catch(function () { alert('답글을 불러오지 못했습니다.'); })
+      .finally(function () { btn.disabled = false; });
+  }
+
+  // 댓글 더보기 – /api/videos/<id>/comments?cursor=... 로 다음 페이지
+  const commentsMore = document.getElementById('comments-more');
+  if (commentsMore && commentsList) {
+    commentsMore.addEventListener('click', function () {
+      const btn = this;
+      if (btn.disabled) return;
+      btn.disabled = true;
+      const url = '/api/videos/' + btn.dataset.videoId + '/comments?sort=' + encodeURIComponent(btn.dataset.sort || 'oldest') +
+        '&cursor=' + encodeURIComponent(btn.dataset.cursor);
+      fetch(url, {
+        credentials: 'same-origin',
+      })
+        .then(function (r) { return r.json(); })
+        .then(function (data) {
+          if (!data.success) return;
+          data.items.forEach(function (c) { commentsList.appendChild(createCommentItem(c, false)); });
+          if (data.next_cursor) {
+            btn.dataset.cursor = data.next_cursor;
+          } else {
+            btn.remove();
+          }
+        })
+        .catch(function () { alert('댓글을 불러오지 못했습니다.'); })
+        .finally(function () { btn.disabled = false; });
     });
-  });
+  }
+
 })();
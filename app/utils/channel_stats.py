@@ -0,0 +1,251 @@
+"""
+채널 통계(channel_stats) 유지 – 프로필·스튜디오에서 SUM/COUNT 집계 대신 1행 조회.
+
+- 쓰기 경로에서 같은 트랜잭션 안에 증감:
+  업로드(Video insert) / 조회수·좋아요 변경(Video update) / 조회수 flush(ViewCounter 훅) /
+  구독·구독 취소(Subscription insert·delete) / 댓글 작성·삭제(Comment insert·delete).
+  영상 삭제·작성자 변경은 해당 채널 행을 원본 테이블에서 다시 계산.
+- 행은 사용자 생성 시 0으로 만들어 둠 (기존 DB 는 최초 실행 시 채움). 행이 없는 채널은 증감을 건너뛰고,
+  읽을 때 원본 집계 1번으로 대체(저장 안 함).
+- reconcile_channel_stats(): 원본 테이블과 비교해 어긋난 행만 수정 (scripts/reconcile_channel_stats.py,
+  --interval 로 주기 실행).
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, event, inspect, text
+
+STAT_COLUMNS = ("video_count", "total_views", "total_likes", "total_comments", "subscriber_count")
+
+_listeners_installed = False
+
+# 사용자별 원본 집계 (users.id 기준, :ids 로 대상 제한)
+_SOURCE_SQL = """
+SELECT u.id AS user_id,
+       (SELECT COUNT(*) FROM videos v WHERE v.user_id = u.id) AS video_count,
+       (SELECT COALESCE(SUM(v.views), 0) FROM videos v WHERE v.user_id = u.id) AS total_views,
+       (SELECT COALESCE(SUM(v.likes), 0) FROM videos v WHERE v.user_id = u.id) AS total_likes,
+       (SELECT COUNT(*) FROM comments c JOIN videos v ON c.video_id = v.id WHERE v.user_id = u.id)
+           AS total_comments,
+       (SELECT COUNT(*) FROM subscriptions s WHERE s.subscribed_to_id = u.id) AS subscriber_count
+FROM users u
+"""
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+def _source_rows(connection, user_ids=None):
+    """원본 테이블 기준 통계 {user_id: {컬럼: 값}}. user_ids=None 이면 전체 사용자."""
+    if user_ids is None:
+        rows = connection.execute(text(_SOURCE_SQL)).mappings().all()
+    else:
+        user_ids = sorted({int(u) for u in user_ids if u is not None})
+        if not user_ids:
+            return {}
+        stmt = text(_SOURCE_SQL + " WHERE u.id IN :ids").bindparams(bindparam("ids", expanding=True))
+        rows = connection.execute(stmt, {"ids": user_ids}).mappings().all()
+    return {r["user_id"]: {c: int(r[c] or 0) for c in STAT_COLUMNS} for r in rows}
+
+
+def _write_rows(connection, stats):
+    """{user_id: 통계} 로 행 교체."""
+    if not stats:
+        return
+    connection.execute(
+        text("DELETE FROM channel_stats WHERE user_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(stats)},
+    )
+    now = _utc_now()
+    connection.execute(
+        text(
+            "INSERT INTO channel_stats (user_id, video_count, total_views, total_likes, total_comments, "
+            "subscriber_count, updated_at) VALUES (:user_id, :video_count, :total_views, :total_likes, "
+            ":total_comments, :subscriber_count, :updated_at)"
+        ),
+        [dict(values, user_id=uid, updated_at=now) for uid, values in stats.items()],
+    )
+
+
+def recompute_channels(connection, user_ids):
+    """해당 채널 행을 원본 테이블에서 다시 계산해 저장."""
+    _write_rows(connection, _source_rows(connection, user_ids))
+
+
+def bump(connection, user_id, **deltas):
+    """
+    채널 통계 증감 (예: bump(conn, 1, video_count=1, total_views=10)).
+    행이 없으면 건너뜀 – 조회 시 원본 집계로 대체되고 reconcile 때 생성됨.
+    """
+    deltas = {c: int(v) for c, v in deltas.items() if v and c in STAT_COLUMNS}
+    if user_id is None or not deltas:
+        return
+    sets = ", ".join(f"{c} = {c} + :{c}" for c in deltas)
+    connection.execute(
+        text(f"UPDATE channel_stats SET {sets}, updated_at = :now WHERE user_id = :user_id"),
+        dict(deltas, now=_utc_now(), user_id=user_id),
+    )
+
+
+def _video_owner(connection, video_id):
+    return connection.execute(text("SELECT user_id FROM videos WHERE id = :id"), {"id": video_id}).scalar()
+
+
+# ---------------------------------------------------------------------------
+# 쓰기 경로 이벤트
+# ---------------------------------------------------------------------------
+def _user_after_insert(mapper, connection, target):
+    connection.execute(
+        text(
+            "INSERT INTO channel_stats (user_id, video_count, total_views, total_likes, total_comments, "
+            "subscriber_count, updated_at) VALUES (:id, 0, 0, 0, 0, 0, :now)"
+        ),
+        {"id": target.id, "now": _utc_now()},
+    )
+
+
+def _user_after_delete(mapper, connection, target):
+    connection.execute(text("DELETE FROM channel_stats WHERE user_id = :id"), {"id": target.id})
+
+
+def _video_after_insert(mapper, connection, target):
+    bump(connection, target.user_id, video_count=1, total_views=target.views or 0, total_likes=target.likes or 0)
+
+
+def _delta(state, name):
+    hist = state.attrs[name].history
+    if not hist.has_changes():
+        return 0
+    old = hist.deleted[0] if hist.deleted else 0
+    new = hist.added[0] if hist.added else 0
+    return (new or 0) - (old or 0)
+
+
+def _video_after_update(mapper, connection, target):
+    state = inspect(target)
+    owner_hist = state.attrs.user_id.history
+    if owner_hist.has_changes():
+        recompute_channels(connection, list(owner_hist.deleted or ()) + [target.user_id])
+        return
+    bump(
+        connection,
+        target.user_id,
+        total_views=_delta(state, "views"),
+        total_likes=_delta(state, "likes"),
+    )
+
+
+def _video_after_delete(mapper, connection, target):
+    # 댓글 등 연관 행 처리 방식과 관계없이 정확하도록 원본에서 다시 계산
+    recompute_channels(connection, [target.user_id])
+
+
+def _comment_after_insert(mapper, connection, target):
+    bump(connection, _video_owner(connection, target.video_id), total_comments=1)
+
+
+def _comment_after_delete(mapper, connection, target):
+    bump(connection, _video_owner(connection, target.video_id), total_comments=-1)
+
+
+def _subscription_after_insert(mapper, connection, target):
+    bump(connection, target.subscribed_to_id, subscriber_count=1)
+
+
+def _subscription_after_delete(mapper, connection, target):
+    bump(connection, target.subscribed_to_id, subscriber_count=-1)
+
+
+def _on_views_flushed(deltas):
+    """ViewCounter flush 훅: 영상별 조회수 증가분을 채널 total_views 에 반영 (flush 와 같은 트랜잭션)."""
+    from app import db
+
+    params = [{"id": vid, "delta": n} for vid, n in deltas.items() if n]
+    if params:
+        db.session.execute(
+            text(
+                "UPDATE channel_stats SET total_views = total_views + :delta "
+                "WHERE user_id = (SELECT user_id FROM videos WHERE id = :id)"
+            ),
+            params,
+        )
+
+
+def _keep_old_value(target, value, oldvalue, initiator):
+    return value
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import Comment, Subscription, User, Video
+
+    event.listen(User, "after_insert", _user_after_insert)
+    event.listen(User, "after_delete", _user_after_delete)
+    # 만료된 객체에 값을 대입해도 이전 값을 history 에 남기도록 (증감 계산용)
+    for attr in (Video.views, Video.likes, Video.user_id):
+        event.listen(attr, "set", _keep_old_value, active_history=True)
+    event.listen(Video, "after_insert", _video_after_insert)
+    event.listen(Video, "after_update", _video_after_update)
+    event.listen(Video, "after_delete", _video_after_delete)
+    event.listen(Comment, "after_insert", _comment_after_insert)
+    event.listen(Comment, "after_delete", _comment_after_delete)
+    event.listen(Subscription, "after_insert", _subscription_after_insert)
+    event.listen(Subscription, "after_delete", _subscription_after_delete)
+    _listeners_installed = True
+
+
+def init_channel_stats(app, db):
+    """
+    create_app 에서 호출 (앱 컨텍스트 안). 이벤트·조회수 flush 훅 등록,
+    channel_stats 가 비어 있으면 기존 데이터로 채움.
+    """
+    _install_listeners()
+    app.extensions["view_counter"].add_flush_hook(_on_views_flushed)
+    if db.session.execute(text("SELECT 1 FROM channel_stats LIMIT 1")).first() is None:
+        reconcile_channel_stats(db)
+
+
+# ---------------------------------------------------------------------------
+# 조회·정합성 복구
+# ---------------------------------------------------------------------------
+def get_channel_stats(user_id):
+    """채널 통계 dict (STAT_COLUMNS). 행이 없으면 원본 집계 (저장하지 않음)."""
+    from app import db
+
+    row = db.session.execute(
+        text(f"SELECT {', '.join(STAT_COLUMNS)} FROM channel_stats WHERE user_id = :id"), {"id": user_id}
+    ).mappings().first()
+    if row is not None:
+        return {c: int(row[c] or 0) for c in STAT_COLUMNS}
+    stats = _source_rows(db.session, [user_id]).get(user_id)
+    return stats or dict.fromkeys(STAT_COLUMNS, 0)
+
+
+def reconcile_channel_stats(db, user_ids=None):
+    """
+    원본 테이블과 비교해 값이 다르거나 없는 행은 다시 쓰고, 없는 사용자의 행은 삭제.
+    반환: 수정한 채널 수.
+    """
+    source = _source_rows(db.session, user_ids)
+    stored = {
+        r["user_id"]: {c: int(r[c] or 0) for c in STAT_COLUMNS}
+        for r in db.session.execute(
+            text(f"SELECT user_id, {', '.join(STAT_COLUMNS)} FROM channel_stats")
+        ).mappings()
+    }
+    drifted = {uid: values for uid, values in source.items() if stored.get(uid) != values}
+    _write_rows(db.session, drifted)
+    fixed = len(drifted)
+    if user_ids is None:
+        orphans = [uid for uid in stored if uid not in source]
+        if orphans:
+            db.session.execute(
+                text("DELETE FROM channel_stats WHERE user_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": orphans},
+            )
+            fixed += len(orphans)
+    db.session.commit()
+    return fixed
@@ -1,13 +1,28 @@
 """
 Cloudinary 업로드 헬퍼.
 
-동영상·썸네일을 Cloudinary에 업로드하고 secure_url, public_id 반환.
+동영상·썸네일·프로필 이미지를 Cloudinary에 업로드·삭제 (작업 큐 app/utils/media_jobs.py 에서 호출).
 .env: CLOUDINARY_* 필수. 배포에서만 USE_CLOUDINARY_PROXY=1 + CLOUDINARY_API_PROXY.
+
+- upload_file(): 로컬 파일을 stream_upload() 로 전송. stream_upload(): CLOUDINARY_UPLOAD_CHUNK_SIZE(기본 20MB) 단위로 읽어
+  Content-Range + X-Unique-Upload-Id 분할 업로드 (upload_large 방식). 메모리는 최대 2청크,
+  실패한 청크는 같은 범위로 재시도. 1청크 이하 파일은 upload 1번.
+  전송량·청크 수·소요 시간·처리량(UploadStats)을 반환하고 앱 로그에 남김.
+- CLOUDINARY_UPLOAD_PREFIX: 업로드 API 주소 변경 (테스트용 로컬 HTTP 서버 등).
 """
 
 import os
-import tempfile
-from typing import Optional, Tuple
+import time
+from collections import namedtuple
+from typing import Optional
+
+# 분할 업로드 기본 청크 크기 (Cloudinary 최소 5MB, 마지막 청크 제외)
+DEFAULT_CHUNK_SIZE = 20 * 1024 * 1024
+# 청크별 재시도 횟수 (연결 오류·5xx)
+CHUNK_RETRIES = 2
+
+# 업로드 지표: 전송 바이트, 요청(청크) 수, 소요 초, 처리량(바이트/초)
+UploadStats = namedtuple("UploadStats", ["bytes_sent", "chunks", "elapsed", "throughput"])
 
 # cloudinary 패키지가 없으면 import 시 에러
 
@@ -38,112 +53,136 @@ def _get_cloudinary_config() -> dict:
         api_proxy = os.environ.get("CLOUDINARY_API_PROXY", "").strip()
         if api_proxy:
             config["api_proxy"] = api_proxy
+    upload_prefix = os.environ.get("CLOUDINARY_UPLOAD_PREFIX", "").strip()
+    if upload_prefix:
+        config["upload_prefix"] = upload_prefix
     return config
 
 
-def upload_video(file_storage, resource_type: str = "video") -> Tuple[Optional[str], Optional[str], Optional[str]]:
-    """
-    비디오 파일을 Cloudinary에 업로드.
+def _chunk_size() -> int:
+    try:
+        return max(1, int(os.environ.get("CLOUDINARY_UPLOAD_CHUNK_SIZE") or DEFAULT_CHUNK_SIZE))
+    except ValueError:
+        return DEFAULT_CHUNK_SIZE
 
-    반환: (secure_url, public_id, error_message)
-    - 성공 시: (secure_url, public_id, None)
-    - 실패 시: (None, None, error_message)
-    """
-    if not _is_cloudinary_configured():
-        return None, None, "Cloudinary API 설정이 없습니다. .env 파일을 확인하세요."
 
+def _remaining_size(stream) -> Optional[int]:
+    """현재 위치부터 끝까지 바이트 수. seek 불가 스트림이면 None."""
     try:
-        import cloudinary
-        import cloudinary.uploader
+        pos = stream.tell()
+        end = stream.seek(0, os.SEEK_END)
+        stream.seek(pos)
+        return end - pos
+    except (AttributeError, OSError, ValueError):
+        return None
 
-        cloudinary.config(**_get_cloudinary_config())
-    except ImportError:
-        return None, None, "cloudinary 패키지가 설치되지 않았습니다."
 
-    if not file_storage or not file_storage.filename:
-        return None, None, "파일이 선택되지 않았습니다."
+def _is_retryable(exc) -> bool:
+    """연결 오류·응답 파싱 실패(Error), 5xx(GeneralError), 요청 제한(RateLimited)만 재시도."""
+    from cloudinary import exceptions
 
-    ext = file_storage.filename.rsplit(".", 1)[-1].lower() if "." in file_storage.filename else "mp4"
+    return type(exc) in (exceptions.Error, exceptions.GeneralError, exceptions.RateLimited)
 
-    try:
-        with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as tmp:
-            file_storage.save(tmp.name)
-            tmp_path = tmp.name
+
+def _upload_part(data, filename, headers, options, retries):
+    import cloudinary.uploader
+
+    for attempt in range(retries + 1):
         try:
-            result = cloudinary.uploader.upload(
-                tmp_path,
-                resource_type="video",
-                folder="wetube/videos",
-                use_filename=True,
-                unique_filename=True,
-            )
-            secure_url = result.get("secure_url")
-            public_id = result.get("public_id")
-            return secure_url, public_id, None
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-    except Exception as e:
-        return None, None, str(e)
-
-
-def upload_image(file_storage, folder: str = "wetube/thumbnails") -> Tuple[Optional[str], Optional[str], Optional[str]]:
+            return cloudinary.uploader.upload_large_part((filename, data), http_headers=headers, **options)
+        except Exception as e:
+            if attempt >= retries or not _is_retryable(e):
+                raise
+            time.sleep(0.5 * (attempt + 1))
+
+
+def stream_upload(stream, filename: str, chunk_size: Optional[int] = None, retries: int = CHUNK_RETRIES,
+                  on_progress=None, **options):
     """
-    이미지(썸네일) 파일을 Cloudinary에 업로드.
+    파일 객체를 chunk_size 단위로 읽어 Cloudinary에 업로드 (cloudinary.config 설정 후 호출).
+    options: resource_type, folder 등 업로드 옵션. on_progress(보낸 바이트, 전체 바이트 또는 None).
 
-    반환: (secure_url, public_id, error_message)
+    반환: (업로드 결과 dict, UploadStats)
     """
+    import cloudinary.uploader
+    import cloudinary.utils
+
+    chunk_size = chunk_size or _chunk_size()
+    total = _remaining_size(stream)
+    started = time.perf_counter()
+    chunk = stream.read(chunk_size)
+    # 다음 청크를 미리 읽어 마지막 청크 여부 판단 (크기를 모르는 스트림도 마지막에 전체 크기 전달)
+    following = stream.read(chunk_size) if chunk else b""
+
+    if not following:
+        # 1청크 이하: 분할 없이 한 번에
+        result = cloudinary.uploader.upload((filename, chunk), **options)
+        sent, chunks = len(chunk), 1
+    else:
+        options = dict(options)
+        options.setdefault("resource_type", "raw")
+        upload_id = cloudinary.utils.random_public_id()
+        sent, chunks, result = 0, 0, None
+        while chunk:
+            end = sent + len(chunk)
+            size = total if total is not None else (end if not following else -1)
+            headers = {"Content-Range": f"bytes {sent}-{end - 1}/{size}", "X-Unique-Upload-Id": upload_id}
+            result = _upload_part(chunk, filename, headers, options, retries)
+            options["public_id"] = result.get("public_id")
+            sent, chunks = end, chunks + 1
+            if on_progress:
+                on_progress(sent, total)
+            chunk = following
+            following = stream.read(chunk_size) if chunk else b""
+
+    elapsed = time.perf_counter() - started
+    stats = UploadStats(sent, chunks, elapsed, sent / elapsed if elapsed > 0 else 0.0)
+    return result, stats
+
+
+def _log_stats(kind, filename, stats):
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        current_app.logger.info(
+            "cloudinary %s 업로드 %s: %d bytes, %d chunks, %.2fs, %.2f MB/s",
+            kind, filename, stats.bytes_sent, stats.chunks, stats.elapsed, stats.throughput / (1024 * 1024),
+        )
+
+
+# ---------------------------------------------------------------------------
+# 작업 큐(app/utils/media_jobs.py)용 – 실패 시 예외 발생 (재시도 판단은 작업 큐에서)
+# ---------------------------------------------------------------------------
+def _configure():
     if not _is_cloudinary_configured():
-        return None, None, "Cloudinary API 설정이 없습니다."
+        raise RuntimeError("Cloudinary API 설정이 없습니다.")
+    import cloudinary
 
-    try:
-        import cloudinary
-        import cloudinary.uploader
+    cloudinary.config(**_get_cloudinary_config())
 
-        cloudinary.config(**_get_cloudinary_config())
-    except ImportError:
-        return None, None, "cloudinary 패키지가 설치되지 않았습니다."
 
-    if not file_storage or not file_storage.filename:
-        return None, None, "파일이 선택되지 않았습니다."
-
-    ext = file_storage.filename.rsplit(".", 1)[-1].lower() if "." in file_storage.filename else "jpg"
-    try:
-        with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as tmp:
-            file_storage.save(tmp.name)
-            tmp_path = tmp.name
-        try:
-            result = cloudinary.uploader.upload(
-                tmp_path,
-                resource_type="image",
-                folder=folder,
-                use_filename=True,
-                unique_filename=True,
-            )
-            secure_url = result.get("secure_url")
-            public_id = result.get("public_id")
-            return secure_url, public_id, None
-        finally:
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
-    except Exception as e:
-        return None, None, str(e)
-
-
-def delete_cloudinary_resource(public_id: str, resource_type: str = "video") -> bool:
-    """Cloudinary에서 리소스 삭제. resource_type: 'video' 또는 'image'."""
-    if not public_id or not _is_cloudinary_configured():
-        return False
-    try:
-        import cloudinary
-        import cloudinary.uploader
-
-        cloudinary.config(**_get_cloudinary_config())
-        cloudinary.uploader.destroy(public_id, resource_type=resource_type)
-        return True
-    except Exception:
-        return False
+def upload_file(path: str, resource_type: str, folder: str, public_id: Optional[str] = None) -> dict:
+    """
+    로컬 파일을 Cloudinary에 업로드 (청크 단위, stream_upload). 반환: 업로드 결과 dict.
+    public_id 를 주면 같은 id 로 덮어쓰므로 재시도해도 리소스가 늘어나지 않음.
+    """
+    _configure()
+    options = {"resource_type": resource_type, "folder": folder}
+    if public_id:
+        options.update(public_id=public_id, overwrite=True, unique_filename=False)
+    else:
+        options.update(use_filename=True, unique_filename=True)
+    with open(path, "rb") as f:
+        result, stats = stream_upload(f, os.path.basename(path), **options)
+    _log_stats(resource_type, os.path.basename(path), stats)
+    return result
+
+
+def destroy_resource(public_id: str, resource_type: str = "video") -> None:
+    """Cloudinary 리소스 삭제. 이미 없으면 성공으로 처리, 그 외 응답·오류는 예외."""
+    _configure()
+    import cloudinary.uploader
+
+    result = cloudinary.uploader.destroy(public_id, resource_type=resource_type, invalidate=True)
+    if result.get("result") not in ("ok", "not found"):
+        raise RuntimeError(f"Cloudinary 삭제 실패 ({public_id}): {result}")
@@ -0,0 +1,114 @@
+"""
+댓글 좋아요·싫어요 – comment_likes / comment_dislikes 행 + comments.likes / dislikes 카운터.
+
+- toggle_reaction(): 한 트랜잭션 안에서 (비디오 좋아요 app/utils/likes.py 와 같은 방식)
+  1) 같은 반응 DELETE (지워졌으면 해제) → 아니면 INSERT ... ON CONFLICT DO NOTHING 후 반대 반응 DELETE,
+     rowcount 로 판별하므로 사전 SELECT 없음, 동시 토글·중복 클릭에도 행 수와 카운터가 일치.
+  2) UPDATE comments SET likes = likes ± a, dislikes = dislikes ± b 1번 (RETURNING 으로 새 값).
+- get_reactions(): 댓글 id 목록에 대한 사용자의 반응을 쿼리 1번(UNION ALL)으로 → 댓글 한 페이지 상태를 한 번에.
+- repair_reaction_counts(): 중간 테이블 기준으로 어긋난 카운터 재계산.
+"""
+
+from sqlalchemy import bindparam, delete, literal, select, text, union_all, update
+
+from app.utils.likes import insert_ignore
+
+REACTIONS = ("like", "dislike")
+
+
+def _tables():
+    from app.models.comment import comment_dislikes, comment_likes
+
+    return {"like": comment_likes, "dislike": comment_dislikes}
+
+
+def toggle_reaction(session, comment, user_id, reaction, commit=True):
+    """
+    comment 에 대한 user_id 의 반응(reaction: "like" | "dislike") 토글.
+    이미 같은 반응이면 해제, 아니면 설정 (반대 반응은 해제).
+    반환: (현재 반응 "like" | "dislike" | None, likes, dislikes).
+    """
+    from app.models import Comment
+
+    if reaction not in REACTIONS:
+        raise ValueError(f"알 수 없는 반응: {reaction}")
+    opposite = "dislike" if reaction == "like" else "like"
+    tables = _tables()
+    same, other = tables[reaction], tables[opposite]
+    comment_id = comment.id
+    deltas = dict.fromkeys(REACTIONS, 0)
+
+    removed = session.execute(
+        delete(same).where(same.c.comment_id == comment_id, same.c.user_id == user_id)
+    ).rowcount
+    if removed:
+        current = None
+        deltas[reaction] = -1
+    else:
+        inserted = session.execute(
+            insert_ignore(session, same).values(comment_id=comment_id, user_id=user_id)
+        ).rowcount
+        # 0 이면 같은 사용자의 동시 요청이 먼저 추가한 것 – 상태는 설정됨, 증감 없음
+        current = reaction
+        deltas[reaction] = 1 if inserted else 0
+        deltas[opposite] = -session.execute(
+            delete(other).where(other.c.comment_id == comment_id, other.c.user_id == user_id)
+        ).rowcount
+
+    table = Comment.__table__
+    stmt = update(table).where(table.c.id == comment_id)
+    values = {}
+    if deltas["like"]:
+        values["likes"] = table.c.likes + deltas["like"]
+    if deltas["dislike"]:
+        values["dislikes"] = table.c.dislikes + deltas["dislike"]
+    if values and session.get_bind().dialect.update_returning:
+        likes, dislikes = session.execute(
+            stmt.values(**values).returning(table.c.likes, table.c.dislikes)
+        ).one()
+    else:
+        if values:
+            session.execute(stmt.values(**values))
+        likes, dislikes = session.execute(
+            select(table.c.likes, table.c.dislikes).where(table.c.id == comment_id)
+        ).one()
+    # 세션에 로드된 comment 의 카운터는 다음 접근 시 다시 조회
+    session.expire(comment, ["likes", "dislikes"])
+    if commit:
+        session.commit()
+    return current, int(likes or 0), int(dislikes or 0)
+
+
+def get_reactions(session, user_id, comment_ids):
+    """{comment_id: "like" | "dislike"} – 반응하지 않은 댓글은 빠짐. 비로그인(None)이면 {}. 쿼리 1번."""
+    comment_ids = sorted({int(c) for c in comment_ids if c is not None})
+    if not user_id or not comment_ids:
+        return {}
+    selects = [
+        select(table.c.comment_id, literal(name).label("reaction")).where(
+            table.c.user_id == user_id, table.c.comment_id.in_(comment_ids)
+        )
+        for name, table in _tables().items()
+    ]
+    return {comment_id: reaction for comment_id, reaction in session.execute(union_all(*selects))}
+
+
+def repair_reaction_counts(db, comment_ids=None):
+    """comment_likes / comment_dislikes 기준으로 comments.likes / dislikes 재계산. 반환: 수정한 댓글 수."""
+    likes = "(SELECT COUNT(*) FROM comment_likes l WHERE l.comment_id = comments.id)"
+    dislikes = "(SELECT COUNT(*) FROM comment_dislikes d WHERE d.comment_id = comments.id)"
+    sql = (
+        f"UPDATE comments SET likes = {likes}, dislikes = {dislikes} "
+        f"WHERE (likes != {likes} OR dislikes != {dislikes})"
+    )
+    if comment_ids is None:
+        result = db.session.execute(text(sql))
+    else:
+        ids = sorted({int(c) for c in comment_ids})
+        if not ids:
+            return 0
+        result = db.session.execute(
+            text(sql + " AND id IN :ids").bindparams(bindparam("ids", expanding=True)), {"ids": ids}
+        )
+    db.session.commit()
+    return result.rowcount or 0
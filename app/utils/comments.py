@@ -0,0 +1,126 @@
+"""
+댓글 조회 – 비디오별 최상위 댓글·답글을 keyset 페이지로 (watch 첫 화면·'댓글 더보기'/'답글 보기' JSON).
+
+- 최상위 댓글·답글 모두 (created_at, id) 오름차순 keyset (app/utils/pagination.py), 최상위 댓글은 인기순(likes, id)도.
+  (video_id, parent_id, created_at|likes, id)·(parent_id, created_at, id) 인덱스로 페이지마다 per_page+1 행만 읽음.
+- 답글은 처음에 읽지 않고 '답글 N개' 버튼으로 댓글별 페이지 조회. 화면의 N 은 현재 페이지 댓글들에 대해 GROUP BY 1번.
+- videos.comment_count(답글 포함): 댓글 insert/delete 이벤트에서 같은 트랜잭션에 ± 1 → 전체 개수 COUNT 없음.
+  기존 DB 는 컬럼 추가 시 repair_comment_counts() 로 채움.
+"""
+
+from sqlalchemy import bindparam, event, func, select, text
+
+from app.utils.loading import loader_options
+from app.utils.pagination import keyset_paginate
+
+# 댓글 정렬 이름 → [(컬럼 속성명, 내림차순 여부)]. oldest: 작성 시각 오름차순 (기본), top: 좋아요 많은 순
+COMMENT_SORT_KEYS = {
+    "oldest": [("created_at", False), ("id", False)],
+    "top": [("likes", True), ("id", True)],
+}
+
+_listeners_installed = False
+
+
+def comment_keys(sort="oldest"):
+    """정렬 이름으로 [(컬럼, 내림차순 여부)]. 모르는 정렬은 oldest."""
+    from app.models import Comment
+
+    spec = COMMENT_SORT_KEYS.get(sort) or COMMENT_SORT_KEYS["oldest"]
+    return [(getattr(Comment, name), desc) for name, desc in spec]
+
+
+# ---------------------------------------------------------------------------
+# 페이지 조회
+# ---------------------------------------------------------------------------
+def top_comments_page(video_id, cursor=None, per_page=20, sort="oldest"):
+    """
+    비디오의 최상위 댓글 한 페이지 (작성자 함께 로드). KeysetPage – items, has_next, next_cursor.
+    sort: oldest (등록순) | top (인기순, (video_id, parent_id, likes, id) 인덱스). 커서는 같은 sort 로만 이어서 사용.
+    """
+    from app.models import Comment
+
+    query = Comment.query.filter_by(video_id=video_id, parent_id=None).options(*loader_options("comments"))
+    return keyset_paginate(query, comment_keys(sort), per_page=per_page, cursor=cursor)
+
+
+def replies_page(parent_id, cursor=None, per_page=10):
+    """댓글의 답글 한 페이지 (작성자 함께 로드)."""
+    from app.models import Comment
+
+    query = Comment.query.filter_by(parent_id=parent_id).options(*loader_options("comments"))
+    return keyset_paginate(query, comment_keys(), per_page=per_page, cursor=cursor)
+
+
+def reply_counts(comment_ids):
+    """{댓글 id: 답글 수} (답글 없는 댓글은 0). 쿼리 1번."""
+    from app import db
+    from app.models import Comment
+
+    comment_ids = [int(c) for c in comment_ids]
+    if not comment_ids:
+        return {}
+    counts = dict.fromkeys(comment_ids, 0)
+    rows = db.session.execute(
+        select(Comment.parent_id, func.count())
+        .where(Comment.parent_id.in_(comment_ids))
+        .group_by(Comment.parent_id)
+    )
+    counts.update({parent_id: n for parent_id, n in rows})
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# videos.comment_count 유지
+# ---------------------------------------------------------------------------
+def adjust_comment_count(connection, video_id, delta):
+    """videos.comment_count 를 delta 만큼 변경 (0 미만으로 내려가지 않음)."""
+    if video_id is None or not delta:
+        return
+    connection.execute(
+        text(
+            "UPDATE videos SET comment_count = CASE WHEN comment_count + :delta < 0 THEN 0 "
+            "ELSE comment_count + :delta END WHERE id = :id"
+        ),
+        {"delta": int(delta), "id": video_id},
+    )
+
+
+def _comment_after_insert(mapper, connection, target):
+    adjust_comment_count(connection, target.video_id, 1)
+
+
+def _comment_after_delete(mapper, connection, target):
+    adjust_comment_count(connection, target.video_id, -1)
+
+
+def install_listeners():
+    """댓글 insert/delete 이벤트 등록 (create_app 에서 1번)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import Comment
+
+    event.listen(Comment, "after_insert", _comment_after_insert)
+    event.listen(Comment, "after_delete", _comment_after_delete)
+    _listeners_installed = True
+
+
+def repair_comment_counts(db, video_ids=None):
+    """comments 기준으로 videos.comment_count 재계산 (video_ids=None 이면 전체). 반환: 수정한 비디오 수."""
+    sql = (
+        "UPDATE videos SET comment_count = "
+        "(SELECT COUNT(*) FROM comments c WHERE c.video_id = videos.id) "
+        "WHERE comment_count != (SELECT COUNT(*) FROM comments c WHERE c.video_id = videos.id)"
+    )
+    if video_ids is None:
+        result = db.session.execute(text(sql))
+    else:
+        ids = sorted({int(v) for v in video_ids})
+        if not ids:
+            return 0
+        result = db.session.execute(
+            text(sql + " AND id IN :ids").bindparams(bindparam("ids", expanding=True)), {"ids": ids}
+        )
+    db.session.commit()
+    return result.rowcount or 0
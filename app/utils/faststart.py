@@ -0,0 +1,233 @@
+"""
+MP4 faststart – moov box 가 mdat 뒤(파일 끝)에 있는 MP4/MOV 를 moov 가 앞에 오도록 다시 씀 (qt-faststart 와 같은 방식).
+
+- moov 가 끝에 있으면 브라우저는 재생 전에 파일 끝을 따로 요청해야 함 (왕복 1회 + 탐색). 앞으로 옮기면 첫 요청만으로 재생 시작.
+- 순수 파이썬 box 재작성: moov 만 메모리로 읽어 stco/co64(청크 위치 표)를 이동한 만큼 고치고,
+  나머지(mdat 본문)는 고정 크기 버퍼로 복사 → 동영상 크기와 관계없이 메모리 일정. 같은 폴더 임시 파일에 쓴 뒤 os.replace.
+- 32비트 stco 가 넘치면 co64 로 바꿔 씀. 압축된 moov(cmov)·조각 MP4(moof)는 건드리지 않음.
+- 업로드 파일은 작업 큐의 video.faststart 작업(app/utils/media_jobs.py), 기존 파일은 scripts/faststart_videos.py 로
+  처리 – 둘 다 relocate_stored_video: uuid 파일명은 immutable 로 1년 캐시되므로(app/utils/media.py) 제자리 교체하지 않고
+  새 uuid 파일명으로 쓴 뒤 videos.video_path 를 바꾸고 이전 파일 삭제.
+"""
+
+import os
+import stat
+import struct
+import tempfile
+import uuid
+
+from app.utils.media_probe import ProbeError, iter_boxes
+
+# moov 안에서 자식 box 를 다시 짜야 하는 컨테이너 (청크 위치 표 stco/co64 는 stbl 안)
+_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+_COPY_CHUNK = 1024 * 1024
+
+
+class FaststartError(ProbeError):
+    """faststart 로 바꿀 수 없는 파일 (moov 없음·압축된 moov·조각 MP4·moov 가 너무 큼)."""
+
+
+class _Overflow(Exception):
+    """stco(32비트) 위치가 이동 후 4GB 를 넘음 → co64 로 다시 만들어야 함."""
+
+
+def _header(box_type, payload_size):
+    size = payload_size + 8
+    if size > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, box_type, payload_size + 16)
+    return struct.pack(">I4s", size, box_type)
+
+
+def _rewrite_offsets(box_type, payload, shift, force_co64):
+    """stco/co64 본문 → (새 type, 새 본문). shift(offset) 로 각 청크 위치를 옮김."""
+    version_flags = payload[:4]
+    count = struct.unpack_from(">I", payload, 4)[0]
+    if box_type == b"stco":
+        offsets = struct.unpack_from(f">{count}I", payload, 8)
+    else:
+        offsets = struct.unpack_from(f">{count}Q", payload, 8)
+    moved = [shift(o) for o in offsets]
+    if box_type == b"co64" or force_co64:
+        return b"co64", version_flags + struct.pack(f">I{count}Q", count, *moved)
+    if moved and max(moved) > 0xFFFFFFFF:
+        raise _Overflow
+    return b"stco", version_flags + struct.pack(f">I{count}I", count, *moved)
+
+
+def _rebuild(data, shift, force_co64):
+    """box 목록 바이트(data)를 다시 짬: 컨테이너는 재귀, stco/co64 는 위치 수정, 나머지는 그대로."""
+    out = []
+    pos = 0
+    while pos + 8 <= len(data):
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = len(data) - pos
+        if size < header_size or pos + size > len(data):
+            raise FaststartError(f"잘못된 box 크기: {box_type!r}")
+        payload = data[pos + header_size:pos + size]
+        if box_type == b"cmov":
+            raise FaststartError("압축된 moov 는 지원하지 않음")
+        if box_type in _CONTAINERS:
+            payload = _rebuild(payload, shift, force_co64)
+        elif box_type in (b"stco", b"co64"):
+            box_type, payload = _rewrite_offsets(box_type, payload, shift, force_co64)
+        else:
+            # 바뀌지 않는 box 는 원래 헤더(64비트 크기 포함) 그대로
+            out.append(data[pos:pos + size])
+            pos += size
+            continue
+        out.append(_header(box_type, len(payload)) + payload)
+        pos += size
+    return b"".join(out)
+
+
+def _copy_range(src, dst, start, length):
+    src.seek(start)
+    remaining = length
+    while remaining > 0:
+        chunk = src.read(min(_COPY_CHUNK, remaining))
+        if not chunk:
+            raise FaststartError("파일이 예상보다 짧음")
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+def needs_faststart(path):
+    """moov 가 첫 mdat 뒤에 있으면 True. MP4/MOV 가 아니거나 손상되면 ProbeError."""
+    return _layout(path)[0] is not None
+
+
+def _layout(path):
+    """최상위 box 배치 → (옮길 moov (offset, size) 또는 None, 첫 mdat offset, box 목록)."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(8)
+        if len(head) < 8 or head[4:8] not in (b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide"):
+            raise ProbeError("MP4/MOV 파일이 아님")
+        boxes = list(iter_boxes(f, 0, file_size))
+    types = {box_type for box_type, _, _, _ in boxes}
+    if b"moov" not in types:
+        raise FaststartError("moov box 없음")
+    if b"moof" in types:
+        raise FaststartError("조각 MP4(moof)는 지원하지 않음")
+    moov = next((offset, size) for box_type, offset, _, size in boxes if box_type == b"moov")
+    mdat_offset = next((offset for box_type, offset, _, _ in boxes if box_type == b"mdat"), None)
+    if mdat_offset is None or moov[0] < mdat_offset:
+        return None, mdat_offset, boxes
+    return moov, mdat_offset, boxes
+
+
+def relocate_moov(path, max_moov_size=64 * 1024 * 1024, dst_path=None):
+    """
+    moov 가 mdat 뒤에 있으면 앞으로 옮겨 path 를 교체 (dst_path 를 주면 그 경로에 쓰고 path 는 그대로).
+    옮겼으면 True, 이미 faststart 면 False.
+    새 배치: [첫 mdat 앞의 box들(ftyp 등)] [moov] [첫 mdat 부터의 나머지 box들(moov 제외)].
+    mdat 본문은 고정 크기 버퍼로 복사 (메모리 사용량 = moov 크기 + 1MB). 실패 시 원본 유지.
+    """
+    moov, mdat_offset, boxes = _layout(path)
+    if moov is None:
+        return False
+    moov_offset, moov_size = moov
+    if moov_size > max_moov_size:
+        raise FaststartError("moov box 가 너무 큼")
+
+    moov_end = moov_offset + moov_size
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".faststart")
+    try:
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            src.seek(moov_offset)
+            moov_data = src.read(moov_size)
+            if len(moov_data) < moov_size:
+                raise FaststartError("파일이 예상보다 짧음")
+            new_moov = None
+            for force_co64 in (False, True):
+                # 새 moov 크기는 co64 여부로만 정해짐 → 크기를 먼저 구한 뒤 구간별 이동량으로 청크 위치 수정
+                new_size = len(_rebuild(moov_data, lambda o: o, force_co64))
+
+                def shift(offset, new_size=new_size):
+                    if mdat_offset <= offset < moov_offset:
+                        return offset + new_size
+                    if offset >= moov_end:
+                        return offset + new_size - moov_size
+                    return offset
+
+                try:
+                    new_moov = _rebuild(moov_data, shift, force_co64)
+                    break
+                except _Overflow:
+                    continue
+            if new_moov is None:
+                raise FaststartError("청크 위치가 표현 범위를 넘음")
+            for box_type, offset, _, size in boxes:
+                if offset == mdat_offset:
+                    dst.write(new_moov)
+                if offset != moov_offset:
+                    _copy_range(src, dst, offset, size)
+        # mkstemp 는 0600 으로 만듦 → 원본 권한 유지 (프록시 오프로드 시 웹 서버가 읽을 수 있게)
+        os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(tmp_path, dst_path or path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def ensure_faststart(path):
+    """업로드 후처리용: 가능하면 moov 를 앞으로 옮김. 옮겼으면 True, 그대로 두면 False (형식 오류도 False)."""
+    try:
+        return relocate_moov(path)
+    except (OSError, ProbeError):
+        return False
+
+
+def relocate_stored_video(db, folder, name):
+    """
+    일괄 처리용 (scripts/faststart_videos.py): folder/name 의 moov 를 앞으로 옮기고 videos.faststart 반영.
+    uuid 파일명(immutable 캐시)이면 새 uuid 파일명으로 쓰고, 같은 트랜잭션에서 그 파일을 쓰는 비디오의
+    video_path 를 바꾼 뒤 커밋되면 이전 파일 삭제. 그 외 파일명(짧은 캐시)은 제자리 교체.
+    반환: 처리 후 파일명, 옮길 필요 없으면 None. DB 에 없는 uuid 파일은 FaststartError (건드리지 않음).
+    """
+    from sqlalchemy import select, update
+
+    from app.models import Video
+    from app.utils.media import is_immutable_name
+    from app.utils.response_cache import VIDEOS, mark_changed
+
+    path = os.path.join(folder, name)
+    if not needs_faststart(path):
+        return None
+    if not is_immutable_name(name):
+        if not relocate_moov(path):
+            return None
+        db.session.execute(update(Video).where(Video.video_path == name).values(faststart=True))
+        db.session.commit()
+        return name
+
+    if db.session.execute(select(Video.id).where(Video.video_path == name).limit(1)).first() is None:
+        raise FaststartError("DB 에 없는 파일 (uuid 파일명은 제자리 교체하지 않음)")
+    new_name = uuid.uuid4().hex + os.path.splitext(name)[1]
+    new_path = os.path.join(folder, new_name)
+    if not relocate_moov(path, dst_path=new_path):
+        return None
+    try:
+        db.session.execute(
+            update(Video).where(Video.video_path == name).values(video_path=new_name, faststart=True)
+        )
+        # 목록·상세 응답에 이전 파일 URL 이 캐시돼 있음
+        mark_changed(db.session, VIDEOS)
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        os.remove(new_path)
+        raise
+    os.remove(path)
+    return new_name
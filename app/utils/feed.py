@@ -0,0 +1,274 @@
+"""
+구독 피드 – 사용자별 inbox(feed_items) fan-out-on-write + 구독자 많은 채널은 merge-on-read.
+
+- 업로드(Video insert): 채널 구독자 수가 FEED_FANOUT_MAX_SUBSCRIBERS 미만이면 같은 트랜잭션에서 구독자마다
+  feed_items 행 추가 (INSERT ... SELECT 1번). 이상이면 채널을 users.feed_pull = True 로 표시하고 넣지 않음.
+  표시는 유지됨 → 표시 전 영상은 inbox 에, 이후 영상은 조회 때 합침 (겹치는 영상은 한 번만).
+- 구독(Subscription insert): 일반 채널이면 최근 FEED_BACKFILL_LIMIT 개 영상을 inbox 에 채움.
+  구독 취소는 그 채널 행 삭제. 비디오 삭제·작성자 변경, 사용자 삭제 시에도 정리.
+- 조회 feed_page(): inbox 의 (user_id, created_at, video_id) 인덱스 keyset 과 구독 중인 feed_pull 채널별
+  (user_id, created_at, id) 인덱스 keyset 을 각각 한 페이지 분량만 읽어 합침 → 일반 채널 구독 수와 무관하게 일정.
+  커서는 (created_at, id) 로 app/utils/pagination.py 와 같은 형식.
+- rebuild_feeds(): subscriptions·videos 기준으로 inbox 재구성 (scripts/rebuild_feeds.py, 기존 DB 는 최초 실행 시).
+"""
+
+import heapq
+
+from flask import current_app
+from sqlalchemy import bindparam, event, inspect, or_, select, text
+
+from app.utils.loading import loader_options
+from app.utils.pagination import KeysetPage, encode_cursor, keyset_paginate, sort_keys
+
+_listeners_installed = False
+
+
+def _config(name, default):
+    try:
+        return current_app.config.get(name, default)
+    except RuntimeError:
+        return default
+
+
+# ---------------------------------------------------------------------------
+# 쓰기 경로 (fan-out·backfill·정리)
+# ---------------------------------------------------------------------------
+def is_pull_channel(connection, channel_id):
+    """
+    채널 영상을 조회 때 합치는지 여부. 아직 표시 전이고 구독자 수가 FEED_FANOUT_MAX_SUBSCRIBERS 이상이면
+    이때 feed_pull 을 표시 (구독자 수는 channel_stats 1행, 행이 없으면 subscriptions COUNT).
+    """
+    row = connection.execute(
+        text(
+            "SELECT u.feed_pull, cs.subscriber_count FROM users u "
+            "LEFT JOIN channel_stats cs ON cs.user_id = u.id WHERE u.id = :id"
+        ),
+        {"id": channel_id},
+    ).first()
+    if row is None:
+        return True
+    pull, subscribers = row
+    if pull:
+        return True
+    if subscribers is None:
+        subscribers = connection.execute(
+            text("SELECT COUNT(*) FROM subscriptions WHERE subscribed_to_id = :id"), {"id": channel_id}
+        ).scalar()
+    if (subscribers or 0) < int(_config("FEED_FANOUT_MAX_SUBSCRIBERS", 1000)):
+        return False
+    connection.execute(text("UPDATE users SET feed_pull = :pull WHERE id = :id"), {"pull": True, "id": channel_id})
+    return True
+
+
+def fanout_video(connection, video_id, channel_id):
+    """일반 채널 영상을 구독자 inbox 에 추가. 반환: 추가한 행 수 (feed_pull 채널은 0)."""
+    if channel_id is None or is_pull_channel(connection, channel_id):
+        return 0
+    return connection.execute(
+        text(
+            "INSERT INTO feed_items (user_id, video_id, channel_id, created_at) "
+            "SELECT s.subscriber_id, v.id, v.user_id, v.created_at FROM videos v "
+            "JOIN subscriptions s ON s.subscribed_to_id = v.user_id "
+            "WHERE v.id = :video_id AND v.created_at IS NOT NULL"
+        ),
+        {"video_id": video_id},
+    ).rowcount
+
+
+def backfill_subscription(connection, subscriber_id, channel_id):
+    """새 구독: 일반 채널이면 최근 FEED_BACKFILL_LIMIT 개 영상을 inbox 에 추가. 반환: 추가한 행 수."""
+    if is_pull_channel(connection, channel_id):
+        return 0
+    return connection.execute(
+        text(
+            "INSERT INTO feed_items (user_id, video_id, channel_id, created_at) "
+            "SELECT :user_id, v.id, v.user_id, v.created_at FROM videos v "
+            "WHERE v.user_id = :channel_id AND v.created_at IS NOT NULL AND NOT EXISTS "
+            "(SELECT 1 FROM feed_items f WHERE f.user_id = :user_id AND f.video_id = v.id) "
+            "ORDER BY v.created_at DESC, v.id DESC LIMIT :limit"
+        ),
+        {
+            "user_id": subscriber_id,
+            "channel_id": channel_id,
+            "limit": int(_config("FEED_BACKFILL_LIMIT", 100)),
+        },
+    ).rowcount
+
+
+def remove_subscription(connection, subscriber_id, channel_id):
+    """구독 취소: 그 채널 영상을 inbox 에서 삭제."""
+    connection.execute(
+        text("DELETE FROM feed_items WHERE user_id = :user_id AND channel_id = :channel_id"),
+        {"user_id": subscriber_id, "channel_id": channel_id},
+    )
+
+
+def _video_after_insert(mapper, connection, target):
+    fanout_video(connection, target.id, target.user_id)
+
+
+def _video_after_update(mapper, connection, target):
+    if inspect(target).attrs.user_id.history.has_changes():
+        connection.execute(text("DELETE FROM feed_items WHERE video_id = :id"), {"id": target.id})
+        fanout_video(connection, target.id, target.user_id)
+
+
+def _video_after_delete(mapper, connection, target):
+    connection.execute(text("DELETE FROM feed_items WHERE video_id = :id"), {"id": target.id})
+
+
+def _subscription_after_insert(mapper, connection, target):
+    backfill_subscription(connection, target.subscriber_id, target.subscribed_to_id)
+
+
+def _subscription_after_delete(mapper, connection, target):
+    remove_subscription(connection, target.subscriber_id, target.subscribed_to_id)
+
+
+def _user_after_delete(mapper, connection, target):
+    connection.execute(
+        text("DELETE FROM feed_items WHERE user_id = :id OR channel_id = :id"), {"id": target.id}
+    )
+
+
+def install_listeners():
+    """업로드·구독·삭제 이벤트 등록 (create_app 에서 1번)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import Subscription, User, Video
+
+    event.listen(Video, "after_insert", _video_after_insert)
+    event.listen(Video, "after_update", _video_after_update)
+    event.listen(Video, "after_delete", _video_after_delete)
+    event.listen(Subscription, "after_insert", _subscription_after_insert)
+    event.listen(Subscription, "after_delete", _subscription_after_delete)
+    event.listen(User, "after_delete", _user_after_delete)
+    _listeners_installed = True
+
+
+def init_feed(app, db):
+    """create_app 에서 호출 (앱 컨텍스트 안). 이벤트 등록, inbox 가 비어 있고 구독이 있으면 재구성."""
+    install_listeners()
+    if db.session.execute(text("SELECT 1 FROM feed_items LIMIT 1")).first() is None:
+        if db.session.execute(text("SELECT 1 FROM subscriptions LIMIT 1")).first() is not None:
+            rebuild_feeds(db)
+
+
+# ---------------------------------------------------------------------------
+# 조회
+# ---------------------------------------------------------------------------
+def pull_channel_ids(session, user_id):
+    """user_id 가 구독 중인 feed_pull 채널 id 목록."""
+    from app.models import Subscription, User
+
+    return [
+        channel_id
+        for (channel_id,) in session.execute(
+            select(Subscription.subscribed_to_id)
+            .join(User, User.id == Subscription.subscribed_to_id)
+            .where(Subscription.subscriber_id == user_id, User.feed_pull.is_(True))
+        )
+    ]
+
+
+def _sort_key(video):
+    created_at = video.created_at
+    if created_at is not None and created_at.tzinfo is not None:
+        created_at = created_at.replace(tzinfo=None)
+    return created_at, video.id
+
+
+def feed_page(user_id, page=1, per_page=12, cursor=None):
+    """
+    구독 피드 한 페이지 (최신순, 작성자 함께 로드). KeysetPage – items, has_next, next_cursor, total.
+    cursor 가 없으면 page 번호까지의 행을 양쪽에서 읽어 합친 뒤 해당 구간만 사용 (얕은 페이지 링크 호환).
+    """
+    from app import db
+    from app.models import Video
+    from app.models.subscription import feed_items
+
+    page = max(1, int(page or 1))
+    limit = per_page if cursor else page * per_page
+    in_inbox = select(feed_items.c.video_id).where(feed_items.c.user_id == user_id)
+    sources = [
+        (
+            Video.query.join(feed_items, feed_items.c.video_id == Video.id)
+            .filter(feed_items.c.user_id == user_id)
+            .options(*loader_options("video_list")),
+            [(feed_items.c.created_at, True), (feed_items.c.video_id, True)],
+        )
+    ]
+    count_query = Video.query.filter(Video.id.in_(in_inbox))
+    pull_ids = pull_channel_ids(db.session, user_id)
+    # 대형 채널은 채널마다 따로 조회 – (user_id, created_at, id) 인덱스를 그대로 따라가므로 정렬 없이 LIMIT 만큼만 읽음
+    for channel_id in pull_ids:
+        sources.append(
+            (
+                Video.query.filter(Video.user_id == channel_id).options(*loader_options("video_list")),
+                sort_keys(Video, "latest"),
+            )
+        )
+    if pull_ids:
+        count_query = Video.query.filter(or_(Video.id.in_(in_inbox), Video.user_id.in_(pull_ids)))
+
+    parts = [keyset_paginate(query, keys, per_page=limit, cursor=cursor) for query, keys in sources]
+    merged, seen = [], set()
+    for video in heapq.merge(*[p.items for p in parts], key=_sort_key, reverse=True):
+        if video.id not in seen:
+            seen.add(video.id)
+            merged.append(video)
+
+    start = 0 if cursor else (page - 1) * per_page
+    items = merged[start:start + per_page]
+    has_next = len(merged) > start + per_page or any(p.has_next for p in parts)
+    next_cursor = encode_cursor(list(_sort_key(items[-1]))) if has_next and items else None
+    return KeysetPage(count_query, items, page, per_page, has_next, next_cursor)
+
+
+# ---------------------------------------------------------------------------
+# 재구성
+# ---------------------------------------------------------------------------
+def rebuild_feeds(db, user_ids=None):
+    """
+    inbox 재구성: 구독 중인 일반 채널마다 최근 FEED_BACKFILL_LIMIT 개 영상.
+    user_ids=None 이면 구독자 수 기준으로 feed_pull 표시도 다시 계산. 반환: 추가한 행 수.
+    """
+    session = db.session
+    params = {
+        "limit": int(_config("FEED_FANOUT_MAX_SUBSCRIBERS", 1000)),
+        "backfill": int(_config("FEED_BACKFILL_LIMIT", 100)),
+        "pull": False,
+    }
+    sql = (
+        "INSERT INTO feed_items (user_id, video_id, channel_id, created_at) "
+        "SELECT s.subscriber_id, v.id, v.user_id, v.created_at FROM subscriptions s "
+        "JOIN users u ON u.id = s.subscribed_to_id AND u.feed_pull = :pull "
+        "JOIN (SELECT id, user_id, created_at, "
+        "ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY created_at DESC, id DESC) AS rn "
+        "FROM videos WHERE created_at IS NOT NULL) v ON v.user_id = s.subscribed_to_id AND v.rn <= :backfill"
+    )
+    if user_ids is None:
+        session.execute(
+            text(
+                "UPDATE users SET feed_pull = "
+                "((SELECT COUNT(*) FROM subscriptions s WHERE s.subscribed_to_id = users.id) >= :limit)"
+            ),
+            params,
+        )
+        session.execute(text("DELETE FROM feed_items"))
+        result = session.execute(text(sql), params)
+    else:
+        ids = sorted({int(u) for u in user_ids})
+        if not ids:
+            return 0
+        session.execute(
+            text("DELETE FROM feed_items WHERE user_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": ids},
+        )
+        result = session.execute(
+            text(sql + " WHERE s.subscriber_id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            dict(params, ids=ids),
+        )
+    session.commit()
+    return result.rowcount or 0
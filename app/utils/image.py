@@ -1,22 +1,88 @@
 """
 이미지 파일 검증 유틸 – 프로필 이미지 업로드용.
+
+파일 전체를 메모리로 읽지 않음: 크기는 seek/tell, 형식은 앞 32바이트 매직 넘버,
+해상도는 헤더만 읽어 확인(압축 폭탄 차단), Image.verify()는 업로드 임시 파일(spooled)에서 바로 읽음.
 """
 
-from io import BytesIO
+import os
+import tempfile
+import warnings
 
 from PIL import Image
 
+# 해상도 상한 (가로 × 세로 픽셀). 작은 파일이 거대한 해상도로 풀리는 압축 폭탄 차단. 설정 MAX_IMAGE_PIXELS 로 변경.
+DEFAULT_MAX_PIXELS = 40_000_000
+
+_HEADER_SIZE = 32
+
+# 매직 넘버로 확인한 형식 → 허용 확장자
+_FORMAT_EXTENSIONS = {
+    "JPEG": {"jpg", "jpeg"},
+    "PNG": {"png"},
+    "GIF": {"gif"},
+    "WEBP": {"webp"},
+}
+
+
+def sniff_image_format(header):
+    """파일 앞부분 바이트로 이미지 형식 판별. 알 수 없으면 None."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def _max_pixels():
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        return int(current_app.config.get("MAX_IMAGE_PIXELS", DEFAULT_MAX_PIXELS))
+    return DEFAULT_MAX_PIXELS
+
 
-def validate_image_file(file_storage, allowed_extensions, max_size_bytes):
+def _stream_size(file_storage, max_size_bytes):
+    """
+    업로드 스트림 크기 (바이트). seek 가능하면 끝으로 이동해 tell, 아니면 임시 파일로 조금씩 옮기며 셈
+    (max_size_bytes 를 넘는 순간 중단 → 반환값이 max_size_bytes 보다 큼).
+    """
+    stream = file_storage.stream
+    try:
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        return size
+    except (AttributeError, OSError, ValueError):
+        pass
+    spooled = tempfile.SpooledTemporaryFile(max_size=512 * 1024)
+    size = 0
+    for chunk in iter(lambda: stream.read(64 * 1024), b""):
+        size += len(chunk)
+        if size > max_size_bytes:
+            return size
+        spooled.write(chunk)
+    spooled.seek(0)
+    file_storage.stream = spooled
+    return size
+
+
+def validate_image_file(file_storage, allowed_extensions, max_size_bytes, max_pixels=None):
     """
     프로필 이미지 파일 유효성 검사.
 
     검사 항목:
     1. 파일 확장자 (allowed_extensions)
-    2. 파일 크기 (max_size_bytes)
-    3. Pillow Image.verify()로 실제 이미지 파일 여부 확인
+    2. 파일 크기 (max_size_bytes) – seek/tell, 내용은 읽지 않음
+    3. 매직 넘버 (앞 32바이트)로 실제 형식 확인 – 허용 확장자에 해당하는 형식만
+    4. 해상도 (max_pixels, 기본 설정 MAX_IMAGE_PIXELS) – 헤더만 읽어 압축 폭탄 차단
+    5. Pillow Image.verify()로 실제 이미지 파일 여부 확인 – 업로드 스트림에서 바로 읽음
 
-    반환: (True, None) 성공 시, (False, 에러메시지) 실패 시
+    반환: (True, None) 성공 시, (False, 에러메시지) 실패 시. 검증 후 스트림은 처음 위치로 되돌림.
     """
     if not file_storage or not file_storage.filename:
         return False, "파일이 선택되지 않았습니다."
@@ -29,19 +95,36 @@ def validate_image_file(file_storage, allowed_extensions, max_size_bytes):
     if ext not in allowed_extensions:
         return False, f"허용되지 않는 파일 형식입니다. 허용: {', '.join(sorted(allowed_extensions))}"
 
-    file_storage.seek(0)
-    data = file_storage.read()
-    file_storage.seek(0)
-
-    if len(data) > max_size_bytes:
+    if _stream_size(file_storage, max_size_bytes) > max_size_bytes:
         max_mb = max_size_bytes // (1024 * 1024)
         return False, f"파일 크기가 너무 큽니다. 최대 {max_mb}MB까지 업로드할 수 있습니다."
 
-    # Pillow로 실제 이미지 파일 여부 검증
+    invalid = "유효하지 않은 이미지 파일입니다. 손상되었거나 이미지 형식이 아닐 수 있습니다."
+    stream = file_storage.stream
+    header = stream.read(_HEADER_SIZE)
+    stream.seek(0)
+    fmt = sniff_image_format(header)
+    if fmt is None or not (_FORMAT_EXTENSIONS[fmt] & set(allowed_extensions)):
+        return False, invalid
+
+    if max_pixels is None:
+        max_pixels = _max_pixels()
     try:
-        img = Image.open(BytesIO(data))
-        img.verify()
+        with warnings.catch_warnings():
+            # 상한은 아래에서 직접 확인 (Pillow 기본 상한 경고는 무시)
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            # Image.open 은 헤더만 읽음 (픽셀 디코딩 없음)
+            img = Image.open(stream, formats=[fmt])
+            width, height = img.size
+            if width * height > max_pixels:
+                return False, f"이미지 해상도가 너무 큽니다. 최대 {max_pixels:,}픽셀까지 업로드할 수 있습니다."
+            img.verify()
+    except Image.DecompressionBombError:
+        return False, f"이미지 해상도가 너무 큽니다. 최대 {max_pixels:,}픽셀까지 업로드할 수 있습니다."
     except Exception:
-        return False, "유효하지 않은 이미지 파일입니다. 손상되었거나 이미지 형식이 아닐 수 있습니다."
+        return False, invalid
+    finally:
+        stream.seek(0)
 
     return True, None
+
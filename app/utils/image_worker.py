@@ -0,0 +1,36 @@
+"""
+썸네일 변형 작업 프로세스용 모듈 (app/utils/thumbnails.py ImageVariants 의 ProcessPoolExecutor).
+
+작업 프로세스는 forkserver/spawn 으로 띄우므로 작업 함수의 모듈을 새로 import 함 (app 패키지 import 는
+앱을 만들지 않음 – 앱 인스턴스는 wsgi.py·app/__main__.py·Flask CLI 가 create_app() 으로 만듦).
+→ 이 모듈은 표준 라이브러리·Pillow 만 import.
+"""
+
+import os
+
+
+def render_variants(src, targets, quality):
+    """
+    원본 1장을 열어 targets [(너비, 형식, 저장 경로)] 를 모두 생성 (작업 프로세스에서 실행).
+    임시 파일에 쓴 뒤 os.replace → 읽는 쪽이 반쯤 쓴 파일을 보지 않음. 반환: 생성한 경로 목록.
+    """
+    from PIL import Image, ImageOps
+
+    done = []
+    with Image.open(src) as img:
+        max_width = max(width for width, _, _ in targets)
+        # JPEG 는 디코딩 단계에서 1/2·1/4·1/8 축소 → 큰 원본도 빠르게
+        img.draft("RGB", (max_width, max(1, img.height * max_width // max(1, img.width))))
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        for width, fmt, dst in targets:
+            w = min(width, img.width)
+            resized = img if w == img.width else img.resize(
+                (w, max(1, round(img.height * w / img.width))), Image.Resampling.LANCZOS
+            )
+            tmp = f"{dst}.{os.getpid()}.tmp"
+            resized.save(tmp, format=fmt.upper(), quality=quality)
+            os.replace(tmp, dst)
+            done.append(dst)
+    return done
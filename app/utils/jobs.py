@@ -0,0 +1,318 @@
+"""
+작업 큐 – jobs 테이블 기반 백그라운드 작업 (재시도·지수 backoff·idempotency key).
+
+- enqueue(session, kind, payload, key): 현재 트랜잭션에 jobs 행 추가. 업무 데이터(비디오 삭제 등)와 함께
+  커밋되므로 커밋된 작업은 유실되지 않음. 같은 key 가 이미 있으면 새로 만들지 않음.
+- 실행: JobQueue 워커 스레드 JOB_WORKER_THREADS 개 (첫 작업 커밋 시 시작, 커밋될 때마다 깨움) 또는
+  별도 프로세스 scripts/run_jobs.py. 조건부 UPDATE 로 작업을 가져가므로 워커·프로세스가 여럿이어도 1번만 실행.
+- 실패: JOB_BACKOFF_BASE * 2^(시도-1) 초 (최대 JOB_BACKOFF_MAX) 뒤 재시도, JOB_MAX_ATTEMPTS 번 실패하면 failed
+  + 등록된 on_failure 호출. 실행 중 워커가 죽으면 JOB_LOCK_TIMEOUT 초 뒤 다른 워커가 다시 가져감.
+- 처리 함수: @job_handler("종류") 로 등록, payload dict 를 받음. 재시도돼도 결과가 같도록 작성.
+"""
+
+import atexit
+import json
+import os
+import socket
+import threading
+import weakref
+from collections import namedtuple
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app, has_app_context
+from sqlalchemy import and_, delete, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+# 세션 info 키: 이 트랜잭션에서 작업을 등록했는지 (커밋 후 워커 깨움)
+_WAKE_KEY = "jobs_enqueued"
+_listeners_installed = False
+
+_Handler = namedtuple("_Handler", ["func", "on_failure"])
+_HANDLERS = {}
+
+# 가져온 작업 (세션과 무관한 값 복사본)
+ClaimedJob = namedtuple("ClaimedJob", ["id", "kind", "payload", "attempts", "max_attempts"])
+
+# 프로세스 종료 시 워커를 멈출 큐 (atexit 등록은 프로세스당 1번, 앱이 사라지면 목록에서도 빠짐. view_counter 와 같은 방식)
+_live_queues = weakref.WeakSet()
+_atexit_registered = False
+
+
+def _shutdown_all():
+    for queue in list(_live_queues):
+        queue.shutdown()
+
+
+def _register_for_exit(queue):
+    global _atexit_registered
+    _live_queues.add(queue)
+    if not _atexit_registered:
+        atexit.register(_shutdown_all)
+        _atexit_registered = True
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+def job_handler(kind, on_failure=None):
+    """
+    작업 처리 함수 등록 데코레이터. on_failure(payload, error) 는 최대 시도 후 최종 실패 시 호출.
+    예: @job_handler("cloudinary.destroy")
+    """
+    def decorator(func):
+        _HANDLERS[kind] = _Handler(func, on_failure)
+        return func
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# 등록
+# ---------------------------------------------------------------------------
+def _after_commit(session):
+    if session.info.pop(_WAKE_KEY, False) and has_app_context():
+        queue = current_app.extensions.get("job_queue")
+        if queue is not None:
+            queue.wake()
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_WAKE_KEY, None)
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+def _insert_ignoring_key(session, values):
+    """idempotency_key 중복이면 건너뛰는 INSERT."""
+    from app.models.job import Job
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        session.execute(upsert(Job.__table__).values(**values).on_conflict_do_nothing(index_elements=["idempotency_key"]))
+        return
+    from sqlalchemy.exc import IntegrityError
+
+    try:
+        with session.begin_nested():
+            session.execute(insert(Job.__table__).values(**values))
+    except IntegrityError:
+        pass
+
+
+def enqueue(session, kind, payload=None, key=None, delay=0, max_attempts=None):
+    """
+    작업 등록 (커밋은 호출한 쪽에서). key 가 같은 작업이 이미 있으면 그 작업 id 반환.
+    delay: 처음 실행까지 대기 초.
+    """
+    from app.models.job import Job
+
+    _install_listeners()
+    now = _utc_now()
+    values = {
+        "kind": kind,
+        "payload": json.dumps(payload or {}, ensure_ascii=False),
+        "idempotency_key": key,
+        "status": "pending",
+        "attempts": 0,
+        "max_attempts": int(max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 5)),
+        "run_at": now + timedelta(seconds=delay),
+        "created_at": now,
+    }
+    if key is None:
+        job_id = session.execute(insert(Job.__table__).values(**values)).inserted_primary_key[0]
+    else:
+        _insert_ignoring_key(session, values)
+        job_id = session.execute(select(Job.id).where(Job.idempotency_key == key)).scalar()
+    session.info[_WAKE_KEY] = True
+    return job_id
+
+
+# ---------------------------------------------------------------------------
+# 실행
+# ---------------------------------------------------------------------------
+class JobQueue:
+    """앱별 작업 실행기. create_app 에서 JobQueue(app) 1회 → app.extensions["job_queue"]."""
+
+    def __init__(self, app):
+        app.config.setdefault("JOB_WORKER_THREADS", 2)
+        app.config.setdefault("JOB_POLL_INTERVAL", 5.0)
+        app.config.setdefault("JOB_MAX_ATTEMPTS", 5)
+        app.config.setdefault("JOB_BACKOFF_BASE", 10.0)
+        app.config.setdefault("JOB_BACKOFF_MAX", 3600.0)
+        app.config.setdefault("JOB_LOCK_TIMEOUT", 1800.0)
+        self._app = app
+        self._threads = []
+        self._thread_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        app.extensions["job_queue"] = self
+        _register_for_exit(self)
+
+    def _context(self):
+        if has_app_context() and current_app._get_current_object() is self._app:
+            return nullcontext()
+        return self._app.app_context()
+
+    def _worker_id(self):
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+    def run_pending(self, limit=None):
+        """실행 시각이 된 작업을 차례로 실행. 실행한 작업 수 반환 (스크립트·테스트·워커 스레드에서 사용)."""
+        done = 0
+        with self._context():
+            worker_id = self._worker_id()
+            while limit is None or done < limit:
+                job = self._claim(worker_id)
+                if job is None:
+                    break
+                self._execute(job)
+                done += 1
+        return done
+
+    def _claim(self, worker_id):
+        """대기 중(또는 잠금 만료된 실행 중) 작업 1건을 가져옴. 다른 워커와 경쟁하면 다음 후보로."""
+        from app import db
+        from app.models.job import Job
+
+        now = _utc_now()
+        stale = now - timedelta(seconds=float(self._app.config.get("JOB_LOCK_TIMEOUT", 1800)))
+        runnable = or_(
+            and_(Job.status == "pending", Job.run_at <= now),
+            and_(Job.status == "running", Job.locked_at < stale),
+        )
+        try:
+            for _ in range(10):
+                job_id = db.session.execute(
+                    select(Job.id).where(runnable).order_by(Job.run_at, Job.id).limit(1)
+                ).scalar()
+                if job_id is None:
+                    return None
+                claimed = db.session.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == job_id, runnable)
+                    .values(status="running", locked_by=worker_id, locked_at=now, attempts=Job.__table__.c.attempts + 1)
+                ).rowcount
+                if not claimed:
+                    db.session.rollback()
+                    continue
+                row = db.session.execute(
+                    select(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts).where(Job.id == job_id)
+                ).one()
+                db.session.commit()
+                return ClaimedJob(*row)
+            return None
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _execute(self, job):
+        from app import db
+
+        handler = _HANDLERS.get(job.kind)
+        payload = json.loads(job.payload or "{}")
+        try:
+            if handler is None:
+                raise LookupError(f"등록되지 않은 작업 종류: {job.kind}")
+            handler.func(payload)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            error = f"{type(e).__name__}: {e}"
+            if handler is None or job.attempts >= job.max_attempts:
+                self._finish(job.id, "failed", error)
+                self._app.logger.error("작업 실패 #%s %s: %s", job.id, job.kind, error)
+                if handler is not None and handler.on_failure is not None:
+                    try:
+                        handler.on_failure(payload, error)
+                        db.session.commit()
+                    except Exception:
+                        db.session.rollback()
+                        self._app.logger.exception("작업 실패 처리 중 오류 #%s %s", job.id, job.kind)
+            else:
+                base = float(self._app.config.get("JOB_BACKOFF_BASE", 10.0))
+                delay = min(float(self._app.config.get("JOB_BACKOFF_MAX", 3600.0)), base * 2 ** (job.attempts - 1))
+                self._finish(job.id, "pending", error, run_at=_utc_now() + timedelta(seconds=delay))
+                self._app.logger.warning(
+                    "작업 재시도 예정 #%s %s (%d/%d, %.0f초 후): %s",
+                    job.id, job.kind, job.attempts, job.max_attempts, delay, error,
+                )
+            return False
+        self._finish(job.id, "done", None)
+        return True
+
+    def _finish(self, job_id, status, error, run_at=None):
+        from app import db
+        from app.models.job import Job
+
+        values = {"status": status, "last_error": error, "locked_by": None, "locked_at": None}
+        if run_at is not None:
+            values["run_at"] = run_at
+        if status in ("done", "failed"):
+            values["finished_at"] = _utc_now()
+        db.session.execute(update(Job.__table__).where(Job.__table__.c.id == job_id).values(**values))
+        db.session.commit()
+
+    # ----- 워커 스레드 -----
+    def wake(self):
+        """새 작업이 커밋됐을 때 호출 – 워커 스레드 시작·깨움 (JOB_WORKER_THREADS=0 이면 아무것도 안 함)."""
+        if int(self._app.config.get("JOB_WORKER_THREADS", 2)) <= 0:
+            return
+        self._ensure_threads()
+        self._wake.set()
+
+    def _ensure_threads(self):
+        count = int(self._app.config.get("JOB_WORKER_THREADS", 2))
+        with self._thread_lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._stop.clear()
+            while len(self._threads) < count:
+                t = threading.Thread(target=self._run, name=f"job-worker-{len(self._threads)}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _run(self):
+        interval = float(self._app.config.get("JOB_POLL_INTERVAL", 5.0))
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception:
+                self._app.logger.exception("작업 큐 처리 실패")
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def shutdown(self):
+        """워커 스레드 종료 (실행 중인 작업은 끝날 때까지 최대 5초 대기)."""
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout=5)
+        self._threads = []
+
+
+def get_job_queue():
+    """현재 앱의 JobQueue 반환."""
+    return current_app.extensions["job_queue"]
+
+
+def purge_jobs(db, older_than_days=7):
+    """끝난(done) 작업 중 older_than_days 일 지난 행 삭제. failed 는 확인용으로 남김. 반환: 삭제 행 수."""
+    from app.models.job import Job
+
+    cutoff = _utc_now() - timedelta(days=older_than_days)
+    removed = db.session.execute(
+        delete(Job.__table__).where(Job.__table__.c.status == "done", Job.__table__.c.finished_at < cutoff)
+    ).rowcount
+    db.session.commit()
+    return removed or 0
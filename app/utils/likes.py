@@ -0,0 +1,206 @@
+"""
+좋아요 토글·상태 – 재집계(COUNT) 없이 원자적 증감, 사용자별 좋아요 목록 캐시.
+
+- toggle_like(): 한 트랜잭션 안에서
+  1) DELETE video_likes (행이 지워졌으면 해제) → 아니면 INSERT ... ON CONFLICT DO NOTHING (삽입됐으면 추가),
+     rowcount 로 판별하므로 사전 SELECT 없음, 동시 토글·중복 클릭에도 행 수와 증감이 일치.
+  2) UPDATE videos SET likes = likes ± 1 (RETURNING 으로 새 값), 채널 total_likes 도 같은 트랜잭션에서 ± 1.
+- is_liked(): 사용자별로 좋아요한 video_id 집합을 쿼리 1번으로 읽어 앱별 메모리 캐시에
+  LIKED_CACHE_TTL 초 보관 (LRU, 최대 LIKED_CACHE_SIZE 명). 토글은 커밋된 뒤에만 캐시에 반영.
+  좋아요가 LIKED_CACHE_MAX_ITEMS 개를 넘는 사용자는 캐시하지 않고 단건 조회.
+  다른 프로세스의 변경은 TTL 이 지나야 보임 (토글 응답의 is_liked 는 항상 DB 기준).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.utils.response_cache import VIDEOS, mark_changed
+
+# 세션 info 키: 커밋 후 캐시에 반영할 (user_id, video_id, liked)
+_PENDING_KEY = "liked_cache_pending"
+_listeners_installed = False
+
+
+# ---------------------------------------------------------------------------
+# 사용자별 좋아요 목록 캐시
+# ---------------------------------------------------------------------------
+class _LikedSetCache:
+    """user_id → (좋아요한 video_id 집합, 만료 시각). 앱별 1개, 최대 max_size 명 (LRU)."""
+
+    def __init__(self, max_size=10000):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._generation = 0
+        self.max_size = max_size
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return entry[0]
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, user_id, video_ids, ttl, generation):
+        """조회 시작 후 토글이 반영됐으면(generation 변경) 저장하지 않음 – 오래된 목록 보관 방지."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._data[user_id] = (set(video_ids), time.monotonic() + ttl)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def apply(self, changes):
+        with self._lock:
+            self._generation += 1
+            for user_id, video_id, liked in changes:
+                entry = self._data.get(user_id)
+                if entry is None:
+                    continue
+                if liked:
+                    entry[0].add(video_id)
+                else:
+                    entry[0].discard(video_id)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+
+def _cache():
+    cache = current_app.extensions.get("liked_set_cache")
+    if cache is None:
+        size = int(current_app.config.get("LIKED_CACHE_SIZE", 10000))
+        cache = current_app.extensions.setdefault("liked_set_cache", _LikedSetCache(size))
+    return cache
+
+
+def clear_liked_cache():
+    """좋아요 목록 캐시 비우기 (video_likes 를 직접 SQL 로 바꿨을 때)."""
+    _cache().clear()
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and has_app_context():
+        _cache().apply(pending)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+def _liked_point_query(session, user_id, video_id):
+    from app.models.video import video_likes
+
+    return session.execute(
+        select(1).where(video_likes.c.video_id == video_id, video_likes.c.user_id == user_id)
+    ).first() is not None
+
+
+def is_liked(session, user_id, video_id):
+    """user_id 가 video_id 에 좋아요를 눌렀는지 (비로그인 None → False). 사용자별 목록 캐시 사용."""
+    from app.models.video import video_likes
+
+    if not user_id:
+        return False
+    ttl = float(current_app.config.get("LIKED_CACHE_TTL", 300))
+    if ttl <= 0:
+        return _liked_point_query(session, user_id, video_id)
+    cache = _cache()
+    liked = cache.get(user_id)
+    if liked is None:
+        max_items = int(current_app.config.get("LIKED_CACHE_MAX_ITEMS", 5000))
+        generation = cache.generation()
+        rows = session.execute(
+            select(video_likes.c.video_id).where(video_likes.c.user_id == user_id).limit(max_items + 1)
+        ).scalars().all()
+        if len(rows) > max_items:
+            return _liked_point_query(session, user_id, video_id)
+        liked = set(rows)
+        cache.set(user_id, liked, ttl, generation)
+    return video_id in liked
+
+
+# ---------------------------------------------------------------------------
+# 토글
+# ---------------------------------------------------------------------------
+def insert_ignore(session, table):
+    """기본 키 중복 행은 무시하는 INSERT 문 (video_likes·comment_likes 등 중간 테이블 토글용)."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        return insert(table).prefix_with("IGNORE") if dialect in ("mysql", "mariadb") else insert(table)
+    return upsert(table).on_conflict_do_nothing()
+
+
+def toggle_like(session, video, user_id, commit=True):
+    """
+    video 에 대한 user_id 의 좋아요 토글. 반환: (is_liked, likes_count).
+    likes_count 는 갱신 직후 videos.likes 값 (COUNT 재집계 없음).
+    """
+    from app.models import Video
+    from app.models.video import video_likes
+    from app.utils.channel_stats import bump
+
+    _install_listeners()
+    video_id, owner_id = video.id, video.user_id
+    removed = session.execute(
+        delete(video_likes).where(video_likes.c.video_id == video_id, video_likes.c.user_id == user_id)
+    ).rowcount
+    if removed:
+        liked, delta = False, -1
+    else:
+        inserted = session.execute(
+            insert_ignore(session, video_likes).values(video_id=video_id, user_id=user_id)
+        ).rowcount
+        # 0 이면 같은 사용자의 동시 요청이 먼저 추가한 것 – 상태는 '좋아요', 증감 없음
+        liked, delta = True, (1 if inserted else 0)
+
+    stmt = update(Video.__table__).where(Video.__table__.c.id == video_id)
+    if delta and session.get_bind().dialect.update_returning:
+        count = session.execute(
+            stmt.values(likes=Video.__table__.c.likes + delta).returning(Video.__table__.c.likes)
+        ).scalar()
+    else:
+        if delta:
+            session.execute(stmt.values(likes=Video.__table__.c.likes + delta))
+        count = session.execute(select(Video.__table__.c.likes).where(Video.__table__.c.id == video_id)).scalar()
+    if delta:
+        # Core UPDATE 라 Video after_update 이벤트가 없으므로 채널 통계 직접 증감
+        bump(session, owner_id, total_likes=delta)
+    # 세션에 로드된 video 의 likes 는 다음 접근 시 다시 조회
+    session.expire(video, ["likes"])
+
+    session.info.setdefault(_PENDING_KEY, []).append((user_id, video_id, liked))
+    if delta:
+        mark_changed(session, VIDEOS)
+    if commit:
+        session.commit()
+    return liked, int(count or 0)
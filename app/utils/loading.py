@@ -0,0 +1,57 @@
+"""
+관계 로딩 전략 – 화면(뷰)별로 함께 읽을 관계를 한 곳에서 정의.
+
+- 컬렉션(Video.tags): selectinload – 페이지 조회 뒤 IN 쿼리 1번. joinedload 처럼 행이 태그 수만큼 늘지 않아
+  LIMIT/OFFSET·keyset 쿼리가 서브쿼리로 감싸지지 않고 중복 제거도 필요 없음.
+- 다대일(Video.user, Comment.user, Comment.video): joinedload – 같은 SELECT 에 LEFT OUTER JOIN (행 수 그대로).
+- LOADER_RAISE(None 이면 DEBUG 일 때만)가 켜져 있으면 raiseload("*", sql_only=True) 추가
+  → 여기서 정하지 않은 관계를 템플릿 등에서 읽어 SQL 이 나가면 바로 예외 (N+1 조기 발견).
+  식별 맵에 이미 있는 객체로 해결되는 다대일 접근, 커밋으로 만료된 뒤 다시 읽는 경우는 예외 없음.
+"""
+
+from flask import current_app, has_app_context
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+_view_loaders = None
+
+
+def _build_view_loaders():
+    from app.models import Comment, Video
+
+    user = joinedload(Video.user)
+    tags = selectinload(Video.tags)
+    return {
+        # 홈 카드 목록: 채널명 + 태그
+        "video_cards": (user, tags),
+        # 검색·태그 페이지·구독 피드·관리자 목록: 채널명
+        "video_list": (user,),
+        # 채널(프로필) 페이지: 비디오 컬럼만 (채널 정보는 이미 있음)
+        "channel_videos": (),
+        # API 상세·관련 동영상: 채널 + 태그
+        "video_detail": (user, tags),
+        # watch 관련 동영상: 채널명
+        "related": (user,),
+        # 댓글·답글: 작성자
+        "comments": (joinedload(Comment.user),),
+        # 관리자 댓글 목록: 작성자 + 비디오 제목
+        "admin_comments": (joinedload(Comment.user), joinedload(Comment.video)),
+    }
+
+
+def raise_on_lazy_load():
+    """LOADER_RAISE 설정값 (None 이면 app.debug). 앱 컨텍스트 밖에서는 False."""
+    if not has_app_context():
+        return False
+    value = current_app.config.get("LOADER_RAISE")
+    return current_app.debug if value is None else bool(value)
+
+
+def loader_options(view):
+    """뷰 이름 → Query.options() 에 넘길 로더 옵션 튜플. 모르는 이름은 KeyError."""
+    global _view_loaders
+    if _view_loaders is None:
+        _view_loaders = _build_view_loaders()
+    options = _view_loaders[view]
+    if raise_on_lazy_load():
+        options = options + (raiseload("*", sql_only=True),)
+    return options
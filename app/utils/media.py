@@ -0,0 +1,107 @@
+"""
+업로드 미디어 서빙 – Range(206 Partial Content)·강한 ETag·장기 캐시·프록시 오프로드.
+
+- serve_media(kind, filename): /media/videos|thumbnails|profiles/<파일명> 응답 (main.media_* 라우트).
+- ETag: 파일 크기 + 수정 시각(ns) (stat 1번, 내용 해시 없음) → 강한 ETag, Last-Modified 함께.
+  If-None-Match / If-Modified-Since 일치 시 304.
+- 캐시: _save_upload_file 이 만드는 uuid hex 파일명(32자 + 확장자)은 내용이 바뀌지 않으므로
+  Cache-Control: public, max-age=MEDIA_IMMUTABLE_MAX_AGE(1년), immutable. 그 외(프로필 이미지 등)는 MEDIA_MAX_AGE 초.
+  변형(/media/variants/...)은 URL 이 원본 파일명 기준이므로 원본 파일명으로 판단 (serve_media 의 immutable 인자).
+- Range: bytes=a-b / a- / -n 단일 범위 → 206 + Content-Range, 범위가 파일 밖이면 416,
+  If-Range 가 현재 ETag 와 다르면 전체 200. 여러 범위 요청은 전체 200 (RFC 9110 허용).
+  본문은 wsgi.file_wrapper 로 넘겨 gunicorn 등에서는 sendfile 로 전송.
+- MEDIA_OFFLOAD (앞단 프록시가 파일 전송):
+  "x-accel"    → X-Accel-Redirect: MEDIA_ACCEL_PREFIX/<종류>/<파일명> (nginx internal location)
+  "x-sendfile" → X-Sendfile: 절대 경로 (Apache mod_xsendfile, lighttpd)
+  조건부 요청(304)만 앱에서 처리하고 본문·Range 는 프록시가 처리 → 큰 파일도 워커를 붙잡지 않음.
+"""
+
+import mimetypes
+import os
+import re
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+from flask import abort, current_app, request, send_file
+from werkzeug.security import safe_join
+
+# 종류 → 저장 폴더 설정 키
+MEDIA_FOLDERS = {
+    "videos": "VIDEO_FOLDER",
+    "thumbnails": "THUMBNAIL_FOLDER",
+    "profiles": "PROFILE_IMAGE_FOLDER",
+    "variants": "THUMBNAIL_VARIANT_FOLDER",  # 썸네일 축소본 (app/utils/thumbnails.py)
+}
+
+# uuid4().hex + 확장자 (변형은 내용 해시_너비 + 확장자) – 같은 이름으로 다른 내용이 저장되지 않는 파일
+_IMMUTABLE_NAME = re.compile(r"^[0-9a-f]{32}(?:_[a-z0-9]+)?\.[A-Za-z0-9]+$")
+
+
+def is_immutable_name(filename):
+    """업로드 시 생성한 고유 파일명인지 (장기 캐시 가능 여부)."""
+    return bool(_IMMUTABLE_NAME.match(os.path.basename(filename)))
+
+
+def file_etag(st):
+    """os.stat 결과 → ETag 값 (따옴표 제외)."""
+    return f"{st.st_size:x}-{st.st_mtime_ns:x}"
+
+
+def _apply_cache_headers(resp, filename, immutable=None):
+    config = current_app.config
+    if immutable is None:
+        immutable = is_immutable_name(filename)
+    if immutable:
+        resp.cache_control.max_age = int(config.get("MEDIA_IMMUTABLE_MAX_AGE", 31536000))
+        resp.cache_control.immutable = True
+    else:
+        resp.cache_control.max_age = int(config.get("MEDIA_MAX_AGE", 3600))
+    resp.cache_control.public = True
+
+
+def _offload_response(mode, kind, filename, path, st, etag, immutable=None):
+    """프록시 오프로드 응답 (본문 없음). 조건부 요청이면 304."""
+    resp = current_app.response_class(mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+    resp.set_etag(etag)
+    resp.last_modified = datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+    _apply_cache_headers(resp, filename, immutable)
+    resp = resp.make_conditional(request)
+    if resp.status_code == 304:
+        return resp
+    if mode == "x-accel":
+        prefix = current_app.config.get("MEDIA_ACCEL_PREFIX", "/_protected_media").rstrip("/")
+        resp.headers["X-Accel-Redirect"] = f"{prefix}/{kind}/{quote(filename)}"
+    else:
+        resp.headers["X-Sendfile"] = path
+    # 길이·Range 는 프록시가 실제 파일 기준으로 처리
+    resp.headers.pop("Content-Length", None)
+    return resp
+
+
+def serve_media(kind, filename, immutable=None):
+    """
+    업로드 폴더의 파일 응답 (Range·ETag·캐시·오프로드). 없거나 폴더 밖 경로면 404.
+    immutable: 장기 캐시 여부 (None 이면 filename 으로 판단).
+    """
+    directory = current_app.config[MEDIA_FOLDERS[kind]]
+    path = safe_join(directory, filename)
+    if path is None:
+        abort(404)
+    try:
+        st = os.stat(path)
+    except OSError:
+        abort(404)
+    if not os.path.isfile(path):
+        abort(404)
+    etag = file_etag(st)
+
+    mode = (current_app.config.get("MEDIA_OFFLOAD") or "").strip().lower()
+    if mode in ("x-accel", "x-sendfile"):
+        return _offload_response(mode, kind, filename, os.path.abspath(path), st, etag, immutable)
+
+    # send_file: make_conditional 로 304·206·416·If-Range 처리, 본문은 wsgi.file_wrapper
+    resp = send_file(path, etag=etag, last_modified=st.st_mtime, conditional=True)
+    # werkzeug 는 Range 요청에만 Accept-Ranges 를 붙임 → 첫 전체 응답에도 알려 플레이어가 탐색 시 Range 사용
+    resp.headers.setdefault("Accept-Ranges", "bytes")
+    _apply_cache_headers(resp, filename, immutable)
+    return resp
@@ -0,0 +1,237 @@
+"""
+업로드 후처리 – faststart·Cloudinary 업로드·삭제 작업 (app/utils/jobs.py 작업 큐에서 실행).
+
+- faststart: moov 가 파일 끝에 있는 MP4/MOV 는 요청에서 status = "processing" 으로 바로 응답하고, 작업이
+  새 uuid 파일명으로 다시 써서 video_path·faststart 를 바꿈 (app/utils/faststart.py relocate_stored_video).
+  끝나면(옮길 수 없는 파일·최종 실패도) Cloudinary 사용 시 업로드 작업 등록, 아니면 status = "ready".
+
+- 업로드: 요청에서는 파일을 로컬 업로드 폴더에 저장하고 Video.status = "processing" 으로 바로 응답.
+  작업이 Cloudinary에 올린 뒤 video_url 등을 채우고 로컬 파일 삭제, status = "ready".
+  처리 중에도 로컬 파일로 재생 가능. 최종 실패 시 status = "failed" (로컬 파일 유지).
+  public_id 는 로컬 파일명으로 고정 → 재시도해도 같은 리소스를 덮어씀.
+- 프로필 이미지도 같은 방식 (로컬 파일명 → 업로드 후 secure_url 로 교체).
+- 삭제: 원격 리소스 삭제를 DB 변경과 같은 트랜잭션에 작업으로 등록 → 실패해도 재시도, 유실 없음.
+- 업로드가 끝나기 전에 비디오·프로필 이미지가 바뀌거나 삭제됐으면, 방금 올린 리소스도 삭제 작업으로 정리.
+"""
+
+import os
+
+from flask import current_app
+from sqlalchemy import update
+
+from app.utils.jobs import enqueue, job_handler
+from app.utils.response_cache import VIDEOS, mark_changed
+
+VIDEO_FOLDER_REMOTE = "wetube/videos"
+THUMBNAIL_FOLDER_REMOTE = "wetube/thumbnails"
+PROFILE_FOLDER_REMOTE = "wetube/profiles"
+
+
+def _remove_local(folder_key, filename):
+    if not filename:
+        return
+    try:
+        os.remove(os.path.join(current_app.config[folder_key], filename))
+    except OSError:
+        pass
+
+
+def _stem(filename):
+    return os.path.splitext(filename)[0]
+
+
+# ---------------------------------------------------------------------------
+# 등록 (요청 처리 중, 커밋 전에 호출)
+# ---------------------------------------------------------------------------
+def enqueue_destroy(session, public_id, resource_type):
+    """Cloudinary 리소스 삭제 작업 등록 (public_id 가 없으면 무시)."""
+    if not public_id:
+        return None
+    return enqueue(
+        session,
+        "cloudinary.destroy",
+        {"public_id": public_id, "resource_type": resource_type},
+        key=f"destroy:{resource_type}:{public_id}",
+    )
+
+
+def enqueue_video_upload(session, video):
+    """로컬에 저장된 비디오(·썸네일) 파일의 Cloudinary 업로드 작업 등록. video.id 가 있어야 함."""
+    return enqueue(
+        session,
+        "cloudinary.upload_video",
+        {"video_id": video.id, "video_file": video.video_path, "thumbnail_file": video.thumbnail_path},
+        key=f"upload_video:{video.id}",
+    )
+
+
+def enqueue_video_faststart(session, video, upload=False):
+    """moov 를 앞으로 옮기는 작업 등록. upload=True 면 끝난 뒤 Cloudinary 업로드 작업으로 이어짐."""
+    return enqueue(
+        session,
+        "video.faststart",
+        {"video_id": video.id, "video_file": video.video_path, "upload": bool(upload)},
+        key=f"faststart:{video.id}",
+    )
+
+
+def enqueue_profile_upload(session, user, filename):
+    """로컬에 저장된 프로필 이미지의 Cloudinary 업로드 작업 등록."""
+    return enqueue(
+        session,
+        "cloudinary.upload_profile",
+        {"user_id": user.id, "file": filename},
+        key=f"upload_profile:{user.id}:{filename}",
+    )
+
+
+# ---------------------------------------------------------------------------
+# 작업 처리
+# ---------------------------------------------------------------------------
+def _faststart_done(payload):
+    """faststart 다음 단계: Cloudinary 업로드 작업 등록 또는 status = "ready" (커밋은 작업 큐가)."""
+    from app import db
+    from app.models import Video
+
+    video = db.session.get(Video, payload["video_id"])
+    if video is None:
+        return
+    if payload.get("upload"):
+        enqueue_video_upload(db.session, video)
+    else:
+        table = Video.__table__
+        db.session.execute(
+            update(table).where(table.c.id == video.id, table.c.status == "processing").values(status="ready")
+        )
+
+
+def _faststart_failed(payload, error):
+    # 원본 파일은 그대로라 재생 가능 → 다음 단계는 그대로 진행
+    _faststart_done(payload)
+
+
+@job_handler("video.faststart", on_failure=_faststart_failed)
+def _faststart(payload):
+    from app import db
+    from app.models import Video
+    from app.utils.faststart import relocate_stored_video
+    from app.utils.media_probe import ProbeError
+
+    video = db.session.get(Video, payload["video_id"])
+    if video is None:
+        return
+    # 재시도 시 이미 새 파일명으로 바뀌었으면 옮기기는 건너뜀
+    if video.video_path == payload["video_file"]:
+        try:
+            relocate_stored_video(db, current_app.config["VIDEO_FOLDER"], payload["video_file"])
+        except ProbeError:
+            # 옮길 수 없는 파일(조각 MP4·큰 moov 등) → 그대로 둠. OSError 는 재시도
+            pass
+    _faststart_done(payload)
+
+
+@job_handler("cloudinary.destroy")
+def _destroy(payload):
+    from app.utils.cloudinary_upload import destroy_resource
+
+    destroy_resource(payload["public_id"], payload.get("resource_type", "video"))
+
+
+def _upload_video_failed(payload, error):
+    from app import db
+    from app.models import Video
+
+    db.session.execute(
+        update(Video.__table__)
+        .where(Video.__table__.c.id == payload["video_id"], Video.__table__.c.status == "processing")
+        .values(status="failed")
+    )
+
+
+@job_handler("cloudinary.upload_video", on_failure=_upload_video_failed)
+def _upload_video(payload):
+    from app import db
+    from app.models import Video
+    from app.utils.cloudinary_upload import upload_file
+
+    table = Video.__table__
+    video_id = payload["video_id"]
+    video_file = payload.get("video_file")
+    thumbnail_file = payload.get("thumbnail_file")
+    video = db.session.get(Video, video_id)
+    if video is None:
+        # 처리 전에 삭제됨 → 남은 로컬 파일만 정리
+        _remove_local("VIDEO_FOLDER", video_file)
+        _remove_local("THUMBNAIL_FOLDER", thumbnail_file)
+        return
+
+    # 단계별로 커밋 → 재시도 시 끝난 단계는 건너뜀
+    if video_file and not video.video_public_id:
+        path = os.path.join(current_app.config["VIDEO_FOLDER"], video_file)
+        result = upload_file(path, "video", VIDEO_FOLDER_REMOTE, public_id=_stem(video_file))
+        public_id = result.get("public_id")
+        saved = db.session.execute(
+            update(table)
+            .where(table.c.id == video_id, table.c.video_public_id.is_(None))
+            .values(video_url=result.get("secure_url"), video_public_id=public_id, video_path=public_id)
+        ).rowcount
+        if not saved:
+            enqueue_destroy(db.session, public_id, "video")
+            db.session.commit()
+            _remove_local("VIDEO_FOLDER", video_file)
+            _remove_local("THUMBNAIL_FOLDER", thumbnail_file)
+            return
+        # Core UPDATE 라 Video 이벤트가 없으므로 목록 응답 캐시는 직접 무효화
+        mark_changed(db.session, VIDEOS)
+        db.session.commit()
+        _remove_local("VIDEO_FOLDER", video_file)
+        db.session.expire(video)
+
+    if thumbnail_file and not video.thumbnail_public_id:
+        path = os.path.join(current_app.config["THUMBNAIL_FOLDER"], thumbnail_file)
+        result = upload_file(path, "image", THUMBNAIL_FOLDER_REMOTE, public_id=_stem(thumbnail_file))
+        public_id = result.get("public_id")
+        saved = db.session.execute(
+            update(table)
+            .where(table.c.id == video_id, table.c.thumbnail_public_id.is_(None))
+            .values(thumbnail_url=result.get("secure_url"), thumbnail_public_id=public_id, thumbnail_path=public_id)
+        ).rowcount
+        if saved:
+            mark_changed(db.session, VIDEOS)
+        else:
+            enqueue_destroy(db.session, public_id, "image")
+        db.session.commit()
+        _remove_local("THUMBNAIL_FOLDER", thumbnail_file)
+
+    db.session.execute(update(table).where(table.c.id == video_id).values(status="ready"))
+
+
+@job_handler("cloudinary.upload_profile")
+def _upload_profile(payload):
+    from app import db
+    from app.models import User
+    from app.utils.cloudinary_upload import upload_file
+    from app.utils.request_cache import invalidate_user
+
+    table = User.__table__
+    filename = payload["file"]
+    user = db.session.get(User, payload["user_id"])
+    if user is None or user.profile_image != filename:
+        # 그 사이 다른 이미지로 바뀌었거나 탈퇴 → 로컬 파일만 정리
+        _remove_local("PROFILE_IMAGE_FOLDER", filename)
+        return
+    path = os.path.join(current_app.config["PROFILE_IMAGE_FOLDER"], filename)
+    result = upload_file(path, "image", PROFILE_FOLDER_REMOTE, public_id=f"u{user.id}_{_stem(filename)}")
+    public_id = result.get("public_id")
+    saved = db.session.execute(
+        update(table)
+        .where(table.c.id == user.id, table.c.profile_image == filename)
+        .values(profile_image=result.get("secure_url"), profile_image_public_id=public_id)
+    ).rowcount
+    if saved:
+        # Core UPDATE 라 User 이벤트가 없으므로 사용자 캐시 항목은 직접 무효화
+        invalidate_user(db.session, user.id)
+    else:
+        enqueue_destroy(db.session, public_id, "image")
+    db.session.commit()
+    _remove_local("PROFILE_IMAGE_FOLDER", filename)
@@ -0,0 +1,443 @@
+"""
+동영상 메타데이터 추출 – MP4/MOV(ISO BMFF box)·WebM/MKV(EBML) 헤더를 순수 파이썬으로 파싱.
+
+- probe(path) → MediaInfo (재생 시간(초)·해상도·코덱·비트레이트). ffprobe 등 외부 프로그램 없음.
+- 파일 전체를 읽지 않음: MP4 는 최상위 box 헤더를 seek 로 건너뛰며 moov 를 찾고, moov 안에서도
+  mvhd·tkhd·mdhd·hdlr·stsd 등 필요한 box 만 읽음 (stts·stsz·stco 같은 큰 표·mdat 본문은 건너뜀).
+  WebM 은 Segment 의 Info·Tracks 만 읽고 Cluster(본문)를 만나면 중단.
+- 업로드 시 app/routes/studio.py 에서 호출, 기존 파일은 scripts/probe_videos.py 로 일괄 채움 (프로세스 풀).
+- 지원하지 않는 형식·손상된 파일은 ProbeError.
+"""
+
+import os
+import struct
+from collections import namedtuple
+from io import BytesIO
+
+MediaInfo = namedtuple(
+    "MediaInfo",
+    [
+        "container",    # "mp4" | "mov" | "webm" | "matroska"
+        "duration",     # 재생 시간(초, float) 또는 None
+        "width",
+        "height",
+        "video_codec",  # 예: "h264", "hevc", "vp9", "av1"
+        "audio_codec",  # 예: "aac", "opus"
+        "bitrate",      # 전체 평균 비트레이트(bps) = 파일 크기 × 8 / 재생 시간
+        "faststart",    # MP4: moov 가 mdat 앞에 있으면 True (바로 재생 가능). WebM 은 None
+    ],
+)
+
+
+class ProbeError(ValueError):
+    """지원하지 않는 형식이거나 헤더가 손상된 파일."""
+
+
+# 읽어서 파싱하는 box/element 크기 상한 (이보다 크면 손상된 파일로 간주)
+_MAX_LEAF_SIZE = 1024 * 1024
+
+# 코덱 식별자 → 표시 이름
+_MP4_CODECS = {
+    "avc1": "h264", "avc3": "h264", "hvc1": "hevc", "hev1": "hevc", "av01": "av1", "vp09": "vp9",
+    "vp08": "vp8", "mp4v": "mpeg4", "mp4a": "aac", "opus": "opus", "Opus": "opus", "ac-3": "ac3",
+    "ec-3": "eac3", "fLaC": "flac", ".mp3": "mp3", "alac": "alac",
+}
+_MKV_CODECS = {
+    "V_MPEG4/ISO/AVC": "h264", "V_MPEGH/ISO/HEVC": "hevc", "V_VP8": "vp8", "V_VP9": "vp9", "V_AV1": "av1",
+    "A_OPUS": "opus", "A_VORBIS": "vorbis", "A_AAC": "aac", "A_MPEG/L3": "mp3", "A_FLAC": "flac", "A_AC3": "ac3",
+}
+
+
+def _codec_name(table, raw):
+    if not raw:
+        return None
+    return table.get(raw) or raw.strip().lower()
+
+
+# ---------------------------------------------------------------------------
+# MP4 / MOV (ISO BMFF)
+# ---------------------------------------------------------------------------
+def read_box_header(f, offset, end):
+    """offset 위치 box 헤더 → (type, 헤더 크기, 전체 크기). 남은 바이트가 헤더보다 작으면 None."""
+    f.seek(offset)
+    header = f.read(8)
+    if len(header) < 8:
+        return None
+    size, box_type = struct.unpack(">I4s", header)
+    header_size = 8
+    if size == 1:
+        large = f.read(8)
+        if len(large) < 8:
+            return None
+        size = struct.unpack(">Q", large)[0]
+        header_size = 16
+    elif size == 0:  # 파일 끝까지
+        size = end - offset
+    if size < header_size or offset + size > end:
+        raise ProbeError(f"잘못된 box 크기: {box_type!r} @ {offset}")
+    return box_type, header_size, size
+
+
+def iter_boxes(f, start, end):
+    """[start, end) 구간의 box 를 순서대로 (type, 시작 위치, 헤더 크기, 전체 크기) 로. 본문은 읽지 않음."""
+    offset = start
+    while offset + 8 <= end:
+        header = read_box_header(f, offset, end)
+        if header is None:
+            break
+        box_type, header_size, size = header
+        yield box_type, offset, header_size, size
+        offset += size
+
+
+def _read_payload(f, offset, header_size, size):
+    if size - header_size > _MAX_LEAF_SIZE:
+        raise ProbeError("box 가 너무 큼")
+    f.seek(offset + header_size)
+    return f.read(size - header_size)
+
+
+def _full_box_times(payload):
+    """mvhd·mdhd 공통: (timescale, duration). version 0 은 32비트, 1 은 64비트 시각."""
+    if not payload:
+        return None, None
+    if payload[0] == 1:
+        timescale, duration = struct.unpack_from(">IQ", payload, 4 + 16)
+    else:
+        timescale, duration = struct.unpack_from(">II", payload, 4 + 8)
+    return timescale, duration
+
+
+def _tkhd_size(payload):
+    """tkhd 의 표시 크기 (width, height). 16.16 고정소수점."""
+    base = 4 + (32 if payload[0] == 1 else 20) + 52
+    if len(payload) < base + 8:
+        return None, None
+    width, height = struct.unpack_from(">II", payload, base)
+    return width >> 16, height >> 16
+
+
+def _parse_track(f, start, end):
+    """trak box → dict(handler, timescale, duration, codec, width, height)."""
+    track = {}
+    stack = [(start, end)]
+    while stack:
+        lo, hi = stack.pop()
+        for box_type, offset, header_size, size in iter_boxes(f, lo, hi):
+            if box_type in (b"mdia", b"minf", b"stbl"):
+                stack.append((offset + header_size, offset + size))
+            elif box_type == b"tkhd":
+                track["width"], track["height"] = _tkhd_size(_read_payload(f, offset, header_size, size))
+            elif box_type == b"mdhd":
+                track["timescale"], track["duration"] = _full_box_times(_read_payload(f, offset, header_size, size))
+            elif box_type == b"hdlr":
+                payload = _read_payload(f, offset, header_size, size)
+                track["handler"] = payload[8:12].decode("latin-1")
+            elif box_type == b"stsd":
+                payload = _read_payload(f, offset, header_size, size)
+                if len(payload) >= 16:
+                    track["codec"] = payload[12:16].decode("latin-1")
+                    # VisualSampleEntry: 헤더 8 + 예약 8 + 예약 16 바이트 뒤 width, height (16비트)
+                    if len(payload) >= 8 + 36:
+                        track["sample_size"] = struct.unpack_from(">HH", payload, 8 + 32)
+    return track
+
+
+def _probe_mp4(f, file_size):
+    moov = None
+    mdat_offset = None
+    major_brand = None
+    for box_type, offset, header_size, size in iter_boxes(f, 0, file_size):
+        if box_type == b"ftyp":
+            major_brand = _read_payload(f, offset, header_size, size)[:4]
+        elif box_type == b"moov":
+            moov = (offset, header_size, size)
+        elif box_type == b"mdat" and mdat_offset is None:
+            mdat_offset = offset
+    if moov is None:
+        raise ProbeError("moov box 없음")
+    offset, header_size, size = moov
+
+    duration = None
+    tracks = []
+    for box_type, child, child_header, child_size in iter_boxes(f, offset + header_size, offset + size):
+        if box_type == b"mvhd":
+            timescale, length = _full_box_times(_read_payload(f, child, child_header, child_size))
+            if timescale and length and length not in (0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+                duration = length / timescale
+        elif box_type == b"trak":
+            tracks.append(_parse_track(f, child + child_header, child + child_size))
+
+    video = next((t for t in tracks if t.get("handler") == "vide"), {})
+    audio = next((t for t in tracks if t.get("handler") == "soun"), {})
+    if not duration:
+        # mvhd 에 길이가 없으면 (조각 MP4 등) 가장 긴 트랙 길이
+        lengths = [t["duration"] / t["timescale"] for t in tracks if t.get("timescale") and t.get("duration")]
+        duration = max(lengths) if lengths else None
+    width, height = video.get("width"), video.get("height")
+    if not width and video.get("sample_size"):
+        width, height = video["sample_size"]
+    return MediaInfo(
+        container="mov" if major_brand == b"qt  " else "mp4",
+        duration=duration,
+        width=width or None,
+        height=height or None,
+        video_codec=_codec_name(_MP4_CODECS, video.get("codec")),
+        audio_codec=_codec_name(_MP4_CODECS, audio.get("codec")),
+        bitrate=int(file_size * 8 / duration) if duration else None,
+        faststart=mdat_offset is None or offset < mdat_offset,
+    )
+
+
+# ---------------------------------------------------------------------------
+# WebM / Matroska (EBML)
+# ---------------------------------------------------------------------------
+_EBML = 0x1A45DFA3
+_DOC_TYPE = 0x4282
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_TIMECODE_SCALE = 0x2AD7B1
+_DURATION = 0x4489
+_TRACKS = 0x1654AE6B
+_TRACK_ENTRY = 0xAE
+_TRACK_TYPE = 0x83
+_CODEC_ID = 0x86
+_VIDEO = 0xE0
+_PIXEL_WIDTH = 0xB0
+_PIXEL_HEIGHT = 0xBA
+_CLUSTER = 0x1F43B675
+
+
+def _read_vint(f, keep_marker):
+    """EBML 가변 길이 정수 → (값, 바이트 수, 크기 미정 여부). 요소 ID 는 marker 비트 포함."""
+    first = f.read(1)
+    if not first:
+        raise EOFError
+    b = first[0]
+    length, mask = 1, 0x80
+    while length <= 8 and not b & mask:
+        length += 1
+        mask >>= 1
+    if length > 8:
+        raise ProbeError("잘못된 EBML 정수")
+    rest = f.read(length - 1)
+    if len(rest) < length - 1:
+        raise EOFError
+    value = b if keep_marker else b & (mask - 1)
+    for x in rest:
+        value = (value << 8) | x
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, length, unknown
+
+
+def _iter_elements(f, start, end):
+    """[start, end) 의 EBML 요소를 (ID, 본문 시작, 본문 크기 또는 None(미정)) 으로. 본문은 읽지 않음."""
+    pos = start
+    while end is None or pos < end:
+        f.seek(pos)
+        try:
+            element_id, id_len, _ = _read_vint(f, keep_marker=True)
+            size, size_len, unknown = _read_vint(f, keep_marker=False)
+        except EOFError:
+            return
+        data_start = pos + id_len + size_len
+        yield element_id, data_start, None if unknown else size
+        if unknown:
+            return
+        pos = data_start + size
+
+
+def _read_element(f, data_start, size):
+    if size is None or size > _MAX_LEAF_SIZE:
+        raise ProbeError("EBML 요소가 너무 큼")
+    f.seek(data_start)
+    return f.read(size)
+
+
+def _uint(data):
+    return int.from_bytes(data, "big") if data else 0
+
+
+def _float(data):
+    if len(data) == 4:
+        return struct.unpack(">f", data)[0]
+    if len(data) == 8:
+        return struct.unpack(">d", data)[0]
+    return None
+
+
+def _probe_matroska(f, file_size):
+    doc_type = "matroska"
+    segment = None
+    for element_id, data_start, size in _iter_elements(f, 0, file_size):
+        if element_id == _EBML:
+            header = BytesIO(_read_element(f, data_start, size))
+            for child_id, child_start, child_size in _iter_elements(header, 0, size):
+                if child_id == _DOC_TYPE:
+                    doc_type = _read_element(header, child_start, child_size).decode("ascii", "replace").strip("\0")
+        elif element_id == _SEGMENT:
+            segment = (data_start, file_size if size is None else min(file_size, data_start + size))
+            break
+    if segment is None:
+        raise ProbeError("Segment 요소 없음")
+
+    timecode_scale, raw_duration = 1_000_000, None
+    tracks = []
+    seen_info = seen_tracks = False
+    for element_id, data_start, size in _iter_elements(f, *segment):
+        if element_id == _INFO:
+            info = BytesIO(_read_element(f, data_start, size))
+            for child_id, child_start, child_size in _iter_elements(info, 0, size):
+                if child_id == _TIMECODE_SCALE:
+                    timecode_scale = _uint(_read_element(info, child_start, child_size)) or timecode_scale
+                elif child_id == _DURATION:
+                    raw_duration = _float(_read_element(info, child_start, child_size))
+            seen_info = True
+        elif element_id == _TRACKS:
+            block = BytesIO(_read_element(f, data_start, size))
+            for entry_id, entry_start, entry_size in _iter_elements(block, 0, size):
+                if entry_id != _TRACK_ENTRY:
+                    continue
+                track = {}
+                for child_id, child_start, child_size in _iter_elements(block, entry_start, entry_start + entry_size):
+                    if child_id == _TRACK_TYPE:
+                        track["type"] = _uint(_read_element(block, child_start, child_size))
+                    elif child_id == _CODEC_ID:
+                        track["codec"] = _read_element(block, child_start, child_size).decode("ascii", "replace")
+                    elif child_id == _VIDEO:
+                        for v_id, v_start, v_size in _iter_elements(block, child_start, child_start + child_size):
+                            if v_id == _PIXEL_WIDTH:
+                                track["width"] = _uint(_read_element(block, v_start, v_size))
+                            elif v_id == _PIXEL_HEIGHT:
+                                track["height"] = _uint(_read_element(block, v_start, v_size))
+                tracks.append(track)
+            seen_tracks = True
+        elif element_id == _CLUSTER:
+            break  # 본문 시작 – Info·Tracks 는 보통 그 앞에 있음
+        if seen_info and seen_tracks:
+            break
+
+    if not seen_info and not seen_tracks:
+        raise ProbeError("Info·Tracks 요소 없음")
+    video = next((t for t in tracks if t.get("type") == 1), {})
+    audio = next((t for t in tracks if t.get("type") == 2), {})
+    duration = raw_duration * timecode_scale / 1e9 if raw_duration else None
+    return MediaInfo(
+        container="webm" if doc_type == "webm" else "matroska",
+        duration=duration,
+        width=video.get("width"),
+        height=video.get("height"),
+        video_codec=_codec_name(_MKV_CODECS, video.get("codec")),
+        audio_codec=_codec_name(_MKV_CODECS, audio.get("codec")),
+        bitrate=int(file_size * 8 / duration) if duration else None,
+        faststart=None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# 공개 API
+# ---------------------------------------------------------------------------
+def probe(path):
+    """동영상 파일 메타데이터 → MediaInfo. 지원하지 않거나 손상된 파일이면 ProbeError."""
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(12)
+        try:
+            if head[:4] == _EBML.to_bytes(4, "big"):
+                return _probe_matroska(f, file_size)
+            if len(head) >= 8 and head[4:8] in (b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide"):
+                return _probe_mp4(f, file_size)
+        except (struct.error, IndexError) as e:
+            raise ProbeError(f"헤더 손상: {e}") from e
+    raise ProbeError("지원하지 않는 동영상 형식")
+
+
+def apply_media_info(video, info):
+    """MediaInfo 를 Video 컬럼에 반영 (duration 은 초 단위 반올림)."""
+    video.duration = int(round(info.duration)) if info.duration else None
+    video.width = info.width
+    video.height = info.height
+    video.video_codec = info.video_codec
+    video.audio_codec = info.audio_codec
+    video.bitrate = info.bitrate
+    video.faststart = info.faststart
+
+
+def probe_into(video, path):
+    """path 를 분석해 video 에 반영. 성공하면 MediaInfo, 분석할 수 없으면 None (업로드는 계속 진행)."""
+    try:
+        info = probe(path)
+    except (OSError, ProbeError):
+        return None
+    apply_media_info(video, info)
+    return info
+
+
+def probe_many(paths):
+    """프로세스 풀 작업 단위: [경로] → [(경로, MediaInfo 또는 None, 오류 메시지 또는 None)]."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, probe(path), None))
+        except (OSError, ProbeError) as e:
+            results.append((path, None, str(e)))
+    return results
+
+
+def backfill_media_info(db, workers=None, only_missing=True, chunk_size=16):
+    """
+    로컬 업로드 폴더(VIDEO_FOLDER)에 파일이 있는 비디오의 미디어 정보 일괄 채움 (scripts/probe_videos.py).
+    분석은 프로세스 풀(workers 개, 0 이면 현재 프로세스)에서 chunk_size 개씩, DB 반영은 현재 프로세스에서 묶어서.
+    only_missing: duration 이 비어 있는 비디오만. 반환: {"checked", "updated", "failed", "missing"}
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from flask import current_app
+    from sqlalchemy import select, update
+
+    from app.models import Video
+
+    folder = current_app.config["VIDEO_FOLDER"]
+    query = select(Video.id, Video.video_path).where(Video.video_url.is_(None))
+    if only_missing:
+        query = query.where(Video.duration.is_(None))
+    by_path = {}
+    missing = 0
+    for video_id, video_path in db.session.execute(query):
+        path = os.path.join(folder, video_path or "")
+        if video_path and os.path.isfile(path):
+            by_path.setdefault(path, []).append(video_id)
+        else:
+            missing += 1
+
+    paths = list(by_path)
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers > 0 and len(chunks) > 1:
+        methods = multiprocessing.get_all_start_methods()
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork" if "fork" in methods else None)
+        ) as pool:
+            batches = list(pool.map(probe_many, chunks))
+    else:
+        batches = [probe_many(c) for c in chunks]
+
+    table = Video.__table__
+    updated = failed = 0
+    for batch in batches:
+        for path, info, _error in batch:
+            if info is None:
+                failed += 1
+                continue
+            values = {
+                "duration": int(round(info.duration)) if info.duration else None,
+                "width": info.width, "height": info.height,
+                "video_codec": info.video_codec, "audio_codec": info.audio_codec, "bitrate": info.bitrate,
+                "faststart": info.faststart,
+            }
+            for video_id in by_path[path]:
+                db.session.execute(update(table).where(table.c.id == video_id).values(**values))
+                updated += 1
+        db.session.commit()
+    return {"checked": len(paths), "updated": updated, "failed": failed, "missing": missing}
@@ -0,0 +1,231 @@
+"""
+Keyset(cursor) 페이지네이션 – paginate() 의 COUNT(*) + OFFSET 대신 정렬 키 기준으로 다음 행을 조회.
+
+- 정렬 키: latest (created_at, id) / views (views, id) / popular (likes, views, id)
+  마지막 행의 키 값을 불투명 커서(base64 JSON)로 인코딩 → 다음 요청에서 WHERE 키 < 커서 로 이어서 조회.
+- 커서 없이 page 번호만 오면 OFFSET 으로 조회 (얕은 페이지 링크 호환). 항상 LIMIT per_page+1 로
+  다음 페이지 여부를 판단하므로 목록 조회 자체에는 COUNT(*) 가 없음.
+- 전체 개수(total/pages)는 템플릿·API 가 접근할 때만 별도로 계산하고, 앱별 TTL 캐시에 보관
+  (PAGINATION_COUNT_TTL 초, 기본 30).
+
+KeysetPage 는 Flask-SQLAlchemy Pagination 과 같은 속성(items, page, pages, total, has_next,
+has_prev, next_num, prev_num)을 제공하므로 기존 템플릿을 그대로 사용할 수 있습니다.
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import DateTime, and_, func, or_, select
+from sqlalchemy.orm import lazyload
+
+# 정렬 이름 → [(컬럼 속성명, 내림차순 여부)]. 마지막 키는 항상 id (동률 정리)
+VIDEO_SORT_KEYS = {
+    "latest": [("created_at", True), ("id", True)],
+    "views": [("views", True), ("id", True)],
+    "popular": [("likes", True), ("views", True), ("id", True)],
+}
+
+
+def sort_keys(model, sort="latest"):
+    """모델과 정렬 이름으로 [(컬럼, 내림차순 여부)] 반환. 모르는 정렬은 latest."""
+    spec = VIDEO_SORT_KEYS.get(sort) or VIDEO_SORT_KEYS["latest"]
+    return [(getattr(model, name), desc) for name, desc in spec]
+
+
+# ---------------------------------------------------------------------------
+# 커서 인코딩
+# ---------------------------------------------------------------------------
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values):
+    """정렬 키 값 목록 → 불투명 커서 문자열."""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, keys):
+    """커서 문자열 → 정렬 키 값 목록 (키 컬럼 타입에 맞게 변환). 잘못된 커서면 None."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            return None
+        result = []
+        for (col, _desc), value in zip(keys, values):
+            if value is not None and isinstance(getattr(col, "type", None), DateTime):
+                value = datetime.fromisoformat(value)
+            result.append(value)
+        return result
+    except (ValueError, TypeError, json.JSONDecodeError):
+        return None
+
+
+def _seek_condition(keys, values):
+    """(k1, k2, ...) 가 커서 값 다음인 행 조건 (사전식 비교, 키별 정렬 방향 반영)."""
+    clauses = []
+    for i, (col, desc) in enumerate(keys):
+        prefix = [keys[j][0] == values[j] for j in range(i)]
+        step = col < values[i] if desc else col > values[i]
+        clauses.append(and_(*prefix, step))
+    return or_(*clauses)
+
+
+# ---------------------------------------------------------------------------
+# 개수 캐시
+# ---------------------------------------------------------------------------
+class _CountCache:
+    """(SQL, 파라미터) → (개수, 만료 시각). 앱별 1개."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit and hit[1] > time.monotonic():
+                return hit[0]
+            return None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            if len(self._data) > 1000:
+                self._data.clear()
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _count_cache():
+    return current_app.extensions.setdefault("pagination_count_cache", _CountCache())
+
+
+def cached_count(query):
+    """
+    쿼리 결과 행 수. 같은 쿼리(SQL+파라미터)는 PAGINATION_COUNT_TTL 초 동안 캐시된 값 사용.
+    eager 로드 옵션은 제거하고 COUNT(*) 서브쿼리로 계산 (Flask-SQLAlchemy paginate 와 동일 방식).
+    """
+    from app import db
+
+    count_query = query.options(lazyload("*")).order_by(None)
+    compiled = count_query.statement.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    ttl = float(current_app.config.get("PAGINATION_COUNT_TTL", 30))
+    cache = _count_cache()
+    if ttl > 0:
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+    total = db.session.execute(select(func.count()).select_from(count_query.subquery())).scalar() or 0
+    if ttl > 0:
+        cache.set(key, total, ttl)
+    return total
+
+
+def clear_count_cache():
+    """개수 캐시 비우기 (대량 변경 후 즉시 반영이 필요할 때)."""
+    _count_cache().clear()
+
+
+# ---------------------------------------------------------------------------
+# 페이지
+# ---------------------------------------------------------------------------
+class KeysetPage:
+    """keyset 조회 결과. Flask-SQLAlchemy Pagination 과 호환되는 속성 제공."""
+
+    def __init__(self, query, items, page, per_page, has_next, next_cursor):
+        self._query = query
+        self._total = None
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.has_next = has_next
+        self.next_cursor = next_cursor
+
+    @property
+    def total(self):
+        """전체 개수 (처음 접근 시 계산, 캐시 사용)."""
+        if self._total is None:
+            self._total = cached_count(self._query)
+        return self._total
+
+    @property
+    def pages(self):
+        if not self.total:
+            return 0
+        return (self.total + self.per_page - 1) // self.per_page
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def meta(self, with_total=True):
+        """API 응답용 메타 (기존 _pagination_meta 키 + next_cursor)."""
+        meta = {
+            "current_page": self.page,
+            "per_page": self.per_page,
+            "has_next": self.has_next,
+            "has_prev": self.has_prev,
+            "next_cursor": self.next_cursor,
+        }
+        if with_total:
+            meta["total_items"] = self.total
+            meta["total_pages"] = self.pages
+        return meta
+
+
+def keyset_paginate(query, keys, page=1, per_page=12, cursor=None):
+    """
+    keys 순서로 정렬해 한 페이지 조회.
+    cursor 가 유효하면 커서 다음부터(seek), 아니면 page 번호로 OFFSET 조회.
+    page 는 커서 사용 시에도 표시·이전 링크용으로 그대로 유지.
+    query 가 엔티티가 아닌 컬럼을 고른 쿼리면 items 는 그 컬럼들의 행 (app/utils/serializers.py).
+    """
+    page = max(1, int(page or 1))
+    values = decode_cursor(cursor, keys)
+    ordered = query.order_by(*[col.desc() if desc else col.asc() for col, desc in keys])
+    if values is not None:
+        ordered = ordered.filter(_seek_condition(keys, values))
+    else:
+        ordered = ordered.offset((page - 1) * per_page)
+    rows = ordered.add_columns(*[col for col, _ in keys]).limit(per_page + 1).all()
+
+    descriptions = query.column_descriptions
+    width = len(descriptions)
+    entity_only = width == 1 and descriptions[0]["expr"] is descriptions[0]["type"]
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+    # 컬럼 쿼리는 행 그대로 (뒤에 붙은 정렬 키 컬럼은 이름으로 접근하는 쪽에 영향 없음)
+    items = [row[0] for row in rows] if entity_only else rows
+    next_cursor = encode_cursor(list(rows[-1][width:])) if has_next and rows else None
+    return KeysetPage(query, items, page, per_page, has_next, next_cursor)
+
+
+def empty_page(per_page=12):
+    """결과가 없는 페이지 (쿼리 없이)."""
+    page = KeysetPage(None, [], 1, per_page, False, None)
+    page._total = 0
+    return page
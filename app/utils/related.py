@@ -0,0 +1,343 @@
+"""
+관련 동영상 추천 – 비디오별 상위 K 개 관련 동영상을 related_videos 테이블에 미리 계산해 두고 조회.
+
+- 순위: 태그 Jaccard 유사도 > 같은 카테고리 > 같은 업로더 > 인기(조회수·좋아요).
+  (기존 get_related_videos 의 같은 태그 > 카테고리 > 작성자 > 인기순 우선순위를 점수로 표현)
+- 조회: related_videos 의 (video_id, rank) PK 로 한 번에 조회 (videos 조인).
+  목록이 없거나 RELATED_VIDEOS_MAX_AGE 초보다 오래됐으면 그 비디오만 다시 계산해 저장.
+  목록마다 rank = -1 표시 행(related_id = 자기 자신)을 함께 저장 → 추천할 영상이 없어도 계산 시각이 남아
+  조회마다 재계산하지 않음.
+- 조회 중 재계산은 요청 세션이 아닌 별도 연결(트랜잭션)로 저장 → GET 처리 중 요청 세션을 커밋·롤백하지 않음.
+- 갱신: 태그 변경(retag_videos)·카테고리 변경·삭제 시 해당 비디오, 그 비디오를 추천 목록에 가진 비디오,
+  새로 붙은 태그를 공유하는 비디오(태그당 RELATED_INVALIDATE_MAX_TAG 개 이하)의 목록을 지움
+  → 다음 조회 때 재계산. 전체 재계산은 rebuild_related() (scripts/rebuild_related.py).
+- 전체 재계산은 태그 역색인(tag → 비디오 목록)으로 교집합 크기를 세어 배치 단위로 계산
+  (비디오가 RELATED_MAX_POSTING 개 넘게 달린 태그는 후보 생성에서 제외, 유사도 분모에는 포함).
+"""
+
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import and_, delete, event, func, inspect, insert, select, text
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.utils.loading import loader_options
+
+# 계산 시각 표시 행의 rank (추천 목록은 0 부터)
+MARKER_RANK = -1
+
+_listeners_installed = False
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+def _config(name, default):
+    try:
+        return current_app.config.get(name, default)
+    except RuntimeError:
+        return default
+
+
+# ---------------------------------------------------------------------------
+# 점수 계산
+# ---------------------------------------------------------------------------
+def _rank_candidates(current, tag_count, candidates, k):
+    """
+    current: (id, category, user_id), tag_count: 현재 비디오 태그 수.
+    candidates: {id: (category, user_id, views, likes, 태그 수, 공통 태그 수)}.
+    반환: [(related_id, jaccard)] 상위 k 개.
+    """
+    video_id, category, user_id = current
+    scored = []
+    for cid, (c_category, c_user_id, views, likes, c_tags, inter) in candidates.items():
+        if cid == video_id:
+            continue
+        union = tag_count + c_tags - inter
+        jaccard = inter / union if inter and union else 0.0
+        key = (
+            jaccard,
+            bool(category) and c_category == category,
+            c_user_id == user_id,
+            views or 0,
+            likes or 0,
+            cid,
+        )
+        scored.append((key, cid, jaccard))
+    scored.sort(reverse=True)
+    return [(cid, jaccard) for _key, cid, jaccard in scored[:k]]
+
+
+def _store(session, lists):
+    """{video_id: [(related_id, score)]} 저장 (기존 목록 교체, 빈 목록도 표시 행 저장). session 은 Connection 도 가능."""
+    from app.models.video import related_videos
+
+    if not lists:
+        return
+    now = _utc_now()
+    session.execute(delete(related_videos).where(related_videos.c.video_id.in_(list(lists))))
+    rows = []
+    for vid, items in lists.items():
+        rows.append({"video_id": vid, "rank": MARKER_RANK, "related_id": vid, "score": 0.0, "computed_at": now})
+        rows.extend(
+            {"video_id": vid, "rank": rank, "related_id": rid, "score": score, "computed_at": now}
+            for rank, (rid, score) in enumerate(items)
+        )
+    session.execute(insert(related_videos), rows)
+
+
+# ---------------------------------------------------------------------------
+# 비디오 1개 계산 (조회 시 목록이 없거나 오래된 경우)
+# ---------------------------------------------------------------------------
+def compute_related(session, video_id, k=None):
+    """video_id 의 관련 동영상 [(related_id, score)] 계산. 비디오가 없으면 None."""
+    from app.models import Video
+    from app.models.video import video_tags
+
+    k = k or int(_config("RELATED_VIDEOS_K", 10))
+    row = session.execute(select(Video.id, Video.category, Video.user_id).where(Video.id == video_id)).first()
+    if row is None:
+        return None
+    current = tuple(row)
+    tag_ids = session.execute(select(video_tags.c.tag_id).where(video_tags.c.video_id == video_id)).scalars().all()
+
+    meta_cols = (Video.id, Video.category, Video.user_id, Video.views, Video.likes)
+    candidates = {}
+    overlaps = {}
+    if tag_ids:
+        cap = int(_config("RELATED_MAX_POSTING", 5000))
+        inter = func.count().label("inter")
+        overlaps = dict(
+            session.execute(
+                select(video_tags.c.video_id, inter)
+                .where(video_tags.c.tag_id.in_(tag_ids), video_tags.c.video_id != video_id)
+                .group_by(video_tags.c.video_id)
+                .order_by(inter.desc())
+                .limit(cap)
+            ).all()
+        )
+    if overlaps:
+        tag_total = (
+            select(func.count())
+            .select_from(video_tags)
+            .where(video_tags.c.video_id == Video.id)
+            .scalar_subquery()
+        )
+        for vid, category, user_id, views, likes, total in session.execute(
+            select(*meta_cols, tag_total).where(Video.id.in_(list(overlaps)))
+        ):
+            candidates[vid] = (category, user_id, views, likes, total, overlaps[vid])
+
+    # 태그로 못 채울 때를 위한 후보: 같은 카테고리·같은 업로더·전체 인기 상위 k+1 개
+    popular = (Video.views.desc(), Video.likes.desc(), Video.id.desc())
+    fallbacks = [select(*meta_cols).order_by(*popular).limit(k + 1)]
+    if current[1]:
+        fallbacks.append(select(*meta_cols).where(Video.category == current[1]).order_by(*popular).limit(k + 1))
+    fallbacks.append(select(*meta_cols).where(Video.user_id == current[2]).order_by(*popular).limit(k + 1))
+    for stmt in fallbacks:
+        for vid, category, user_id, views, likes in session.execute(stmt):
+            candidates.setdefault(vid, (category, user_id, views, likes, 0, 0))
+
+    return _rank_candidates(current, len(tag_ids), candidates, k)
+
+
+def refresh_related(session, video_id, k=None):
+    """
+    video_id 목록을 session 으로 읽어 계산하고, 별도 연결의 트랜잭션으로 저장 (session 은 커밋·롤백하지 않음).
+    반환: 계산한 목록 (비디오 없으면 None).
+    """
+    items = compute_related(session, video_id, k)
+    if items is None:
+        return None
+    bind = session.get_bind()
+    try:
+        with getattr(bind, "engine", bind).begin() as connection:
+            _store(connection, {video_id: items})
+    except (IntegrityError, OperationalError):
+        # 다른 요청이 같은 목록을 동시에 저장했거나 DB 가 잠겨 있음 → 저장은 다음 조회에 맡기고 계산 결과만 사용
+        pass
+    return items
+
+
+# ---------------------------------------------------------------------------
+# 조회
+# ---------------------------------------------------------------------------
+def _lookup(session, video_id, limit, options):
+    """[(Video 또는 None, computed_at)] rank 순. 표시 행(rank -1)은 Video 가 None 이고 맨 앞."""
+    from app.models import Video
+    from app.models.video import related_videos
+
+    return (
+        session.query(Video, related_videos.c.computed_at)
+        .select_from(related_videos)
+        .outerjoin(Video, and_(related_videos.c.related_id == Video.id, related_videos.c.rank > MARKER_RANK))
+        .filter(related_videos.c.video_id == video_id)
+        .order_by(related_videos.c.rank)
+        .options(*options)
+        .limit(limit + 1)
+        .all()
+    )
+
+
+def _load(session, ids, options):
+    """id 목록 순서대로 Video 조회 (재계산 직후 표시용)."""
+    from app.models import Video
+
+    if not ids:
+        return []
+    by_id = {v.id: v for v in session.query(Video).filter(Video.id.in_(ids)).options(*options)}
+    return [by_id[i] for i in ids if i in by_id]
+
+
+def _is_stale(computed_at):
+    max_age = float(_config("RELATED_VIDEOS_MAX_AGE", 86400))
+    if max_age <= 0 or computed_at is None:
+        return max_age > 0
+    if computed_at.tzinfo is None:
+        computed_at = computed_at.replace(tzinfo=timezone.utc)
+    return computed_at < _utc_now() - timedelta(seconds=max_age)
+
+
+def get_related(video_id, limit=10, options=None):
+    """
+    관련 동영상 Video 목록 (로더 기본값: 작성자, options 로 다른 로더 지정. app/utils/loading.py).
+    저장된 목록이 없거나 오래됐으면 다시 계산해 별도 연결로 저장 (요청 세션은 커밋하지 않음).
+    """
+    from app import db
+
+    if options is None:
+        options = loader_options("related")
+    session = db.session
+    # 요청 세션의 미반영 변경은 flush 하지 않음 (쓰기 잠금을 잡으면 별도 연결의 저장이 대기)
+    with session.no_autoflush:
+        rows = _lookup(session, video_id, limit, options)
+        if not rows or _is_stale(rows[0][1]):
+            items = refresh_related(session, video_id)
+            if items is None:
+                return []
+            return _load(session, [rid for rid, _score in items[:limit]], options)
+    return [video for video, _computed_at in rows if video is not None][:limit]
+
+
+# ---------------------------------------------------------------------------
+# 무효화
+# ---------------------------------------------------------------------------
+def invalidate_related(session, video_ids, added_tag_ids=()):
+    """
+    video_ids 의 목록, 이 비디오들을 추천 목록에 가진 비디오의 목록,
+    added_tag_ids 를 가진 비디오(태그당 RELATED_INVALIDATE_MAX_TAG 개 이하)의 목록 삭제.
+    """
+    from app.models.video import related_videos, video_tags
+
+    video_ids = list({int(v) for v in video_ids})
+    if not video_ids:
+        return
+    targets = select(related_videos.c.video_id).where(related_videos.c.related_id.in_(video_ids))
+    session.execute(
+        delete(related_videos).where(
+            related_videos.c.video_id.in_(video_ids) | related_videos.c.video_id.in_(targets)
+        )
+    )
+    added_tag_ids = list({int(t) for t in added_tag_ids})
+    if added_tag_ids:
+        from app.models import Tag
+
+        cap = int(_config("RELATED_INVALIDATE_MAX_TAG", 200))
+        small_tags = select(Tag.id).where(Tag.id.in_(added_tag_ids), Tag.video_count <= cap)
+        sharing = select(video_tags.c.video_id).where(video_tags.c.tag_id.in_(small_tags))
+        session.execute(delete(related_videos).where(related_videos.c.video_id.in_(sharing)))
+
+
+def _after_delete(mapper, connection, target):
+    connection.execute(
+        text(
+            "DELETE FROM related_videos WHERE video_id = :id "
+            "OR video_id IN (SELECT video_id FROM related_videos WHERE related_id = :id)"
+        ),
+        {"id": target.id},
+    )
+
+
+def _after_update(mapper, connection, target):
+    state = inspect(target)
+    if state.attrs.category.history.has_changes() or state.attrs.user_id.history.has_changes():
+        connection.execute(text("DELETE FROM related_videos WHERE video_id = :id"), {"id": target.id})
+
+
+def install_listeners():
+    """Video 삭제·카테고리 변경 시 목록 삭제 이벤트 등록 (create_app 에서 1회)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import Video
+
+    event.listen(Video, "after_delete", _after_delete)
+    event.listen(Video, "after_update", _after_update)
+    _listeners_installed = True
+
+
+# ---------------------------------------------------------------------------
+# 전체 재계산
+# ---------------------------------------------------------------------------
+def rebuild_related(db, k=None, batch_size=500):
+    """
+    모든 비디오의 관련 동영상 목록 재계산 (scripts/rebuild_related.py).
+    videos·video_tags 를 한 번 읽어 태그 역색인을 만들고 batch_size 개씩 계산·저장. 반환: 처리한 비디오 수.
+    """
+    from app.models import Video
+    from app.models.video import video_tags
+
+    k = k or int(_config("RELATED_VIDEOS_K", 10))
+    max_posting = int(_config("RELATED_MAX_POSTING", 5000))
+    session = db.session
+
+    meta = {
+        vid: (category, user_id, views or 0, likes or 0)
+        for vid, category, user_id, views, likes in session.execute(
+            select(Video.id, Video.category, Video.user_id, Video.views, Video.likes)
+        )
+    }
+    video_tag_sets = defaultdict(set)
+    postings = defaultdict(list)
+    for vid, tag_id in session.execute(select(video_tags.c.video_id, video_tags.c.tag_id)):
+        if vid in meta:
+            video_tag_sets[vid].add(tag_id)
+            postings[tag_id].append(vid)
+
+    # 그룹별 인기 상위 k+1 (카테고리·업로더·전체)
+    def _top(ids):
+        return sorted(ids, key=lambda v: (meta[v][2], meta[v][3], v), reverse=True)[: k + 1]
+
+    by_category = defaultdict(list)
+    by_user = defaultdict(list)
+    for vid, (category, user_id, _views, _likes) in meta.items():
+        if category:
+            by_category[category].append(vid)
+        by_user[user_id].append(vid)
+    top_category = {c: _top(ids) for c, ids in by_category.items()}
+    top_user = {u: _top(ids) for u, ids in by_user.items()}
+    top_all = _top(meta)
+
+    count = 0
+    ids = sorted(meta)
+    for start in range(0, len(ids), batch_size):
+        lists = {}
+        for vid in ids[start:start + batch_size]:
+            category, user_id, _views, _likes = meta[vid]
+            tags = video_tag_sets.get(vid, ())
+            overlaps = Counter()
+            for tag_id in tags:
+                posting = postings[tag_id]
+                if len(posting) <= max_posting:
+                    overlaps.update(posting)
+            pool = set(overlaps) | set(top_all) | set(top_user.get(user_id, ())) | set(top_category.get(category, ()))
+            candidates = {
+                cid: meta[cid] + (len(video_tag_sets.get(cid, ())), overlaps.get(cid, 0)) for cid in pool
+            }
+            lists[vid] = _rank_candidates((vid, category, user_id), len(tags), candidates, k)
+        _store(session, lists)
+        session.commit()
+        count += len(lists)
+    return count
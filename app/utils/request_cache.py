@@ -0,0 +1,272 @@
+"""
+요청 단위 메모 + 사용자(User) 행 캐시 + 요청별 쿼리 수.
+
+- memoize(namespace, key, loader): 같은 요청 안에서 같은 (namespace, key) 는 loader 를 1번만 호출.
+  flask.g 에 두고 요청 시작 때 비움 (현재 사용자·구독 여부 등 요청 중 여러 번 묻는 값).
+- get_user() / get_user_by_username(): 세션 identity map → 요청 메모 → 앱별 사용자 캐시 → DB 순.
+  캐시에는 컬럼 값만 USER_CACHE_TTL 초 보관 (LRU, 최대 USER_CACHE_SIZE 명)하고, 꺼낼 때는
+  session.merge(load=False) 로 세션에 붙이므로 SELECT 없음 → 로그인 사용자 로드(user_loader)·
+  프로필 페이지 사용자 조회가 매 요청 쿼리 없이 처리됨. USER_CACHE_TTL=0 이면 사용 안 함.
+  ORM 으로 User 를 수정·삭제(프로필 수정, 관리자 편집·삭제)하면 커밋된 뒤 해당 항목 삭제.
+  Core UPDATE 로 users 를 바꾸는 곳은 invalidate_user() 호출. 다른 프로세스의 변경은 TTL 이 지나야 보임.
+- 쿼리 수: 엔진 before_cursor_execute 로 요청마다 셈 → query_count().
+  QUERY_COUNT_HEADER 가 True 면 응답 헤더 X-Query-Count 로도 내보냄 (개발·테스트용).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, has_app_context, has_request_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+# g 속성 이름: 요청 메모, 요청별 쿼리 수
+_MEMO_ATTR = "_request_memo"
+_COUNT_ATTR = "_request_query_count"
+# 세션 info 키: 커밋 후 캐시에서 지울 user_id
+_PENDING_KEY = "user_cache_pending"
+_listeners_installed = False
+
+
+# ---------------------------------------------------------------------------
+# 요청 단위 메모
+# ---------------------------------------------------------------------------
+def memoize(namespace, key, loader):
+    """요청 안에서 (namespace, key) 의 loader() 결과를 재사용. 요청 밖에서는 매번 호출."""
+    if not has_request_context():
+        return loader()
+    memo = g.get(_MEMO_ATTR)
+    if memo is None:
+        memo = {}
+        setattr(g, _MEMO_ATTR, memo)
+    slot = (namespace, key)
+    if slot not in memo:
+        memo[slot] = loader()
+    return memo[slot]
+
+
+def forget(namespace):
+    """요청 메모에서 namespace 항목 삭제 (요청 중 값이 바뀌었을 때)."""
+    memo = g.get(_MEMO_ATTR) if has_request_context() else None
+    if memo:
+        for slot in [s for s in memo if s[0] == namespace]:
+            del memo[slot]
+
+
+# ---------------------------------------------------------------------------
+# 사용자 행 캐시
+# ---------------------------------------------------------------------------
+class _UserRowCache:
+    """user_id → (컬럼 값 dict, 만료 시각), username → user_id. 앱별 1개, 최대 max_size 명 (LRU)."""
+
+    def __init__(self, max_size=10000):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._names = {}
+        self._generation = 0
+        self.max_size = max_size
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._drop(user_id)
+                return None
+            self._data.move_to_end(user_id)
+            return entry[0]
+
+    def user_id_for(self, username):
+        with self._lock:
+            return self._names.get(username)
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, values, ttl, generation):
+        """조회 시작 후 사용자 변경이 커밋됐으면(generation 변경) 저장하지 않음 – 오래된 행 보관 방지."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            user_id = values["id"]
+            self._drop(user_id)
+            self._data[user_id] = (values, time.monotonic() + ttl)
+            self._names[values["username"]] = user_id
+            while len(self._data) > self.max_size:
+                self._drop(next(iter(self._data)))
+
+    def evict(self, user_ids):
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._drop(user_id)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._names.clear()
+
+    def _drop(self, user_id):
+        entry = self._data.pop(user_id, None)
+        if entry is not None and self._names.get(entry[0]["username"]) == user_id:
+            del self._names[entry[0]["username"]]
+
+
+def _cache():
+    cache = current_app.extensions.get("user_row_cache")
+    if cache is None:
+        size = int(current_app.config.get("USER_CACHE_SIZE", 10000))
+        cache = current_app.extensions.setdefault("user_row_cache", _UserRowCache(size))
+    return cache
+
+
+def _ttl():
+    return float(current_app.config.get("USER_CACHE_TTL", 60) or 0) if has_app_context() else 0
+
+
+def clear_user_cache():
+    """사용자 캐시 비우기 (users 를 직접 SQL 로 여러 행 바꿨을 때)."""
+    _cache().clear()
+
+
+def invalidate_user(session, user_id):
+    """session 이 커밋된 뒤 user_id 캐시 항목 삭제 (Core UPDATE 로 users 를 바꾼 경우)."""
+    session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+def _row_values(user):
+    return {attr.key: getattr(user, attr.key) for attr in inspect(user).mapper.column_attrs}
+
+
+def _attach(session, values):
+    """캐시된 컬럼 값으로 User 를 만들어 세션에 붙임 (SELECT 없음)."""
+    from app.models import User
+
+    user = User(**values)
+    make_transient_to_detached(user)
+    return session.merge(user, load=False)
+
+
+def get_user(user_id, session=None):
+    """id 로 User 조회 (identity map → 요청 메모 → 사용자 캐시 → DB). 없으면 None."""
+    from app import db
+    from app.models import User
+
+    if user_id is None:
+        return None
+    session = session or db.session
+    user_id = int(user_id)
+    user = session.identity_map.get(identity_key(User, user_id))
+    if user is not None:
+        return user
+
+    def load():
+        ttl = _ttl()
+        if ttl <= 0:
+            return session.get(User, user_id)
+        cache = _cache()
+        values = cache.get(user_id)
+        if values is not None:
+            return _attach(session, values)
+        generation = cache.generation()
+        found = session.get(User, user_id)
+        if found is not None:
+            cache.set(_row_values(found), ttl, generation)
+        return found
+
+    return memoize("user", user_id, load)
+
+
+def get_user_by_username(username, session=None):
+    """username 으로 User 조회 (캐시된 username → id 가 있으면 get_user). 없으면 None."""
+    from app import db
+    from app.models import User
+
+    session = session or db.session
+
+    def load():
+        ttl = _ttl()
+        if ttl <= 0:
+            return session.query(User).filter_by(username=username).first()
+        cache = _cache()
+        user_id = cache.user_id_for(username)
+        if user_id is not None:
+            user = get_user(user_id, session)
+            if user is not None and user.username == username:
+                return user
+        generation = cache.generation()
+        user = session.query(User).filter_by(username=username).first()
+        if user is not None:
+            cache.set(_row_values(user), ttl, generation)
+        return user
+
+    return memoize("username", username, load)
+
+
+def _user_changed(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        invalidate_user(session, target.id)
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and has_app_context():
+        _cache().evict(pending)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# 요청별 쿼리 수
+# ---------------------------------------------------------------------------
+def query_count():
+    """현재 요청에서 지금까지 실행한 SQL 문 수 (요청 밖이면 0)."""
+    return g.get(_COUNT_ATTR, 0) if has_request_context() else 0
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        setattr(g, _COUNT_ATTR, g.get(_COUNT_ATTR, 0) + 1)
+
+
+def _before_request():
+    # 테스트처럼 앱 컨텍스트를 여러 요청이 공유해도 g 의 메모·쿼리 수는 요청마다 새로 시작
+    g.pop(_MEMO_ATTR, None)
+    setattr(g, _COUNT_ATTR, 0)
+
+
+def _after_request(response):
+    if current_app.config.get("QUERY_COUNT_HEADER"):
+        response.headers["X-Query-Count"] = str(query_count())
+    return response
+
+
+def install_listeners():
+    """User 변경 이벤트·커밋 훅 등록 (create_app 에서 1번)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import User
+
+    event.listen(User, "after_update", _user_changed)
+    event.listen(User, "after_delete", _user_changed)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+def init_request_cache(app, db):
+    """create_app 에서 호출 (앱 컨텍스트 안). 이벤트·요청 훅 등록, 이 앱 엔진의 쿼리 수 세기 시작."""
+    install_listeners()
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    if not event.contains(db.engine, "before_cursor_execute", _count_query):
+        event.listen(db.engine, "before_cursor_execute", _count_query)
@@ -0,0 +1,387 @@
+"""
+응답 캐시 – 누구에게나 같은 목록 응답(홈·태그 페이지, 목록 API)을 렌더링 결과째 보관.
+
+- @cached_response(*namespaces, args=...): 엔드포인트 + URL 인자 + 지정한 쿼리 인자(빈 값 제외, 이름순)를
+  키로 응답 본문을 RESPONSE_CACHE_TTL 초 보관. 1단계는 프로세스 내 LRU(최대 RESPONSE_CACHE_SIZE 개),
+  RESPONSE_CACHE_PATH 를 주면 같은 호스트의 워커가 공유하는 SQLite 파일 2단계 추가.
+  anonymous_only=True(HTML)면 비로그인·flash 없는 요청만 캐시. 페이지의 CSRF 토큰은 자리표시자로
+  렌더링해 두고 응답할 때마다 요청 세션의 토큰으로 바꿔 넣음.
+- 무효화: 키에 네임스페이스("videos", "tags")별 세대 번호가 들어가고, 세대가 오르면 이전 항목은 더 이상
+  조회되지 않음 (TTL 로 정리). 공유 단계를 쓰면 세대도 SQLite 파일에 있어 다른 워커에도 바로 반영.
+  * Video ORM 추가·수정·삭제, 좋아요 토글, 업로드 작업의 URL 갱신 → "videos" (커밋된 뒤)
+  * 태그 카운트 변경 (인기 태그 캐시 무효화와 함께) → "tags", "videos"
+  * 조회수 flush 는 무효화하지 않음: 몇 초마다 flush 되므로 세대를 올리면 목록 캐시가 거의 항상 비게 됨.
+    캐시된 응답의 조회수는 최대 RESPONSE_CACHE_TTL 초 늦게 반영.
+- 모든 캐시 응답에 약한 ETag → If-None-Match 가 같으면 304. RESPONSE_CACHE_TTL=0 이면 사용 안 함.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, g, has_app_context, request, session
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# 네임스페이스: 비디오 목록(조회수·좋아요·태그 포함), 인기 태그
+VIDEOS = "videos"
+TAGS = "tags"
+
+# 이보다 큰 응답 본문은 캐시하지 않음 (바이트)
+MAX_BODY_SIZE = 1024 * 1024
+# 캐시된 HTML 에 넣어 두는 CSRF 토큰 자리표시자 (응답 시 실제 토큰으로 교체)
+CSRF_PLACEHOLDER = "__response_cache_csrf_token__"
+
+# 세션 info 키: 커밋 후 세대를 올릴 네임스페이스
+_PENDING_KEY = "response_cache_pending"
+_listeners_installed = False
+
+
+# ---------------------------------------------------------------------------
+# 저장소 (프로세스 내 LRU + 선택적 공유 SQLite 파일)
+# ---------------------------------------------------------------------------
+class _MemoryTier:
+    """키 → (항목, 만료 시각). 최대 max_size 개 (LRU)."""
+
+    def __init__(self, max_size=256):
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self.max_size = max_size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, item, ttl):
+        with self._lock:
+            self._data[key] = (item, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _SqliteTier:
+    """로컬 SQLite 파일 – 같은 호스트의 여러 워커가 응답과 네임스페이스 세대를 공유."""
+
+    def __init__(self, path):
+        self._path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, etag TEXT NOT NULL, mimetype TEXT NOT NULL, "
+                "body BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache_generations ("
+                "namespace TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self._path, timeout=10, isolation_level=None)
+
+    def get(self, key):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT etag, mimetype, body FROM response_cache WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        finally:
+            conn.close()
+        return _Entry(row[2], row[1], row[0]) if row else None
+
+    def set(self, key, item, ttl):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache (key, etag, mimetype, body, expires) VALUES (?, ?, ?, ?, ?)",
+                (key, item.etag, item.mimetype, item.body, now + ttl),
+            )
+            conn.execute("DELETE FROM response_cache WHERE expires <= ?", (now,))
+        finally:
+            conn.close()
+
+    def generations(self, namespaces):
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(namespaces))
+            rows = dict(
+                conn.execute(
+                    "SELECT namespace, generation FROM response_cache_generations "
+                    f"WHERE namespace IN ({placeholders})",
+                    list(namespaces),
+                ).fetchall()
+            )
+        finally:
+            conn.close()
+        return [rows.get(ns, 0) for ns in namespaces]
+
+    def bump(self, namespaces):
+        conn = self._connect()
+        try:
+            conn.executemany(
+                "INSERT INTO response_cache_generations (namespace, generation) VALUES (?, 1) "
+                "ON CONFLICT(namespace) DO UPDATE SET generation = generation + 1",
+                [(ns,) for ns in namespaces],
+            )
+        finally:
+            conn.close()
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM response_cache")
+        finally:
+            conn.close()
+
+
+class _Entry:
+    """캐시된 응답 본문·MIME 형식·약한 ETag 값."""
+
+    __slots__ = ("body", "mimetype", "etag")
+
+    def __init__(self, body, mimetype, etag):
+        self.body = bytes(body)
+        self.mimetype = mimetype
+        self.etag = etag
+
+
+class ResponseCache:
+    """응답 캐시 + 네임스페이스 세대. app.extensions["response_cache"]로 접근."""
+
+    def __init__(self, app=None):
+        self._app = None
+        self._memory = None
+        self._shared = None
+        self._lock = threading.Lock()
+        self._generations = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("RESPONSE_CACHE_TTL", 30)
+        app.config.setdefault("RESPONSE_CACHE_SIZE", 256)
+        app.config.setdefault("RESPONSE_CACHE_PATH", None)
+        self._app = app
+        app.extensions["response_cache"] = self
+
+    @property
+    def ttl(self):
+        return float(self._app.config.get("RESPONSE_CACHE_TTL", 30) or 0)
+
+    @property
+    def memory(self):
+        if self._memory is None:
+            self._memory = _MemoryTier(int(self._app.config.get("RESPONSE_CACHE_SIZE", 256)))
+        return self._memory
+
+    @property
+    def shared(self):
+        if self._shared is None:
+            path = self._app.config.get("RESPONSE_CACHE_PATH")
+            if path:
+                self._shared = _SqliteTier(path)
+        return self._shared
+
+    # ----- 세대 -----
+    def generations(self, namespaces):
+        if self.shared is not None:
+            return self.shared.generations(namespaces)
+        with self._lock:
+            return [self._generations.get(ns, 0) for ns in namespaces]
+
+    def invalidate(self, *namespaces):
+        """네임스페이스 세대를 올려 해당 응답을 모두 무효화."""
+        namespaces = sorted(set(namespaces))
+        if not namespaces:
+            return
+        if self.shared is not None:
+            self.shared.bump(namespaces)
+        with self._lock:
+            for ns in namespaces:
+                self._generations[ns] = self._generations.get(ns, 0) + 1
+
+    def clear(self):
+        self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
+        self.invalidate(VIDEOS, TAGS)
+
+    # ----- 항목 -----
+    def get(self, key):
+        item = self.memory.get(key)
+        if item is None and self.shared is not None:
+            item = self.shared.get(key)
+            if item is not None:
+                self.memory.set(key, item, self.ttl)
+        return item
+
+    def set(self, key, item):
+        self.memory.set(key, item, self.ttl)
+        if self.shared is not None:
+            self.shared.set(key, item, self.ttl)
+
+
+def get_response_cache():
+    """현재 앱의 ResponseCache 반환."""
+    return current_app.extensions["response_cache"]
+
+
+# ---------------------------------------------------------------------------
+# 무효화 (커밋 후)
+# ---------------------------------------------------------------------------
+def mark_changed(session, *namespaces):
+    """session 이 커밋된 뒤 namespaces 응답 무효화 (Core UPDATE 등 Video 이벤트가 없는 쓰기 경로용)."""
+    session.info.setdefault(_PENDING_KEY, set()).update(namespaces)
+
+
+def invalidate_responses(*namespaces):
+    """즉시 무효화 (이미 커밋된 변경)."""
+    if has_app_context() and "response_cache" in current_app.extensions:
+        get_response_cache().invalidate(*namespaces)
+
+
+def _video_changed(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        mark_changed(session, VIDEOS)
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        invalidate_responses(*pending)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def install_listeners():
+    """Video 변경 이벤트·커밋 훅 등록 (create_app 에서 1번)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import Video
+
+    event.listen(Video, "after_insert", _video_changed)
+    event.listen(Video, "after_update", _video_changed)
+    event.listen(Video, "after_delete", _video_changed)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+def init_response_cache(app, db):
+    """create_app 에서 호출. 이벤트 등록."""
+    install_listeners()
+
+
+# ---------------------------------------------------------------------------
+# 뷰 데코레이터
+# ---------------------------------------------------------------------------
+def _cache_key(namespaces, args, view_args, generations):
+    parts = [request.endpoint]
+    parts.extend(f"{k}={view_args[k]}" for k in sorted(view_args))
+    for name in sorted(args):
+        value = (request.args.get(name) or "").strip()
+        if value:
+            parts.append(f"{name}={value}")
+    parts.extend(f"{ns}#{gen}" for ns, gen in zip(namespaces, generations))
+    return "|".join(parts)
+
+
+def _is_personal():
+    """로그인 사용자·표시할 flash 메시지가 있는 요청 (사람마다 다른 HTML)."""
+    return current_user.is_authenticated or "_flashes" in session
+
+
+def _fill_csrf(body):
+    """자리표시자를 현재 세션의 CSRF 토큰으로 교체."""
+    placeholder = CSRF_PLACEHOLDER.encode()
+    if placeholder not in body:
+        return body
+    from flask_wtf.csrf import generate_csrf
+
+    return body.replace(placeholder, generate_csrf().encode())
+
+
+def _to_response(item, private, hit):
+    response = current_app.response_class(_fill_csrf(item.body), mimetype=item.mimetype)
+    response.set_etag(item.etag, weak=True)
+    # 브라우저는 보관하되 매번 ETag 로 재검증 (HTML 에는 세션별 CSRF 토큰이 있어 공유 캐시 금지)
+    response.cache_control.no_cache = True
+    if private:
+        response.cache_control.private = True
+        response.vary.add("Cookie")
+    response.headers["X-Response-Cache"] = "HIT" if hit else "MISS"
+    return response.make_conditional(request)
+
+
+def _render(view, view_args, view_kwargs):
+    """뷰 실행. 템플릿의 csrf_token() 은 세션에 토큰을 만들지 않고 자리표시자를 돌려줌."""
+    field = current_app.config.get("WTF_CSRF_FIELD_NAME", "csrf_token")
+    if field in g:
+        return current_app.make_response(view(*view_args, **view_kwargs))
+    setattr(g, field, CSRF_PLACEHOLDER)
+    try:
+        return current_app.make_response(view(*view_args, **view_kwargs))
+    finally:
+        if g.get(field) == CSRF_PLACEHOLDER:
+            g.pop(field)
+
+
+def cached_response(*namespaces, args=(), anonymous_only=False):
+    """
+    GET 응답 캐시 데코레이터. namespaces 가 무효화되면 다시 렌더링.
+    args: 응답을 바꾸는 쿼리 인자 이름 (그 외 인자는 키에서 제외).
+    anonymous_only: HTML 처럼 로그인 사용자마다 다른 응답이면 True (비로그인 요청만 캐시).
+    """
+    namespaces = tuple(sorted(namespaces))
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*view_args, **view_kwargs):
+            cache = get_response_cache()
+            if cache.ttl <= 0 or request.method != "GET" or (anonymous_only and _is_personal()):
+                return view(*view_args, **view_kwargs)
+            key = _cache_key(namespaces, args, view_kwargs, cache.generations(namespaces))
+            item = cache.get(key)
+            if item is not None:
+                return _to_response(item, anonymous_only, hit=True)
+
+            response = _render(view, view_args, view_kwargs)
+            body = None if response.direct_passthrough else response.get_data()
+            if (
+                body is None
+                or response.status_code != 200
+                or len(body) > MAX_BODY_SIZE
+                or session.modified
+                or "Set-Cookie" in response.headers
+            ):
+                # 캐시하지 않는 응답 (오류·세션 변경 등): 자리표시자만 실제 토큰으로
+                if body is not None:
+                    response.set_data(_fill_csrf(body))
+                return response
+            item = _Entry(body, response.mimetype, hashlib.sha1(body).hexdigest()[:20])
+            cache.set(key, item)
+            return _to_response(item, anonymous_only, hit=False)
+
+        return wrapped
+
+    return decorator
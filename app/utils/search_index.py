@@ -0,0 +1,232 @@
+"""
+동영상 전문 검색 – SQLite FTS5 가상 테이블(videos_fts) 기반.
+
+- 토큰화: 영문·숫자는 단어 단위(접두어 검색), 한글·한자·가나는 2글자 bigram 으로 분해.
+  "검색키워드가" → 검색 색키 키워 워드 드가  →  "키워드" 검색 시 구문 "키워 워드" 로 부분 일치.
+- 동기화: Video insert/update/delete 시 ORM 이벤트로 같은 트랜잭션 안에서 인덱스 갱신
+  (studio.upload / edit / delete, 관리자 삭제, 시드 스크립트 등 모든 경로 포함).
+- 정렬: bm25 점수(제목 가중치 10, 설명 1) 기반 관련도순(sort=relevance).
+  relevance_keys() 로 (점수, id) keyset 페이지네이션 키를 만들어 app/utils/pagination.py 와 함께 사용.
+- FTS5 를 쓸 수 없는 DB(비 SQLite 등)나 1글자 한글 검색어는 기존 ILIKE 검색으로 대체.
+
+기존 DB: scripts/rebuild_search_index.py 로 전체 재색인 (테이블 최초 생성 시에는 자동 backfill).
+"""
+
+import re
+import weakref
+
+from sqlalchemy import and_, event, inspect, literal_column, or_, select, table, text
+
+FTS_TABLE = "videos_fts"
+
+# 제목 가중치 10, 설명 1 (bm25 는 값이 작을수록 관련도 높음)
+_RANK_EXPR = f"bm25({FTS_TABLE}, 10.0, 1.0)"
+
+# bigram 으로 분해할 문자: 한글 자모·음절, 히라가나·가타카나, CJK 한자
+_CJK_CLASS = "\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7a3"
+_TOKEN_RE = re.compile(rf"[{_CJK_CLASS}]+|[^\W_{_CJK_CLASS}]+")
+_CJK_RE = re.compile(rf"[{_CJK_CLASS}]")
+
+# 엔진별 FTS 사용 가능 여부 (create_app 시 init_search_index 가 기록)
+_fts_engines = weakref.WeakKeyDictionary()
+_listeners_installed = False
+
+
+# ---------------------------------------------------------------------------
+# 토큰화
+# ---------------------------------------------------------------------------
+def _bigrams(run):
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def tokenize(value):
+    """색인용 토큰 목록. 영문은 소문자 단어, CJK 연속 구간은 bigram."""
+    tokens = []
+    for m in _TOKEN_RE.finditer((value or "").lower()):
+        word = m.group(0)
+        if _CJK_RE.match(word):
+            tokens.extend(_bigrams(word))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_match_query(q):
+    """
+    검색어 → FTS5 MATCH 식. 표현할 수 없으면 None (ILIKE 로 대체).
+    영문 단어는 접두어("pyth"*), CJK 구간은 bigram 구문("키워 워드"), 모두 AND.
+    """
+    parts = []
+    for m in _TOKEN_RE.finditer((q or "").lower()):
+        word = m.group(0)
+        if _CJK_RE.match(word):
+            if len(word) < 2:
+                # 1글자는 bigram 끝자리 위치를 찾을 수 없어 부분 일치 보장 불가
+                return None
+            parts.append('"' + " ".join(_bigrams(word)) + '"')
+        else:
+            parts.append(f'"{word}"*')
+    return " ".join(parts) if parts else None
+
+
+# ---------------------------------------------------------------------------
+# 인덱스 생성·동기화
+# ---------------------------------------------------------------------------
+def _index_row(connection, video_id, title, description):
+    connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": video_id})
+    connection.execute(
+        text(f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (:id, :title, :description)"),
+        {
+            "id": video_id,
+            "title": " ".join(tokenize(title)),
+            "description": " ".join(tokenize(description)),
+        },
+    )
+
+
+def _is_enabled(engine):
+    return _fts_engines.get(engine, False)
+
+
+def _after_insert(mapper, connection, target):
+    if _is_enabled(connection.engine):
+        _index_row(connection, target.id, target.title, target.description)
+
+
+def _after_update(mapper, connection, target):
+    if not _is_enabled(connection.engine):
+        return
+    state = inspect(target)
+    if state.attrs.title.history.has_changes() or state.attrs.description.history.has_changes():
+        _index_row(connection, target.id, target.title, target.description)
+
+
+def _after_delete(mapper, connection, target):
+    if _is_enabled(connection.engine):
+        connection.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {"id": target.id})
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    from app.models import Video
+
+    event.listen(Video, "after_insert", _after_insert)
+    event.listen(Video, "after_update", _after_update)
+    event.listen(Video, "after_delete", _after_delete)
+    _listeners_installed = True
+
+
+def rebuild_search_index(db, batch_size=1000):
+    """videos 전체를 다시 색인. 색인한 행 수 반환 (scripts/rebuild_search_index.py)."""
+    if not _is_enabled(db.engine):
+        return 0
+    db.session.execute(text(f"DELETE FROM {FTS_TABLE}"))
+    count = 0
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            text("SELECT id, title, description FROM videos WHERE id > :last ORDER BY id LIMIT :n"),
+            {"last": last_id, "n": batch_size},
+        ).fetchall()
+        if not rows:
+            break
+        db.session.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (:id, :title, :description)"),
+            [
+                {
+                    "id": r.id,
+                    "title": " ".join(tokenize(r.title)),
+                    "description": " ".join(tokenize(r.description)),
+                }
+                for r in rows
+            ],
+        )
+        count += len(rows)
+        last_id = rows[-1].id
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')"))
+    db.session.commit()
+    return count
+
+
+def init_search_index(app, db):
+    """
+    create_app 에서 호출. SQLite + FTS5 사용 가능하면 videos_fts 생성(없을 때만, 생성 시 backfill)
+    후 ORM 동기화 이벤트 등록. SEARCH_FTS_ENABLED=False 이거나 사용 불가면 ILIKE 검색 유지.
+    """
+    engine = db.engine
+    if not app.config.get("SEARCH_FTS_ENABLED", True) or engine.dialect.name != "sqlite":
+        _fts_engines[engine] = False
+        return False
+    try:
+        exists = db.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).scalar() is not None
+        if not exists:
+            db.session.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                    "title, description, tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            )
+            db.session.commit()
+    except Exception:
+        db.session.rollback()
+        app.logger.warning("FTS5 사용 불가 – ILIKE 검색으로 동작합니다.")
+        _fts_engines[engine] = False
+        return False
+
+    _fts_engines[engine] = True
+    _install_listeners()
+    if not exists:
+        rebuild_search_index(db)
+    return True
+
+
+# ---------------------------------------------------------------------------
+# 검색 쿼리
+# ---------------------------------------------------------------------------
+def _like_filter(query, q):
+    from app.models import Video
+
+    pattern = f"%{q}%"
+    return query.filter(
+        or_(
+            Video.title.ilike(pattern),
+            and_(Video.description.isnot(None), Video.description.ilike(pattern)),
+        )
+    )
+
+
+def apply_search(query, q, db):
+    """
+    Video 쿼리에 키워드 검색 조건 적용.
+    반환: (query, rank 컬럼 또는 None). rank 가 있으면 order_by(rank) 로 관련도순 정렬 가능.
+    """
+    from app.models import Video
+
+    match = build_match_query(q) if _is_enabled(db.engine) else None
+    if match is None:
+        return _like_filter(query, q), None
+    hits = (
+        select(
+            literal_column("rowid").label("video_id"),
+            literal_column(_RANK_EXPR).label("rank"),
+        )
+        .select_from(table(FTS_TABLE))
+        .where(text(f"{FTS_TABLE} MATCH :fts_match").bindparams(fts_match=match))
+        .subquery("search_hits")
+    )
+    query = query.join(hits, hits.c.video_id == Video.id)
+    return query, hits.c.rank
+
+
+def relevance_keys(rank_col):
+    """관련도순 keyset 키: (bm25 오름차순, id 오름차순)."""
+    from app.models import Video
+
+    return [(rank_col, False), (Video.id, False)]
@@ -0,0 +1,207 @@
+"""
+REST API 비디오 직렬화 – 목록은 ORM 객체 없이 필요한 컬럼만 튜플로 조회해 dict 로 변환.
+
+- VideoSerializer(fields): fields= 쿼리 인자("id,title,channel")로 응답 필드를 고르면(스파스 필드셋)
+  그 필드에 필요한 컬럼만 SELECT (channel 은 users 외부 조인, tags 는 페이지 전체를 IN 쿼리 1번).
+  Query 결과 행은 identity map 에 들어가지 않으므로 객체 생성·변경 추적 비용이 없음.
+- URL: /media/videos/, /media/thumbnails/ 접두사를 요청마다 url_for 1번으로 구해 두고 파일명만 인코딩해 붙임
+  (행마다 url_for 2번 대신). Cloudinary URL 이 있으면 그대로 사용.
+- 상세 API 처럼 이미 로드한 Video 객체는 dump_video() 로 같은 형태 변환.
+- OrjsonProvider: orjson 이 설치돼 있고 API_JSON_ORJSON 이 True 면 jsonify 가 orjson 으로 인코딩
+  (install_json_provider). 키 정렬·datetime(HTTP 날짜)·Decimal 등은 Flask 기본 인코더와 같은 결과.
+"""
+
+from flask import current_app, url_for
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+
+# 응답 필드 (출력 순서)
+VIDEO_FIELDS = (
+    "id", "title", "description", "category", "duration", "width", "height", "video_codec", "audio_codec",
+    "bitrate", "views", "likes", "created_at", "video_url", "thumbnail_url", "channel", "tags",
+)
+
+
+def parse_fields(raw, allowed=VIDEO_FIELDS):
+    """fields= 값("a,b") → allowed 순서의 필드 튜플. 없거나 아는 필드가 없으면 전체."""
+    if not raw:
+        return allowed
+    wanted = {name.strip() for name in str(raw).split(",")}
+    fields = tuple(name for name in allowed if name in wanted)
+    return fields or allowed
+
+
+def _field_columns():
+    """필드 → 필요한 컬럼 (id 는 항상 조회)."""
+    from app.models import User, Video
+
+    simple = ("title", "description", "category", "duration", "width", "height", "video_codec",
+              "audio_codec", "bitrate", "views", "likes", "created_at")
+    columns = {name: [getattr(Video, name)] for name in simple}
+    columns["video_url"] = [Video.video_path, Video.video_url]
+    columns["thumbnail_url"] = [Video.thumbnail_path, Video.thumbnail_url]
+    columns["channel"] = [User.id.label("channel_id"), User.username.label("channel_username")]
+    return columns
+
+
+class _MediaUrls:
+    """로컬 미디어 URL 접두사 + 파일명 인코딩 (url_for 의 path 변환기와 같은 규칙)."""
+
+    def __init__(self):
+        self._quote = current_app.url_map.converters["path"](current_app.url_map).to_url
+        self.video_prefix = url_for("main.media_video", filename="_")[:-1]
+        self.thumbnail_prefix = url_for("main.media_thumbnail", filename="_")[:-1]
+
+    def video(self, path, remote):
+        if not path:
+            return None
+        return remote or self.video_prefix + self._quote(path)
+
+    def thumbnail(self, path, remote):
+        if remote:
+            return remote
+        return self.thumbnail_prefix + self._quote(path) if path else None
+
+
+def tag_names(session, video_ids):
+    """{video_id: [태그 이름, ...]} – video_tags·tags 조인 1번."""
+    from app.models import Tag
+    from app.models.video import video_tags
+
+    names = {video_id: [] for video_id in video_ids}
+    if not names:
+        return names
+    rows = session.execute(
+        select(video_tags.c.video_id, Tag.name)
+        .join(Tag, Tag.id == video_tags.c.tag_id)
+        .where(video_tags.c.video_id.in_(list(names)))
+        .order_by(video_tags.c.video_id, video_tags.c.tag_id)
+    )
+    for video_id, name in rows:
+        names[video_id].append(name)
+    return names
+
+
+class VideoSerializer:
+    """비디오 → API dict. 요청 1번에 하나 생성 (URL 접두사 계산에 요청 컨텍스트 필요)."""
+
+    def __init__(self, fields=None):
+        self.fields = parse_fields(fields)
+        self._urls = None
+
+    @property
+    def urls(self):
+        if self._urls is None:
+            self._urls = _MediaUrls()
+        return self._urls
+
+    def query(self, session):
+        """fields 에 필요한 컬럼만 고른 Query (첫 컬럼은 Video.id). 필터·정렬은 Video 쿼리와 같이 추가."""
+        from app.models import User, Video
+
+        columns, seen = [Video.id], {"id"}
+        mapping = _field_columns()
+        for name in self.fields:
+            for column in mapping.get(name, ()):
+                if column.key not in seen:
+                    seen.add(column.key)
+                    columns.append(column)
+        query = session.query(*columns).select_from(Video)
+        if "channel" in self.fields:
+            query = query.outerjoin(User, User.id == Video.user_id)
+        return query
+
+    def dump_rows(self, session, rows, pending_views=None):
+        """query() 결과 행 목록 → dict 목록. pending_views: {video_id: 아직 반영 안 된 조회수}."""
+        tags = tag_names(session, [row.id for row in rows]) if "tags" in self.fields else None
+        items = []
+        for row in rows:
+            values = row._mapping
+            item = {}
+            for name in self.fields:
+                if name == "video_url":
+                    item[name] = self.urls.video(values["video_path"], values["video_url"])
+                elif name == "thumbnail_url":
+                    item[name] = self.urls.thumbnail(values["thumbnail_path"], values["thumbnail_url"])
+                elif name == "channel":
+                    item[name] = {"id": values["channel_id"], "username": values["channel_username"] or "unknown"}
+                elif name == "tags":
+                    item[name] = tags[row.id]
+                elif name in ("description", "category"):
+                    item[name] = values[name] or ""
+                elif name == "created_at":
+                    item[name] = values[name].isoformat() if values[name] else None
+                elif name == "views" and pending_views:
+                    item[name] = (values[name] or 0) + pending_views.get(row.id, 0)
+                else:
+                    item[name] = values[name]
+            items.append(item)
+        return items
+
+    def dump_video(self, video):
+        """이미 로드한 Video 객체 → dict (상세·관련 동영상)."""
+        item = {}
+        for name in self.fields:
+            if name == "video_url":
+                item[name] = self.urls.video(video.video_path, video.video_url)
+            elif name == "thumbnail_url":
+                item[name] = self.urls.thumbnail(video.thumbnail_path, video.thumbnail_url)
+            elif name == "channel":
+                user = video.user
+                item[name] = {"id": user.id if user else None, "username": user.username if user else "unknown"}
+            elif name == "tags":
+                item[name] = [t.name for t in video.tags] if video.tags else []
+            elif name in ("description", "category"):
+                item[name] = getattr(video, name) or ""
+            elif name == "created_at":
+                item[name] = video.created_at.isoformat() if video.created_at else None
+            else:
+                item[name] = getattr(video, name)
+        return item
+
+
+# ---------------------------------------------------------------------------
+# JSON 인코더 (orjson, 선택)
+# ---------------------------------------------------------------------------
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify·request.get_json 을 orjson 으로 처리. 그 외 타입은 Flask 기본 변환(default) 사용."""
+
+    def __init__(self, app):
+        import orjson
+
+        super().__init__(app)
+        self._orjson = orjson
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        option = self._orjson.OPT_NON_STR_KEYS | self._orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= self._orjson.OPT_SORT_KEYS
+        try:
+            return self._orjson.dumps(obj, default=self.default, option=option).decode()
+        except TypeError:
+            # namedtuple 등 orjson 이 직접 처리하지 않는 타입 → 표준 인코더
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return self._orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        return self._app.response_class(f"{self.dumps(obj)}\n", mimetype=self.mimetype)
+
+
+def install_json_provider(app):
+    """API_JSON_ORJSON 이고 orjson 이 설치돼 있으면 app.json 교체. 반환: 사용 여부."""
+    if not app.config.get("API_JSON_ORJSON", True):
+        return False
+    try:
+        app.json = OrjsonProvider(app)
+    except ImportError:
+        return False
+    return True
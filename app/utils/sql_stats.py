@@ -0,0 +1,263 @@
+"""
+SQL 계측 – 엔진 before/after_cursor_execute 로 SQL 문마다 실행 시간을 재서 요청별·지문별로 집계.
+
+- 지문(fingerprint): 문자열·숫자 리터럴과 바인드 자리를 ? 로, IN (?, ?, ...) 을 IN (?) 로, 공백을 한 칸으로
+  바꾼 SQL. 같은 모양의 쿼리는 인자·IN 목록 길이와 관계없이 한 줄로 모임 (SqlStats.top(), 관리자 /admin/sql).
+- 요청별: SQL 문 수(request_cache.query_count), DB 시간 합계, 가장 느린 문 REQUEST_SLOWEST 개 → request_sql_stats().
+  SQL_SERVER_TIMING(None 이면 DEBUG 일 때만)이면 응답 헤더 Server-Timing 에 db·app 시간.
+- 느린 쿼리: SQL_SLOW_QUERY_MS 이상이면 최근 SLOW_QUERY_KEEP 개를 메모리에 보관, SQL_SLOW_QUERY_LOG 를 주면
+  그 파일에도 한 줄씩 (LOG_MAX_BYTES 넘으면 교체, LOG_BACKUPS 개 유지).
+- 요청 밖(조회수 flush 스레드, 작업 워커 등)의 SQL 도 앱 컨텍스트가 있으면 지문 통계에 포함.
+"""
+
+import logging
+import logging.handlers
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+
+from app.utils.request_cache import query_count
+
+# 요청마다 기록할 느린 문 수, 메모리에 보관할 최근 느린 쿼리 수, 느린 쿼리 로그의 SQL 최대 길이
+REQUEST_SLOWEST = 3
+SLOW_QUERY_KEEP = 200
+SLOW_QUERY_MAX_SQL = 2000
+# 느린 쿼리 로그 파일 교체 크기(바이트)·보관 개수
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+# g 속성 이름: 요청 시작 시각, DB 시간 합계(초), 느린 문 [(초, 지문)]
+_START_ATTR = "_sql_request_start"
+_TIME_ATTR = "_sql_request_time"
+_SLOWEST_ATTR = "_sql_request_slowest"
+# connection.info 키: 실행 중인 문의 시작 시각 스택
+_TIMER_KEY = "sql_stats_start"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_VALUES_LIST = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement):
+    """SQL 문 → 정규화한 지문 (리터럴·바인드 → ?, IN 목록 → (?), 공백 정리)."""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _IN_LIST.sub("(?)", sql)
+    sql = _VALUES_LIST.sub(r"\1", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+# ---------------------------------------------------------------------------
+# 지문별 누적 통계
+# ---------------------------------------------------------------------------
+class _Fingerprint:
+    __slots__ = ("sql", "calls", "total", "max", "last_at")
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last_at = None
+
+
+class SqlStats:
+    """SQL 지문별 호출 수·시간 + 최근 느린 쿼리. app.extensions["sql_stats"]로 접근."""
+
+    def __init__(self, app=None):
+        self._app = None
+        self._lock = threading.Lock()
+        self._fingerprints = {}
+        self._slow = deque(maxlen=SLOW_QUERY_KEEP)
+        self._log_handler = None
+        self.since = datetime.now(timezone.utc)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("SQL_STATS_ENABLED", True)
+        app.config.setdefault("SQL_SLOW_QUERY_MS", 100)
+        app.config.setdefault("SQL_SLOW_QUERY_LOG", None)
+        app.config.setdefault("SQL_STATS_MAX_FINGERPRINTS", 500)
+        app.config.setdefault("SQL_SERVER_TIMING", None)
+        self._app = app
+        app.extensions["sql_stats"] = self
+
+    @property
+    def enabled(self):
+        return bool(self._app.config.get("SQL_STATS_ENABLED", True))
+
+    def record(self, statement, elapsed, where=None):
+        """SQL 문 1개 실행 결과 반영 (elapsed: 초). 반환: 지문."""
+        sql = fingerprint(statement)
+        now = datetime.now(timezone.utc)
+        limit = int(self._app.config.get("SQL_STATS_MAX_FINGERPRINTS", 500))
+        with self._lock:
+            entry = self._fingerprints.get(sql)
+            if entry is None:
+                if len(self._fingerprints) >= limit > 0:
+                    # 가득 차면 총 시간이 가장 작은 지문을 버림
+                    del self._fingerprints[min(self._fingerprints.values(), key=lambda e: e.total).sql]
+                entry = self._fingerprints[sql] = _Fingerprint(sql)
+            entry.calls += 1
+            entry.total += elapsed
+            entry.max = max(entry.max, elapsed)
+            entry.last_at = now
+        if elapsed * 1000 >= float(self._app.config.get("SQL_SLOW_QUERY_MS", 100)):
+            self._record_slow(statement, sql, elapsed, where, now)
+        return sql
+
+    def _record_slow(self, statement, sql, elapsed, where, now):
+        item = {"at": now, "ms": elapsed * 1000, "where": where or "-", "fingerprint": sql}
+        with self._lock:
+            self._slow.append(item)
+        handler = self._slow_log_handler()
+        if handler is not None:
+            line = f"{item['ms']:.1f}ms {item['where']} | {_SPACE.sub(' ', statement)[:SLOW_QUERY_MAX_SQL]}"
+            handler.handle(logging.makeLogRecord({"msg": line, "levelno": logging.WARNING, "levelname": "WARNING"}))
+
+    def _slow_log_handler(self):
+        path = self._app.config.get("SQL_SLOW_QUERY_LOG")
+        if not path:
+            return None
+        with self._lock:
+            if self._log_handler is None or self._log_handler.baseFilename != os.path.abspath(path):
+                if self._log_handler is not None:
+                    self._log_handler.close()
+                handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8", delay=True
+                )
+                handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+                self._log_handler = handler
+            return self._log_handler
+
+    def top(self, limit=50, order="total"):
+        """지문별 통계 dict 목록 (order: total | calls | avg | max 내림차순)."""
+        with self._lock:
+            rows = [
+                {
+                    "fingerprint": e.sql,
+                    "calls": e.calls,
+                    "total_ms": e.total * 1000,
+                    "avg_ms": e.total * 1000 / e.calls,
+                    "max_ms": e.max * 1000,
+                    "last_at": e.last_at,
+                }
+                for e in self._fingerprints.values()
+            ]
+        key = {"calls": "calls", "avg": "avg_ms", "max": "max_ms"}.get(order, "total_ms")
+        rows.sort(key=lambda row: row[key], reverse=True)
+        return rows[:limit]
+
+    def slow_queries(self):
+        """최근 느린 쿼리 (최신순)."""
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def reset(self):
+        with self._lock:
+            self._fingerprints.clear()
+            self._slow.clear()
+            self.since = datetime.now(timezone.utc)
+
+
+def get_sql_stats():
+    """현재 앱의 SqlStats 반환."""
+    return current_app.extensions["sql_stats"]
+
+
+# ---------------------------------------------------------------------------
+# 엔진 이벤트
+# ---------------------------------------------------------------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_TIMER_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timers = conn.info.get(_TIMER_KEY)
+    if not timers:
+        return
+    elapsed = time.perf_counter() - timers.pop()
+    if not has_app_context():
+        return
+    stats = current_app.extensions.get("sql_stats")
+    if stats is None or not stats.enabled:
+        return
+    in_request = has_request_context()
+    sql = stats.record(statement, elapsed, f"{request.method} {request.path}" if in_request else None)
+    if in_request:
+        setattr(g, _TIME_ATTR, g.get(_TIME_ATTR, 0.0) + elapsed)
+        slowest = g.get(_SLOWEST_ATTR)
+        if slowest is None:
+            slowest = []
+            setattr(g, _SLOWEST_ATTR, slowest)
+        if len(slowest) < REQUEST_SLOWEST or elapsed > slowest[-1][0]:
+            slowest.append((elapsed, sql))
+            slowest.sort(key=lambda item: item[0], reverse=True)
+            del slowest[REQUEST_SLOWEST:]
+
+
+def _handle_error(exception_context):
+    # 실패한 문은 after_cursor_execute 가 오지 않으므로 시작 시각만 버림 (풀의 연결에 쌓이지 않게)
+    connection = exception_context.connection
+    timers = connection.info.get(_TIMER_KEY) if connection is not None else None
+    if timers:
+        timers.pop()
+
+
+# ---------------------------------------------------------------------------
+# 요청별 집계·Server-Timing
+# ---------------------------------------------------------------------------
+def request_sql_stats():
+    """현재 요청의 {"count": SQL 문 수, "db_ms": DB 시간 합계, "slowest": [{"ms", "fingerprint"}]}."""
+    if not has_request_context():
+        return {"count": 0, "db_ms": 0.0, "slowest": []}
+    return {
+        "count": query_count(),
+        "db_ms": g.get(_TIME_ATTR, 0.0) * 1000,
+        "slowest": [{"ms": elapsed * 1000, "fingerprint": sql} for elapsed, sql in g.get(_SLOWEST_ATTR) or ()],
+    }
+
+
+def _server_timing_enabled():
+    value = current_app.config.get("SQL_SERVER_TIMING")
+    return current_app.debug if value is None else bool(value)
+
+
+def _before_request():
+    setattr(g, _START_ATTR, time.perf_counter())
+    setattr(g, _TIME_ATTR, 0.0)
+    g.pop(_SLOWEST_ATTR, None)
+
+
+def _after_request(response):
+    if _server_timing_enabled():
+        stats = request_sql_stats()
+        timing = f'db;dur={stats["db_ms"]:.2f};desc="{stats["count"]} queries"'
+        started = g.get(_START_ATTR)
+        if started is not None:
+            timing += f", app;dur={(time.perf_counter() - started) * 1000:.2f}"
+        response.headers.add("Server-Timing", timing)
+    return response
+
+
+def init_sql_stats(app, db):
+    """create_app 에서 호출 (앱 컨텍스트 안). 이 앱 엔진의 SQL 시간 측정·요청 훅 등록."""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    if not event.contains(db.engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(db.engine, "handle_error", _handle_error)
@@ -0,0 +1,112 @@
+"""
+구독 상태·구독자 수 – 채널 여러 개를 쿼리 1번씩으로, 구독 토글은 재집계(COUNT) 없이 원자적 증감.
+
+- subscription_states(): 사용자가 channel_ids 중 어떤 채널을 구독 중인지 (subscriptions PK 범위 조회 1번).
+- subscriber_counts(): channel_stats.subscriber_count 조회 1번 (행이 없는 채널만 subscriptions GROUP BY 1번 더).
+- toggle_subscription(): 좋아요 토글(app/utils/likes.py)과 같은 방식 – DELETE (지워졌으면 해제) → 아니면
+  INSERT ... ON CONFLICT DO NOTHING, rowcount 로 판별 후 channel_stats.subscriber_count ± 1 (RETURNING 으로 새 값).
+  Core 문이라 Subscription 이벤트가 없으므로 구독 피드 inbox 채움·정리(app/utils/feed.py)도 같은 트랜잭션에서 직접 호출.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select, update
+
+from app.utils.feed import backfill_subscription, remove_subscription
+from app.utils.likes import insert_ignore
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+def _ids(channel_ids):
+    return sorted({int(c) for c in channel_ids if c is not None})
+
+
+def subscription_states(session, user_id, channel_ids):
+    """{channel_id: 구독 중 여부} (모든 channel_ids 포함, 비로그인 None 이면 모두 False). 쿼리 1번."""
+    from app.models import Subscription
+
+    ids = _ids(channel_ids)
+    states = dict.fromkeys(ids, False)
+    if not user_id or not ids:
+        return states
+    rows = session.execute(
+        select(Subscription.subscribed_to_id).where(
+            Subscription.subscriber_id == user_id, Subscription.subscribed_to_id.in_(ids)
+        )
+    ).scalars()
+    states.update(dict.fromkeys(rows, True))
+    return states
+
+
+def subscriber_counts(session, channel_ids):
+    """{channel_id: 구독자 수}. channel_stats 1번, 통계 행이 없는 채널만 subscriptions 집계 1번 더."""
+    from app.models import ChannelStats, Subscription
+
+    ids = _ids(channel_ids)
+    if not ids:
+        return {}
+    counts = dict(
+        session.execute(
+            select(ChannelStats.user_id, ChannelStats.subscriber_count).where(ChannelStats.user_id.in_(ids))
+        ).all()
+    )
+    missing = [c for c in ids if c not in counts]
+    if missing:
+        counts.update(dict.fromkeys(missing, 0))
+        counts.update(
+            session.execute(
+                select(Subscription.subscribed_to_id, func.count())
+                .where(Subscription.subscribed_to_id.in_(missing))
+                .group_by(Subscription.subscribed_to_id)
+            ).all()
+        )
+    return {c: int(n or 0) for c, n in counts.items()}
+
+
+def toggle_subscription(session, subscriber_id, channel_id, commit=True):
+    """
+    subscriber_id 의 channel_id 구독 토글. 반환: (is_subscribed, subscriber_count).
+    subscriber_count 는 갱신 직후 channel_stats 값 (통계 행이 없는 채널은 subscriptions 집계).
+    """
+    from app.models import ChannelStats, Subscription
+
+    table = Subscription.__table__
+    removed = session.execute(
+        delete(table).where(table.c.subscriber_id == subscriber_id, table.c.subscribed_to_id == channel_id)
+    ).rowcount
+    if removed:
+        subscribed, delta = False, -1
+    else:
+        inserted = session.execute(
+            insert_ignore(session, table).values(
+                subscriber_id=subscriber_id, subscribed_to_id=channel_id, created_at=_utc_now()
+            )
+        ).rowcount
+        # 0 이면 같은 사용자의 동시 요청이 먼저 추가한 것 – 상태는 '구독', 증감 없음
+        subscribed, delta = True, (1 if inserted else 0)
+
+    count = None
+    if delta:
+        stats = ChannelStats.__table__
+        stmt = (
+            update(stats)
+            .where(stats.c.user_id == channel_id)
+            .values(subscriber_count=stats.c.subscriber_count + delta, updated_at=_utc_now())
+        )
+        if session.get_bind().dialect.update_returning:
+            count = session.execute(stmt.returning(stats.c.subscriber_count)).scalar()
+        else:
+            session.execute(stmt)
+        # 구독 피드 inbox: 새 구독은 최근 영상 채움, 해제는 그 채널 행 삭제
+        if subscribed:
+            backfill_subscription(session, subscriber_id, channel_id)
+        else:
+            remove_subscription(session, subscriber_id, channel_id)
+    if count is None:
+        count = subscriber_counts(session, [channel_id]).get(channel_id, 0)
+    if commit:
+        session.commit()
+    return subscribed, int(count)
@@ -0,0 +1,176 @@
+"""
+태그별 비디오 수(tags.video_count) 유지 + 인기 태그 상위 N 캐시.
+
+- 증감: Video.save_tags·retag_videos(app/utils/tags.py) 에서 추가·제거된 태그만 video_count ± 1 (같은 트랜잭션, 원자적 UPDATE).
+  비디오 삭제는 세션 before_flush 에서 video_tags 를 읽어 연결된 태그를 - 1.
+- 조회: get_popular_tags() 는 video_count 인덱스로 상위 N 개만 읽고, 앱별 메모리 캐시에
+  POPULAR_TAGS_CACHE_TTL 초(기본 60) 동안 보관 → 홈·태그 페이지에서 video_tags GROUP BY 없음.
+  카운트가 바뀐 트랜잭션이 커밋되면 캐시를 비움.
+- 복구: repair_tag_counts() 가 video_tags 기준으로 전체 재계산 (scripts/repair_tag_counts.py).
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import bindparam, event, select, text
+from sqlalchemy.orm import Session
+
+from app.utils.response_cache import TAGS, VIDEOS, invalidate_responses
+
+# 캐시에 보관하는 상위 태그 수 (API limit 최대값과 동일)
+POPULAR_TAGS_CACHE_SIZE = 50
+
+# 캐시 항목 (템플릿·API 에서 Tag 대신 사용: id, name, video_count)
+PopularTag = namedtuple("PopularTag", ["id", "name", "video_count"])
+
+# 세션 info 키: 이 트랜잭션에서 태그 카운트가 바뀌었는지
+_DIRTY_KEY = "tag_counts_dirty"
+_listeners_installed = False
+
+
+# ---------------------------------------------------------------------------
+# 카운트 증감
+# ---------------------------------------------------------------------------
+def adjust_tag_counts(session, tag_ids, delta):
+    """tag_ids 의 video_count 를 delta 만큼 변경 (0 미만으로 내려가지 않음)."""
+    tag_ids = sorted({int(t) for t in tag_ids if t is not None})
+    if not tag_ids or not delta:
+        return
+    session.execute(
+        text(
+            "UPDATE tags SET video_count = CASE WHEN video_count + :delta < 0 THEN 0 "
+            "ELSE video_count + :delta END WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True)),
+        {"delta": int(delta), "ids": tag_ids},
+    )
+    session.info[_DIRTY_KEY] = True
+
+
+def _before_flush(session, flush_context, instances):
+    """삭제 예정 Video 의 태그 카운트 - 1 (video_tags 행이 지워지기 전에 조회)."""
+    from app.models import Video
+    from app.models.video import video_tags
+
+    video_ids = [obj.id for obj in session.deleted if isinstance(obj, Video) and obj.id is not None]
+    if not video_ids:
+        return
+    rows = session.execute(
+        select(video_tags.c.tag_id).where(video_tags.c.video_id.in_(video_ids))
+    ).fetchall()
+    # 같은 태그가 여러 삭제 비디오에 걸려 있으면 그 수만큼 감소
+    counts = {}
+    for (tag_id,) in rows:
+        counts[tag_id] = counts.get(tag_id, 0) + 1
+    by_delta = {}
+    for tag_id, n in counts.items():
+        by_delta.setdefault(n, []).append(tag_id)
+    for n, ids in by_delta.items():
+        adjust_tag_counts(session, ids, -n)
+
+
+def _after_commit(session):
+    if session.info.pop(_DIRTY_KEY, False) and has_app_context():
+        invalidate_popular_tags()
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_DIRTY_KEY, None)
+
+
+def install_listeners():
+    """세션 이벤트 등록 (create_app 에서 1회)."""
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "before_flush", _before_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+# ---------------------------------------------------------------------------
+# 인기 태그 캐시
+# ---------------------------------------------------------------------------
+class _PopularTagsCache:
+    """상위 POPULAR_TAGS_CACHE_SIZE 개 태그 목록과 만료 시각. 앱별 1개."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items = None
+        self._expires = 0.0
+
+    def get(self):
+        with self._lock:
+            if self._items is not None and self._expires > time.monotonic():
+                return self._items
+            return None
+
+    def set(self, items, ttl):
+        with self._lock:
+            self._items = items
+            self._expires = time.monotonic() + ttl
+
+    def clear(self):
+        with self._lock:
+            self._items = None
+
+
+def _cache():
+    return current_app.extensions.setdefault("popular_tags_cache", _PopularTagsCache())
+
+
+def _load_top_tags(limit):
+    from app import db
+    from app.models import Tag
+
+    rows = (
+        db.session.query(Tag.id, Tag.name, Tag.video_count)
+        .filter(Tag.video_count > 0)
+        .order_by(Tag.video_count.desc(), Tag.id)
+        .limit(limit)
+        .all()
+    )
+    return [PopularTag(*row) for row in rows]
+
+
+def get_popular_tags(limit=12):
+    """비디오 수 기준 상위 limit 개 태그 (PopularTag 목록). TTL 캐시 사용."""
+    limit = max(0, int(limit))
+    ttl = float(current_app.config.get("POPULAR_TAGS_CACHE_TTL", 60))
+    if ttl <= 0 or limit > POPULAR_TAGS_CACHE_SIZE:
+        return _load_top_tags(limit)
+    cache = _cache()
+    items = cache.get()
+    if items is None:
+        items = _load_top_tags(POPULAR_TAGS_CACHE_SIZE)
+        cache.set(items, ttl)
+    return items[:limit]
+
+
+def invalidate_popular_tags():
+    """인기 태그 캐시 비우기 (카운트 변경 커밋 후 자동 호출). 태그·비디오 목록 응답 캐시도 무효화."""
+    _cache().clear()
+    invalidate_responses(TAGS, VIDEOS)
+
+
+# ---------------------------------------------------------------------------
+# 정합성 복구
+# ---------------------------------------------------------------------------
+def repair_tag_counts(db):
+    """
+    video_tags 기준으로 모든 태그의 video_count 재계산.
+    반환: 값이 달라서 고친 태그 수.
+    """
+    fixed = db.session.execute(
+        text(
+            "UPDATE tags SET video_count = ("
+            "SELECT COUNT(*) FROM video_tags WHERE video_tags.tag_id = tags.id) "
+            "WHERE video_count <> ("
+            "SELECT COUNT(*) FROM video_tags WHERE video_tags.tag_id = tags.id)"
+        )
+    ).rowcount
+    db.session.commit()
+    invalidate_popular_tags()
+    return fixed or 0
@@ -0,0 +1,295 @@
+"""
+태그 일괄 처리 – 태그 이름 정규화, 이름 → id 일괄 조회·생성, 여러 비디오 태그 일괄 변경.
+
+- 정규화: 앞뒤 공백 제거 + 연속 공백 1칸, 대소문자 무시 비교("Python" == "python", "Été" == "été",
+  먼저 쓴 표기 유지). 비교 키는 파이썬 casefold() 로 만들어 tags.name_key(유니크)에 저장 –
+  SQLite lower() 는 ASCII 만 바꾸므로 DB 함수로 비교하지 않음. 50자 초과·빈 이름은 무시.
+- resolve_tags(): 캐시에 없는 키를 name_key IN 쿼리 1번으로 조회, 없는 태그는
+  INSERT ... ON CONFLICT DO NOTHING 1번으로 생성 후 다시 조회 (동시 업로드 중복 생성 경쟁 없음).
+- 이름 → (id, 표기) 캐시: 앱별 프로세스 메모리. 트랜잭션이 커밋된 뒤에만 반영 (롤백된 태그 id 보관 방지).
+  태그를 직접 SQL 로 삭제했다면 clear_tag_cache() 호출.
+- retag_videos(): 여러 비디오의 태그를 한 번에 교체/추가 – video_tags 조회·삭제·삽입 각 1번,
+  tags.video_count 증감·관련 동영상 목록 무효화 포함 (관리자 일괄 변경, scripts/seed_db.py). Video.save_tags 도 이 함수 사용.
+"""
+
+import threading
+
+from flask import current_app, has_app_context
+from sqlalchemy import delete, event, insert, select, text, tuple_
+from sqlalchemy.orm import Session
+
+MAX_TAG_LENGTH = 50
+
+# IN 목록 최대 크기 (SQLite 바인드 변수 제한 대비)
+_CHUNK = 500
+
+# 세션 info 키: 커밋 후 캐시에 넣을 (키, id, 표기)
+_PENDING_KEY = "tag_cache_pending"
+_listeners_installed = False
+
+
+# ---------------------------------------------------------------------------
+# 정규화
+# ---------------------------------------------------------------------------
+def normalize_tag_name(name):
+    """공백 정리한 표시용 이름. 빈 문자열이면 ''."""
+    return " ".join(str(name or "").split())
+
+
+def tag_key(name):
+    """대소문자·공백 무시 비교 키 (casefold: 비ASCII 대소문자도 같은 키)."""
+    return normalize_tag_name(name).casefold()
+
+
+def parse_tag_names(value):
+    """
+    콤마 구분 문자열(또는 이름 목록) → 정규화된 이름 목록.
+    대소문자만 다른 중복은 처음 나온 표기 하나만 남김. 50자 초과·빈 이름 제외.
+    """
+    if not value:
+        return []
+    raw = value.split(",") if isinstance(value, str) else value
+    names = []
+    seen = set()
+    for item in raw:
+        name = normalize_tag_name(item)
+        if not name or len(name) > MAX_TAG_LENGTH:
+            continue
+        key = name.casefold()
+        if key in seen:
+            continue
+        seen.add(key)
+        names.append(name)
+    return names
+
+
+def _chunks(items):
+    items = list(items)
+    for i in range(0, len(items), _CHUNK):
+        yield items[i:i + _CHUNK]
+
+
+# ---------------------------------------------------------------------------
+# 이름 → id 캐시
+# ---------------------------------------------------------------------------
+class _TagIdCache:
+    """정규화 키 → (id, 표기). 앱별 1개, 최대 max_size 개 (넘치면 비움)."""
+
+    def __init__(self, max_size=10000):
+        self._lock = threading.Lock()
+        self._data = {}
+        self.max_size = max_size
+
+    def get_many(self, keys):
+        with self._lock:
+            return {k: self._data[k] for k in keys if k in self._data}
+
+    def update(self, entries):
+        with self._lock:
+            if len(self._data) + len(entries) > self.max_size:
+                self._data.clear()
+            self._data.update(entries)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _cache():
+    return current_app.extensions.setdefault("tag_id_cache", _TagIdCache())
+
+
+def clear_tag_cache():
+    """이름 → id 캐시 비우기."""
+    _cache().clear()
+
+
+def _after_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and has_app_context():
+        _cache().update(pending)
+
+
+def _after_rollback(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _install_listeners():
+    global _listeners_installed
+    if _listeners_installed:
+        return
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_soft_rollback", _after_rollback)
+    _listeners_installed = True
+
+
+# ---------------------------------------------------------------------------
+# 일괄 조회·생성
+# ---------------------------------------------------------------------------
+def _insert_missing(session, names):
+    """없는 태그 생성. 이미 있는 이름(동시 생성 포함)은 건너뜀."""
+    from app.models import Tag
+
+    rows = [{"name": n, "name_key": tag_key(n)} for n in names]
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        for chunk in _chunks(rows):
+            # name·name_key 어느 쪽이 겹쳐도 건너뜀
+            session.execute(upsert(Tag.__table__).values(chunk).on_conflict_do_nothing())
+        return
+    # ON CONFLICT 미지원 DB: 이름별 SAVEPOINT 로 중복만 무시
+    from sqlalchemy.exc import IntegrityError
+
+    for row in rows:
+        try:
+            with session.begin_nested():
+                session.execute(insert(Tag.__table__).values(row))
+        except IntegrityError:
+            pass
+
+
+def _resolve_map(session, names, create):
+    """정규화 키 → (id, 표기). 입력 순서 유지."""
+    from app.models import Tag
+
+    _install_listeners()
+    names = parse_tag_names(names)
+    if not names:
+        return {}
+    keys = {tag_key(name): name for name in names}
+    cache = _cache()
+    found = cache.get_many(keys)
+    fresh = {}
+
+    def _lookup():
+        for chunk in _chunks([k for k in keys if k not in found]):
+            rows = session.execute(select(Tag.id, Tag.name, Tag.name_key).where(Tag.name_key.in_(chunk))).all()
+            for tag_id, tag_name, k in rows:
+                if k in keys and k not in found:
+                    found[k] = fresh[k] = (tag_id, tag_name)
+
+    # 1) 비교 키(name_key 유니크 인덱스)로 조회
+    _lookup()
+    missing = [keys[k] for k in keys if k not in found]
+    if missing and create:
+        # 2) 없는 이름만 한 번에 생성 → 생성된(또는 동시에 다른 요청이 만든) 행 다시 조회
+        _insert_missing(session, missing)
+        _lookup()
+
+    if fresh:
+        session.info.setdefault(_PENDING_KEY, {}).update(fresh)
+    return {k: found[k] for k in keys if k in found}
+
+
+def resolve_tags(session, names, create=True):
+    """
+    태그 이름 목록 → [(id, 표기)] (입력 순서, 정규화·중복 제거 후).
+    create=False 면 없는 태그는 결과에서 제외.
+    """
+    return list(_resolve_map(session, names, create).values())
+
+
+# ---------------------------------------------------------------------------
+# 여러 비디오 태그 일괄 변경
+# ---------------------------------------------------------------------------
+def retag_videos(session, video_tags_map, replace=True, commit=True):
+    """
+    {video_id: 태그 문자열 또는 이름 목록} 으로 여러 비디오의 태그를 한 번에 설정.
+    replace=False 면 기존 태그는 두고 추가만 함. 반환: {"added": n, "removed": n} (연결 행 수).
+    """
+    from app.models import Video
+    from app.models.video import video_tags
+    from app.utils.related import invalidate_related
+    from app.utils.tag_stats import adjust_tag_counts
+
+    wanted = {int(vid): parse_tag_names(value) for vid, value in video_tags_map.items()}
+    if not wanted:
+        return {"added": 0, "removed": 0}
+
+    all_names = [n for names in wanted.values() for n in names]
+    resolved = {k: tag_id for k, (tag_id, _name) in _resolve_map(session, all_names, True).items()}
+
+    current = {vid: set() for vid in wanted}
+    for chunk in _chunks(wanted):
+        rows = session.execute(
+            select(video_tags.c.video_id, video_tags.c.tag_id).where(video_tags.c.video_id.in_(chunk))
+        ).all()
+        for vid, tag_id in rows:
+            current[vid].add(tag_id)
+
+    to_add, to_remove = [], []
+    deltas = {}
+    for vid, names in wanted.items():
+        new_ids = {resolved[tag_key(n)] for n in names if tag_key(n) in resolved}
+        for tag_id in new_ids - current[vid]:
+            to_add.append({"video_id": vid, "tag_id": tag_id})
+            deltas[tag_id] = deltas.get(tag_id, 0) + 1
+        if replace:
+            for tag_id in current[vid] - new_ids:
+                to_remove.append((vid, tag_id))
+                deltas[tag_id] = deltas.get(tag_id, 0) - 1
+
+    for chunk in _chunks(to_remove):
+        session.execute(delete(video_tags).where(tuple_(video_tags.c.video_id, video_tags.c.tag_id).in_(chunk)))
+    if to_add:
+        session.execute(insert(video_tags), to_add)
+
+    by_delta = {}
+    for tag_id, d in deltas.items():
+        if d:
+            by_delta.setdefault(d, []).append(tag_id)
+    for d, ids in by_delta.items():
+        adjust_tag_counts(session, ids, d)
+
+    # 태그가 바뀐 비디오와 관련된 추천 목록은 다음 조회 때 재계산
+    changed = {vid for vid, _ in to_remove} | {row["video_id"] for row in to_add}
+    if changed:
+        invalidate_related(session, changed, {row["tag_id"] for row in to_add})
+
+    # 이미 로드된 Video.tags 는 다음 접근 시 다시 조회
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Video) and obj.id in wanted:
+            session.expire(obj, ["tags"])
+
+    if commit:
+        session.commit()
+    return {"added": len(to_add), "removed": len(to_remove)}
+
+
+# ---------------------------------------------------------------------------
+# 기존 DB 마이그레이션 – name_key 채우기
+# ---------------------------------------------------------------------------
+def backfill_tag_keys(session):
+    """
+    name_key 가 비었거나 tag_key() 와 다른 태그의 키를 채움. 같은 키가 된 태그(예: 예전에 따로 생긴
+    "Été"/"été")는 id 가 가장 작은 태그 하나로 합침 (video_tags 연결 이동, 나머지 삭제).
+    반환: 합쳐서 지운 태그 수. 호출한 쪽에서 커밋·video_count 재계산.
+    """
+    rows = session.execute(text("SELECT id, name, name_key FROM tags ORDER BY id")).all()
+    keepers = {}
+    merged = {}
+    for tag_id, name, name_key in rows:
+        key = tag_key(name)
+        if key in keepers:
+            merged[tag_id] = keepers[key]
+        else:
+            keepers[key] = (tag_id, key, name_key)
+    for dup_id, (keep_id, _key, _old) in merged.items():
+        # 두 태그에 모두 연결된 비디오는 남는 태그 연결만 유지
+        session.execute(
+            text(
+                "DELETE FROM video_tags WHERE tag_id = :dup AND video_id IN "
+                "(SELECT video_id FROM video_tags WHERE tag_id = :keep)"
+            ),
+            {"dup": dup_id, "keep": keep_id},
+        )
+        session.execute(text("UPDATE video_tags SET tag_id = :keep WHERE tag_id = :dup"), {"dup": dup_id, "keep": keep_id})
+        session.execute(text("DELETE FROM tags WHERE id = :dup"), {"dup": dup_id})
+    for tag_id, key, name_key in keepers.values():
+        if name_key != key:
+            session.execute(text("UPDATE tags SET name_key = :key WHERE id = :id"), {"key": key, "id": tag_id})
+    return len(merged)
@@ -0,0 +1,279 @@
+"""
+썸네일·프로필 이미지 변형(variant) – 고정 너비 WebP(·AVIF) 축소본 생성 + 디스크 캐시.
+
+- 파일명: <원본 내용 sha256 앞 32자>_<너비>.<형식> (THUMBNAIL_VARIANT_FOLDER)
+  → 같은 내용의 원본은 한 번만 생성, 파일명이 내용 주소라 /media/variants/... 응답은 immutable 캐시.
+  원본 해시는 (경로, 크기, 수정 시각) 기준으로 메모리에 보관 → 요청마다 원본을 다시 읽지 않음.
+- 너비: THUMBNAIL_VARIANT_WIDTHS (기본 320/640/1280). 원본보다 크게 키우지 않음 (원본 너비로 인코딩만).
+  형식: THUMBNAIL_VARIANT_FORMATS (기본 webp, Pillow 가 지원하면 avif 추가 가능).
+- 생성: ProcessPoolExecutor (THUMBNAIL_WORKERS 개, 디코딩·리사이즈·인코딩은 CPU 작업이라 별도 프로세스).
+  작업 프로세스는 forkserver(없으면 spawn)로 띄움 – 요청 스레드에서 처음 만들 때 다른 스레드(조회수 flush,
+  작업 큐 워커)가 잡고 있던 잠금을 fork 로 복사하지 않도록. 작업 함수는 app/utils/image_worker.py.
+  원본 1번 디코딩으로 모든 너비·형식 생성. 생성에 실패한 원본은 THUMBNAIL_FAILED_TTL 초 동안 재시도 안 함. 업로드 직후 precompute_variants() 로 미리 생성하고,
+  요청 시 아직 없으면 생성만 요청하고 원본으로 redirect → 요청이 생성 완료를 기다리지 않음.
+  THUMBNAIL_WORKERS=0 이면 호출한 곳에서 바로 생성 (테스트·스크립트).
+- srcset: variant_srcset(kind, filename) → "<url> 320w, <url> 640w, ...".
+  Cloudinary URL 은 변환 URL (c_limit,w_<너비>,f_auto,q_auto) 로 같은 역할.
+"""
+
+import atexit
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app, url_for
+
+from app.utils.image_worker import render_variants
+
+# 종류 → (원본 폴더 설정 키, 원본 서빙 엔드포인트)
+SOURCE_KINDS = {
+    "thumbnails": ("THUMBNAIL_FOLDER", "main.media_thumbnail"),
+    "profiles": ("PROFILE_IMAGE_FOLDER", "main.media_profile"),
+}
+
+_DIGEST_CACHE_SIZE = 4096
+# 실패 기록이 이 수를 넘으면 만료된 항목 정리
+_FAILED_PRUNE_SIZE = 1024
+
+# 프로세스 종료 시 풀을 닫을 생성기 (atexit 등록은 프로세스당 1번, 앱이 사라지면 목록에서도 빠짐. view_counter 와 같은 방식)
+_live_variants = weakref.WeakSet()
+_atexit_registered = False
+
+
+def _shutdown_all():
+    for variants in list(_live_variants):
+        variants.shutdown()
+
+
+def _register_for_exit(variants):
+    global _atexit_registered
+    _live_variants.add(variants)
+    if not _atexit_registered:
+        atexit.register(_shutdown_all)
+        _atexit_registered = True
+
+
+def _file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()[:32]
+
+
+class ImageVariants:
+    """앱별 변형 생성기. create_app 에서 ImageVariants(app) 1회 → app.extensions["image_variants"]."""
+
+    def __init__(self, app):
+        from PIL import features
+
+        app.config.setdefault("THUMBNAIL_VARIANT_WIDTHS", (320, 640, 1280))
+        app.config.setdefault("THUMBNAIL_VARIANT_FORMATS", ("webp",))
+        app.config.setdefault("THUMBNAIL_VARIANT_QUALITY", 80)
+        app.config.setdefault("THUMBNAIL_WORKERS", 2)
+        app.config.setdefault("THUMBNAIL_FAILED_TTL", 600)
+        self._app = app
+        self._features = features
+        self._lock = threading.RLock()  # _generate 가 잠금 상태에서 _pool() 호출
+        self._digests = OrderedDict()  # (경로, 크기, mtime_ns) → 해시
+        self._pending = {}  # 해시 → Future
+        self._failed = {}  # 생성 실패한 원본 해시 → 재시도 가능 시각 (이미지가 아닌 파일 등)
+        self._executor = None
+        app.extensions["image_variants"] = self
+        _register_for_exit(self)
+
+    # ----- 설정 -----
+    def widths(self):
+        return tuple(sorted(int(w) for w in self._app.config.get("THUMBNAIL_VARIANT_WIDTHS") or ()))
+
+    def formats(self):
+        """설정된 형식 중 현재 Pillow 가 인코딩할 수 있는 것만."""
+        return tuple(f for f in self._app.config.get("THUMBNAIL_VARIANT_FORMATS") or () if self._features.check(f))
+
+    def folder(self):
+        return self._app.config["THUMBNAIL_VARIANT_FOLDER"]
+
+    # ----- 원본 -----
+    def source_path(self, kind, filename):
+        """원본 절대 경로 (없거나 폴더 밖 경로면 None)."""
+        from werkzeug.security import safe_join
+
+        folder_key, _ = SOURCE_KINDS[kind]
+        path = safe_join(self._app.config[folder_key], filename)
+        return path if path and os.path.isfile(path) else None
+
+    def source_digest(self, path):
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is not None:
+                self._digests.move_to_end(key)
+                return digest
+        digest = _file_digest(path)
+        with self._lock:
+            self._digests[key] = digest
+            while len(self._digests) > _DIGEST_CACHE_SIZE:
+                self._digests.popitem(last=False)
+        return digest
+
+    def _targets(self, digest):
+        folder = self.folder()
+        targets = []
+        for fmt in self.formats():
+            for width in self.widths():
+                dst = os.path.join(folder, f"{digest}_{width}.{fmt}")
+                if not os.path.exists(dst):
+                    targets.append((width, fmt, dst))
+        return targets
+
+    # ----- 생성 -----
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                # fork 는 다른 스레드가 잡은 잠금까지 복사 → 깨끗한 프로세스에서 띄우는 forkserver(없으면 spawn).
+                # 작업 함수는 image_worker 모듈에만 있음 (워커는 Pillow 와 app 패키지 import 만, 앱은 만들지 않음)
+                methods = multiprocessing.get_all_start_methods()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=int(self._app.config.get("THUMBNAIL_WORKERS", 2)),
+                    mp_context=multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn"),
+                )
+            return self._executor
+
+    def _generate(self, path, digest):
+        """digest 원본의 빠진 변형 생성 요청. 워커가 있으면 Future, 없으면 바로 생성 후 None."""
+        with self._lock:
+            retry_at = self._failed.get(digest)
+            if retry_at is not None:
+                if time.monotonic() < retry_at:
+                    return None
+                del self._failed[digest]
+            future = self._pending.get(digest)
+            if future is not None:
+                return future
+        targets = self._targets(digest)
+        if not targets:
+            return None
+        os.makedirs(self.folder(), exist_ok=True)
+        quality = int(self._app.config.get("THUMBNAIL_VARIANT_QUALITY", 80))
+        if int(self._app.config.get("THUMBNAIL_WORKERS", 2)) <= 0:
+            try:
+                render_variants(path, targets, quality)
+            except Exception as e:
+                self._mark_failed(digest, path, e)
+            return None
+        with self._lock:
+            future = self._pending.get(digest)
+            if future is not None:
+                return future
+            future = self._pool().submit(render_variants, path, targets, quality)
+            self._pending[digest] = future
+        future.add_done_callback(lambda f: self._finished(digest, path, f))
+        return future
+
+    def _finished(self, digest, path, future):
+        with self._lock:
+            self._pending.pop(digest, None)
+        error = future.exception() if not future.cancelled() else None
+        if error is not None:
+            self._mark_failed(digest, path, error)
+
+    def _mark_failed(self, digest, path, error):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._failed) >= _FAILED_PRUNE_SIZE:
+                self._failed = {d: t for d, t in self._failed.items() if t > now}
+            self._failed[digest] = now + float(self._app.config.get("THUMBNAIL_FAILED_TTL", 600))
+        self._app.logger.warning("썸네일 변형 생성 실패 %s: %s", os.path.basename(path), error)
+
+    def precompute(self, kind, filename):
+        """업로드 직후 호출 – 모든 너비·형식 생성 요청 (원본이 없으면 무시). 실패해도 예외 없음."""
+        path = self.source_path(kind, filename) if filename else None
+        if path is None:
+            return None
+        try:
+            return self._generate(path, self.source_digest(path))
+        except OSError:
+            return None
+
+    def variant_for(self, kind, filename, width, fmt):
+        """
+        변형 파일명 반환. 아직 없으면 생성을 요청하고 None (워커 없음 모드에서는 바로 생성해 반환).
+        kind·width·fmt 가 설정에 없거나 원본이 없으면 LookupError.
+        """
+        if kind not in SOURCE_KINDS or width not in self.widths() or fmt not in self.formats():
+            raise LookupError(f"지원하지 않는 변형: {kind}/{fmt}/{width}")
+        path = self.source_path(kind, filename)
+        if path is None:
+            raise LookupError(f"원본 없음: {kind}/{filename}")
+        digest = self.source_digest(path)
+        name = f"{digest}_{width}.{fmt}"
+        if os.path.exists(os.path.join(self.folder(), name)):
+            return name
+        self._generate(path, digest)
+        return name if os.path.exists(os.path.join(self.folder(), name)) else None
+
+    def wait(self, timeout=None):
+        """진행 중인 생성 작업이 끝날 때까지 대기 (스크립트·테스트용)."""
+        with self._lock:
+            futures = list(self._pending.values())
+        for f in futures:
+            try:
+                f.result(timeout=timeout)
+            except Exception:
+                pass
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_image_variants():
+    """현재 앱의 ImageVariants 반환."""
+    return current_app.extensions["image_variants"]
+
+
+def precompute_variants(kind, filename):
+    """업로드 후 변형 미리 생성 (app/routes/studio.py upload, auth 프로필 이미지)."""
+    return get_image_variants().precompute(kind, filename)
+
+
+# ---------------------------------------------------------------------------
+# URL·srcset
+# ---------------------------------------------------------------------------
+def _cloudinary_transform(url, width):
+    """Cloudinary 전달 URL 에 너비 제한·자동 형식·자동 품질 변환 추가."""
+    if "res.cloudinary.com" not in url or "/upload/" not in url:
+        return url
+    return url.replace("/upload/", f"/upload/c_limit,w_{width},f_auto,q_auto/", 1)
+
+
+def variant_url(kind, filename, width, fmt=None):
+    """로컬 원본의 width 너비 변형 URL (fmt 기본: 설정의 첫 형식). 원격 URL 이면 Cloudinary 변환 URL."""
+    if filename.startswith(("http://", "https://")):
+        return _cloudinary_transform(filename, width)
+    variants = get_image_variants()
+    formats = variants.formats()
+    if not formats:
+        return url_for(SOURCE_KINDS[kind][1], filename=filename)
+    return url_for("main.media_variant", kind=kind, fmt=fmt or formats[0], width=width, filename=filename)
+
+
+def variant_srcset(kind, filename, fmt=None):
+    """img srcset 값. 원본이 없으면 None."""
+    if not filename:
+        return None
+    variants = get_image_variants()
+    if filename.startswith(("http://", "https://")):
+        if "res.cloudinary.com" not in filename:
+            return None
+    elif not variants.formats():
+        return None
+    return ", ".join(f"{variant_url(kind, filename, w, fmt)} {w}w" for w in variants.widths()) or None
@@ -0,0 +1,340 @@
+"""
+조회수 버퍼 – watch / API 상세 조회 시 매 요청 commit 대신 증가분을 모았다가 일괄 반영.
+
+동작:
+  - increment(video_id): 증가분을 버퍼(메모리 또는 로컬 SQLite 파일)에 누적
+  - 백그라운드 스레드가 VIEW_COUNT_FLUSH_INTERVAL 초마다, 또는 누적 건수가
+    VIEW_COUNT_FLUSH_SIZE 이상이면 즉시 flush()
+  - flush(): UPDATE videos SET views = views + :delta WHERE id = :id 를 executemany 한 번으로 실행
+  - 화면·API 표시용 조회수 = DB 저장값 + 아직 반영되지 않은 증가분 (apply_pending)
+
+설정 (app.config):
+  VIEW_COUNT_BUFFERED        False면 버퍼 없이 원자적 UPDATE 후 즉시 commit (기본 True)
+  VIEW_COUNT_FLUSH_INTERVAL  백그라운드 flush 주기(초) (기본 5.0)
+  VIEW_COUNT_FLUSH_SIZE      누적 증가분이 이 값 이상이면 즉시 flush (기본 500)
+  VIEW_COUNT_STORE_PATH      지정 시 같은 호스트의 여러 워커가 공유하는 SQLite 파일 버퍼 사용
+"""
+
+import atexit
+import sqlite3
+import threading
+import weakref
+from collections import defaultdict
+from contextlib import nullcontext
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm.attributes import set_committed_value
+
+_UPDATE_SQL = text("UPDATE videos SET views = views + :delta WHERE id = :id")
+
+# apply_pending 이 덮어쓴 (DB 값, 표시 값). DB에서 다시 로드되면 제거됨.
+_OVERLAY_KEY = "_pending_views_overlay"
+_overlay_listener_classes = set()
+
+# 프로세스 종료 시 남은 증가분을 반영할 카운터 (atexit 등록은 프로세스당 1번, 앱이 사라지면 목록에서도 빠짐)
+_live_counters = weakref.WeakSet()
+_atexit_registered = False
+
+
+def _shutdown_all():
+    for counter in list(_live_counters):
+        counter.shutdown()
+
+
+def _register_for_exit(counter):
+    global _atexit_registered
+    _live_counters.add(counter)
+    if not _atexit_registered:
+        atexit.register(_shutdown_all)
+        _atexit_registered = True
+
+
+def _clear_overlay(target, context, attrs=None):
+    # refresh 는 관계(tags 등)만 채울 때도 호출되므로 views 가 다시 로드된 경우만 제거
+    if attrs is None or "views" in attrs:
+        target.__dict__.pop(_OVERLAY_KEY, None)
+
+
+def _install_overlay_listeners(model_cls):
+    """모델이 DB에서 (재)로드될 때 덮어쓰기 기록을 지우는 이벤트 리스너 1회 등록."""
+    if model_cls in _overlay_listener_classes:
+        return
+    event.listen(model_cls, "load", _clear_overlay)
+    event.listen(model_cls, "refresh", _clear_overlay)
+    _overlay_listener_classes.add(model_cls)
+
+
+class _MemoryStore:
+    """프로세스 내 딕셔너리 버퍼 (video_id → 증가분)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas = defaultdict(int)
+        self._total = 0
+
+    def add(self, video_id, n):
+        with self._lock:
+            self._deltas[video_id] += n
+            self._total += n
+            return self._total
+
+    def get(self, video_ids):
+        with self._lock:
+            return {vid: self._deltas[vid] for vid in video_ids if vid in self._deltas}
+
+    def drain(self):
+        """누적분을 꺼내고 버퍼를 비움."""
+        with self._lock:
+            deltas = dict(self._deltas)
+            self._deltas.clear()
+            self._total = 0
+            return deltas
+
+
+class _SqliteStore:
+    """
+    로컬 SQLite 파일 버퍼. 같은 호스트의 여러 워커 프로세스가 공유.
+    누적 합계는 pending_views_total 1행에 같이 갱신 (증가마다 전체 SUM 없이 flush 기준 판단).
+    """
+
+    def __init__(self, path):
+        self._path = path
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending_views ("
+                "video_id INTEGER PRIMARY KEY, delta INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending_views_total ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL)"
+            )
+            # 합계 행이 없던 기존 파일은 한 번만 SUM 으로 채움
+            conn.execute(
+                "INSERT OR IGNORE INTO pending_views_total (id, total) "
+                "SELECT 1, COALESCE(SUM(delta), 0) FROM pending_views"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self._path, timeout=10, isolation_level=None)
+
+    def add(self, video_id, n):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO pending_views (video_id, delta) VALUES (?, ?) "
+                "ON CONFLICT(video_id) DO UPDATE SET delta = delta + excluded.delta",
+                (video_id, n),
+            )
+            conn.execute("UPDATE pending_views_total SET total = total + ? WHERE id = 1", (n,))
+            total = conn.execute("SELECT total FROM pending_views_total WHERE id = 1").fetchone()[0]
+            conn.execute("COMMIT")
+            return total
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def get(self, video_ids):
+        ids = list(video_ids)
+        if not ids:
+            return {}
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" * len(ids))
+            rows = conn.execute(
+                f"SELECT video_id, delta FROM pending_views WHERE video_id IN ({placeholders})",
+                ids,
+            ).fetchall()
+            return dict(rows)
+        finally:
+            conn.close()
+
+    def drain(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT video_id, delta FROM pending_views").fetchall()
+            conn.execute("DELETE FROM pending_views")
+            conn.execute("UPDATE pending_views_total SET total = 0 WHERE id = 1")
+            conn.execute("COMMIT")
+            return dict(rows)
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+class ViewCounter:
+    """조회수 버퍼 + 백그라운드 flusher. app.extensions["view_counter"]로 접근."""
+
+    def __init__(self, app=None):
+        self._app = None
+        self._store = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._flush_hooks = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("VIEW_COUNT_BUFFERED", True)
+        app.config.setdefault("VIEW_COUNT_FLUSH_INTERVAL", 5.0)
+        app.config.setdefault("VIEW_COUNT_FLUSH_SIZE", 500)
+        app.config.setdefault("VIEW_COUNT_STORE_PATH", None)
+        self._app = app
+        app.extensions["view_counter"] = self
+        _register_for_exit(self)
+
+    # ----- 버퍼 -----
+    @property
+    def store(self):
+        if self._store is None:
+            path = self._app.config.get("VIEW_COUNT_STORE_PATH")
+            self._store = _SqliteStore(path) if path else _MemoryStore()
+        return self._store
+
+    @property
+    def buffered(self):
+        return bool(self._app.config.get("VIEW_COUNT_BUFFERED", True))
+
+    def add_flush_hook(self, func):
+        """flush 시 {video_id: delta} 를 받아 호출할 콜백 등록 (같은 트랜잭션, commit 전. 통계·캐시 갱신용)."""
+        self._flush_hooks.append(func)
+
+    def increment(self, video_id, n=1):
+        """
+        조회수 n 증가.
+        버퍼 모드: 버퍼에 누적 후 반환 (DB 쓰기 없음).
+        비버퍼 모드: 원자적 UPDATE 후 즉시 commit.
+        """
+        if not self.buffered:
+            self._write({video_id: n})
+            return
+        total = self.store.add(video_id, n)
+        self._ensure_thread()
+        if total >= int(self._app.config.get("VIEW_COUNT_FLUSH_SIZE", 500)):
+            self._wake.set()
+
+    def pending(self, video_id):
+        """아직 DB에 반영되지 않은 조회수 증가분."""
+        if not self.buffered:
+            return 0
+        return self.store.get([video_id]).get(video_id, 0)
+
+    def pending_many(self, video_ids):
+        """{video_id: 아직 DB에 반영되지 않은 증가분} (증가분이 있는 비디오만)."""
+        if not self.buffered:
+            return {}
+        return self.store.get(set(video_ids))
+
+    def apply_pending(self, videos):
+        """
+        Video 객체 목록의 views 를 DB 값 + 미반영 증가분으로 덮어씀 (표시용).
+        set_committed_value 로 설정하므로 dirty 표시되지 않아 commit 시 덮어쓰지 않음.
+        """
+        if not self.buffered:
+            return videos
+        videos = [v for v in videos if v is not None]
+        if not videos:
+            return videos
+        _install_overlay_listeners(type(videos[0]))
+        deltas = self.store.get({v.id for v in videos})
+        for v in videos:
+            # 이미 덮어쓴 객체면 DB 값(base) 기준으로 다시 계산 (중복 가산 방지)
+            base = v.views or 0
+            overlay = v.__dict__.get(_OVERLAY_KEY)
+            if overlay and overlay[1] == base:
+                base = overlay[0]
+            shown = base + deltas.get(v.id, 0)
+            if shown != v.views:
+                set_committed_value(v, "views", shown)
+            v.__dict__[_OVERLAY_KEY] = (base, shown)
+        return videos
+
+    # ----- 반영 -----
+    def flush(self):
+        """
+        버퍼의 증가분을 batched UPDATE 로 DB에 반영. 반영한 비디오 수 반환.
+        실패 시 증가분을 버퍼에 되돌려 다음 flush 때 재시도.
+        """
+        with self._flush_lock:
+            deltas = self.store.drain()
+            if not deltas:
+                return 0
+            try:
+                self._write(deltas)
+            except Exception:
+                for video_id, n in deltas.items():
+                    self.store.add(video_id, n)
+                raise
+            return len(deltas)
+
+    def _write(self, deltas):
+        from app import db
+
+        params = [{"id": vid, "delta": n} for vid, n in deltas.items() if n]
+        if not params:
+            return
+        # 요청 처리 중이면 현재 세션 사용 (commit 시 로드된 객체가 만료되어 새 값 반영),
+        # 백그라운드 스레드에서는 별도 앱 컨텍스트를 열어 사용
+        if has_app_context() and current_app._get_current_object() is self._app:
+            ctx = nullcontext()
+        else:
+            ctx = self._app.app_context()
+        with ctx:
+            try:
+                db.session.execute(_UPDATE_SQL, params)
+                for hook in self._flush_hooks:
+                    hook(deltas)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+    # ----- 백그라운드 flusher -----
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="view-counter-flusher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        interval = float(self._app.config.get("VIEW_COUNT_FLUSH_INTERVAL", 5.0))
+        while not self._stop.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                self._app.logger.exception("view counter flush 실패")
+
+    def shutdown(self):
+        """flusher 종료 후 남은 증가분 반영 (프로세스 종료 시 atexit)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+
+def get_view_counter():
+    """현재 앱의 ViewCounter 반환."""
+    return current_app.extensions["view_counter"]
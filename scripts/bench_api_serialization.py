@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+API 직렬화 벤치마크 – 비디오 목록 100건 페이지를 ORM 객체(joinedload)+행마다 url_for+표준 json 으로 만들 때와
+컬럼 튜플 조회+URL 접두사+orjson(app/utils/serializers.py)으로 만들 때 비교.
+
+실행: python scripts/bench_api_serialization.py [--videos 2000] [--per-page 100] [--repeat 20]
+※ 프로젝트 루트에서 실행하세요. 임시 SQLite 파일에 합성 데이터를 만들어 측정 후 삭제합니다.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _legacy_video_to_dict(video):
+    """기존 api._video_to_dict 와 같은 방식 (행마다 url_for 2번, 관계 접근)."""
+    return {
+        "id": video.id,
+        "title": video.title,
+        "description": video.description or "",
+        "category": video.category or "",
+        "duration": video.duration,
+        "width": video.width,
+        "height": video.height,
+        "video_codec": video.video_codec,
+        "audio_codec": video.audio_codec,
+        "bitrate": video.bitrate,
+        "views": video.views,
+        "likes": video.likes,
+        "created_at": video.created_at.isoformat() if video.created_at else None,
+        "video_url": video.get_video_url() if video.video_path else None,
+        "thumbnail_url": video.get_thumbnail_url(),
+        "channel": {
+            "id": video.user.id if video.user else None,
+            "username": video.user.username if video.user else "unknown",
+        },
+        "tags": [t.name for t in video.tags] if video.tags else [],
+    }
+
+
+def _seed(db, n_videos):
+    from app.models import User, Video
+
+    users = [User(username=f"bench{i}", email=f"bench{i}@example.com", password_hash="x") for i in range(20)]
+    db.session.add_all(users)
+    db.session.commit()
+    videos = [
+        Video(
+            title=f"벤치마크 영상 {i}", description="설명 " * 20, category="tech", duration=300,
+            video_path=f"video_{i}.mp4", thumbnail_path=f"thumb_{i}.png", user_id=users[i % 20].id,
+        )
+        for i in range(n_videos)
+    ]
+    db.session.add_all(videos)
+    db.session.commit()
+    for i, video in enumerate(videos):
+        video.save_tags(f"태그{i % 7},태그{i % 11},공통", commit=False)
+    db.session.commit()
+
+
+def _best(func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 목록 직렬화 벤치마크")
+    parser.add_argument("--videos", type=int, default=2000)
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tmp, "bench_api.db").replace("\\", "/")
+        os.environ["JOB_WORKER_THREADS"] = "0"
+        os.environ["THUMBNAIL_WORKERS"] = "0"
+        from sqlalchemy.orm import joinedload
+
+        from app import create_app, db
+        from app.models import Video
+        from app.utils.pagination import keyset_paginate, sort_keys
+        from app.utils.serializers import OrjsonProvider, VideoSerializer
+
+        app = create_app()
+        with app.app_context():
+            _seed(db, args.videos)
+        keys_of = lambda: sort_keys(Video, "latest")  # noqa: E731
+        try:
+            orjson_provider = OrjsonProvider(app)
+        except ImportError:
+            orjson_provider = None
+
+        def legacy():
+            db.session.expunge_all()
+            page = keyset_paginate(
+                Video.query.options(joinedload(Video.user), joinedload(Video.tags)), keys_of(),
+                per_page=args.per_page,
+            )
+            return json.dumps([_legacy_video_to_dict(v) for v in page.items], sort_keys=True)
+
+        def tuples(fields=None, dumps=None):
+            def run():
+                serializer = VideoSerializer(fields)
+                page = keyset_paginate(serializer.query(db.session), keys_of(), per_page=args.per_page)
+                items = serializer.dump_rows(db.session, page.items)
+                return (dumps or (lambda o: json.dumps(o, sort_keys=True)))(items)
+            return run
+
+        cases = [
+            ("ORM+joinedload+url_for+json", legacy),
+            ("튜플+URL 접두사+json", tuples()),
+        ]
+        if orjson_provider is not None:
+            cases.append(("튜플+URL 접두사+orjson", tuples(dumps=orjson_provider.dumps)))
+            cases.append(("fields=id,title,thumbnail_url (orjson)",
+                          tuples("id,title,thumbnail_url", dumps=orjson_provider.dumps)))
+        else:
+            print("[참고] orjson 미설치 – orjson 항목 생략 (pip install orjson)")
+
+        with app.test_request_context("/api/videos"):
+            print(f"비디오 {args.videos:,}건 중 {args.per_page}건 페이지, ms (반복 {args.repeat}회 중 최솟값)")
+            baseline = None
+            for name, func in cases:
+                func()  # 워밍업
+                ms = _best(func, args.repeat)
+                baseline = baseline or ms
+                print(f"  {name:<40} {ms:8.2f} ms  (x{baseline / ms:.1f})")
+
+
+if __name__ == "__main__":
+    main()
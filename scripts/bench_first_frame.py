@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+재생 시작 시간 벤치마크 – moov 가 끝에 있는 MP4 와 faststart 로 옮긴 MP4 의 '첫 프레임까지 걸리는 시간' 비교.
+
+실제 HTTP 서버(werkzeug 스레드 서버)의 /media/videos/<파일> 을 브라우저의 점진적 다운로드처럼 읽습니다:
+bytes=0- 로 box 헤더를 순서대로 읽다가 mdat 를 먼저 만나면 연결을 끊고 그 뒤(moov)를 새로 요청,
+moov 를 받은 뒤 mdat 앞부분(첫 프레임 분량)을 받을 때까지의 시간과 요청 수를 잽니다.
+지연(--rtt-ms, 요청마다)과 대역폭(--mbps, 받은 바이트만큼 대기)은 클라이언트에서 흉내 냅니다.
+
+실행: python scripts/bench_first_frame.py [--size-mb 32] [--duration 600] [--rtt-ms 50] [--mbps 20] [--repeat 3]
+※ 프로젝트 루트에서 실행하세요. 임시 폴더에 DB·테스트 파일을 만들어 측정 후 삭제합니다.
+"""
+import argparse
+import http.client
+import logging
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 첫 프레임을 그리는 데 필요한 mdat 앞부분 (키프레임 1개 분량으로 가정)
+_FIRST_FRAME_BYTES = 256 * 1024
+
+
+def _box(kind, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _moov_at_end_mp4(path, size, duration):
+    """moov 가 끝에 있는 MP4 (초당 30프레임·1초당 청크 1개 – 실제 인코더 출력과 비슷한 moov 크기)."""
+    frames = duration * 30
+    chunk_size = size // duration
+    ftyp = _box(b"ftyp", b"isom" + b"\0\0\0\x01" + b"isomavc1")
+    mdat_start = len(ftyp) + 8
+    mvhd = b"\0" * 12 + struct.pack(">II", 1000, duration * 1000) + b"\0" * 80
+    tkhd = b"\0\0\0\x07" + b"\0" * 72 + struct.pack(">II", 1280 << 16, 720 << 16)
+    mdhd = b"\0" * 12 + struct.pack(">II", 30, frames) + b"\0" * 4
+    hdlr = b"\0" * 8 + b"vide" + b"\0" * 12 + b"VideoHandler\0"
+    entry = b"\0" * 6 + struct.pack(">H", 1) + b"\0" * 16 + struct.pack(">HH", 1280, 720) + b"\0" * 50
+    stsd = b"\0" * 4 + struct.pack(">I", 1) + struct.pack(">I4s", 8 + len(entry), b"avc1") + entry
+    stsz = b"\0" * 4 + struct.pack(f">II{frames}I", 0, frames, *([chunk_size // 30] * frames))
+    stco = b"\0" * 4 + struct.pack(f">I{duration}I", duration, *(mdat_start + i * chunk_size for i in range(duration)))
+    stbl = _box(b"stsd", stsd) + _box(b"stsz", stsz) + _box(b"stco", stco)
+    trak = _box(b"trak", _box(b"tkhd", tkhd) + _box(b"mdia", _box(b"mdhd", mdhd) + _box(b"hdlr", hdlr)
+                                                      + _box(b"minf", _box(b"stbl", stbl))))
+    moov = _box(b"moov", _box(b"mvhd", mvhd) + trak)
+    with open(path, "wb") as f:
+        f.write(ftyp)
+        f.write(struct.pack(">I4s", 8 + size, b"mdat"))
+        block = os.urandom(1024 * 1024)
+        for _ in range(size // len(block)):
+            f.write(block)
+        f.write(block[:size % len(block)])
+        f.write(moov)
+    return len(moov)
+
+
+class _Player:
+    """점진적 다운로드 플레이어 흉내: Range 요청마다 rtt 대기, 받은 바이트만큼 대역폭 대기."""
+
+    def __init__(self, port, url, rtt, bytes_per_sec):
+        self.port, self.url, self.rtt, self.bps = port, url, rtt, bytes_per_sec
+        self.conn = self.resp = None
+        self.requests = 0
+
+    def open(self, start):
+        self.close()
+        time.sleep(self.rtt)
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.port)
+        self.conn.request("GET", self.url, headers={"Range": f"bytes={start}-"})
+        self.resp = self.conn.getresponse()
+        self.requests += 1
+
+    def read(self, n):
+        data = self.resp.read(n)
+        time.sleep(len(data) / self.bps)
+        if len(data) < n:
+            raise EOFError
+        return data
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = self.resp = None
+
+    def first_frame(self):
+        """첫 프레임까지 걸린 시간(초). moov 전체 + mdat 앞부분을 받으면 끝."""
+        started = time.perf_counter()
+        pos, moov_seen, mdat_payload = 0, False, None
+        self.open(0)
+        try:
+            while True:
+                size, kind = struct.unpack(">I4s", self.read(8))
+                header = 8
+                if size == 1:
+                    size, header = struct.unpack(">Q", self.read(8))[0], 16
+                if kind == b"mdat":
+                    mdat_payload = pos + header
+                    if moov_seen:
+                        break
+                    # moov 가 아직 없음 → 연결을 끊고 mdat 뒤를 새로 요청 (브라우저의 탐색과 같음)
+                    pos += size
+                    self.open(pos)
+                    continue
+                self.read(size - header)
+                pos += size
+                if kind == b"moov":
+                    moov_seen = True
+                    if mdat_payload is not None:
+                        self.open(mdat_payload)
+                        break
+            self.read(_FIRST_FRAME_BYTES)
+        finally:
+            self.close()
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="faststart 전후 첫 프레임까지 시간 비교")
+    parser.add_argument("--size-mb", type=int, default=32, help="테스트 파일 mdat 크기(MB)")
+    parser.add_argument("--duration", type=int, default=600, help="재생 시간(초) – moov 표 크기 결정")
+    parser.add_argument("--rtt-ms", type=float, default=50.0, help="요청당 왕복 지연(ms)")
+    parser.add_argument("--mbps", type=float, default=20.0, help="다운로드 대역폭(Mbit/s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from werkzeug.serving import make_server
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(work_dir, "bench_first_frame.db").replace("\\", "/")
+        from app import create_app, db
+        from app.utils.faststart import relocate_moov
+        from app.utils.media_probe import probe
+
+        app = create_app()
+        app.config["VIDEO_FOLDER"] = work_dir
+        app.config["JOB_WORKER_THREADS"] = 0
+
+        before = uuid.uuid4().hex + ".mp4"
+        after = uuid.uuid4().hex + ".mp4"
+        moov_size = _moov_at_end_mp4(os.path.join(work_dir, before), args.size_mb * 1024 * 1024, args.duration)
+        shutil.copyfile(os.path.join(work_dir, before), os.path.join(work_dir, after))
+        t0 = time.perf_counter()
+        relocate_moov(os.path.join(work_dir, after))
+        relocate_time = time.perf_counter() - t0
+        assert probe(os.path.join(work_dir, after)).faststart
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # 요청 로그 생략
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        print(
+            f"mdat {args.size_mb}MB, moov {moov_size / 1024:.0f}KB, 지연 {args.rtt_ms:.0f}ms, "
+            f"대역폭 {args.mbps:.0f}Mbit/s, 반복 {args.repeat}회 (최소값)"
+        )
+        print(f"  moov 이동 시간: {relocate_time * 1000:.0f}ms")
+        for label, name in (("moov 끝 (처리 전)", before), ("faststart (처리 후)", after)):
+            times, requests = [], 0
+            for _ in range(args.repeat):
+                player = _Player(server.server_port, f"/media/videos/{name}", args.rtt_ms / 1000,
+                                 args.mbps * 1_000_000 / 8)
+                times.append(player.first_frame())
+                requests = player.requests
+            print(f"  {label:16}: 첫 프레임 {min(times) * 1000:7.0f}ms, Range 요청 {requests}회")
+
+        server.shutdown()
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
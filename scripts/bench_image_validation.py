@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+이미지 검증 메모리 벤치마크 – validate_image_file 의 파이썬 힙 최대 사용량·시간 비교
+(이전 방식: 전체 read() + BytesIO 복사 후 verify vs 현재: seek/tell + 매직 넘버 + 스트림 verify).
+
+업로드와 같은 조건(werkzeug 가 쓰는 SpooledTemporaryFile 스트림)으로 5MB·상한 근처·압축 폭탄 PNG 를 검증합니다.
+
+실행: python scripts/bench_image_validation.py [--limit-mb 5] [--repeat 5]
+※ 프로젝트 루트에서 실행하세요.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _legacy_validate(file_storage, max_size_bytes):
+    """이전 구현 (비교용): 전체를 bytes 로 읽고 BytesIO 로 감싸 verify."""
+    from PIL import Image
+
+    file_storage.seek(0)
+    data = file_storage.read()
+    file_storage.seek(0)
+    if len(data) > max_size_bytes:
+        return False
+    try:
+        Image.open(BytesIO(data)).verify()
+    except Exception:
+        return False
+    return True
+
+
+def _noise_png(target_bytes):
+    """압축이 거의 안 되는 노이즈 PNG (대략 target_bytes 크기)."""
+    from PIL import Image
+
+    side = int((target_bytes / 3) ** 0.5)
+    buf = BytesIO()
+    Image.frombytes("RGB", (side, side), os.urandom(side * side * 3)).save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def _bomb_png():
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("1", (20000, 20000)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _upload(data, filename):
+    """werkzeug 업로드와 같은 스트림 (500KB 넘으면 디스크 임시 파일)."""
+    from werkzeug.datastructures import FileStorage
+
+    spooled = tempfile.SpooledTemporaryFile(max_size=500 * 1024)
+    spooled.write(data)
+    spooled.seek(0)
+    return FileStorage(stream=spooled, filename=filename, content_type="image/png")
+
+
+def _measure(func, data, repeat):
+    peaks, times, result = [], [], None
+    for _ in range(repeat):
+        fs = _upload(data, "bench.png")
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        result = func(fs)
+        times.append(time.perf_counter() - t0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        fs.stream.close()
+    return result, max(peaks), min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이미지 검증 메모리·시간 벤치마크")
+    parser.add_argument("--limit-mb", type=int, default=5, help="업로드 크기 상한 (MAX_PROFILE_IMAGE_SIZE)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from app.utils.image import validate_image_file
+
+    limit = args.limit_mb * 1024 * 1024
+    cases = [
+        (f"{args.limit_mb}MB 대 PNG", _noise_png(limit * 0.8)),
+        ("상한 근처 PNG", _noise_png(limit * 0.97)),
+        ("압축 폭탄 PNG (20000x20000)", _bomb_png()),
+    ]
+    allowed = {"jpg", "jpeg", "png", "gif", "webp"}
+    print(f"크기 상한 {args.limit_mb}MB, 반복 {args.repeat}회 (파이썬 힙 최대 사용량, 최소 시간)")
+    for label, data in cases:
+        if len(data) > limit:
+            print(f"  {label}: {len(data) / 1024 / 1024:.2f}MB 가 상한을 넘어 건너뜀")
+            continue
+        print(f"  {label} ({len(data) / 1024 / 1024:.2f}MB)")
+        ok, peak, elapsed = _measure(lambda fs: _legacy_validate(fs, limit), data, args.repeat)
+        print(f"    이전 방식: 결과={ok!s:5} 최대 {peak / 1024 / 1024:7.2f}MB  {elapsed * 1000:7.1f}ms")
+        ok, peak, elapsed = _measure(lambda fs: validate_image_file(fs, allowed, limit)[0], data, args.repeat)
+        print(f"    스트리밍 : 결과={ok!s:5} 최대 {peak / 1024 / 1024:7.2f}MB  {elapsed * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
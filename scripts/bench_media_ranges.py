@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+미디어 Range 요청 벤치마크 – /media/videos/<파일> 에 동시 Range 요청 (동영상 탐색·이어받기 패턴).
+
+실제 HTTP 서버(werkzeug 스레드 서버)를 띄워 스레드마다 keep-alive 연결로 임의 구간을 요청하고,
+받은 바이트를 원본과 비교해 검증한 뒤 처리량·지연 시간을 출력합니다.
+
+실행: python scripts/bench_media_ranges.py [--size-mb 64] [--requests 2000] [--threads 8] [--range-kb 512]
+※ 프로젝트 루트에서 실행하세요. 임시 폴더에 DB·테스트 파일을 만들어 측정 후 삭제합니다.
+"""
+import argparse
+import http.client
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미디어 Range 요청 동시 처리 벤치마크")
+    parser.add_argument("--size-mb", type=int, default=64, help="테스트 파일 크기(MB)")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--range-kb", type=int, default=512, help="요청당 구간 크기(KB)")
+    args = parser.parse_args()
+
+    from werkzeug.serving import make_server
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(work_dir, "bench_media.db").replace("\\", "/")
+        from app import create_app, db
+
+        app = create_app()
+        app.config["VIDEO_FOLDER"] = work_dir
+        app.config["JOB_WORKER_THREADS"] = 0
+
+        size = args.size_mb * 1024 * 1024
+        filename = uuid.uuid4().hex + ".mp4"
+        path = os.path.join(work_dir, filename)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        with open(path, "rb") as f:
+            original = f.read()
+
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)  # 요청 로그 생략
+        server = make_server("127.0.0.1", 0, app, threaded=True)
+        port = server.server_port
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+
+        span = args.range_kb * 1024
+        per_thread = args.requests // args.threads
+        latencies = []
+        received = []
+        errors = []
+        lock = threading.Lock()
+
+        def worker(seed):
+            rng = random.Random(seed)
+            conn = http.client.HTTPConnection("127.0.0.1", port)
+            local = []
+            nbytes = 0
+            try:
+                for _ in range(per_thread):
+                    start = rng.randrange(0, size - 1)
+                    end = min(size - 1, start + span - 1)
+                    t0 = time.perf_counter()
+                    conn.request("GET", f"/media/videos/{filename}", headers={"Range": f"bytes={start}-{end}"})
+                    resp = conn.getresponse()
+                    body = resp.read()
+                    local.append(time.perf_counter() - t0)
+                    nbytes += len(body)
+                    if resp.status != 206 or body != original[start:end + 1]:
+                        errors.append((resp.status, start, end))
+            finally:
+                conn.close()
+                with lock:
+                    latencies.extend(local)
+                    received.append(nbytes)
+
+        print(f"파일 {args.size_mb}MB, Range 요청 {per_thread * args.threads}건 ({args.range_kb}KB), 스레드 {args.threads}개")
+        workers = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        server.shutdown()
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+        done = len(latencies)
+        sent = sum(received)
+        print(f"  처리량  : {done / elapsed:8.1f} req/s, {sent / elapsed / 1024 / 1024:8.1f} MB/s")
+        print(f"  지연 시간: p50 {_percentile(latencies, 50) * 1000:.1f}ms, p95 {_percentile(latencies, 95) * 1000:.1f}ms")
+        if errors:
+            print(f"  경고: 잘못된 응답 {len(errors)}건 (예: status={errors[0][0]} 구간={errors[0][1]}-{errors[0][2]})")
+        else:
+            print("  검증: 모든 응답이 206 + 요청 구간과 일치")
+
+
+if __name__ == "__main__":
+    main()
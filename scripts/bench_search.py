@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+검색 벤치마크 – 합성 카탈로그에서 ILIKE 전체 스캔 vs FTS5(videos_fts) 비교.
+
+실행: python scripts/bench_search.py [--rows 1000000] [--repeat 5]
+※ 프로젝트 루트에서 실행하세요. 임시 SQLite 파일에 합성 데이터를 만들어 측정 후 삭제합니다.
+  100만 건 생성·색인에는 수 분이 걸릴 수 있습니다.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.search_index import build_match_query, tokenize
+
+WORDS_KO = ["파이썬", "플라스크", "튜토리얼", "여행", "브이로그", "요리", "게임", "음악", "강의", "리뷰",
+            "데이터베이스", "웹개발", "초보자", "완벽정리", "하이라이트", "라이브", "먹방", "운동"]
+WORDS_EN = ["python", "flask", "sqlite", "travel", "vlog", "cooking", "music", "review", "tutorial", "live"]
+QUERIES = ["파이썬", "데이터베이스", "플라스크 튜토리얼", "python", "완벽정리", "없는검색어"]
+
+
+def _sentence(rng, n):
+    words = WORDS_KO + WORDS_EN
+    return " ".join(rng.choice(words) + rng.choice(["", "으로", "에서", "의", ""]) for _ in range(n))
+
+
+def _build(conn, rows):
+    rng = random.Random(42)
+    conn.execute("CREATE TABLE videos (id INTEGER PRIMARY KEY, title TEXT, description TEXT)")
+    conn.execute(
+        "CREATE VIRTUAL TABLE videos_fts USING fts5(title, description, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    batch = 10000
+    for start in range(0, rows, batch):
+        data = [(i, _sentence(rng, 4), _sentence(rng, 12)) for i in range(start + 1, min(rows, start + batch) + 1)]
+        conn.executemany("INSERT INTO videos VALUES (?, ?, ?)", data)
+        conn.executemany(
+            "INSERT INTO videos_fts (rowid, title, description) VALUES (?, ?, ?)",
+            [(i, " ".join(tokenize(t)), " ".join(tokenize(d))) for i, t, d in data],
+        )
+    conn.execute("INSERT INTO videos_fts (videos_fts) VALUES ('optimize')")
+    conn.commit()
+
+
+def _time(conn, sql, params, repeat):
+    best = None
+    rows = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = conn.execute(sql, params).fetchall()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ILIKE vs FTS5 검색 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench_search.db"))
+        started = time.perf_counter()
+        _build(conn, args.rows)
+        print(f"합성 카탈로그 {args.rows:,}건 생성·색인: {time.perf_counter() - started:.1f}초")
+        print("ms, 반복 중 최솟값. top20 = 최신순 20건, count = paginate() 의 COUNT(*) 에 해당")
+        header = ["ILIKE top20", "ILIKE count", "FTS top20", "FTS ranked", "FTS count"]
+        print(f"{'검색어':<14}" + "".join(f"{h:>13}" for h in header))
+        for q in QUERIES:
+            like = (f"%{q}%", f"%{q}%")
+            match = (build_match_query(q),)
+            timings = [
+                _time(conn, "SELECT id FROM videos WHERE title LIKE ? OR description LIKE ? "
+                            "ORDER BY id DESC LIMIT 20", like, args.repeat),
+                _time(conn, "SELECT COUNT(*) FROM videos WHERE title LIKE ? OR description LIKE ?",
+                      like, args.repeat),
+                _time(conn, "SELECT rowid FROM videos_fts WHERE videos_fts MATCH ? "
+                            "ORDER BY rowid DESC LIMIT 20", match, args.repeat),
+                _time(conn, "SELECT rowid FROM videos_fts WHERE videos_fts MATCH ? "
+                            "ORDER BY bm25(videos_fts, 10.0, 1.0) LIMIT 20", match, args.repeat),
+                _time(conn, "SELECT COUNT(*) FROM videos_fts WHERE videos_fts MATCH ?", match, args.repeat),
+            ]
+            print(f"{q:<14}" + "".join(f"{ms:>13.1f}" for ms, _ in timings))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+조회수 버퍼 벤치마크 – /watch/<id> 처리량 비교 (버퍼 사용 vs 요청마다 commit).
+
+실행: python scripts/bench_view_counter.py [--requests 2000] [--threads 8]
+※ 프로젝트 루트에서 실행하세요. 임시 SQLite 파일 DB를 만들어 측정 후 삭제합니다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _run(buffered, total_requests, threads, db_dir):
+    """한 가지 모드로 앱을 만들어 watch 요청을 병렬로 보내고 (초당 요청 수, 최종 views) 반환."""
+    db_path = os.path.join(db_dir, f"bench_views_{'buf' if buffered else 'sync'}.db")
+    os.environ["DATABASE_URL"] = "sqlite:///" + db_path.replace("\\", "/")
+
+    from app import create_app, db
+    from app.models import Video
+
+    app = create_app()
+    app.config["TESTING"] = True
+    app.config["VIEW_COUNT_BUFFERED"] = buffered
+    app.config["VIEW_COUNT_FLUSH_INTERVAL"] = 1.0
+    with app.app_context():
+        video = Video(title="bench", video_path="bench.mp4", user_id=1)
+        db.session.add(video)
+        db.session.commit()
+        video_id = video.id
+
+    per_thread = total_requests // threads
+    errors = []
+
+    def worker():
+        client = app.test_client()
+        for _ in range(per_thread):
+            resp = client.get(f"/watch/{video_id}")
+            if resp.status_code != 200:
+                errors.append(resp.status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    app.extensions["view_counter"].shutdown()
+    with app.app_context():
+        views = db.session.get(Video, video_id).views
+        db.session.remove()
+        db.engine.dispose()
+    if errors:
+        print(f"  경고: 실패 응답 {len(errors)}건 (예: {errors[0]})")
+    return per_thread * threads / elapsed, views
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회수 버퍼 처리량 벤치마크")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        print(f"watch 요청 {args.requests}건, 스레드 {args.threads}개")
+        sync_rps, sync_views = _run(False, args.requests, args.threads, db_dir)
+        print(f"  요청마다 commit : {sync_rps:8.1f} req/s (views={sync_views})")
+        buf_rps, buf_views = _run(True, args.requests, args.threads, db_dir)
+        print(f"  버퍼 + 일괄 반영: {buf_rps:8.1f} req/s (views={buf_views})")
+        print(f"  처리량 배율: x{buf_rps / sync_rps:.2f}")
+
+
+if __name__ == "__main__":
+    main()
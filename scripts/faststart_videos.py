@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+MP4 faststart 일괄 처리 – VIDEO_FOLDER(uploads/videos)의 MP4/MOV 중 moov 가 파일 끝에 있는 것을
+moov 가 앞에 오도록 다시 씀 (app/utils/faststart.py, 파일마다 고정 크기 버퍼로 복사).
+uuid 파일명은 immutable 캐시 대상이라 새 uuid 파일명으로 쓰고 videos.video_path 변경 후 이전 파일 삭제.
+실행: python scripts/faststart_videos.py [--dry-run]
+※ 프로젝트 루트에서 실행하세요. 처리 전후 재생 시작 시간 비교는 scripts/bench_first_frame.py.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.utils.faststart import needs_faststart, relocate_stored_video
+from app.utils.media_probe import ProbeError
+
+_EXTENSIONS = (".mp4", ".m4v", ".mov")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="업로드된 MP4/MOV 의 moov 를 파일 앞으로 옮김")
+    parser.add_argument("--dry-run", action="store_true", help="옮길 파일만 출력하고 수정하지 않음")
+    args = parser.parse_args()
+
+    app = create_app()
+    folder = app.config["VIDEO_FOLDER"]
+    names = sorted(n for n in os.listdir(folder) if n.lower().endswith(_EXTENSIONS))
+    started = time.perf_counter()
+    moved = skipped = failed = 0
+    moved_bytes = 0
+    for name in names:
+        path = os.path.join(folder, name)
+        try:
+            if not needs_faststart(path):
+                skipped += 1
+                continue
+            if args.dry_run:
+                print(f"  [대상] {name}")
+                moved += 1
+                continue
+            with app.app_context():
+                new_name = relocate_stored_video(db, folder, name)
+            if new_name:
+                moved += 1
+                moved_bytes += os.path.getsize(os.path.join(folder, new_name))
+                print(f"  [처리] {name}" + (f" → {new_name}" if new_name != name else ""))
+        except (OSError, ProbeError) as e:
+            failed += 1
+            print(f"  [실패] {name}: {e}")
+    elapsed = time.perf_counter() - started
+    label = "대상" if args.dry_run else "처리"
+    print(
+        f"[완료] 파일 {len(names)}개 중 {label} {moved}개 ({moved_bytes / 1024 / 1024:.1f}MB), "
+        f"이미 faststart {skipped}개, 실패 {failed}개 ({elapsed:.1f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""
+미디어 정보 일괄 채움 – VIDEO_FOLDER(uploads/videos)에 파일이 있는 비디오의 재생 시간·해상도·코덱·비트레이트를
+컨테이너 헤더에서 읽어 videos 테이블에 반영 (app/utils/media_probe.py, 프로세스 풀로 병렬 분석).
+실행: python scripts/probe_videos.py [--all] [--workers 4]
+※ 프로젝트 루트에서 실행하세요. 기본은 duration 이 비어 있는 비디오만 처리합니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.utils.media_probe import backfill_media_info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비디오 미디어 정보 일괄 채움")
+    parser.add_argument("--all", action="store_true", help="이미 값이 있는 비디오도 다시 분석")
+    parser.add_argument("--workers", type=int, default=None, help="분석 프로세스 수 (기본: CPU 수, 0이면 단일 프로세스)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        stats = backfill_media_info(db, workers=args.workers, only_missing=not args.all)
+        elapsed = time.perf_counter() - started
+    print(
+        f"[완료] 파일 {stats['checked']}개 분석, {stats['updated']}건 반영, 분석 실패 {stats['failed']}건, "
+        f"로컬 파일 없음 {stats['missing']}건 ({elapsed:.1f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+구독 피드 inbox(feed_items) 재구성 – subscriptions·videos 기준으로 구독 중인 일반 채널의 최근 영상을 다시 채움.
+실행: python scripts/rebuild_feeds.py [--user USERNAME ...]
+※ 프로젝트 루트에서 실행하세요. --user 없이 실행하면 구독자 수 기준 대형 채널(feed_pull) 표시도 다시 계산합니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models import User
+from app.utils.feed import rebuild_feeds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="구독 피드 inbox 재구성")
+    parser.add_argument("--user", action="append", default=[], help="대상 사용자명 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        user_ids = None
+        if args.user:
+            found = User.query.filter(User.username.in_(args.user)).all()
+            user_ids = [u.id for u in found]
+            missing = set(args.user) - {u.username for u in found}
+            for name in sorted(missing):
+                print(f"[건너뜀] 없는 사용자: {name}")
+        started = time.perf_counter()
+        added = rebuild_feeds(db, user_ids)
+        print(f"[완료] feed_items {added}행 추가 ({time.perf_counter() - started:.2f}초)")
+
+
+if __name__ == "__main__":
+    main()
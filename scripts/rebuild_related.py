@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+"""
+관련 동영상 목록(related_videos) 전체 재계산.
+실행: python scripts/rebuild_related.py [--k 10] [--batch-size 500]
+※ 프로젝트 루트에서 실행하세요. 목록은 조회 시에도 필요할 때마다 계산되므로,
+  대량 시드·태그 일괄 변경 직후나 주기 작업(cron)으로 미리 채울 때 사용합니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.utils.related import rebuild_related
+
+
+def main():
+    parser = argparse.ArgumentParser(description="related_videos 전체 재계산")
+    parser.add_argument("--k", type=int, default=None, help="비디오별 저장 개수 (기본 RELATED_VIDEOS_K)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        count = rebuild_related(db, k=args.k, batch_size=args.batch_size)
+        print(f"[완료] {count}개 비디오 관련 동영상 재계산 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
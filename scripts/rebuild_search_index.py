@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""
+전문 검색 인덱스(videos_fts) 재색인 – 기존 videos 행을 모두 다시 색인.
+실행: python scripts/rebuild_search_index.py [--batch-size 1000]
+※ 프로젝트 루트에서 실행하세요. 인덱스 테이블이 없으면 앱 시작 시 생성됩니다.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.utils.search_index import rebuild_search_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="videos_fts 전체 재색인")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        count = rebuild_search_index(db, batch_size=args.batch_size)
+        if count == 0 and not app.config.get("SEARCH_FTS_ENABLED", True):
+            print("[안내] SEARCH_FTS_ENABLED=False – ILIKE 검색 사용 중이라 재색인하지 않았습니다.")
+            return
+        print(f"[완료] {count}개 비디오 재색인 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+채널 통계(channel_stats) 정합성 복구 – 원본 테이블(videos, comments, subscriptions) 기준으로 어긋난 행 수정.
+실행: python scripts/reconcile_channel_stats.py [--interval 600]
+※ 프로젝트 루트에서 실행하세요. --interval 을 주면 해당 초마다 반복 실행 (Ctrl+C 로 종료).
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.utils.channel_stats import reconcile_channel_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="channel_stats 재계산")
+    parser.add_argument("--interval", type=float, default=0, help="반복 주기(초). 0이면 1회 실행")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        while True:
+            started = time.perf_counter()
+            fixed = reconcile_channel_stats(db)
+            print(f"[완료] {fixed}개 채널 통계 수정 ({time.perf_counter() - started:.2f}초)")
+            if args.interval <= 0:
+                break
+            try:
+                time.sleep(args.interval)
+            except KeyboardInterrupt:
+                break
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
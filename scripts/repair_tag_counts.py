@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""
+태그 비디오 수(tags.video_count) 정합성 복구 – video_tags 기준으로 전체 재계산.
+실행: python scripts/repair_tag_counts.py [--dry-run]
+※ 프로젝트 루트에서 실행하세요. 직접 SQL 로 video_tags 를 수정했거나 카운트가 어긋났을 때 사용.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app import create_app, db
+from app.utils.tag_stats import repair_tag_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tags.video_count 재계산")
+    parser.add_argument("--dry-run", action="store_true", help="어긋난 태그만 출력하고 수정하지 않음")
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        rows = db.session.execute(
+            text(
+                "SELECT t.id, t.name, t.video_count, COUNT(vt.video_id) AS actual "
+                "FROM tags t LEFT JOIN video_tags vt ON vt.tag_id = t.id "
+                "GROUP BY t.id, t.name, t.video_count "
+                "HAVING t.video_count <> COUNT(vt.video_id) ORDER BY t.id"
+            )
+        ).fetchall()
+        for r in rows:
+            print(f"  #{r.id} {r.name}: {r.video_count} → {r.actual}")
+        if args.dry_run:
+            print(f"[dry-run] 어긋난 태그 {len(rows)}개")
+            return
+        fixed = repair_tag_counts(db)
+        print(f"[완료] {fixed}개 태그 video_count 수정")
+
+
+if __name__ == "__main__":
+    main()
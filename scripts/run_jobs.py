@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+작업 큐 워커 – jobs 테이블의 대기 작업(Cloudinary 업로드·원격 삭제 등)을 실행.
+실행: python scripts/run_jobs.py [--once] [--interval 2] [--purge-days 7]
+※ 프로젝트 루트에서 실행하세요. 웹 프로세스에서 JOB_WORKER_THREADS=0 으로 두고 이 스크립트만 실행해도 됨.
+  여러 개를 동시에 실행해도 같은 작업을 중복 실행하지 않음. Ctrl+C 로 종료.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.utils.jobs import get_job_queue, purge_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 큐 워커")
+    parser.add_argument("--once", action="store_true", help="대기 작업을 한 번 처리하고 종료")
+    parser.add_argument("--interval", type=float, default=2.0, help="대기 작업이 없을 때 확인 주기(초)")
+    parser.add_argument("--purge-days", type=float, default=7, help="이 일수 지난 완료 작업 삭제 (0이면 삭제 안 함)")
+    args = parser.parse_args()
+
+    app = create_app()
+    app.config["JOB_WORKER_THREADS"] = 0  # 이 프로세스에서는 아래 루프만 실행
+    with app.app_context():
+        queue = get_job_queue()
+        if args.purge_days > 0:
+            print(f"[정리] 완료 작업 {purge_jobs(db, args.purge_days)}건 삭제")
+        while True:
+            done = queue.run_pending()
+            if done:
+                print(f"[완료] 작업 {done}건 처리")
+            if args.once:
+                break
+            try:
+                time.sleep(args.interval)
+            except KeyboardInterrupt:
+                break
+            db.session.remove()
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app, db
 from app.models import Tag, User, Video
+from app.utils.tags import resolve_tags, retag_videos
 
 SEED_TAGS = ["Python", "Flask", "튜토리얼", "WeTube", "동영상"]
 
@@ -63,15 +64,13 @@ def main():
             print("videos: 레코드 없음 (uploads/videos 폴더 확인)")
 
         # 2) tags 시드
-        for name in SEED_TAGS:
-            if Tag.query.filter_by(name=name).first() is None:
-                db.session.add(Tag(name=name))
+        resolve_tags(db.session, SEED_TAGS)
         db.session.commit()
         print(f"tags: {Tag.query.count()}개")
 
         # 3) video_tags 연결
         if video:
-            video.save_tags(", ".join(SEED_TAGS))
+            retag_videos(db.session, {video.id: SEED_TAGS})
             print(f"video_tags: video_id={video.id}에 태그 {len(SEED_TAGS)}개 연결")
 
     print("시드 완료.")
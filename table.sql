@@ -13,6 +13,7 @@ CREATE TABLE IF NOT EXISTS users (
     profile_image VARCHAR(255) NULL,
     profile_image_public_id VARCHAR(255) NULL,
     is_admin BOOLEAN NOT NULL DEFAULT 0,
+    feed_pull BOOLEAN NOT NULL DEFAULT 0,  -- 구독자 많은 채널: 구독 피드를 조회 때 합침 (app/utils/feed.py)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -27,11 +28,14 @@ CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
 CREATE TABLE IF NOT EXISTS tags (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name VARCHAR(50) NOT NULL UNIQUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    video_count INTEGER NOT NULL DEFAULT 0  -- 연결된 비디오 수 (인기 태그 정렬, scripts/repair_tag_counts.py 로 재계산)
 );
 
 -- 태그 테이블 인덱스
 CREATE INDEX IF NOT EXISTS idx_tags_name ON tags (name);
+CREATE INDEX IF NOT EXISTS ix_tags_video_count ON tags (video_count);
+CREATE INDEX IF NOT EXISTS ix_tags_name_lower ON tags (lower(name));
 
 -- ============================================
 -- 3. 비디오 테이블 (videos)
@@ -43,14 +47,22 @@ CREATE TABLE IF NOT EXISTS videos (
     video_path VARCHAR(500) NOT NULL,
     thumbnail_path VARCHAR(500) NULL,
     category VARCHAR(50) NULL,
-    duration INTEGER NULL,
+    duration INTEGER NULL,            -- 재생 시간(초), 업로드 시 컨테이너 헤더에서 추출 (app/utils/media_probe.py)
+    width INTEGER NULL,
+    height INTEGER NULL,
+    video_codec VARCHAR(32) NULL,
+    audio_codec VARCHAR(32) NULL,
+    bitrate INTEGER NULL,             -- 평균 비트레이트(bps)
+    faststart BOOLEAN NULL,           -- MP4: moov 가 mdat 앞이면 1 (바로 재생), WebM·미분석은 NULL
     views INTEGER NOT NULL DEFAULT 0,
     likes INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,  -- 댓글 수 (답글 포함, 댓글 작성·삭제 시 증감)
     user_id INTEGER NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     video_public_id VARCHAR(255) NULL,
     thumbnail_public_id VARCHAR(255) NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'ready',  -- Cloudinary 업로드 작업: processing / ready / failed
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
 
@@ -58,6 +70,7 @@ CREATE TABLE IF NOT EXISTS videos (
 CREATE INDEX IF NOT EXISTS idx_videos_category ON videos (category);
 CREATE INDEX IF NOT EXISTS idx_videos_created_at ON videos (created_at);
 CREATE INDEX IF NOT EXISTS idx_videos_user_id ON videos (user_id);
+CREATE INDEX IF NOT EXISTS ix_videos_user_created ON videos (user_id, created_at, id);
 
 -- ============================================
 -- 4. 댓글 테이블 (comments)
@@ -82,6 +95,11 @@ CREATE INDEX IF NOT EXISTS idx_comments_created_at ON comments (created_at);
 CREATE INDEX IF NOT EXISTS idx_comments_user_id ON comments (user_id);
 CREATE INDEX IF NOT EXISTS idx_comments_video_id ON comments (video_id);
 CREATE INDEX IF NOT EXISTS idx_comments_parent_id ON comments (parent_id);
+-- 최상위 댓글·답글 keyset 페이지 조회용
+CREATE INDEX IF NOT EXISTS ix_comments_video_parent_created ON comments (video_id, parent_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_comments_parent_created ON comments (parent_id, created_at, id);
+-- 인기순(좋아요 많은 순) 최상위 댓글 keyset 조회용
+CREATE INDEX IF NOT EXISTS ix_comments_video_parent_likes ON comments (video_id, parent_id, likes, id);
 
 -- ============================================
 -- 5. 비디오 좋아요 중간 테이블 (video_likes)
@@ -132,6 +150,8 @@ CREATE TABLE IF NOT EXISTS subscriptions (
     CHECK (subscriber_id != subscribed_to_id)  -- 자기 자신을 구독할 수 없음
 );
 
+CREATE INDEX IF NOT EXISTS ix_subscriptions_subscribed_to ON subscriptions (subscribed_to_id, subscriber_id);
+
 -- ============================================
 -- 9. 비디오 태그 중간 테이블 (video_tags)
 -- ============================================
@@ -143,3 +163,93 @@ CREATE TABLE IF NOT EXISTS video_tags (
     FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
     FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
 );
+
+-- ============================================
+-- 10. 비디오 전문 검색 가상 테이블 (videos_fts, SQLite FTS5)
+-- rowid = videos.id. title/description 에는 토큰화된 문자열 저장
+-- (영문 단어 + 한글 bigram, app/utils/search_index.py). 앱 시작 시 자동 생성.
+-- ============================================
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+    title,
+    description,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+-- ============================================
+-- 11. 관련 동영상 미리 계산 테이블 (related_videos)
+-- video_id 별 rank 순서의 추천 목록 (태그 Jaccard > 카테고리 > 업로더 > 인기, app/utils/related.py).
+-- 목록이 없거나 오래되면 조회 시 재계산. 전체 재계산: scripts/rebuild_related.py
+-- ============================================
+CREATE TABLE IF NOT EXISTS related_videos (
+    video_id INTEGER NOT NULL,
+    rank INTEGER NOT NULL,
+    related_id INTEGER NOT NULL,
+    score FLOAT NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (video_id, rank),
+    FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+    FOREIGN KEY (related_id) REFERENCES videos(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_related_videos_related_id ON related_videos (related_id);
+
+-- ============================================
+-- 12. 채널 통계 요약 테이블 (channel_stats)
+-- 사용자(채널)별 영상 수·총 조회수·총 좋아요·총 댓글·구독자 수 (app/utils/channel_stats.py).
+-- 업로드·삭제·조회수 flush·좋아요·구독·댓글 시 갱신, scripts/reconcile_channel_stats.py 로 재계산.
+-- ============================================
+CREATE TABLE IF NOT EXISTS channel_stats (
+    user_id INTEGER PRIMARY KEY,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    total_views INTEGER NOT NULL DEFAULT 0,
+    total_likes INTEGER NOT NULL DEFAULT 0,
+    total_comments INTEGER NOT NULL DEFAULT 0,
+    subscriber_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- ============================================
+-- 13. 작업 큐 테이블 (jobs)
+-- Cloudinary 업로드·원격 삭제 등 요청 밖에서 처리할 작업 (app/utils/jobs.py, app/utils/media_jobs.py).
+-- 재시도 시 run_at 을 지수 backoff 로 미룸. idempotency_key 가 같은 작업은 1번만 등록.
+-- 별도 워커 프로세스: scripts/run_jobs.py
+-- ============================================
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind VARCHAR(50) NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    idempotency_key VARCHAR(255) NULL UNIQUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',  -- pending / running / done / failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100) NULL,
+    locked_at TIMESTAMP NULL,
+    last_error TEXT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_jobs_status_run_at ON jobs (status, run_at);
+
+-- ============================================
+-- 14. 구독 피드 inbox 테이블 (feed_items)
+-- 업로드 시 채널 구독자마다 1행 (fan-out-on-write), created_at 은 비디오 업로드 시각 복사본.
+-- 구독자 많은 채널(users.feed_pull)은 넣지 않고 조회 때 합침 (app/utils/feed.py).
+-- 재구성: scripts/rebuild_feeds.py
+-- ============================================
+CREATE TABLE IF NOT EXISTS feed_items (
+    user_id INTEGER NOT NULL,
+    video_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (user_id, video_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (video_id) REFERENCES videos(id) ON DELETE CASCADE,
+    FOREIGN KEY (channel_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS ix_feed_items_user_created ON feed_items (user_id, created_at, video_id);
+CREATE INDEX IF NOT EXISTS ix_feed_items_user_channel ON feed_items (user_id, channel_id);
+CREATE INDEX IF NOT EXISTS ix_feed_items_video ON feed_items (video_id);
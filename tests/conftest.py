@@ -33,6 +33,9 @@ def app():
         app = create_app()
         app.config["TESTING"] = True
         app.config["WTF_CSRF_ENABLED"] = False  # 테스트 시 CSRF 검증 비활성화
+        app.config["VIEW_COUNT_BUFFERED"] = False  # 조회수 즉시 반영 (버퍼 동작은 test_view_counter.py)
+        app.config["JOB_WORKER_THREADS"] = 0  # 작업 큐는 테스트에서 run_pending() 으로 직접 실행 (test_jobs.py)
+        app.config["THUMBNAIL_WORKERS"] = 0  # 썸네일 변형은 프로세스 풀 없이 바로 생성 (test_thumbnails.py)
         yield app
     finally:
         if prev is not None:
@@ -70,6 +73,8 @@ def real_app():
     """실제 DB 사용 (instance/wetube.db) – 시드 데이터 삽입용."""
     app = create_app()
     app.config["TESTING"] = True
+    app.config["VIEW_COUNT_BUFFERED"] = False
+    app.config["JOB_WORKER_THREADS"] = 0
     return app
 
 
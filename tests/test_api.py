@@ -367,6 +367,22 @@ def test_api_tag_videos_returns_404_for_unknown_tag(client):
     assert resp.status_code == 404
 
 
+def test_tag_lookups_ignore_case_and_spacing(client, app_ctx, user):
+    """태그 조회는 name_key 기준 – 'Web 개발' 태그를 'web  개발'·'WEB 개발' 로도 찾음 (API·페이지 공통)."""
+    v = Video(title="키조회비디오", video_path="k.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    v.save_tags("Web 개발")
+
+    data = client.get("/api/tags/web  개발/videos").get_json()
+    assert data["tag"]["name"] == "Web 개발"
+    assert [x["title"] for x in data["items"]] == ["키조회비디오"]
+    data = client.get("/api/videos?tag=WEB 개발").get_json()
+    assert [x["title"] for x in data["items"]] == ["키조회비디오"]
+    assert "키조회비디오" in client.get("/tag/web 개발").data.decode("utf-8")
+    assert "키조회비디오" in client.get("/?tag=WEB  개발").data.decode("utf-8")
+
+
 def test_api_tag_videos_latest_order(client, app_ctx, user):
     """태그별 비디오 최신순."""
     v1 = Video(title="먼저", video_path="v1.mp4", user_id=user.id)
@@ -480,3 +496,81 @@ def test_api_user_videos_pagination(client, app_ctx, user):
     data = resp.get_json()
     assert len(data["items"]) <= 2
     assert data["meta"]["current_page"] == 1
+
+
+# ===========================================================================
+# 4. 일괄 조회 API – GET /api/videos?ids=, GET /api/users?ids=
+# ===========================================================================
+
+
+def _batch_query_count(app, client, url):
+    app.config["QUERY_COUNT_HEADER"] = True
+    resp = client.get(url)
+    assert resp.status_code == 200
+    return resp, int(resp.headers["X-Query-Count"])
+
+
+def test_api_videos_batch_keeps_order_and_reports_missing(app, client, app_ctx, user):
+    """ids 순서대로 반환, 없는 id 는 missing. 조회수는 오르지 않음."""
+    videos = [Video(title=f"batch{i}", video_path=f"b{i}.mp4", user_id=user.id, views=3) for i in range(3)]
+    db.session.add_all(videos)
+    db.session.commit()
+    videos[0].save_tags("일괄", commit=True)
+    ids = [videos[2].id, 999999, videos[0].id, videos[2].id]
+
+    data = client.get(f"/api/videos?ids={','.join(map(str, ids))},x").get_json()
+    assert [x["id"] for x in data["items"]] == [videos[2].id, videos[0].id]
+    assert data["missing"] == [999999]
+    assert data["items"][1]["tags"] == ["일괄"]
+    assert data["items"][1]["channel"]["username"] == user.username
+    assert "meta" not in data
+    db.session.expire_all()
+    assert db.session.get(Video, videos[0].id).views == 3
+
+
+def test_api_videos_batch_query_count_is_constant(app, client, app_ctx, user):
+    """비디오 수와 관계없이 쿼리 수 동일 (IN 쿼리), fields 도 적용."""
+    videos = [Video(title=f"cnt{i}", video_path=f"c{i}.mp4", user_id=user.id) for i in range(6)]
+    db.session.add_all(videos)
+    db.session.commit()
+    for v in videos:
+        v.save_tags("하나,둘", commit=False)
+    db.session.commit()
+    ids = [v.id for v in videos]
+
+    _, one = _batch_query_count(app, client, f"/api/videos?ids={ids[0]}")
+    resp, many = _batch_query_count(app, client, f"/api/videos?ids={','.join(map(str, ids))}")
+    assert many == one
+    assert len(resp.get_json()["items"]) == 6
+    items = client.get(f"/api/videos?ids={ids[0]}&fields=title").get_json()["items"]
+    assert items == [{"title": "cnt0"}]
+
+
+def test_api_videos_batch_rejects_too_many_ids(client):
+    from app.routes.api import MAX_BATCH_IDS
+
+    ids = ",".join(str(i) for i in range(1, MAX_BATCH_IDS + 2))
+    resp = client.get(f"/api/videos?ids={ids}")
+    assert resp.status_code == 400
+    assert resp.get_json()["success"] is False
+    assert client.get(f"/api/users?ids={ids}").status_code == 400
+
+
+def test_api_users_batch(app, logged_in_client, app_ctx, user, other_user):
+    """사용자 일괄 조회: 순서·missing·구독자 수·현재 사용자의 구독 여부, 쿼리 수 일정."""
+    logged_in_client.post(f"/user/{other_user.username}/subscribe")
+    data = logged_in_client.get(f"/api/users?ids={other_user.id},424242,{user.id}").get_json()
+    assert [x["username"] for x in data["items"]] == [other_user.username, user.username]
+    assert data["missing"] == [424242]
+    first = data["items"][0]
+    assert (first["subscriber_count"], first["is_subscribed"]) == (1, True)
+    assert "email" not in first
+    assert data["items"][1]["is_subscribed"] is False
+
+    _, one = _batch_query_count(app, logged_in_client, f"/api/users?ids={user.id}")
+    _, many = _batch_query_count(app, logged_in_client, f"/api/users?ids={user.id},{other_user.id},2")
+    assert many == one
+
+
+def test_api_users_batch_empty(client):
+    assert client.get("/api/users").get_json() == {"success": True, "items": [], "missing": []}
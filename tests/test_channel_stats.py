@@ -0,0 +1,147 @@
+# 단위 테스트 – 채널 통계 요약 테이블 (app/utils/channel_stats.py, channel_stats)
+
+import pytest
+from sqlalchemy import event, text
+
+from app import db
+from app.models import ChannelStats, Comment, User, Video
+from app.utils.channel_stats import _source_rows, get_channel_stats, reconcile_channel_stats
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (채널 주인)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def fan(app_ctx):
+    """다른 사용자 (구독·댓글 작성자)."""
+    u = User(username="stats_fan", email="stats_fan@example.com")
+    u.set_password("fanpass")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+def _stored(user_id):
+    row = db.session.get(ChannelStats, user_id)
+    db.session.refresh(row)
+    return {c: getattr(row, c) for c in ("video_count", "total_views", "total_likes", "total_comments", "subscriber_count")}
+
+
+def _assert_in_sync(user_id):
+    assert _stored(user_id) == _source_rows(db.session, [user_id])[user_id]
+
+
+def test_new_user_gets_zero_row(app_ctx, fan):
+    """사용자 생성 시 0으로 채운 행 생성."""
+    assert _stored(fan.id) == dict.fromkeys(_stored(fan.id), 0)
+
+
+def test_video_insert_update_delete(app_ctx, user):
+    """업로드 +1, 조회수·좋아요 변경 반영, 삭제 시 재계산."""
+    v1 = Video(title="통계1", video_path="s1.mp4", user_id=user.id, views=100, likes=5)
+    v2 = Video(title="통계2", video_path="s2.mp4", user_id=user.id, views=50, likes=3)
+    db.session.add_all([v1, v2])
+    db.session.commit()
+    stats = _stored(user.id)
+    assert (stats["video_count"], stats["total_views"], stats["total_likes"]) == (2, 150, 8)
+
+    v1.views = 130
+    v2.likes = 0
+    db.session.commit()
+    assert _stored(user.id)["total_views"] == 180
+    _assert_in_sync(user.id)
+
+    db.session.delete(v1)
+    db.session.commit()
+    _assert_in_sync(user.id)
+    assert _stored(user.id)["video_count"] == 1
+
+
+def test_like_subscribe_comment_routes(client, app_ctx, user, fan):
+    """좋아요 토글·구독 토글·댓글 작성/삭제 라우트 후에도 원본 집계와 일치."""
+    v = Video(title="상호작용", video_path="i.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    client.post("/auth/login", data={"login_id": "stats_fan", "password": "fanpass"})
+
+    client.post(f"/video/{v.id}/like")
+    client.post(f"/user/{user.username}/subscribe")
+    client.post("/comments/create", data={"video_id": v.id, "content": "첫 댓글"})
+    client.post("/comments/create", data={"video_id": v.id, "content": "둘째 댓글"})
+    stats = _stored(user.id)
+    assert (stats["total_likes"], stats["subscriber_count"], stats["total_comments"]) == (1, 1, 2)
+
+    comment = Comment.query.filter_by(video_id=v.id).first()
+    client.post(f"/comments/{comment.id}/delete")
+    client.post(f"/video/{v.id}/like")
+    client.post(f"/user/{user.username}/subscribe")
+    stats = _stored(user.id)
+    assert (stats["total_likes"], stats["subscriber_count"], stats["total_comments"]) == (0, 0, 1)
+    _assert_in_sync(user.id)
+
+
+def test_view_flush_updates_total_views(client, app, app_ctx, user):
+    """버퍼 조회수 flush 시 같은 트랜잭션에서 채널 total_views 증가."""
+    v = Video(title="조회수", video_path="f.mp4", user_id=user.id, views=5)
+    db.session.add(v)
+    db.session.commit()
+    app.config["VIEW_COUNT_BUFFERED"] = True
+    app.config["VIEW_COUNT_FLUSH_INTERVAL"] = 3600
+    app.config["VIEW_COUNT_FLUSH_SIZE"] = 10**9
+    counter = app.extensions["view_counter"]
+    try:
+        for _ in range(3):
+            client.get(f"/api/videos/{v.id}")
+        assert _stored(user.id)["total_views"] == 5
+        counter.flush()
+        assert _stored(user.id)["total_views"] == 8
+    finally:
+        counter.shutdown()
+
+
+def test_reconcile_fixes_drift(app_ctx, user):
+    """직접 수정·삭제로 어긋난 행을 원본 기준으로 복구, 고친 채널 수 반환."""
+    db.session.add(Video(title="드리프트", video_path="d.mp4", user_id=user.id, views=7))
+    db.session.commit()
+    db.session.execute(text("UPDATE channel_stats SET total_views = 999 WHERE user_id = :id"), {"id": user.id})
+    db.session.commit()
+    assert reconcile_channel_stats(db) == 1
+    _assert_in_sync(user.id)
+    assert reconcile_channel_stats(db) == 0
+
+
+def test_read_is_single_row_lookup(app_ctx, user):
+    """get_channel_stats 는 channel_stats 1행 SELECT 1번. 행이 없으면 원본 집계로 대체."""
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        get_channel_stats(user.id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    assert len(statements) == 1 and "channel_stats" in statements[0]
+
+    db.session.add(Video(title="행없음", video_path="n.mp4", user_id=user.id, views=3))
+    db.session.commit()
+    db.session.execute(text("DELETE FROM channel_stats WHERE user_id = :id"), {"id": user.id})
+    db.session.commit()
+    assert get_channel_stats(user.id)["total_views"] == _source_rows(db.session, [user.id])[user.id]["total_views"]
+
+
+def test_dashboard_and_profile_show_stats(logged_in_client, app_ctx, user, fan):
+    """스튜디오 대시보드 댓글 수·프로필 API 통계가 channel_stats 값."""
+    v = Video(title="대시보드", video_path="b.mp4", user_id=user.id, views=42)
+    db.session.add(v)
+    db.session.commit()
+    db.session.add(Comment(content="댓글", user_id=fan.id, video_id=v.id))
+    db.session.commit()
+    stats = logged_in_client.get(f"/api/users/{user.username}").get_json()["item"]["stats"]
+    assert stats["total_views"] == _stored(user.id)["total_views"]
+    assert _stored(user.id)["total_comments"] == 1
+    assert logged_in_client.get("/studio/").status_code == 200
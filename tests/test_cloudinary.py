@@ -6,15 +6,10 @@ from io import BytesIO
 from unittest.mock import patch
 
 import pytest
-from werkzeug.datastructures import FileStorage
 
 from app import db
 from app.models import User, Video
-from app.utils.cloudinary_upload import (
-    delete_cloudinary_resource,
-    upload_image,
-    upload_video,
-)
+from app.utils.cloudinary_upload import destroy_resource, upload_file
 
 # uploads 샘플 파일 경로 (프로젝트 루트 기준)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -23,138 +18,89 @@ UPLOADS_SAMPLE_THUMB = PROJECT_ROOT / "uploads" / "thumbnails" / "sample.png"
 UPLOADS_SAMPLE_PROFILE = PROJECT_ROOT / "uploads" / "profiles" / "sample.jpg"
 
 
-# ----- Cloudinary 헬퍼: 설정 없을 때 -----
-def test_upload_video_returns_error_when_not_configured():
-    """Cloudinary 미설정 시 upload_video → 에러 메시지 반환."""
-    prev = {}
-    for key in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
-        prev[key] = os.environ.pop(key, None)
-    try:
-        fs = FileStorage(stream=BytesIO(b"fake"), filename="test.mp4", content_type="video/mp4")
-        url, pid, err = upload_video(fs)
-        assert url is None
-        assert pid is None
-        assert err is not None
-        assert "Cloudinary" in err or "설정" in err
-    finally:
-        for k, v in prev.items():
-            if v is not None:
-                os.environ[k] = v
+_CLOUDINARY_KEYS = ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET")
 
 
-def test_upload_image_returns_error_when_not_configured():
-    """Cloudinary 미설정 시 upload_image → 에러 메시지 반환."""
-    prev = {}
-    for key in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
-        prev[key] = os.environ.pop(key, None)
-    try:
-        fs = FileStorage(stream=BytesIO(b"fake"), filename="thumb.png", content_type="image/png")
-        url, pid, err = upload_image(fs)
-        assert url is None
-        assert pid is None
-        assert err is not None
-    finally:
-        for k, v in prev.items():
-            if v is not None:
-                os.environ[k] = v
+@pytest.fixture
+def no_cloudinary_env(monkeypatch):
+    for key in _CLOUDINARY_KEYS:
+        monkeypatch.delenv(key, raising=False)
 
 
-def test_upload_video_returns_error_when_no_file():
-    """파일 없이 upload_video 호출 → 에러 반환."""
-    prev_env = {
-        "CLOUDINARY_CLOUD_NAME": os.environ.get("CLOUDINARY_CLOUD_NAME"),
-        "CLOUDINARY_API_KEY": os.environ.get("CLOUDINARY_API_KEY"),
-        "CLOUDINARY_API_SECRET": os.environ.get("CLOUDINARY_API_SECRET"),
-    }
-    os.environ["CLOUDINARY_CLOUD_NAME"] = "test"
-    os.environ["CLOUDINARY_API_KEY"] = "key"
-    os.environ["CLOUDINARY_API_SECRET"] = "secret"
-    try:
-        url, pid, err = upload_video(None)
-        assert url is None and pid is None and err is not None
-        url2, pid2, err2 = upload_video(FileStorage(stream=BytesIO(b""), filename="", content_type=""))
-        assert url2 is None and pid2 is None and err2 is not None
-    finally:
-        for k, v in prev_env.items():
-            if v is not None:
-                os.environ[k] = v
-            elif k in os.environ:
-                del os.environ[k]
+@pytest.fixture
+def cloudinary_env(monkeypatch):
+    for key, value in zip(_CLOUDINARY_KEYS, ("test", "key", "secret")):
+        monkeypatch.setenv(key, value)
 
 
-# ----- Cloudinary 헬퍼: mock 업로드 성공 -----
+# ----- Cloudinary 헬퍼: 설정 없을 때 (작업 큐가 재시도·실패 처리하도록 예외) -----
+def test_upload_file_raises_when_not_configured(no_cloudinary_env, tmp_path):
+    """Cloudinary 미설정 시 upload_file → RuntimeError."""
+    path = tmp_path / "test.mp4"
+    path.write_bytes(b"fake")
+    with pytest.raises(RuntimeError, match="Cloudinary"):
+        upload_file(str(path), "video", "wetube/videos")
+
+
+def test_destroy_resource_raises_when_not_configured(no_cloudinary_env):
+    """Cloudinary 미설정 시 destroy_resource → RuntimeError."""
+    with pytest.raises(RuntimeError, match="Cloudinary"):
+        destroy_resource("some_id", "video")
+
+
+def test_upload_file_raises_when_file_missing(cloudinary_env, tmp_path):
+    """없는 로컬 파일 → OSError (작업 큐에서 재시도)."""
+    with pytest.raises(OSError):
+        upload_file(str(tmp_path / "missing.mp4"), "video", "wetube/videos")
+
+
+# ----- Cloudinary 헬퍼: mock 업로드·삭제 -----
 @patch("cloudinary.uploader.upload")
-def test_upload_video_returns_secure_url_when_mocked(mock_upload):
-    """Cloudinary 업로드 모킹 시 secure_url, public_id 반환."""
+def test_upload_file_returns_result_when_mocked(mock_upload, cloudinary_env, tmp_path):
+    """업로드 결과 dict 반환, public_id 를 주면 같은 id 로 덮어쓰기 옵션."""
     mock_upload.return_value = {
         "secure_url": "https://res.cloudinary.com/test/video/upload/v1/wetube/videos/abc123.mp4",
         "public_id": "wetube/videos/abc123",
     }
-    prev = {
-        "CLOUDINARY_CLOUD_NAME": os.environ.pop("CLOUDINARY_CLOUD_NAME", None),
-        "CLOUDINARY_API_KEY": os.environ.pop("CLOUDINARY_API_KEY", None),
-        "CLOUDINARY_API_SECRET": os.environ.pop("CLOUDINARY_API_SECRET", None),
-    }
-    os.environ["CLOUDINARY_CLOUD_NAME"] = "test"
-    os.environ["CLOUDINARY_API_KEY"] = "key"
-    os.environ["CLOUDINARY_API_SECRET"] = "secret"
-    try:
-        fs = FileStorage(stream=BytesIO(b"fake video"), filename="test.mp4", content_type="video/mp4")
-        url, pid, err = upload_video(fs)
-        assert url == "https://res.cloudinary.com/test/video/upload/v1/wetube/videos/abc123.mp4"
-        assert pid == "wetube/videos/abc123"
-        assert err is None
-    finally:
-        for k, v in prev.items():
-            if v is not None:
-                os.environ[k] = v
-            elif k in os.environ:
-                del os.environ[k]
+    path = tmp_path / "abc123.mp4"
+    path.write_bytes(b"fake video")
+    result = upload_file(str(path), "video", "wetube/videos", public_id="abc123")
+    assert result["secure_url"] == "https://res.cloudinary.com/test/video/upload/v1/wetube/videos/abc123.mp4"
+    assert result["public_id"] == "wetube/videos/abc123"
+    args, options = mock_upload.call_args
+    assert args == (("abc123.mp4", b"fake video"),)
+    assert options["resource_type"] == "video" and options["folder"] == "wetube/videos"
+    assert options["public_id"] == "abc123" and options["overwrite"] is True
 
 
 @patch("cloudinary.uploader.upload")
-def test_upload_image_returns_secure_url_when_mocked(mock_upload):
-    """Cloudinary 이미지 업로드 모킹 시 secure_url 반환."""
+def test_upload_file_image_without_public_id_uses_unique_name(mock_upload, cloudinary_env, tmp_path):
+    """public_id 없이 이미지 업로드 → 파일명 기반 고유 이름."""
     mock_upload.return_value = {
         "secure_url": "https://res.cloudinary.com/test/image/upload/v1/wetube/thumbnails/thumb.jpg",
         "public_id": "wetube/thumbnails/thumb",
     }
-    prev = {
-        "CLOUDINARY_CLOUD_NAME": os.environ.pop("CLOUDINARY_CLOUD_NAME", None),
-        "CLOUDINARY_API_KEY": os.environ.pop("CLOUDINARY_API_KEY", None),
-        "CLOUDINARY_API_SECRET": os.environ.pop("CLOUDINARY_API_SECRET", None),
-    }
-    os.environ["CLOUDINARY_CLOUD_NAME"] = "test"
-    os.environ["CLOUDINARY_API_KEY"] = "key"
-    os.environ["CLOUDINARY_API_SECRET"] = "secret"
-    try:
-        fs = FileStorage(stream=BytesIO(b"fake image"), filename="thumb.jpg", content_type="image/jpeg")
-        url, pid, err = upload_image(fs)
-        assert url == "https://res.cloudinary.com/test/image/upload/v1/wetube/thumbnails/thumb.jpg"
-        assert pid == "wetube/thumbnails/thumb"
-        assert err is None
-    finally:
-        for k, v in prev.items():
-            if v is not None:
-                os.environ[k] = v
-            elif k in os.environ:
-                del os.environ[k]
-
-
-# ----- delete_cloudinary_resource -----
-def test_delete_cloudinary_resource_returns_false_when_not_configured():
-    """Cloudinary 미설정 시 delete_cloudinary_resource → False."""
-    prev = {}
-    for key in ("CLOUDINARY_CLOUD_NAME", "CLOUDINARY_API_KEY", "CLOUDINARY_API_SECRET"):
-        prev[key] = os.environ.pop(key, None)
-    try:
-        assert delete_cloudinary_resource("some_id", "video") is False
-        assert delete_cloudinary_resource(None, "video") is False
-        assert delete_cloudinary_resource("", "image") is False
-    finally:
-        for k, v in prev.items():
-            if v is not None:
-                os.environ[k] = v
+    path = tmp_path / "thumb.jpg"
+    path.write_bytes(b"fake image")
+    result = upload_file(str(path), "image", "wetube/thumbnails")
+    assert result["public_id"] == "wetube/thumbnails/thumb"
+    options = mock_upload.call_args.kwargs
+    assert options["resource_type"] == "image"
+    assert options["use_filename"] is True and options["unique_filename"] is True
+    assert "public_id" not in options
+
+
+@patch("cloudinary.uploader.destroy")
+def test_destroy_resource_accepts_ok_and_not_found(mock_destroy, cloudinary_env):
+    """삭제 응답 ok·not found 는 성공, 그 외는 예외."""
+    mock_destroy.return_value = {"result": "ok"}
+    destroy_resource("wetube/videos/a", "video")
+    mock_destroy.return_value = {"result": "not found"}
+    destroy_resource("wetube/videos/a", "video")
+    assert mock_destroy.call_args.kwargs["resource_type"] == "video"
+    mock_destroy.return_value = {"result": "error"}
+    with pytest.raises(RuntimeError):
+        destroy_resource("wetube/videos/a", "video")
 
 
 # ----- Video 모델 get_video_url, get_thumbnail_url -----
@@ -310,12 +256,9 @@ def test_upload_video_with_sample_from_uploads(mock_upload):
     try:
         if not UPLOADS_SAMPLE_VIDEO.exists():
             pytest.skip("uploads/videos/sample.mp4 샘플 파일이 없습니다.")
-        with open(UPLOADS_SAMPLE_VIDEO, "rb") as f:
-            fs = FileStorage(stream=f, filename="sample.mp4", content_type="video/mp4")
-            url, pid, err = upload_video(fs)
-        assert url == "https://res.cloudinary.com/test/video/upload/v1/wetube/videos/sample.mp4"
-        assert pid == "wetube/videos/sample"
-        assert err is None
+        result = upload_file(str(UPLOADS_SAMPLE_VIDEO), "video", "wetube/videos")
+        assert result["secure_url"] == "https://res.cloudinary.com/test/video/upload/v1/wetube/videos/sample.mp4"
+        assert result["public_id"] == "wetube/videos/sample"
         assert mock_upload.called
     finally:
         _restore_cloudinary_env(prev)
@@ -332,12 +275,9 @@ def test_upload_thumbnail_with_sample_from_uploads(mock_upload):
     try:
         if not UPLOADS_SAMPLE_THUMB.exists():
             pytest.skip("uploads/thumbnails/sample.png 샘플 파일이 없습니다.")
-        with open(UPLOADS_SAMPLE_THUMB, "rb") as f:
-            fs = FileStorage(stream=f, filename="sample.png", content_type="image/png")
-            url, pid, err = upload_image(fs, folder="wetube/thumbnails")
-        assert "res.cloudinary.com" in url
-        assert "wetube/thumbnails" in (pid or "")
-        assert err is None
+        result = upload_file(str(UPLOADS_SAMPLE_THUMB), "image", "wetube/thumbnails")
+        assert "res.cloudinary.com" in result["secure_url"]
+        assert "wetube/thumbnails" in (result.get("public_id") or "")
         assert mock_upload.called
     finally:
         _restore_cloudinary_env(prev)
@@ -354,12 +294,9 @@ def test_upload_profile_image_with_sample_from_uploads(mock_upload):
     try:
         if not UPLOADS_SAMPLE_PROFILE.exists():
             pytest.skip("uploads/profiles/sample.jpg 샘플 파일이 없습니다.")
-        with open(UPLOADS_SAMPLE_PROFILE, "rb") as f:
-            fs = FileStorage(stream=f, filename="sample.jpg", content_type="image/jpeg")
-            url, pid, err = upload_image(fs, folder="wetube/profiles")
-        assert "res.cloudinary.com" in url
-        assert "wetube/profiles" in (pid or "")
-        assert err is None
+        result = upload_file(str(UPLOADS_SAMPLE_PROFILE), "image", "wetube/profiles")
+        assert "res.cloudinary.com" in result["secure_url"]
+        assert "wetube/profiles" in (result.get("public_id") or "")
         assert mock_upload.called
     finally:
         _restore_cloudinary_env(prev)
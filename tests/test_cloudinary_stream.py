@@ -0,0 +1,135 @@
+# 단위 테스트 – Cloudinary 분할 스트리밍 업로드 (로컬 HTTP 서버를 업로드 API 대신 사용)
+
+import json
+import threading
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import cloudinary
+import pytest
+from app.utils.cloudinary_upload import stream_upload, upload_file
+
+CHUNK = 64 * 1024
+
+
+class _FakeCloudinary(BaseHTTPRequestHandler):
+    """업로드 요청의 Content-Range·파일 조각을 기록하고 Cloudinary 형식 JSON 응답."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        msg = BytesParser().parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+        )
+        fields = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                  for part in msg.get_payload()}
+        server = self.server
+        with server.lock:
+            server.requests.append({
+                "path": self.path,
+                "range": self.headers.get("Content-Range"),
+                "upload_id": self.headers.get("X-Unique-Upload-Id"),
+                "size": len(fields["file"]),
+            })
+            fail = server.fail_next
+            server.fail_next = False
+            if not fail:
+                server.received.extend(fields["file"])
+        status, payload = (500, {"error": {"message": "일시 오류"}}) if fail else (200, {
+            "public_id": "wetube/videos/streamed",
+            "secure_url": "https://res.cloudinary.com/test/video/upload/wetube/videos/streamed.mp4",
+        })
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_cloudinary(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeCloudinary)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.received = bytearray()
+    server.fail_next = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    prefix = f"http://127.0.0.1:{server.server_address[1]}"
+    for key, value in (("CLOUDINARY_CLOUD_NAME", "test"), ("CLOUDINARY_API_KEY", "key"),
+                       ("CLOUDINARY_API_SECRET", "secret"), ("CLOUDINARY_UPLOAD_PREFIX", prefix),
+                       ("CLOUDINARY_UPLOAD_CHUNK_SIZE", str(CHUNK))):
+        monkeypatch.setenv(key, value)
+    cloudinary.config(cloud_name="test", api_key="key", api_secret="secret", upload_prefix=prefix)
+    yield server
+    server.shutdown()
+    server.server_close()
+    cloudinary.config(upload_prefix=None)
+
+
+class _ReadTracker:
+    """read() 크기를 기록하는 seek 불가 스트림 (요청 본문 스트림 흉내)."""
+
+    def __init__(self, data):
+        self._buf = BytesIO(data)
+        self.max_read = 0
+
+    def read(self, n=-1):
+        self.max_read = max(self.max_read, n)
+        return self._buf.read(n)
+
+
+def test_upload_file_streams_in_chunks(fake_cloudinary, tmp_path):
+    """청크보다 큰 동영상 → 같은 업로드 id 로 Content-Range 분할 전송, 원본과 동일하게 재조립."""
+    data = bytes(range(256)) * (CHUNK * 3 // 256) + b"tail"
+    path = tmp_path / "big.mp4"
+    path.write_bytes(data)
+    result = upload_file(str(path), "video", "wetube/videos")
+    assert result["public_id"] == "wetube/videos/streamed"
+    reqs = fake_cloudinary.requests
+    assert len(reqs) == 4
+    assert all(r["path"] == "/v1_1/test/video/upload" for r in reqs)
+    assert len({r["upload_id"] for r in reqs}) == 1
+    assert reqs[0]["range"] == f"bytes 0-{CHUNK - 1}/{len(data)}"
+    assert reqs[-1]["range"] == f"bytes {3 * CHUNK}-{len(data) - 1}/{len(data)}"
+    assert max(r["size"] for r in reqs) == CHUNK
+    assert bytes(fake_cloudinary.received) == data
+
+
+def test_stream_upload_unknown_size_retries_and_reports_stats(fake_cloudinary):
+    """seek 불가 스트림: 중간 청크는 전체 크기 -1, 마지막에 실제 크기. 실패한 청크는 재시도, 읽기는 청크 크기 이하."""
+    data = b"x" * (CHUNK * 2 + 10)
+    stream = _ReadTracker(data)
+    progress = []
+    fake_cloudinary.fail_next = True
+    result, stats = stream_upload(
+        stream, "pipe.webm", chunk_size=CHUNK, resource_type="video",
+        on_progress=lambda sent, total: progress.append((sent, total)),
+    )
+    assert result["public_id"] == "wetube/videos/streamed"
+    ranges = [r["range"] for r in fake_cloudinary.requests]
+    assert ranges == [
+        f"bytes 0-{CHUNK - 1}/-1",
+        f"bytes 0-{CHUNK - 1}/-1",
+        f"bytes {CHUNK}-{2 * CHUNK - 1}/-1",
+        f"bytes {2 * CHUNK}-{len(data) - 1}/{len(data)}",
+    ]
+    assert bytes(fake_cloudinary.received) == data
+    assert stream.max_read == CHUNK
+    assert progress[-1] == (len(data), None)
+    assert stats.bytes_sent == len(data) and stats.chunks == 3
+    assert stats.elapsed > 0 and stats.throughput > 0
+
+
+def test_small_video_is_single_request(fake_cloudinary, tmp_path):
+    """청크 이하 크기는 분할 헤더 없이 업로드 1번."""
+    path = tmp_path / "s.mp4"
+    path.write_bytes(b"small video")
+    result = upload_file(str(path), "video", "wetube/videos")
+    assert result["secure_url"].endswith("streamed.mp4")
+    assert [r["range"] for r in fake_cloudinary.requests] == [None]
+    assert bytes(fake_cloudinary.received) == b"small video"
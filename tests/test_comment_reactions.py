@@ -0,0 +1,172 @@
+# 단위 테스트 – 댓글 좋아요·싫어요 (comments 블루프린트, app/utils/comment_reactions.py), 인기순 정렬
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+
+from app import db
+from app.models import Comment, User, Video
+from app.utils.comment_reactions import get_reactions, repair_reaction_counts, toggle_reaction
+
+
+# ----- 공통 픽스처 -----
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (create_app에서 id=1 생성, logged_in_client 의 사용자)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def other_user(app_ctx):
+    """다른 사용자 (카운터 누적 확인용)."""
+    u = User(username="reaction_other", email="reaction_other@example.com")
+    u.set_password("secret")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+@pytest.fixture
+def video(app_ctx, user):
+    v = Video(title="댓글 반응 영상", description="", video_path="r.mp4", thumbnail_path="r.png", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+@pytest.fixture
+def comments(app_ctx, video, user):
+    """등록 시각이 1분씩 차이 나는 최상위 댓글 5개."""
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = [
+        Comment(content=f"반응 {i}", user_id=user.id, video_id=video.id, created_at=base + timedelta(minutes=i))
+        for i in range(5)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+def _counts(comment_id):
+    db.session.expire_all()
+    c = db.session.get(Comment, comment_id)
+    return c.likes, c.dislikes
+
+
+# ----- 토글 -----
+def test_like_toggle_on_off_and_switch(logged_in_client, comments):
+    """좋아요 → 해제, 좋아요 → 싫어요 전환 시 반대 반응 해제·카운터 동시 갱신."""
+    cid = comments[0].id
+    data = logged_in_client.post(f"/comments/{cid}/like").get_json()
+    assert data == {"success": True, "reaction": "like", "likes_count": 1, "dislikes_count": 0}
+    data = logged_in_client.post(f"/comments/{cid}/like").get_json()
+    assert data["reaction"] is None and data["likes_count"] == 0
+    assert _counts(cid) == (0, 0)
+
+    logged_in_client.post(f"/comments/{cid}/like")
+    data = logged_in_client.post(f"/comments/{cid}/dislike").get_json()
+    assert data == {"success": True, "reaction": "dislike", "likes_count": 0, "dislikes_count": 1}
+    assert _counts(cid) == (0, 1)
+    rows = db.session.execute(text("SELECT COUNT(*) FROM comment_likes WHERE comment_id = :c"), {"c": cid}).scalar()
+    assert rows == 0
+
+
+def test_counters_accumulate_across_users(app_ctx, comments, user, other_user):
+    cid = comments[0].id
+    toggle_reaction(db.session, comments[0], user.id, "like")
+    _, likes, dislikes = toggle_reaction(db.session, comments[0], other_user.id, "like")
+    assert (likes, dislikes) == (2, 0)
+    assert _counts(cid) == (2, 0)
+
+
+def test_reaction_requires_login(client, comments):
+    resp = client.post(f"/comments/{comments[0].id}/like")
+    assert resp.status_code in (302, 401)
+    assert _counts(comments[0].id) == (0, 0)
+
+
+def test_reaction_on_missing_comment_returns_404(logged_in_client, app_ctx):
+    resp = logged_in_client.post("/comments/99999/like")
+    assert resp.status_code == 404 and resp.get_json()["success"] is False
+
+
+def test_toggle_rejects_unknown_reaction(app_ctx, comments, user):
+    with pytest.raises(ValueError):
+        toggle_reaction(db.session, comments[0], user.id, "love")
+
+
+# ----- 일괄 조회 -----
+def test_get_reactions_is_single_query(app_ctx, comments, user):
+    """댓글 한 페이지의 반응을 쿼리 1번으로: 좋아요·싫어요·무반응 구분."""
+    toggle_reaction(db.session, comments[1], user.id, "like")
+    toggle_reaction(db.session, comments[3], user.id, "dislike")
+    ids, user_id = [c.id for c in comments], user.id
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        found = get_reactions(db.session, user_id, ids)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    assert found == {comments[1].id: "like", comments[3].id: "dislike"}
+    assert len(statements) == 1
+    assert get_reactions(db.session, None, ids) == {}
+
+
+def test_reactions_endpoint(client, logged_in_client, comments):
+    logged_in_client.post(f"/comments/{comments[2].id}/dislike")
+    ids = ",".join(str(c.id) for c in comments)
+    data = logged_in_client.get(f"/comments/reactions?ids={ids},abc").get_json()
+    assert data == {"success": True, "reactions": {str(comments[2].id): "dislike"}}
+
+
+def test_watch_and_api_show_my_reaction(logged_in_client, video, comments):
+    logged_in_client.post(f"/comments/{comments[0].id}/like")
+    text_ = logged_in_client.get(f"/watch/{video.id}").get_data(as_text=True)
+    assert f'comment-reaction-btn active" data-comment-id="{comments[0].id}" data-reaction="like"' in text_
+
+    items = logged_in_client.get(f"/api/videos/{video.id}/comments").get_json()["items"]
+    by_id = {c["id"]: c for c in items}
+    assert by_id[comments[0].id]["my_reaction"] == "like" and by_id[comments[0].id]["likes"] == 1
+    assert by_id[comments[1].id]["my_reaction"] is None
+
+
+
+def test_watch_reaction_buttons_disabled_for_anonymous(client, video, comments):
+    """비로그인 watch 페이지는 댓글 좋아요·싫어요 버튼을 disabled 로 (로그인 사용자는 그대로)."""
+    button = f'data-comment-id="{comments[0].id}" data-reaction="like" disabled'
+    assert button in client.get(f"/watch/{video.id}").get_data(as_text=True)
+    client.post("/auth/login", data={"login_id": "default", "password": "default"})
+    assert button not in client.get(f"/watch/{video.id}").get_data(as_text=True)
+
+
+# ----- 인기순 정렬 -----
+def test_top_sort_orders_by_likes_with_cursor(client, app_ctx, video, comments):
+    """sort=top: likes 내림차순(동률은 id 내림차순), cursor 로 이어서 조회해도 중복·누락 없음."""
+    for c, likes in zip(comments, [3, 0, 5, 3, 1]):
+        c.likes = likes
+    db.session.commit()
+    seen, cursor = [], None
+    while True:
+        url = f"/api/videos/{video.id}/comments?sort=top&per_page=2" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url).get_json()
+        seen.extend(c["content"] for c in data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ["반응 2", "반응 3", "반응 0", "반응 4", "반응 1"]
+
+    text_ = client.get(f"/watch/{video.id}?comment_sort=top").get_data(as_text=True)
+    assert text_.index("반응 2") < text_.index("반응 1")
+
+
+def test_repair_reaction_counts_fixes_drift(app_ctx, comments, user):
+    toggle_reaction(db.session, comments[0], user.id, "like")
+    db.session.execute(text("UPDATE comments SET likes = 7, dislikes = 2 WHERE id = :id"), {"id": comments[0].id})
+    db.session.commit()
+    assert repair_reaction_counts(db, [comments[0].id]) == 1
+    assert _counts(comments[0].id) == (1, 0)
@@ -382,3 +382,91 @@ def test_watch_no_comments_shows_empty(client, app_ctx, video):
     assert resp.status_code == 200
     text = resp.data.decode("utf-8")
     assert "댓글" in text or "comments" in text.lower()
+
+
+# ----- 댓글 페이지·답글 페이지·videos.comment_count (app/utils/comments.py) -----
+def _add_comments(video, user, n, parent=None, prefix="댓글"):
+    from datetime import datetime, timedelta, timezone
+
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    items = [
+        Comment(
+            content=f"{prefix} {i:02d}", user_id=user.id, video_id=video.id,
+            parent_id=parent.id if parent else None, created_at=base + timedelta(minutes=i),
+        )
+        for i in range(n)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+def test_comment_count_follows_create_reply_delete(logged_in_client, app_ctx, video):
+    """댓글 작성·답글·삭제 라우트에서 videos.comment_count 가 답글 포함 개수로 유지됨."""
+    logged_in_client.post("/comments/create", data={"video_id": video.id, "content": "하나"})
+    top = Comment.query.filter_by(video_id=video.id).one()
+    logged_in_client.post(f"/comments/{top.id}/reply", data={"content": "둘"})
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).comment_count == 2
+
+    reply = Comment.query.filter_by(parent_id=top.id).one()
+    logged_in_client.post(f"/comments/{reply.id}/delete")
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).comment_count == 1
+
+
+def test_watch_renders_first_page_without_replies(client, app, app_ctx, video, user):
+    """watch: 최상위 댓글은 첫 페이지만, 답글은 개수 버튼만 (내용은 API 로 불러옴)."""
+    app.config["COMMENTS_PER_PAGE"] = 3
+    tops = _add_comments(video, user, 5)
+    _add_comments(video, user, 2, parent=tops[0], prefix="답글내용")
+
+    text = client.get(f"/watch/{video.id}").get_data(as_text=True)
+    assert "댓글 00" in text and "댓글 02" in text and "댓글 03" not in text
+    assert "답글내용" not in text
+    assert "답글 2개" in text
+    assert 'id="comments-more"' in text
+    assert '<span id="comments-count">7</span>' in text
+
+
+def test_api_comments_cursor_pages_and_replies(client, app_ctx, video, user):
+    """/api/videos/<id>/comments: cursor 로 이어서 조회 (중복·누락 없음), 답글은 /api/comments/<id>/replies."""
+    tops = _add_comments(video, user, 7)
+    _add_comments(video, user, 3, parent=tops[1], prefix="답글")
+
+    seen, cursor = [], None
+    while True:
+        url = f"/api/videos/{video.id}/comments?per_page=3" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url).get_json()
+        assert data["success"] and data["meta"]["total_comments"] == 10
+        seen.extend(data["items"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert [c["content"] for c in seen] == [f"댓글 {i:02d}" for i in range(7)]
+    assert [c["reply_count"] for c in seen][:3] == [0, 3, 0]
+    assert seen[0]["user"]["username"] == user.username and seen[0]["can_edit"] is False
+
+    first = client.get(f"/api/comments/{tops[1].id}/replies?per_page=2").get_json()
+    assert [c["content"] for c in first["items"]] == ["답글 00", "답글 01"]
+    rest = client.get(f"/api/comments/{tops[1].id}/replies?per_page=2&cursor={first['next_cursor']}").get_json()
+    assert [c["content"] for c in rest["items"]] == ["답글 02"] and rest["next_cursor"] is None
+
+
+def test_api_comments_not_found(client, app_ctx):
+    assert client.get("/api/videos/99999/comments").status_code == 404
+    assert client.get("/api/comments/99999/replies").status_code == 404
+
+
+def test_repair_comment_counts_fixes_drift(app_ctx, video, user):
+    """repair_comment_counts: comments 기준으로 어긋난 comment_count 재계산."""
+    from sqlalchemy import text
+
+    from app.utils.comments import repair_comment_counts
+
+    _add_comments(video, user, 4)
+    db.session.execute(text("UPDATE videos SET comment_count = 99 WHERE id = :id"), {"id": video.id})
+    db.session.commit()
+    assert repair_comment_counts(db) >= 1
+    db.session.expire_all()
+    assert db.session.get(Video, video.id).comment_count == 4
@@ -0,0 +1,194 @@
+# 단위 테스트 – MP4 faststart (app/utils/faststart.py): moov 이동, 청크 위치(stco/co64) 보정, 업로드 후처리
+
+import os
+import struct
+import uuid
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from app import db
+from app.models import Video
+from app.utils.faststart import (
+    FaststartError, _Overflow, _rebuild, ensure_faststart, needs_faststart, relocate_moov, relocate_stored_video,
+)
+from app.utils.media_probe import probe
+
+_MARKERS = [b"CHUNK-%02d" % i for i in range(5)]
+
+
+def _box(kind, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _moov(offsets, co64=False):
+    mvhd = b"\0" * 12 + struct.pack(">II", 1000, 10_000) + b"\0" * 80
+    tkhd = b"\0\0\0\x07" + b"\0" * 72 + struct.pack(">II", 640 << 16, 360 << 16)
+    hdlr = b"\0" * 8 + b"vide" + b"\0" * 12 + b"VideoHandler\0"
+    if co64:
+        table = _box(b"co64", b"\0" * 4 + struct.pack(f">I{len(offsets)}Q", len(offsets), *offsets))
+    else:
+        table = _box(b"stco", b"\0" * 4 + struct.pack(f">I{len(offsets)}I", len(offsets), *offsets))
+    stbl = _box(b"stsz", b"\0" * 12) + table
+    trak = _box(b"trak", _box(b"tkhd", tkhd) + _box(b"mdia", _box(b"hdlr", hdlr) + _box(b"minf", _box(b"stbl", stbl))))
+    return _box(b"moov", _box(b"mvhd", mvhd) + trak)
+
+
+def _moov_at_end(co64=False, trailer=b""):
+    """ftyp + mdat(청크마다 표식) + moov (+ trailer). 청크 위치는 표식 시작 위치."""
+    ftyp = _box(b"ftyp", b"isom\0\0\0\x01isomavc1")
+    body = b"".join(m + b"\0" * 1000 for m in _MARKERS)
+    mdat = _box(b"mdat", body)
+    start = len(ftyp) + 8
+    offsets = [start + i * (len(_MARKERS[0]) + 1000) for i in range(len(_MARKERS))]
+    return ftyp + mdat + _moov(offsets, co64) + trailer
+
+
+def _chunk_offsets(data):
+    for kind, fmt in ((b"stco", "I"), (b"co64", "Q")):
+        pos = data.find(kind)
+        if pos != -1:
+            count = struct.unpack_from(">I", data, pos + 8)[0]
+            return kind, struct.unpack_from(f">{count}{fmt}", data, pos + 12)
+    return None, ()
+
+
+def _write(tmp_path, data, name="v.mp4"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.mark.parametrize("co64", [False, True])
+def test_relocate_moves_moov_and_fixes_chunk_offsets(tmp_path, co64):
+    original = _moov_at_end(co64=co64, trailer=_box(b"free", b"\0" * 16))
+    path = _write(tmp_path, original)
+    assert needs_faststart(path) is True
+    assert probe(path).faststart is False
+
+    assert relocate_moov(path) is True
+    data = open(path, "rb").read()
+    assert len(data) == len(original)
+    assert data.index(b"moov") < data.index(b"mdat")
+    kind, offsets = _chunk_offsets(data)
+    assert kind == (b"co64" if co64 else b"stco")
+    assert [data[o:o + len(m)] for o, m in zip(offsets, _MARKERS)] == _MARKERS
+    info = probe(path)
+    assert info.faststart is True and info.duration == 10.0
+    assert not [n for n in os.listdir(tmp_path) if n.endswith(".faststart")]
+
+
+def test_already_faststart_or_not_mp4_left_untouched(tmp_path):
+    path = _write(tmp_path, _moov_at_end())
+    relocate_moov(path)
+    mtime = os.stat(path).st_mtime_ns
+    assert relocate_moov(path) is False
+    assert os.stat(path).st_mtime_ns == mtime
+
+    for data in (b"\x00\x00\x00\x20ftypmp42", b"not a video", _moov_at_end()[:-20]):
+        broken = _write(tmp_path, data, "broken.mp4")
+        assert ensure_faststart(broken) is False
+        assert open(broken, "rb").read() == data
+
+
+def test_stco_overflow_is_upgraded_to_co64():
+    moov = _moov([100, 200])
+    with pytest.raises(_Overflow):
+        _rebuild(moov, lambda o: o + 2 ** 32, False)
+    rebuilt = _rebuild(moov, lambda o: o + 2 ** 32, True)
+    assert len(rebuilt) == len(moov) + 2 * 4
+    assert _chunk_offsets(rebuilt) == (b"co64", (2 ** 32 + 100, 2 ** 32 + 200))
+
+
+def test_upload_relocates_moov(app, logged_in_client):
+    resp = logged_in_client.post(
+        "/studio/upload",
+        data={"title": "faststart 업로드", "video": (BytesIO(_moov_at_end()), "phone.mp4")},
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 302
+    video = Video.query.filter_by(title="faststart 업로드").one()
+    # 요청에서는 헤더만 읽고 옮기기는 작업 큐로
+    assert video.status == "processing" and video.faststart is False
+    assert video.duration == 10 and (video.width, video.height) == (640, 360)
+    old_path = os.path.join(app.config["VIDEO_FOLDER"], video.video_path)
+
+    app.extensions["job_queue"].run_pending()
+    db.session.expire_all()
+    path = os.path.join(app.config["VIDEO_FOLDER"], video.video_path)
+    try:
+        assert path != old_path and not os.path.exists(old_path)
+        assert probe(path).faststart is True
+        assert video.faststart is True and video.status == "ready"
+    finally:
+        os.remove(path)
+        db.session.delete(video)
+        db.session.commit()
+
+
+def test_faststart_job_chains_cloudinary_upload(app, app_ctx, monkeypatch):
+    """Cloudinary 사용 시 faststart 작업이 끝난 뒤 옮겨 쓴 파일로 업로드 작업이 이어짐."""
+    from app.utils import cloudinary_upload
+    from app.utils.media_jobs import enqueue_video_faststart
+
+    uploaded = []
+
+    def fake_upload(path, resource_type, folder, public_id=None):
+        uploaded.append((os.path.basename(path), probe(path).faststart))
+        return {"public_id": f"{folder}/{public_id}", "secure_url": f"https://res.cloudinary.com/x/{public_id}.mp4"}
+
+    monkeypatch.setattr(cloudinary_upload, "upload_file", fake_upload)
+    name = f"{uuid.uuid4().hex}.mp4"
+    folder = app.config["VIDEO_FOLDER"]
+    _write(Path(folder), _moov_at_end(), name)
+    video = Video(title="faststart 후 업로드", video_path=name, status="processing", user_id=1)
+    db.session.add(video)
+    db.session.flush()
+    enqueue_video_faststart(db.session, video, upload=True)
+    db.session.commit()
+
+    app.extensions["job_queue"].run_pending()
+    db.session.expire_all()
+    try:
+        assert len(uploaded) == 1
+        relocated, faststart = uploaded[0]
+        assert relocated != name and faststart is True
+        assert video.status == "ready" and video.video_url.endswith(f"{os.path.splitext(relocated)[0]}.mp4")
+        # 업로드 뒤 로컬 파일은 둘 다 정리됨
+        assert not os.path.exists(os.path.join(folder, name)) and not os.path.exists(os.path.join(folder, relocated))
+    finally:
+        db.session.delete(video)
+        db.session.commit()
+
+
+def test_stored_uuid_file_is_written_under_new_name(app_ctx, tmp_path):
+    """uuid 파일명(immutable 캐시)은 제자리 교체 없이 새 파일명으로 → video_path 변경, 이전 파일 삭제."""
+    name = f"{uuid.uuid4().hex}.mp4"
+    _write(tmp_path, _moov_at_end(), name)
+    video = Video(title="일괄 faststart", video_path=name, user_id=1)
+    db.session.add(video)
+    db.session.commit()
+
+    new_name = relocate_stored_video(db, str(tmp_path), name)
+    assert new_name != name and new_name.endswith(".mp4")
+    assert os.listdir(tmp_path) == [new_name]
+    db.session.refresh(video)
+    assert video.video_path == new_name and video.faststart is True
+    assert probe(str(tmp_path / new_name)).faststart is True
+    assert relocate_stored_video(db, str(tmp_path), new_name) is None
+
+
+def test_stored_file_replaced_in_place_only_when_not_immutable(app_ctx, tmp_path):
+    """uuid 가 아닌 파일명은 제자리 교체, DB 에 없는 uuid 파일은 건드리지 않음."""
+    _write(tmp_path, _moov_at_end(), "legacy_clip.mp4")
+    assert relocate_stored_video(db, str(tmp_path), "legacy_clip.mp4") == "legacy_clip.mp4"
+    assert probe(str(tmp_path / "legacy_clip.mp4")).faststart is True
+
+    orphan = f"{uuid.uuid4().hex}.mp4"
+    data = _moov_at_end()
+    _write(tmp_path, data, orphan)
+    with pytest.raises(FaststartError):
+        relocate_stored_video(db, str(tmp_path), orphan)
+    assert (tmp_path / orphan).read_bytes() == data
+    assert sorted(os.listdir(tmp_path)) == sorted(["legacy_clip.mp4", orphan])
@@ -0,0 +1,157 @@
+# 단위 테스트 – 구독 피드 (app/utils/feed.py): inbox fan-out, 구독 backfill·취소 정리, 대형 채널 merge-on-read, keyset
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app import db
+from app.models import Subscription, User, Video
+from app.models.subscription import feed_items
+from app.utils.feed import feed_page, rebuild_feeds
+
+_BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+# ----- 공통 픽스처 -----
+@pytest.fixture
+def user(app_ctx):
+    """피드를 보는 사용자 (id=1, logged_in_client 의 사용자)."""
+    return db.session.get(User, 1)
+
+
+def _channel(name):
+    u = User(username=name, email=f"{name}@example.com")
+    u.set_password("secret")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+def _upload(channel, n, start=0, prefix=None):
+    """channel 에 업로드 시각이 1분씩 차이 나는 영상 n 개."""
+    prefix = prefix or channel.username
+    videos = [
+        Video(
+            title=f"{prefix}-{i:02d}", video_path=f"{prefix}{i}.mp4", user_id=channel.id,
+            created_at=_BASE + timedelta(minutes=start + i),
+        )
+        for i in range(n)
+    ]
+    db.session.add_all(videos)
+    db.session.commit()
+    return videos
+
+
+def _subscribe(subscriber, channel):
+    db.session.add(Subscription(subscriber_id=subscriber.id, subscribed_to_id=channel.id))
+    db.session.commit()
+
+
+def _inbox(user_id):
+    return set(db.session.execute(select(feed_items.c.video_id).where(feed_items.c.user_id == user_id)).scalars())
+
+
+def _titles(page):
+    return [v.title for v in page.items]
+
+
+def _walk(user_id, per_page):
+    """cursor 로 끝까지 조회한 제목 목록."""
+    titles, cursor = [], None
+    while True:
+        page = feed_page(user_id, per_page=per_page, cursor=cursor)
+        titles.extend(_titles(page))
+        cursor = page.next_cursor
+        if not cursor:
+            return titles
+
+
+# ----- fan-out·backfill·정리 -----
+def test_upload_fans_out_to_subscribers(app_ctx, user):
+    chan = _channel("fan_chan")
+    _subscribe(user, chan)
+    videos = _upload(chan, 3)
+    assert _inbox(user.id) == {v.id for v in videos}
+    assert _titles(feed_page(user.id)) == ["fan_chan-02", "fan_chan-01", "fan_chan-00"]
+
+
+def test_subscribe_backfills_recent_and_unsubscribe_cleans_up(logged_in_client, app, user):
+    """구독 토글: 최근 FEED_BACKFILL_LIMIT 개 채움, 취소 시 그 채널 행만 삭제."""
+    app.config["FEED_BACKFILL_LIMIT"] = 4
+    chan, other = _channel("bf_chan"), _channel("bf_other")
+    videos = _upload(chan, 6)
+    _subscribe(user, other)
+    kept = _upload(other, 1)
+
+    logged_in_client.post(f"/user/{chan.username}/subscribe")
+    assert _inbox(user.id) == {v.id for v in videos[2:]} | {kept[0].id}
+
+    logged_in_client.post(f"/user/{chan.username}/subscribe")
+    assert _inbox(user.id) == {kept[0].id}
+
+
+def test_video_delete_removes_feed_rows(app_ctx, user):
+    chan = _channel("del_chan")
+    _subscribe(user, chan)
+    video = _upload(chan, 1)[0]
+    db.session.delete(video)
+    db.session.commit()
+    assert _inbox(user.id) == set()
+
+
+# ----- 대형 채널 merge-on-read -----
+def test_large_channel_is_merged_on_read(app, app_ctx, user):
+    """구독자 수가 기준 이상이면 feed_pull 표시 후 inbox 에 넣지 않고, 조회 때 최신순으로 합침 (중복 없음)."""
+    app.config["FEED_FANOUT_MAX_SUBSCRIBERS"] = 2
+    big, small = _channel("big_chan"), _channel("small_chan")
+    fans = [_channel(f"big_fan{i}") for i in range(2)]
+    _subscribe(user, big)
+    _subscribe(user, small)
+    before = _upload(big, 2, start=0, prefix="big-old")  # 구독자 1명 → inbox
+    for fan in fans:
+        _subscribe(fan, big)
+    after = _upload(big, 2, start=10, prefix="big-new")  # 구독자 3명 → feed_pull
+    _upload(small, 2, start=5)
+
+    db.session.expire_all()
+    assert db.session.get(User, big.id).feed_pull is True
+    assert _inbox(user.id) & {v.id for v in after} == set()
+    assert {v.id for v in before} <= _inbox(user.id)
+    expected = ["big-new-01", "big-new-00", "small_chan-01", "small_chan-00", "big-old-01", "big-old-00"]
+    assert _titles(feed_page(user.id, per_page=12)) == expected
+    assert _walk(user.id, per_page=4) == expected
+    assert feed_page(user.id).total == 6
+
+    # 새 구독자: 대형 채널은 backfill 없이 조회 때 합침
+    late = _channel("late_fan")
+    _subscribe(late, big)
+    assert _inbox(late.id) == set()
+    assert _titles(feed_page(late.id)) == ["big-new-01", "big-new-00", "big-old-01", "big-old-00"]
+
+
+# ----- 페이지 -----
+def test_cursor_and_page_numbers_agree(app_ctx, user):
+    chans = [_channel(f"pg_chan{i}") for i in range(3)]
+    for i, chan in enumerate(chans):
+        _subscribe(user, chan)
+        _upload(chan, 5, start=i * 2)
+    walked = _walk(user.id, per_page=4)
+    assert len(walked) == 15 and len(set(walked)) == 15
+    by_page = []
+    for page_no in range(1, 5):
+        page = feed_page(user.id, page=page_no, per_page=4)
+        by_page.extend(_titles(page))
+        assert page.has_next == (page_no < 4)
+    assert by_page == walked
+
+
+def test_rebuild_feeds_restores_inbox(app_ctx, user):
+    chan = _channel("rb_chan")
+    _subscribe(user, chan)
+    videos = _upload(chan, 3)
+    db.session.execute(feed_items.delete())
+    db.session.commit()
+    assert rebuild_feeds(db) == 3
+    assert _inbox(user.id) == {v.id for v in videos}
+    assert rebuild_feeds(db, [user.id]) == 3
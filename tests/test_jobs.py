@@ -0,0 +1,201 @@
+# 단위 테스트 – 작업 큐 (app/utils/jobs.py) 재시도·backoff·idempotency, Cloudinary 업로드·삭제 작업 (app/utils/media_jobs.py)
+
+import os
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import update
+
+from app import db
+from app.models import Job, Video
+from app.utils.jobs import enqueue, get_job_queue, job_handler
+
+_calls = []
+
+
+@job_handler("test.flaky", on_failure=lambda payload, error: _calls.append(("gave_up", payload["n"])))
+def _flaky(payload):
+    _calls.append(("run", payload["n"]))
+    if len([c for c in _calls if c[0] == "run"]) <= payload.get("fail_times", 0):
+        raise RuntimeError("일시 오류")
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    _calls.clear()
+
+
+@pytest.fixture
+def cloud_env(monkeypatch):
+    for key, value in (("CLOUDINARY_CLOUD_NAME", "test"), ("CLOUDINARY_API_KEY", "key"),
+                       ("CLOUDINARY_API_SECRET", "secret")):
+        monkeypatch.setenv(key, value)
+
+
+def _make_due(job_id):
+    """backoff 대기 시간을 건너뛰고 바로 실행 가능하게."""
+    db.session.execute(update(Job.__table__).where(Job.__table__.c.id == job_id).values(run_at=datetime(2000, 1, 1)))
+    db.session.commit()
+
+
+def test_enqueue_same_key_creates_one_job(app_ctx):
+    """같은 idempotency key 로 두 번 등록해도 작업은 1건, 같은 id."""
+    first = enqueue(db.session, "test.flaky", {"n": 1}, key="once")
+    second = enqueue(db.session, "test.flaky", {"n": 2}, key="once")
+    db.session.commit()
+    assert first == second
+    assert Job.query.filter_by(idempotency_key="once").count() == 1
+    assert get_job_queue().run_pending() == 1
+    assert _calls == [("run", 1)]
+
+
+def test_failed_job_is_retried_with_backoff(app, app_ctx):
+    """실패하면 pending 으로 돌아가 run_at 이 미뤄지고, 시각이 되면 다시 실행되어 done."""
+    app.config["JOB_BACKOFF_BASE"] = 30
+    job_id = enqueue(db.session, "test.flaky", {"n": 7, "fail_times": 1})
+    db.session.commit()
+    queue = get_job_queue()
+
+    assert queue.run_pending() == 1
+    job = db.session.get(Job, job_id)
+    assert job.status == "pending" and job.attempts == 1
+    assert "일시 오류" in job.last_error
+    assert job.run_at > datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=20)
+    assert queue.run_pending() == 0  # 아직 대기 시간
+
+    _make_due(job_id)
+    assert queue.run_pending() == 1
+    db.session.expire_all()
+    job = db.session.get(Job, job_id)
+    assert job.status == "done" and job.attempts == 2 and job.finished_at is not None
+
+
+def test_job_fails_after_max_attempts_and_calls_on_failure(app_ctx):
+    """최대 시도 횟수만큼 실패하면 failed + on_failure 호출, 이후 다시 실행 안 됨."""
+    job_id = enqueue(db.session, "test.flaky", {"n": 3, "fail_times": 99}, max_attempts=2)
+    db.session.commit()
+    queue = get_job_queue()
+    queue.run_pending()
+    _make_due(job_id)
+    queue.run_pending()
+    db.session.expire_all()
+    assert db.session.get(Job, job_id).status == "failed"
+    assert _calls == [("run", 3), ("run", 3), ("gave_up", 3)]
+    _make_due(job_id)
+    assert queue.run_pending() == 0
+
+
+def test_claim_is_exclusive_and_reclaims_stale_jobs(app, app_ctx):
+    """한 워커가 가져간 작업은 다른 워커가 못 가져감. 잠금이 만료되면 다시 가져감."""
+    job_id = enqueue(db.session, "test.flaky", {"n": 1})
+    db.session.commit()
+    queue = get_job_queue()
+    assert queue._claim("w1").id == job_id
+    assert queue._claim("w2") is None
+    app.config["JOB_LOCK_TIMEOUT"] = 60
+    db.session.execute(
+        update(Job.__table__).where(Job.__table__.c.id == job_id).values(locked_at=datetime(2000, 1, 1))
+    )
+    db.session.commit()
+    reclaimed = queue._claim("w2")
+    assert reclaimed.id == job_id and reclaimed.attempts == 2
+
+
+# ----- Cloudinary 업로드·삭제 작업 -----
+@patch("cloudinary.uploader.upload")
+def test_cloudinary_upload_returns_processing_then_job_publishes(mock_upload, cloud_env, logged_in_client, app, app_ctx):
+    """업로드 요청은 원격 호출 없이 processing 으로 응답, 작업 실행 후 video_url 채우고 로컬 파일 삭제."""
+    mock_upload.side_effect = lambda file, **opts: {
+        "public_id": f"{opts['folder']}/{opts['public_id']}",
+        "secure_url": f"https://res.cloudinary.com/test/{opts['resource_type']}/{opts['public_id']}",
+    }
+    resp = logged_in_client.post(
+        "/studio/upload",
+        data={
+            "title": "비동기 업로드",
+            "video": (BytesIO(b"\x00\x00\x00\x20ftypmp42"), "a.mp4"),
+            "thumbnail": (BytesIO(b"\x89PNG\r\n\x1a\n"), "t.png"),
+        },
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 302
+    assert not mock_upload.called
+    video = Video.query.filter_by(title="비동기 업로드").one()
+    assert video.status == "processing" and video.video_url is None
+    local_video = os.path.join(app.config["VIDEO_FOLDER"], video.video_path)
+    assert os.path.isfile(local_video)
+
+    assert get_job_queue().run_pending() == 1
+    db.session.expire_all()
+    video = db.session.get(Video, video.id)
+    assert video.status == "ready"
+    assert video.video_url.startswith("https://") and video.thumbnail_url.startswith("https://")
+    assert video.video_public_id.startswith("wetube/videos/")
+    assert not os.path.exists(local_video)
+    assert mock_upload.call_count == 2
+
+
+
+def test_exit_shutdown_registered_once_per_process(monkeypatch, app):
+    import app.utils.jobs as jobs
+
+    calls = []
+    monkeypatch.setattr(jobs, "_atexit_registered", False)
+    monkeypatch.setattr(jobs.atexit, "register", calls.append)
+    queues = [jobs.JobQueue(app) for _ in range(3)]
+    assert calls == [jobs._shutdown_all]
+    assert all(queue in jobs._live_queues for queue in queues)
+
+@patch("cloudinary.uploader.upload", side_effect=RuntimeError("원격 오류"))
+def test_cloudinary_upload_gives_up_marks_failed(mock_upload, cloud_env, app, app_ctx):
+    """업로드가 계속 실패하면 status=failed, 로컬 파일은 남아 재생 가능."""
+    filename = "jobs_fail_test.mp4"
+    path = os.path.join(app.config["VIDEO_FOLDER"], filename)
+    with open(path, "wb") as f:
+        f.write(b"data")
+    try:
+        video = Video(title="실패", video_path=filename, status="processing", user_id=1)
+        db.session.add(video)
+        db.session.flush()
+        from app.utils.media_jobs import enqueue_video_upload
+        job_id = enqueue_video_upload(db.session, video)
+        db.session.execute(update(Job.__table__).where(Job.__table__.c.id == job_id).values(max_attempts=1))
+        db.session.commit()
+        get_job_queue().run_pending()
+        db.session.expire_all()
+        assert db.session.get(Video, video.id).status == "failed"
+        assert os.path.isfile(path)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@patch("cloudinary.uploader.destroy")
+def test_delete_enqueues_durable_remote_destroy(mock_destroy, cloud_env, logged_in_client, app_ctx):
+    """비디오 삭제 시 원격 삭제는 작업으로 등록 → 실패하면 재시도해 결국 삭제."""
+    video = Video(
+        title="원격 삭제", video_path="wetube/videos/gone", video_public_id="wetube/videos/gone",
+        thumbnail_public_id="wetube/thumbnails/gone", user_id=1,
+    )
+    db.session.add(video)
+    db.session.commit()
+    mock_destroy.side_effect = [RuntimeError("timeout"), {"result": "ok"}, {"result": "not found"}]
+
+    resp = logged_in_client.post(f"/studio/delete/{video.id}")
+    assert resp.status_code == 302
+    assert not mock_destroy.called
+    jobs = Job.query.filter_by(kind="cloudinary.destroy").order_by(Job.id).all()
+    assert [j.idempotency_key for j in jobs] == [
+        "destroy:video:wetube/videos/gone", "destroy:image:wetube/thumbnails/gone",
+    ]
+
+    queue = get_job_queue()
+    queue.run_pending()
+    for j in jobs:
+        _make_due(j.id)
+    queue.run_pending()
+    db.session.expire_all()
+    assert [db.session.get(Job, j.id).status for j in jobs] == ["done", "done"]
+    assert mock_destroy.call_count == 3
@@ -0,0 +1,130 @@
+# 단위 테스트 – 좋아요 원자적 토글·좋아요 목록 캐시 (app/utils/likes.py), 동시 토글 시 카운트 정확성
+
+import os
+import threading
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app import create_app, db
+from app.models import User, Video
+from app.models.video import video_likes
+from app.utils.channel_stats import get_channel_stats
+from app.utils.likes import clear_liked_cache, is_liked, toggle_like
+
+
+@pytest.fixture
+def video(app_ctx):
+    v = Video(title="토글 영상", video_path="toggle.mp4", user_id=1)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _likes_rows(video_id):
+    return db.session.execute(
+        select(func.count()).select_from(video_likes).where(video_likes.c.video_id == video_id)
+    ).scalar()
+
+
+def test_toggle_returns_state_and_counter(app_ctx, video):
+    """추가 → 해제 순서로 상태·카운트 반환, videos.likes·channel_stats 도 같이 증감."""
+    assert toggle_like(db.session, video, 1) == (True, 1)
+    assert db.session.get(Video, video.id).likes == 1
+    assert get_channel_stats(1)["total_likes"] == 1
+    assert toggle_like(db.session, video, 1) == (False, 0)
+    assert _likes_rows(video.id) == 0
+    assert get_channel_stats(1)["total_likes"] == 0
+
+
+def test_liked_cache_follows_commits(app, app_ctx, video):
+    """좋아요 목록은 캐시되고, 토글은 커밋 후 캐시에 반영 (롤백되면 반영 안 됨)."""
+    assert is_liked(db.session, 1, video.id) is False
+    # 캐시된 상태에서 직접 SQL 로 바꾸면 캐시 비우기 전까지 보이지 않음
+    db.session.execute(insert(video_likes).values(video_id=video.id, user_id=1))
+    db.session.commit()
+    assert is_liked(db.session, 1, video.id) is False
+    clear_liked_cache()
+    assert is_liked(db.session, 1, video.id) is True
+
+    toggle_like(db.session, video, 1, commit=False)
+    db.session.rollback()
+    assert is_liked(db.session, 1, video.id) is True
+    toggle_like(db.session, video, 1)
+    assert is_liked(db.session, 1, video.id) is False
+    assert is_liked(db.session, None, video.id) is False
+
+
+# ----- 동시 토글: 별도 연결을 쓰도록 임시 파일 DB 앱 사용 -----
+@pytest.fixture
+def file_app(tmp_path):
+    prev = os.environ.get("DATABASE_URL")
+    os.environ["DATABASE_URL"] = "sqlite:///" + str(tmp_path / "likes.db").replace("\\", "/")
+    try:
+        app = create_app()
+        app.config["TESTING"] = True
+        app.config["WTF_CSRF_ENABLED"] = False
+        app.config["VIEW_COUNT_BUFFERED"] = False
+        app.config["JOB_WORKER_THREADS"] = 0
+        yield app
+    finally:
+        if prev is not None:
+            os.environ["DATABASE_URL"] = prev
+        else:
+            del os.environ["DATABASE_URL"]
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+def test_concurrent_togglers_keep_exact_counts(file_app):
+    """여러 사용자가 동시에 여러 번 토글해도 videos.likes == video_likes 행 수 == 홀수 번 누른 사용자 수."""
+    n_users = 8
+    with file_app.app_context():
+        users = []
+        for i in range(n_users):
+            u = User(username=f"toggler{i}", email=f"toggler{i}@example.com")
+            u.set_password("secret")
+            users.append(u)
+        db.session.add_all(users)
+        v = Video(title="동시 토글", video_path="race.mp4", user_id=1)
+        db.session.add(v)
+        db.session.commit()
+        video_id = v.id
+
+    clients = []
+    for i in range(n_users):
+        c = file_app.test_client()
+        c.post("/auth/login", data={"login_id": f"toggler{i}", "password": "secret"})
+        clients.append(c)
+
+    # 짝수 번째 사용자는 6번(최종 해제), 홀수 번째는 5번(최종 좋아요)
+    presses = [6 if i % 2 == 0 else 5 for i in range(n_users)]
+    barrier = threading.Barrier(n_users)
+    errors = []
+
+    def worker(i):
+        try:
+            barrier.wait()
+            for _ in range(presses[i]):
+                resp = clients[i].post(f"/video/{video_id}/like")
+                assert resp.status_code == 200, resp.data
+        except Exception as exc:  # noqa: BLE001 – 스레드 예외를 메인에서 확인
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+    expected = sum(1 for p in presses if p % 2)
+    with file_app.app_context():
+        assert db.session.get(Video, video_id).likes == expected
+        assert _likes_rows(video_id) == expected
+        assert get_channel_stats(1)["total_likes"] == expected
+    for i, c in enumerate(clients):
+        data = c.get(f"/video/{video_id}/like/status").get_json()
+        assert data["is_liked"] is bool(presses[i] % 2)
+        assert data["likes_count"] == expected
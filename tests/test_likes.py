@@ -86,10 +86,11 @@ def test_like_status_logged_in_not_liked(client, app_ctx, video, other_user):
 
 def test_like_status_logged_in_liked(client, app_ctx, video, other_user):
     """로그인 후 좋아요 누른 상태 → is_liked True, likes_count 반영."""
-    # video_likes에 직접 추가 (로그인 전 좋아요 상태 시뮬레이션)
+    # video_likes에 직접 추가 (로그인 전 좋아요 상태 시뮬레이션, likes 카운터도 함께)
     db.session.execute(
         insert(video_likes).values(video_id=video.id, user_id=other_user.id)
     )
+    video.likes = 1
     db.session.commit()
 
     _login_client(client, "likes_other", "secret")
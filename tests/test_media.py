@@ -0,0 +1,107 @@
+# 단위 테스트 – 미디어 서빙 (app/utils/media.py): Range 206/416, ETag·304, 캐시 헤더, X-Accel-Redirect·X-Sendfile
+
+import os
+import uuid
+
+import pytest
+
+DATA = bytes(range(256)) * 40  # 10240 바이트
+
+
+@pytest.fixture
+def media_file(app):
+    """VIDEO_FOLDER 에 uuid 파일명으로 저장된 테스트 파일."""
+    filename = uuid.uuid4().hex + ".mp4"
+    path = os.path.join(app.config["VIDEO_FOLDER"], filename)
+    with open(path, "wb") as f:
+        f.write(DATA)
+    yield filename
+    os.remove(path)
+
+
+def _get(client, url, **headers):
+    resp = client.get(url, headers=headers)
+    data = resp.get_data()
+    resp.close()
+    return resp, data
+
+
+def test_full_response_has_strong_etag_and_immutable_cache(client, media_file):
+    """전체 응답: 200, Accept-Ranges, 강한 ETag, uuid 파일명은 1년 immutable 캐시."""
+    resp, data = _get(client, f"/media/videos/{media_file}")
+    assert resp.status_code == 200
+    assert data == DATA
+    assert resp.headers["Accept-Ranges"] == "bytes"
+    assert resp.mimetype == "video/mp4"
+    etag, weak = resp.get_etag()
+    assert etag and not weak
+    assert resp.cache_control.max_age == 31536000
+    assert resp.cache_control.immutable and resp.cache_control.public
+    assert resp.last_modified is not None
+
+
+@pytest.mark.parametrize(
+    "range_header, start, end",
+    [("bytes=0-9", 0, 9), ("bytes=100-", 100, len(DATA) - 1), ("bytes=-5", len(DATA) - 5, len(DATA) - 1)],
+)
+def test_single_range_returns_partial_content(client, media_file, range_header, start, end):
+    """단일 범위(처음·열린 끝·끝에서 n바이트) → 206 + Content-Range, 해당 바이트만."""
+    resp, data = _get(client, f"/media/videos/{media_file}", Range=range_header)
+    assert resp.status_code == 206
+    assert resp.headers["Content-Range"] == f"bytes {start}-{end}/{len(DATA)}"
+    assert data == DATA[start:end + 1]
+    assert int(resp.headers["Content-Length"]) == end - start + 1
+
+
+def test_unsatisfiable_range_returns_416(client, media_file):
+    resp, _ = _get(client, f"/media/videos/{media_file}", Range=f"bytes={len(DATA) + 10}-")
+    assert resp.status_code == 416
+    assert resp.headers["Content-Range"] == f"bytes */{len(DATA)}"
+
+
+def test_conditional_requests(client, media_file):
+    """If-None-Match 일치 → 304, If-Range 가 옛 ETag 면 Range 무시하고 전체 200."""
+    resp, _ = _get(client, f"/media/videos/{media_file}")
+    etag = resp.headers["ETag"]
+    resp, data = _get(client, f"/media/videos/{media_file}", **{"If-None-Match": etag})
+    assert resp.status_code == 304 and data == b""
+    resp, data = _get(client, f"/media/videos/{media_file}", Range="bytes=0-9", **{"If-Range": etag})
+    assert resp.status_code == 206 and data == DATA[:10]
+    resp, data = _get(client, f"/media/videos/{media_file}", Range="bytes=0-9", **{"If-Range": '"stale"'})
+    assert resp.status_code == 200 and data == DATA
+
+
+def test_mutable_name_uses_short_cache_and_missing_is_404(app, client):
+    """uuid 가 아닌 파일명은 MEDIA_MAX_AGE 캐시, 없는 파일·폴더 밖 경로는 404."""
+    path = os.path.join(app.config["PROFILE_IMAGE_FOLDER"], "media_test_avatar.png")
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+    try:
+        resp, _ = _get(client, "/media/profiles/media_test_avatar.png")
+        assert resp.status_code == 200
+        assert resp.cache_control.max_age == app.config["MEDIA_MAX_AGE"]
+        assert not resp.cache_control.immutable
+    finally:
+        os.remove(path)
+    assert client.get("/media/videos/nope.mp4").status_code == 404
+    assert client.get("/media/videos/../../config.py").status_code == 404
+
+
+def test_x_accel_redirect_offload(app, client, media_file):
+    """x-accel 모드: 본문 없이 X-Accel-Redirect + 캐시 헤더, 조건부 요청은 앱에서 304."""
+    app.config["MEDIA_OFFLOAD"] = "x-accel"
+    resp, data = _get(client, f"/media/videos/{media_file}")
+    assert resp.status_code == 200 and data == b""
+    assert resp.headers["X-Accel-Redirect"] == f"/_protected_media/videos/{media_file}"
+    assert resp.mimetype == "video/mp4"
+    assert resp.cache_control.immutable
+    resp, _ = _get(client, f"/media/videos/{media_file}", **{"If-None-Match": resp.headers["ETag"]})
+    assert resp.status_code == 304
+    assert "X-Accel-Redirect" not in resp.headers
+
+
+def test_x_sendfile_offload(app, client, media_file):
+    app.config["MEDIA_OFFLOAD"] = "x-sendfile"
+    resp, data = _get(client, f"/media/videos/{media_file}")
+    assert data == b""
+    assert resp.headers["X-Sendfile"] == os.path.abspath(os.path.join(app.config["VIDEO_FOLDER"], media_file))
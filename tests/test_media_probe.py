@@ -0,0 +1,155 @@
+# 단위 테스트 – 동영상 메타데이터 추출 (app/utils/media_probe.py): MP4/MOV box·WebM EBML 파싱, 업로드 반영, 일괄 채움
+
+import os
+import struct
+import uuid
+from io import BytesIO
+
+import pytest
+
+from app import db
+from app.models import Video
+from app.utils.media_probe import ProbeError, backfill_media_info, probe
+
+
+# ----- 테스트용 컨테이너 만들기 -----
+def _box(kind, payload=b""):
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _trak(handler, codec, duration, width=0, height=0):
+    tkhd = b"\0\0\0\x07" + b"\0" * 20 + b"\0" * 52 + struct.pack(">II", width << 16, height << 16)
+    mdhd = b"\0" * 4 + b"\0" * 8 + struct.pack(">II", 90000, int(duration * 90000)) + b"\0" * 4
+    hdlr = b"\0" * 8 + handler + b"\0" * 12 + b"Handler\0"
+    entry_body = b"\0" * 6 + struct.pack(">H", 1) + b"\0" * 16 + struct.pack(">HH", width, height) + b"\0" * 50
+    stsd = b"\0" * 4 + struct.pack(">I", 1) + struct.pack(">I4s", 8 + len(entry_body), codec) + entry_body
+    stbl = _box(b"stsd", stsd) + _box(b"stts", b"\0" * 64) + _box(b"stco", b"\0" * 64)
+    return _box(b"trak", _box(b"tkhd", tkhd) + _box(b"mdia", _box(b"mdhd", mdhd) + _box(b"hdlr", hdlr)
+                                                     + _box(b"minf", _box(b"stbl", stbl))))
+
+
+def _mp4(duration=125.5, width=1280, height=720, moov_first=True, mvhd_version=0, mdat_size=4096, brand=b"isom"):
+    if mvhd_version == 1:
+        mvhd = b"\x01\0\0\0" + b"\0" * 16 + struct.pack(">IQ", 1000, int(duration * 1000)) + b"\0" * 80
+    else:
+        mvhd = b"\0" * 4 + b"\0" * 8 + struct.pack(">II", 1000, int(duration * 1000)) + b"\0" * 80
+    moov = _box(b"moov", _box(b"mvhd", mvhd) + _trak(b"vide", b"avc1", duration, width, height)
+                + _trak(b"soun", b"mp4a", duration))
+    ftyp = _box(b"ftyp", brand + b"\0\0\0\x01" + b"isomavc1")
+    # mdat 는 64비트 크기(size=1) 헤더로
+    mdat = struct.pack(">I4sQ", 1, b"mdat", 16 + mdat_size) + b"\0" * mdat_size
+    return ftyp + (moov + mdat if moov_first else mdat + moov)
+
+
+def _ebml(element_id, data):
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + b"\x01" + len(data).to_bytes(7, "big") + data
+
+
+def _webm(duration_ms=83456.0):
+    header = _ebml(0x1A45DFA3, _ebml(0x4282, b"webm"))
+    info = _ebml(0x1549A966, _ebml(0x2AD7B1, (1_000_000).to_bytes(3, "big")) + _ebml(0x4489, struct.pack(">d", duration_ms)))
+    video = _ebml(0xAE, _ebml(0x83, b"\x01") + _ebml(0x86, b"V_VP9")
+                  + _ebml(0xE0, _ebml(0xB0, (640).to_bytes(2, "big")) + _ebml(0xBA, (360).to_bytes(2, "big"))))
+    audio = _ebml(0xAE, _ebml(0x83, b"\x02") + _ebml(0x86, b"A_OPUS"))
+    tracks = _ebml(0x1654AE6B, video + audio)
+    cluster = _ebml(0x1F43B675, b"\0" * 2048)
+    # Segment 크기 미정 (스트리밍 녹화 파일)
+    return header + (0x18538067).to_bytes(4, "big") + b"\x01\xff\xff\xff\xff\xff\xff\xff" + info + tracks + cluster
+
+
+def _write(tmp_path, data, name="v.mp4"):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+# ----- 파싱 -----
+def test_probe_mp4_moov_first(tmp_path):
+    data = _mp4()
+    info = probe(_write(tmp_path, data))
+    assert info.container == "mp4"
+    assert info.duration == pytest.approx(125.5)
+    assert (info.width, info.height) == (1280, 720)
+    assert (info.video_codec, info.audio_codec) == ("h264", "aac")
+    assert info.bitrate == int(len(data) * 8 / 125.5)
+    assert info.faststart is True
+
+
+def test_probe_mov_moov_at_end_with_64bit_sizes(tmp_path):
+    """moov 가 끝에 있고 mvhd version 1, mdat 64비트 크기 – 큰 mdat 은 읽지 않고 건너뜀."""
+    path = _write(tmp_path, _mp4(duration=3600.0, moov_first=False, mvhd_version=1, brand=b"qt  "), "v.mov")
+    info = probe(path)
+    assert info.container == "mov"
+    assert info.duration == pytest.approx(3600.0)
+    assert info.faststart is False
+    assert (info.width, info.height) == (1280, 720)
+
+
+def test_probe_webm_with_unknown_segment_size(tmp_path):
+    info = probe(_write(tmp_path, _webm(), "v.webm"))
+    assert info.container == "webm"
+    assert info.duration == pytest.approx(83.456)
+    assert (info.width, info.height) == (640, 360)
+    assert (info.video_codec, info.audio_codec) == ("vp9", "opus")
+    assert info.faststart is None
+
+
+@pytest.mark.parametrize("data", [b"not a video at all", b"\x00\x00\x00\x20ftypmp42", _mp4()[:200]])
+def test_probe_rejects_unsupported_or_truncated(tmp_path, data):
+    with pytest.raises(ProbeError):
+        probe(_write(tmp_path, data))
+
+
+# ----- 업로드·API·필터 -----
+def test_upload_stores_media_info_and_length_filter(app, logged_in_client):
+    resp = logged_in_client.post(
+        "/studio/upload",
+        data={"title": "길이 있는 영상", "video": (BytesIO(_mp4(duration=125.5)), "clip.mp4")},
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 302
+    video = Video.query.filter_by(title="길이 있는 영상").one()
+    try:
+        assert video.duration == 126
+        assert (video.width, video.height, video.video_codec) == (1280, 720, "h264")
+        assert video.faststart is True
+
+        items = logged_in_client.get("/api/videos?length=short&per_page=100").get_json()["items"]
+        item = next(i for i in items if i["id"] == video.id)
+        assert item["duration"] == 126 and item["video_codec"] == "h264"
+        items = logged_in_client.get("/api/videos?length=long&per_page=100").get_json()["items"]
+        assert all(i["id"] != video.id for i in items)
+        page = logged_in_client.get("/?length=short&sort=views").get_data(as_text=True)
+        assert "2:06" in page
+        # 카테고리·정렬·태그 링크도 길이 필터 유지 ('전체' 길이 링크만 제외)
+        assert 'href="/?category=music&amp;sort=views&amp;tag=&amp;length=short"' in page
+        assert 'href="/?category=all&amp;sort=popular&amp;tag=&amp;length=short"' in page
+        assert 'href="/?category=all&amp;sort=views&amp;tag="' in page
+    finally:
+        os.remove(os.path.join(app.config["VIDEO_FOLDER"], video.video_path))
+        db.session.delete(video)
+        db.session.commit()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_backfill_fills_missing_media_info(app, app_ctx, workers):
+    """duration 이 비어 있는 비디오의 로컬 파일 분석 → 일괄 반영 (workers=2 는 프로세스 풀)."""
+    folder = app.config["VIDEO_FOLDER"]
+    names = [f"{uuid.uuid4().hex}.mp4" for _ in range(3)]
+    for i, name in enumerate(names):
+        with open(os.path.join(folder, name), "wb") as f:
+            f.write(_mp4(duration=60.0 * (i + 1)) if i < 2 else b"broken")
+    videos = [Video(title=f"backfill {i}", video_path=n, user_id=1) for i, n in enumerate(names)]
+    videos.append(Video(title="backfill remote", video_path="gone.mp4", user_id=1))
+    db.session.add_all(videos)
+    db.session.commit()
+    try:
+        stats = backfill_media_info(db, workers=workers, chunk_size=1)
+        assert stats["updated"] >= 2 and stats["failed"] >= 1 and stats["missing"] >= 1
+        db.session.expire_all()
+        assert [db.session.get(Video, v.id).duration for v in videos] == [60, 120, None, None]
+        assert db.session.get(Video, videos[0].id).faststart is True
+    finally:
+        for name in names:
+            os.remove(os.path.join(folder, name))
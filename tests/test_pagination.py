@@ -0,0 +1,120 @@
+# 단위 테스트 – keyset(cursor) 페이지네이션 (app/utils/pagination.py, 목록 API·페이지)
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import User, Video
+from app.utils.pagination import (
+    clear_count_cache,
+    decode_cursor,
+    encode_cursor,
+    keyset_paginate,
+    sort_keys,
+)
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def videos(app_ctx, user):
+    """정렬 키 동률이 섞인 비디오 9개 (created_at 2개씩 같음, views·likes 중복)."""
+    base = datetime(2025, 1, 1)
+    items = []
+    for i in range(9):
+        v = Video(
+            title=f"keyset{i}",
+            video_path=f"k{i}.mp4",
+            user_id=user.id,
+            created_at=base + timedelta(hours=i // 2),
+            views=(i % 3) * 10,
+            likes=i % 2,
+        )
+        db.session.add(v)
+        items.append(v)
+    db.session.commit()
+    return items
+
+
+def _walk(client, url, per_page=2):
+    """next_cursor 를 따라 끝까지 조회해 id 목록 반환."""
+    ids = []
+    cursor = None
+    for _ in range(20):
+        sep = "&" if "?" in url else "?"
+        q = f"{url}{sep}per_page={per_page}" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(q).get_json()
+        ids.extend(i["id"] for i in data["items"])
+        cursor = data["next_cursor"]
+        assert cursor == data["meta"]["next_cursor"]
+        if not cursor:
+            break
+    return ids
+
+
+def test_cursor_roundtrip_with_datetime(app_ctx):
+    """datetime 키도 커서 인코딩 후 원래 값으로 복원."""
+    keys = sort_keys(Video, "latest")
+    values = [datetime(2025, 3, 4, 5, 6, 7, 123456), 42]
+    assert decode_cursor(encode_cursor(values), keys) == values
+    assert decode_cursor("잘못된커서", keys) is None
+    assert decode_cursor(encode_cursor([1]), keys) is None
+
+
+@pytest.mark.parametrize("sort", ["latest", "views", "popular"])
+def test_api_cursor_walk_matches_offset_order(client, videos, sort):
+    """정렬별로 커서를 따라간 순서 == 한 번에 조회한 순서 (중복·누락 없음)."""
+    expected = [i["id"] for i in client.get(f"/api/videos?sort={sort}&per_page=100").get_json()["items"]]
+    assert len(expected) == len(videos)
+    assert _walk(client, f"/api/videos?sort={sort}") == expected
+
+
+def test_api_page_number_still_works(client, videos):
+    """cursor 없이 page 번호만 줘도 기존과 같이 동작 (meta 키 유지)."""
+    data = client.get("/api/videos?page=2&per_page=4").get_json()
+    assert len(data["items"]) == 4
+    meta = data["meta"]
+    assert meta["current_page"] == 2
+    assert meta["total_items"] == 9
+    assert meta["total_pages"] == 3
+    assert meta["has_prev"] is True and meta["has_next"] is True
+    assert data["next_cursor"]
+
+
+def test_tag_and_user_videos_return_next_cursor(client, videos, user):
+    """태그·사용자 비디오 API 도 next_cursor 로 끝까지 조회 가능."""
+    for v in videos[:5]:
+        v.save_tags("커서태그", commit=False)
+    db.session.commit()
+    assert len(_walk(client, "/api/tags/커서태그/videos")) == 5
+    assert len(_walk(client, f"/api/users/{user.username}/videos")) == 9
+
+
+def test_profile_next_link_carries_cursor(client, app_ctx, user):
+    """프로필 페이지 '다음' 링크에 cursor 포함, 따라가면 두 번째 페이지."""
+    for i in range(13):
+        db.session.add(Video(title=f"prof{i}", video_path="p.mp4", user_id=user.id))
+    db.session.commit()
+    html = client.get(f"/user/{user.username}").data.decode("utf-8")
+    assert "cursor=" in html
+    page = keyset_paginate(Video.query.filter_by(user_id=user.id), sort_keys(Video, "latest"), per_page=12)
+    resp = client.get(f"/user/{user.username}?page=2&cursor={page.next_cursor}")
+    assert "2 / 2" in resp.data.decode("utf-8")
+
+
+def test_total_is_cached_until_cleared(app, app_ctx, videos, user):
+    """전체 개수는 TTL 동안 캐시 → 새 행이 바로 반영되지 않고, 캐시 비우면 반영."""
+    app.config["PAGINATION_COUNT_TTL"] = 60
+    query = Video.query.filter(Video.user_id == user.id)
+    keys = sort_keys(Video, "latest")
+    assert keyset_paginate(query, keys).total == 9
+    db.session.add(Video(title="late", video_path="l.mp4", user_id=user.id))
+    db.session.commit()
+    assert keyset_paginate(query, keys).total == 9
+    clear_count_cache()
+    assert keyset_paginate(query, keys).total == 10
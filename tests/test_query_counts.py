@@ -0,0 +1,124 @@
+# 회귀 테스트 – 화면·API 별 SQL 문 수 상한 (X-Query-Count), 뷰별 관계 로더 (app/utils/loading.py)
+# LOADER_RAISE 를 켜 두므로 로더에 없는 관계를 템플릿·직렬화에서 읽으면 (N+1) 요청이 500 으로 실패.
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+
+from app import db
+from app.models import Comment, Subscription, User, Video
+from app.utils.loading import loader_options
+
+
+# ----- 공통 -----
+@pytest.fixture
+def counted_app(app):
+    """쿼리 수 헤더·raiseload 켜고 응답 캐시 끔 (요청마다 새 앱 컨텍스트)."""
+    app.config.update(QUERY_COUNT_HEADER=True, LOADER_RAISE=True, RESPONSE_CACHE_TTL=0)
+    return app
+
+
+def _add_videos(user_id, count, start=0):
+    videos = [
+        Video(title=f"qc{i}", video_path=f"qc{i}.mp4", thumbnail_path=f"qc{i}.png", user_id=user_id, category="tech")
+        for i in range(start, start + count)
+    ]
+    db.session.add_all(videos)
+    db.session.commit()
+    for v in videos:
+        v.save_tags("가,나,다", commit=False)
+    db.session.commit()
+    return videos
+
+
+@pytest.fixture
+def seeded(counted_app):
+    """채널 1개(비디오 절반), 기본 사용자가 구독, 첫 비디오에 댓글 5개·답글 5개."""
+    with counted_app.app_context():
+        channel = User(username="qc_channel", email="qc_channel@example.com")
+        channel.set_password("secret")
+        db.session.add(channel)
+        db.session.commit()
+        videos = _add_videos(channel.id, 8) + _add_videos(1, 7, start=8)
+        db.session.add(Subscription(subscriber_id=1, subscribed_to_id=channel.id))
+        db.session.commit()
+        for i in range(5):
+            comment = Comment(content=f"댓글{i}", user_id=channel.id, video_id=videos[0].id)
+            db.session.add(comment)
+            db.session.commit()
+            db.session.add(Comment(content="답글", user_id=1, video_id=videos[0].id, parent_id=comment.id))
+            db.session.commit()
+        return {"channel_id": channel.id, "video_id": videos[0].id, "comment_id": comment.id}
+
+
+def _query_count(client, url):
+    client.get(url)  # 관련 동영상 계산·캐시 채우기 등 첫 요청 비용 제외
+    response = client.get(url)
+    assert response.status_code == 200, url
+    return int(response.headers["X-Query-Count"])
+
+
+# 화면·API → 최대 SQL 문 수 (비로그인 / 로그인). 비디오 15개·댓글 5개 기준, 목록 크기와 무관해야 함
+PAGE_LIMITS = [
+    ("/watch/{video_id}", 11, 11),
+    ("/", 2, 2),
+    ("/?tag=가", 3, 3),
+    ("/search?q=qc1", 2, 2),
+    ("/subscriptions", 3, 2),
+    ("/user/qc_channel", 4, 3),
+    ("/tag/가", 2, 2),
+    ("/api/videos", 2, 2),
+    ("/api/videos?ids=1,2,3,4,5,6,7,8,9,10,11,12,13,14,15", 2, 2),
+    ("/api/videos/{video_id}", 8, 8),
+    ("/api/tags/가/videos", 3, 3),
+    ("/api/users/qc_channel", 1, 2),
+    ("/api/users/qc_channel/videos", 2, 2),
+    ("/api/users?ids=1,2,3", 2, 3),
+    ("/api/videos/{video_id}/comments", 3, 4),
+    ("/api/comments/{comment_id}/replies", 3, 4),
+]
+
+
+# ----- 쿼리 수 상한 -----
+@pytest.mark.parametrize("url, anonymous_limit, user_limit", PAGE_LIMITS)
+def test_query_count_upper_bound(counted_app, client, seeded, url, anonymous_limit, user_limit):
+    url = url.format(**seeded)
+    assert _query_count(client, url) <= anonymous_limit
+    client.post("/auth/login", data={"login_id": "default", "password": "default"})
+    assert _query_count(client, url) <= user_limit
+
+
+def test_admin_pages_query_count(counted_app, client, seeded):
+    client.post("/auth/login", data={"login_id": "admin", "password": "admin1234"})
+    assert _query_count(client, "/admin/") <= 7
+    assert _query_count(client, "/admin/videos") <= 1
+    assert _query_count(client, "/admin/comments") <= 1
+
+
+def test_list_query_count_does_not_grow_with_page_size(counted_app, client, seeded):
+    """태그·채널을 비디오마다 따로 읽지 않음 → 목록이 길어져도 SQL 문 수 동일."""
+    urls = ["/", "/api/videos?per_page=30", "/subscriptions", "/tag/가"]
+    before = [_query_count(client, url) for url in urls]
+    with counted_app.app_context():
+        _add_videos(seeded["channel_id"], 12, start=100)
+    assert [_query_count(client, url) for url in urls] == before
+
+
+# ----- 로더 -----
+def test_undeclared_relationship_raises_only_when_enabled(counted_app, seeded):
+    with counted_app.app_context():
+        video = Video.query.options(*loader_options("channel_videos")).filter_by(id=seeded["video_id"]).one()
+        with pytest.raises(InvalidRequestError):
+            video.tags
+        db.session.expunge_all()
+        counted_app.config["LOADER_RAISE"] = False
+        video = Video.query.options(*loader_options("channel_videos")).filter_by(id=seeded["video_id"]).one()
+        assert [t.name for t in video.tags] == ["가", "나", "다"]
+
+
+def test_collections_use_selectin_not_join(counted_app, seeded):
+    """태그 컬렉션은 별도 IN 쿼리 → 페이지 SELECT 에 video_tags 조인·서브쿼리 없음."""
+    with counted_app.app_context():
+        sql = str(Video.query.options(*loader_options("video_cards")).limit(12).statement)
+        assert "video_tags" not in sql and "anon_1" not in sql
+        with pytest.raises(KeyError):
+            loader_options("unknown")
@@ -0,0 +1,184 @@
+# 단위 테스트 – 관련 동영상 미리 계산 (app/utils/related.py, related_videos)
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app import db
+from app.models import User, Video
+from app.models.video import related_videos
+from app.utils.related import compute_related, get_related, rebuild_related
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def other_user(app_ctx):
+    """다른 업로더."""
+    u = User(username="related_other", email="related_other@example.com", password_hash="")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+@pytest.fixture
+def catalog(app_ctx, user, other_user):
+    """현재(abc) / 태그 동일(abc) / 태그 1개 공유(a) / 같은 카테고리 / 다른 업로더 인기 영상."""
+    specs = [
+        ("현재", "edu", user, 0, "a, b, c"),
+        ("태그동일", "x", other_user, 0, "a, b, c"),
+        ("태그일부", "x", other_user, 0, "a, z"),
+        ("같은카테고리", "edu", other_user, 0, ""),
+        ("인기영상", "y", other_user, 500, ""),
+    ]
+    videos = {}
+    for title, category, owner, views, tags in specs:
+        v = Video(title=title, video_path="r.mp4", user_id=owner.id, category=category, views=views)
+        db.session.add(v)
+        db.session.commit()
+        v.save_tags(tags)
+        videos[title] = v
+    return videos
+
+
+def _stored(video_id):
+    return db.session.execute(
+        select(related_videos.c.related_id)
+        .where(related_videos.c.video_id == video_id, related_videos.c.rank >= 0)
+        .order_by(related_videos.c.rank)
+    ).scalars().all()
+
+
+def test_ranking_jaccard_then_category_then_popular(catalog):
+    """태그 유사도 높은 순 → 같은 카테고리 → 인기순, 자기 자신 제외."""
+    related = get_related(catalog["현재"].id, limit=4)
+    assert [v.title for v in related] == ["태그동일", "태그일부", "같은카테고리", "인기영상"]
+
+
+def test_second_lookup_is_single_query(catalog):
+    """저장된 목록은 SELECT 1번(related_videos 조인)으로 조회."""
+    vid = catalog["현재"].id
+    get_related(vid)
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        related = get_related(vid, limit=3)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    assert len(related) == 3
+    assert len(statements) == 1 and "related_videos" in statements[0]
+
+
+def _statements(callback):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        callback()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return statements
+
+
+def test_empty_list_is_stored_and_not_recomputed(app_ctx, user):
+    """추천할 영상이 없어도 계산 시각(표시 행)을 저장 → 다음 조회는 SELECT 1번, 재계산 없음."""
+    Video.query.delete()
+    db.session.commit()
+    alone = Video(title="혼자", video_path="a.mp4", user_id=user.id)
+    db.session.add(alone)
+    db.session.commit()
+    assert get_related(alone.id) == []
+    statements = _statements(lambda: get_related(alone.id))
+    assert len(statements) == 1 and "related_videos" in statements[0]
+
+
+def test_refresh_does_not_commit_request_session(catalog):
+    """재계산은 별도 연결로 저장 – 요청 세션의 미커밋 변경은 커밋·롤백되지 않고 남음."""
+    cur = catalog["현재"]
+    vid = cur.id
+    cur.title = "미커밋 제목"
+    related = get_related(vid, limit=2)
+    assert [v.title for v in related] == ["태그동일", "태그일부"]
+    assert cur in db.session.dirty
+    db.session.rollback()
+    assert db.session.get(Video, vid).title == "현재"
+    assert _stored(vid)
+
+
+def test_retag_invalidates_affected_lists(catalog):
+    """태그 변경 → 그 비디오와 그 비디오를 추천하던 목록 삭제 후 다음 조회 때 재계산."""
+    cur, partial = catalog["현재"], catalog["태그일부"]
+    get_related(cur.id)
+    get_related(partial.id)
+    assert _stored(cur.id) and _stored(partial.id)
+
+    partial.save_tags("a, b, c, d")
+    assert _stored(cur.id) == [] and _stored(partial.id) == []
+    assert [v.title for v in get_related(cur.id, limit=2)] == ["태그동일", "태그일부"]
+
+
+def test_new_tag_invalidates_sharing_videos(catalog, user):
+    """새로 붙은 태그를 가진 비디오들의 목록도 무효화 (새 비디오가 추천에 바로 반영)."""
+    cur = catalog["현재"]
+    get_related(cur.id)
+    newcomer = Video(title="신규영상", video_path="n.mp4", user_id=user.id)
+    db.session.add(newcomer)
+    db.session.commit()
+    newcomer.save_tags("a, b, c")
+    assert newcomer.id in [v.id for v in get_related(cur.id, limit=2)]
+
+
+def test_delete_removes_lists_pointing_to_video(catalog):
+    """비디오 삭제 → 자기 목록과 그 비디오를 포함하던 목록 삭제."""
+    cur, same = catalog["현재"], catalog["태그동일"]
+    get_related(cur.id)
+    get_related(same.id)
+    db.session.delete(same)
+    db.session.commit()
+    assert _stored(cur.id) == []
+    assert db.session.execute(
+        select(related_videos.c.video_id).where(related_videos.c.related_id == same.id)
+    ).first() is None
+    assert "태그동일" not in [v.title for v in get_related(cur.id)]
+
+
+def test_stale_list_is_recomputed(app, catalog):
+    """RELATED_VIDEOS_MAX_AGE 보다 오래된 목록은 조회 시 재계산."""
+    cur = catalog["현재"]
+    get_related(cur.id)
+    old = datetime(2000, 1, 1)
+    db.session.execute(update(related_videos).where(related_videos.c.video_id == cur.id).values(computed_at=old))
+    db.session.commit()
+    get_related(cur.id)
+    computed = db.session.execute(
+        select(related_videos.c.computed_at).where(related_videos.c.video_id == cur.id)
+    ).scalars().first()
+    assert computed > old + timedelta(days=365)
+
+
+def test_rebuild_matches_single_compute(catalog):
+    """rebuild_related(역색인 배치) 결과 == 비디오별 compute_related 결과."""
+    count = rebuild_related(db, batch_size=2)
+    assert count == Video.query.count()
+    for v in catalog.values():
+        expected = [rid for rid, _score in compute_related(db.session, v.id)]
+        assert _stored(v.id) == expected
+
+
+def test_watch_page_shows_related(client, catalog):
+    """시청 페이지 관련 동영상에 태그 공유 영상 표시."""
+    html = client.get(f"/watch/{catalog['현재'].id}").data.decode("utf-8")
+    assert "태그동일" in html
+    assert html.find("태그동일") < html.find("인기영상")
@@ -0,0 +1,135 @@
+# 단위 테스트 – 요청 단위 메모·사용자 행 캐시·요청별 쿼리 수 (app/utils/request_cache.py)
+
+import pytest
+from flask import g
+from sqlalchemy import event
+
+from app import db
+from app.models import User
+from app.utils.request_cache import get_user, get_user_by_username, memoize, query_count
+
+
+# ----- 공통 -----
+@pytest.fixture
+def counted_app(app):
+    """X-Query-Count 헤더를 켠 앱 (요청마다 새 앱 컨텍스트 → 세션·g 가 요청 단위)."""
+    app.config["QUERY_COUNT_HEADER"] = True
+    return app
+
+
+def _login(client, login_id="default", password="default"):
+    client.post("/auth/login", data={"login_id": login_id, "password": password})
+
+
+def _query_count(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return int(response.headers["X-Query-Count"])
+
+
+def _count_statements(app, func):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+    return result, statements
+
+
+# ----- 쿼리 수 감소 -----
+def test_cached_users_skip_loader_and_username_queries(counted_app, client):
+    """사용자 캐시가 있으면 로그인 사용자 로드·사용자명 조회 SELECT 가 빠짐 (2번 감소)."""
+    _login(client)
+    counted_app.config["USER_CACHE_TTL"] = 0
+    _query_count(client, "/user/admin")
+    uncached = _query_count(client, "/user/admin")
+
+    counted_app.config["USER_CACHE_TTL"] = 60
+    _query_count(client, "/user/admin")
+    cached = _query_count(client, "/user/admin")
+    assert cached == uncached - 2
+
+
+def test_query_count_header_off_by_default(app, client):
+    assert "X-Query-Count" not in client.get("/api/users/default").headers
+
+
+def test_memoize_calls_loader_once_per_request(app):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return len(calls)
+
+    with app.test_request_context("/"):
+        app.preprocess_request()
+        assert [memoize("ns", 1, loader) for _ in range(3)] == [1, 1, 1]
+        assert memoize("ns", 2, loader) == 2
+    with app.test_request_context("/"):
+        app.preprocess_request()
+        assert memoize("ns", 1, loader) == 3
+        assert query_count() == 0 and g.get("_request_query_count") == 0
+
+
+def test_cached_user_is_attached_without_select(app):
+    """캐시에서 꺼낸 User 는 SELECT 없이 세션에 붙고, 수정·커밋도 정상 동작."""
+    with app.app_context():
+        assert get_user(1).username == "default"
+
+    def fetch_and_edit():
+        with app.app_context():
+            user = get_user(1)
+            values = (user.username, user.email, user.is_admin)
+            user.nickname = "캐시닉네임"
+            db.session.commit()
+            return values
+
+    values, statements = _count_statements(app, fetch_and_edit)
+    assert values == ("default", "default@example.com", False)
+    assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
+    with app.app_context():
+        assert db.session.get(User, 1).nickname == "캐시닉네임"
+
+
+# ----- 무효화 -----
+def test_profile_edit_invalidates_cached_user(counted_app, client):
+    _login(client)
+    client.get("/user/default")
+    client.post("/auth/profile", data={"nickname": "새닉네임", "email": "default@example.com"})
+    with counted_app.app_context():
+        assert get_user(1).nickname == "새닉네임"
+        assert get_user_by_username("default").nickname == "새닉네임"
+    item = client.get("/api/users/default").get_json()["item"]
+    assert item["nickname"] == "새닉네임"
+
+
+def test_admin_edit_and_delete_invalidate_cached_user(app, client):
+    with app.app_context():
+        user = User(username="cached_user", email="cached@example.com")
+        user.set_password("secret")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        assert get_user_by_username("cached_user").id == user_id
+
+    _login(client, "admin", "admin1234")
+    client.post(
+        f"/admin/users/{user_id}/edit",
+        data={"nickname": "관리자수정", "email": "cached@example.com", "is_admin": "1"},
+    )
+    with app.app_context():
+        user = get_user(user_id)
+        assert (user.nickname, user.is_admin) == ("관리자수정", True)
+
+    client.post(f"/admin/users/{user_id}/delete")
+    with app.app_context():
+        assert get_user(user_id) is None
+        assert get_user_by_username("cached_user") is None
+    assert client.get("/user/cached_user").status_code == 404
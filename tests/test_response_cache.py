@@ -0,0 +1,135 @@
+# 단위 테스트 – 응답 캐시 (app/utils/response_cache.py): HIT/MISS·ETag 304·CSRF 토큰·무효화·공유 SQLite 단계
+
+import re
+import time
+
+import pytest
+
+from app import db
+from app.models import Video
+from app.utils.response_cache import VIDEOS, _SqliteTier, get_response_cache
+from app.utils.view_counter import get_view_counter
+
+
+# ----- 공통 -----
+@pytest.fixture
+def video(app_ctx):
+    v = Video(title="캐시 영상", video_path="cache.mp4", user_id=1, views=0, likes=0)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _cache_state(response):
+    return response.headers.get("X-Response-Cache")
+
+
+def _items(client, url="/api/videos"):
+    return {item["id"]: item for item in client.get(url).get_json()["items"]}
+
+
+# ----- HIT/MISS·키 -----
+def test_anonymous_pages_are_cached_with_normalized_args(client, video):
+    assert _cache_state(client.get("/?page=1")) == "MISS"
+    assert _cache_state(client.get("/?page=1&utm_source=x&category=")) == "HIT"
+    assert _cache_state(client.get("/?sort=popular")) == "MISS"
+    assert _cache_state(client.get("/api/videos?per_page=5")) == "MISS"
+    assert _cache_state(client.get("/api/videos?per_page=5")) == "HIT"
+    assert _cache_state(client.get("/api/tags/popular")) == "MISS"
+    assert _cache_state(client.get("/tag/none")) == "MISS"
+    assert _cache_state(client.get("/tag/none")) == "HIT"
+
+
+def test_logged_in_html_is_not_cached_but_api_is(logged_in_client, video):
+    assert _cache_state(logged_in_client.get("/")) is None
+    logged_in_client.get("/api/videos")
+    assert _cache_state(logged_in_client.get("/api/videos")) == "HIT"
+
+
+def test_etag_returns_304(client, video):
+    first = client.get("/api/videos")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    again = client.get("/api/videos", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+    page = client.get("/")
+    assert client.get("/", headers={"If-None-Match": page.headers["ETag"]}).status_code == 304
+
+
+def test_disabled_with_zero_ttl(app, client, video):
+    app.config["RESPONSE_CACHE_TTL"] = 0
+    client.get("/api/videos")
+    assert _cache_state(client.get("/api/videos")) is None
+
+
+# ----- CSRF 토큰 -----
+def test_cached_page_carries_session_csrf_token(app, client, video):
+    """캐시된 HTML 의 CSRF 토큰은 요청 세션의 것 → 캐시 적중 페이지에서도 폼 제출 가능."""
+    app.config["WTF_CSRF_ENABLED"] = True
+    client.get("/")
+    page = client.get("/")
+    assert _cache_state(page) == "HIT"
+    html = page.get_data(as_text=True)
+    assert "__response_cache_csrf_token__" not in html
+    token = re.search(r'name="csrf-token" content="([^"]+)"', html).group(1)
+    response = client.post("/auth/login", data={"login_id": "default", "password": "default", "csrf_token": token})
+    assert response.status_code == 302
+
+
+# ----- 무효화 -----
+def test_upload_edit_and_delete_invalidate(client, video):
+    assert _items(client)[video.id]["title"] == "캐시 영상"
+    video.title = "제목 변경"
+    db.session.commit()
+    assert _items(client)[video.id]["title"] == "제목 변경"
+
+    new = Video(title="새 영상", video_path="new.mp4", user_id=1)
+    db.session.add(new)
+    db.session.commit()
+    assert new.id in _items(client)
+
+    db.session.delete(new)
+    db.session.commit()
+    assert new.id not in _items(client)
+
+
+def test_like_and_tag_changes_invalidate(logged_in_client, video):
+    assert _items(logged_in_client)[video.id]["likes"] == 0
+    logged_in_client.post(f"/video/{video.id}/like")
+    assert _items(logged_in_client)[video.id]["likes"] == 1
+
+    assert logged_in_client.get("/api/tags/popular").get_json()["items"] == []
+    video.save_tags("캐시태그", commit=True)
+    names = [t["name"] for t in logged_in_client.get("/api/tags/popular").get_json()["items"]]
+    assert names == ["캐시태그"]
+    assert _items(logged_in_client)[video.id]["tags"] == ["캐시태그"]
+
+
+def test_view_flush_keeps_cache_until_ttl(app, client, video, monkeypatch):
+    """조회수 flush 는 세대를 올리지 않음 → 캐시된 목록의 조회수는 TTL 이 지나야 반영."""
+    import app.utils.response_cache as response_cache
+
+    now = [time.monotonic()]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    app.config["VIEW_COUNT_BUFFERED"] = True
+    assert _items(client)[video.id]["views"] == 0
+    counter = get_view_counter()
+    counter.store.add(video.id, 3)
+    counter.flush()
+    assert _cache_state(client.get("/api/videos")) == "HIT"
+    assert _items(client)[video.id]["views"] == 0
+    now[0] += app.config["RESPONSE_CACHE_TTL"] + 1
+    assert _items(client)[video.id]["views"] == 3
+
+
+# ----- 공유 단계 -----
+def test_shared_sqlite_tier(app, client, video, tmp_path):
+    """다른 워커가 채운 응답을 사용하고, 다른 워커의 무효화(세대 증가)도 바로 반영."""
+    path = str(tmp_path / "responses.db")
+    app.config["RESPONSE_CACHE_PATH"] = path
+    assert _cache_state(client.get("/api/videos")) == "MISS"
+    get_response_cache().memory.clear()
+    assert _cache_state(client.get("/api/videos")) == "HIT"
+
+    _SqliteTier(path).bump([VIDEOS])
+    assert _cache_state(client.get("/api/videos")) == "MISS"
@@ -0,0 +1,125 @@
+# 단위 테스트 – 전문 검색 인덱스 (app/utils/search_index.py, videos_fts)
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import User, Video
+from app.utils.search_index import build_match_query, rebuild_search_index, tokenize
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저."""
+    return db.session.get(User, 1)
+
+
+def _add_video(user, title, description=None, **kwargs):
+    v = Video(title=title, description=description, video_path="s.mp4", user_id=user.id, **kwargs)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _indexed_ids():
+    return {r[0] for r in db.session.execute(text("SELECT rowid FROM videos_fts")).fetchall()}
+
+
+# ----- 토큰화 -----
+def test_tokenize_korean_bigrams_and_words():
+    """한글은 bigram, 영문은 소문자 단어 단위."""
+    assert tokenize("검색키워드 API테스트") == ["검색", "색키", "키워", "워드", "api", "테스", "스트"]
+    assert tokenize(None) == []
+
+
+def test_build_match_query():
+    """한글 구간은 bigram 구문, 영문은 접두어 검색. 1글자 한글은 None(ILIKE 대체)."""
+    assert build_match_query("키워드") == '"키워 워드"'
+    assert build_match_query("Flask 튜토리얼") == '"flask"* "튜토 토리 리얼"'
+    assert build_match_query("가") is None
+    assert build_match_query("   ") is None
+
+
+# ----- 동기화 -----
+def test_insert_update_delete_keep_index_in_sync(app_ctx, user):
+    """Video 추가·수정·삭제 시 videos_fts 도 같은 트랜잭션에서 갱신."""
+    v = _add_video(user, "동기화 테스트", "설명")
+    assert v.id in _indexed_ids()
+
+    v.title = "바뀐제목입니다"
+    db.session.commit()
+    hit = db.session.execute(
+        text("SELECT rowid FROM videos_fts WHERE videos_fts MATCH :m"), {"m": build_match_query("바뀐제목")}
+    ).scalar()
+    assert hit == v.id
+
+    video_id = v.id
+    db.session.delete(v)
+    db.session.commit()
+    assert video_id not in _indexed_ids()
+
+
+def test_studio_edit_reindexes(logged_in_client, app_ctx, user):
+    """studio.edit 로 제목 수정 → 새 제목으로 검색됨, 옛 제목으로는 안 나옴."""
+    v = _add_video(user, "예전제목영상")
+    logged_in_client.post(
+        f"/studio/edit/{v.id}",
+        data={"title": "새로운제목영상", "description": "", "tags": ""},
+    )
+    items = logged_in_client.get("/api/videos?search=새로운제목").get_json()["items"]
+    assert [i["id"] for i in items] == [v.id]
+    assert logged_in_client.get("/api/videos?search=예전제목").get_json()["items"] == []
+
+
+def test_rebuild_search_index(app_ctx, user):
+    """rebuild_search_index → 인덱스를 비운 뒤 videos 전체 재색인."""
+    _add_video(user, "재색인 하나")
+    _add_video(user, "재색인 둘")
+    db.session.execute(text("DELETE FROM videos_fts"))
+    db.session.commit()
+    assert _indexed_ids() == set()
+    count = rebuild_search_index(db, batch_size=1)
+    assert count == Video.query.count()
+    assert len(_indexed_ids()) == count
+
+
+# ----- 검색 결과 -----
+def test_search_partial_korean_match(client, app_ctx, user):
+    """조사가 붙은 한글도 부분 일치로 검색 ('파이썬' → '파이썬으로')."""
+    v = _add_video(user, "파이썬으로 만드는 웹")
+    items = client.get("/api/videos?search=파이썬").get_json()["items"]
+    assert [i["id"] for i in items] == [v.id]
+
+
+def test_search_single_char_falls_back_to_like(client, app_ctx, user):
+    """1글자 한글 검색어는 ILIKE 로 처리되어 단어 끝 글자도 찾음."""
+    v = _add_video(user, "한글자끝말")
+    items = client.get("/api/videos?search=말").get_json()["items"]
+    assert v.id in [i["id"] for i in items]
+
+
+def test_search_relevance_ranks_title_match_first(client, app_ctx, user):
+    """sort=relevance → 제목 일치가 설명 일치보다 앞."""
+    desc_hit = _add_video(user, "다른 영상", "랭킹키워드 설명")
+    title_hit = _add_video(user, "랭킹키워드 제목", "무관한 설명")
+    items = client.get("/api/videos?search=랭킹키워드&sort=relevance").get_json()["items"]
+    assert [i["id"] for i in items] == [title_hit.id, desc_hit.id]
+
+    resp = client.get("/search?q=랭킹키워드&sort=relevance")
+    text_ = resp.data.decode("utf-8")
+    assert text_.find("랭킹키워드 제목") < text_.find("다른 영상")
+
+
+def test_search_relevance_cursor_pagination(client, app_ctx, user):
+    """sort=relevance&cursor= → next_cursor 로 중복·누락 없이 끝까지 조회."""
+    ids = {_add_video(user, f"커서검색 {i}").id for i in range(5)}
+    seen = []
+    cursor = ""
+    for _ in range(10):
+        data = client.get(f"/api/videos?search=커서검색&sort=relevance&per_page=2&cursor={cursor}").get_json()
+        seen.extend(i["id"] for i in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == ids
@@ -0,0 +1,106 @@
+# 단위 테스트 – API 직렬화 (app/utils/serializers.py): 컬럼 튜플 변환·스파스 필드·URL 접두사·orjson 인코더
+
+import collections
+from datetime import datetime, timezone
+
+import pytest
+from flask import url_for
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from app import db
+from app.models import Video
+from app.utils.serializers import OrjsonProvider, VideoSerializer, _MediaUrls
+
+
+# ----- 공통 -----
+@pytest.fixture
+def video(app_ctx):
+    v = Video(title="직렬화 영상", video_path="a b/한글#1?.mp4", thumbnail_path="썸네일 #2.png", user_id=1)
+    db.session.add(v)
+    db.session.commit()
+    v.save_tags("직렬화,테스트", commit=True)
+    return v
+
+
+def _statements(func):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, statements
+
+
+# ----- URL -----
+def test_media_urls_match_url_for(app):
+    with app.test_request_context("/"):
+        urls = _MediaUrls()
+        for name in ("plain.mp4", "a b/한글#1?.mp4", "100%.png"):
+            assert urls.video(name, None) == url_for("main.media_video", filename=name)
+            assert urls.thumbnail(name, None) == url_for("main.media_thumbnail", filename=name)
+        assert urls.video("x.mp4", "https://cdn/x.mp4") == "https://cdn/x.mp4"
+        assert urls.video(None, None) is None and urls.thumbnail(None, None) is None
+
+
+# ----- 튜플 변환 -----
+def test_rows_and_objects_serialize_identically(app, video):
+    with app.test_request_context("/api/videos"):
+        serializer = VideoSerializer()
+        rows = serializer.query(db.session).filter(Video.id == video.id).all()
+        assert serializer.dump_rows(db.session, rows) == [serializer.dump_video(video)]
+        item = serializer.dump_video(video)
+        assert item["tags"] == ["직렬화", "테스트"]
+        assert item["channel"] == {"id": 1, "username": "default"}
+
+
+def test_sparse_fields_select_only_needed_columns(app, video):
+    with app.test_request_context("/api/videos"):
+        serializer = VideoSerializer("title,id,unknown")
+        assert serializer.fields == ("id", "title")
+        items, statements = _statements(lambda: serializer.dump_rows(db.session, serializer.query(db.session).all()))
+    assert {"id": video.id, "title": "직렬화 영상"} in items
+    assert all(set(item) == {"id", "title"} for item in items)
+    assert len(statements) == 1
+    assert "users" not in statements[0] and "description" not in statements[0]
+
+
+def test_list_api_skips_identity_map(client, video):
+    video_id = video.id
+    db.session.expunge_all()
+    items = client.get("/api/videos?fields=id,tags").get_json()["items"]
+    assert {"id": video_id, "tags": ["직렬화", "테스트"]} in items
+    assert not any(isinstance(obj, Video) for obj in db.session.identity_map.values())
+
+
+def test_unknown_fields_fall_back_to_all(client, video):
+    item = client.get("/api/videos?fields=nope").get_json()["items"][0]
+    assert "channel" in item and "video_url" in item
+
+
+# ----- orjson -----
+def test_orjson_provider_matches_default(app):
+    pytest.importorskip("orjson")
+    assert isinstance(app.json, OrjsonProvider)
+    default = DefaultJSONProvider(app)
+    Point = collections.namedtuple("Point", "x y")
+    payload = {"b": 1, "a": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+    assert app.json.loads(app.json.dumps(payload)) == default.loads(default.dumps(payload))
+    assert app.json.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+    assert app.json.loads(app.json.dumps({"p": Point(1, 2)})) == {"p": [1, 2]}
+    with app.test_request_context("/"):
+        assert app.json.response({"a": 1}).get_data(as_text=True) == '{"a":1}\n'
+
+
+def test_orjson_can_be_disabled(app):
+    from app.utils.serializers import install_json_provider
+
+    app.config["API_JSON_ORJSON"] = False
+    app.json = DefaultJSONProvider(app)
+    assert install_json_provider(app) is False
+    assert not isinstance(app.json, OrjsonProvider)
@@ -0,0 +1,105 @@
+# 단위 테스트 – SQL 계측 (app/utils/sql_stats.py): 지문 정규화·요청별 DB 시간·Server-Timing·느린 쿼리 로그·관리자 화면
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.utils.sql_stats import _TIMER_KEY, fingerprint, get_sql_stats, request_sql_stats
+
+
+# ----- 공통 -----
+def _login(client, login_id, password):
+    client.post("/auth/login", data={"login_id": login_id, "password": password})
+
+
+# ----- 지문 -----
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("SELECT a FROM t WHERE id IN (?, ?, ?) LIMIT 12", "SELECT a FROM t WHERE id IN (?) LIMIT ?"),
+        ("SELECT  a\n FROM t WHERE name = 'it''s' AND x = -1.5", "SELECT a FROM t WHERE name = ? AND x = ?"),
+        ("SELECT anon_1.id FROM t WHERE b = %(b_1)s OR c = :c", "SELECT anon_1.id FROM t WHERE b = ? OR c = ?"),
+        ("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)", "INSERT INTO t (a, b) VALUES (?)"),
+    ],
+)
+def test_fingerprint_normalizes_literals_and_lists(statement, expected):
+    assert fingerprint(statement) == expected
+
+
+# ----- 누적·요청별 -----
+def test_same_shape_queries_share_a_fingerprint(app):
+    with app.app_context():
+        get_sql_stats().reset()
+        db.session.execute(text("SELECT id FROM videos WHERE id IN (1, 2, 3)"))
+        db.session.execute(text("SELECT id FROM videos WHERE id IN (4, 5)"))
+        rows = {row["fingerprint"]: row for row in get_sql_stats().top()}
+    row = rows["SELECT id FROM videos WHERE id IN (?)"]
+    assert row["calls"] == 2 and row["total_ms"] >= row["max_ms"] > 0
+
+
+def test_request_stats_track_count_time_and_slowest(app):
+    with app.test_request_context("/"):
+        app.preprocess_request()
+        for i in range(5):
+            db.session.execute(text(f"SELECT {i}"))
+        stats = request_sql_stats()
+    assert stats["count"] == 5 and stats["db_ms"] > 0
+    assert len(stats["slowest"]) == 3
+    assert all(item["fingerprint"] == "SELECT ?" for item in stats["slowest"])
+    assert stats["slowest"][0]["ms"] >= stats["slowest"][-1]["ms"]
+
+
+def test_server_timing_header(app, client):
+    assert "Server-Timing" not in client.get("/api/videos").headers
+    app.config["SQL_SERVER_TIMING"] = True
+    header = client.get("/api/users/default").headers["Server-Timing"]
+    assert header.startswith("db;dur=") and 'desc="' in header and "app;dur=" in header
+
+
+def test_failed_statement_does_not_leave_timer(app):
+    with app.app_context():
+        connection = db.session.connection()
+        with pytest.raises(OperationalError):
+            db.session.execute(text("SELECT * FROM no_such_table"))
+        assert not connection.info.get(_TIMER_KEY)
+
+
+# ----- 느린 쿼리 -----
+def test_slow_queries_are_kept_and_logged(app, client, tmp_path):
+    log_path = tmp_path / "slow.log"
+    app.config.update(SQL_SLOW_QUERY_MS=0, SQL_SLOW_QUERY_LOG=str(log_path))
+    with app.app_context():
+        get_sql_stats().reset()
+    client.get("/api/users/default")
+    with app.app_context():
+        slow = get_sql_stats().slow_queries()
+    assert slow and all(item["where"] == "GET /api/users/default" for item in slow)
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(slow)
+    assert "GET /api/users/default | SELECT" in lines[0]
+
+
+def test_disabled_records_nothing(app):
+    app.config["SQL_STATS_ENABLED"] = False
+    with app.app_context():
+        get_sql_stats().reset()
+        db.session.execute(text("SELECT 1"))
+        assert get_sql_stats().top() == []
+
+
+# ----- 관리자 화면 -----
+def test_admin_sql_page_and_reset(app, client):
+    _login(client, "default", "default")
+    assert client.get("/admin/sql").status_code == 302
+    client.get("/auth/logout")
+
+    _login(client, "admin", "admin1234")
+    client.get("/api/videos")
+    page = client.get("/admin/sql?order=calls")
+    assert page.status_code == 200
+    assert "FROM videos" in page.get_data(as_text=True)
+
+    assert client.post("/admin/sql/reset").status_code == 302
+    with app.app_context():
+        assert all("FROM videos" not in row["fingerprint"] for row in get_sql_stats().top())
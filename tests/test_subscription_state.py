@@ -0,0 +1,123 @@
+# 단위 테스트 – 구독 상태·구독자 수 일괄 조회, 구독 토글 (app/utils/subscriptions.py, /api/channels/state)
+
+import pytest
+from sqlalchemy import event, select, text
+
+from app import db
+from app.models import Subscription, User, Video
+from app.models.subscription import feed_items
+from app.utils.subscriptions import subscriber_counts, subscription_states, toggle_subscription
+
+
+# ----- 공통 픽스처 -----
+@pytest.fixture
+def user(app_ctx):
+    """구독하는 사용자 (id=1, logged_in_client 의 사용자)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def channels(app_ctx):
+    """채널 4개. 0·1 은 구독자 2명, 2 는 1명, 3 은 0명 (fan 두 명 기준)."""
+    users = []
+    for name in ("ch_a", "ch_b", "ch_c", "ch_d", "fan_a", "fan_b"):
+        u = User(username=name, email=f"{name}@example.com")
+        u.set_password("secret")
+        users.append(u)
+    db.session.add_all(users)
+    db.session.commit()
+    chans, fans = users[:4], users[4:]
+    for fan in fans:
+        for chan in chans[:2]:
+            db.session.add(Subscription(subscriber_id=fan.id, subscribed_to_id=chan.id))
+    db.session.add(Subscription(subscriber_id=fans[0].id, subscribed_to_id=chans[2].id))
+    db.session.commit()
+    return chans
+
+
+def _count_statements(func):
+    statements = []
+
+    def _record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        result = func()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    return result, statements
+
+
+# ----- 일괄 조회 -----
+def test_batch_lookups_are_one_query_each(app_ctx, user, channels):
+    ids = [c.id for c in channels]
+    user_id = user.id
+    toggle_subscription(db.session, user_id, ids[1])
+
+    counts, statements = _count_statements(lambda: subscriber_counts(db.session, ids))
+    assert counts == {ids[0]: 2, ids[1]: 3, ids[2]: 1, ids[3]: 0}
+    assert len(statements) == 1
+
+    states, statements = _count_statements(lambda: subscription_states(db.session, user_id, ids))
+    assert states == {ids[0]: False, ids[1]: True, ids[2]: False, ids[3]: False}
+    assert len(statements) == 1
+    assert subscription_states(db.session, None, ids) == dict.fromkeys(ids, False)
+
+
+def test_counts_fall_back_when_stats_row_missing(app_ctx, channels):
+    chan_id = channels[0].id
+    db.session.execute(text("DELETE FROM channel_stats WHERE user_id = :id"), {"id": chan_id})
+    db.session.commit()
+    assert subscriber_counts(db.session, [chan_id, channels[2].id]) == {chan_id: 2, channels[2].id: 1}
+
+
+# ----- 토글 -----
+def test_toggle_route_updates_count_and_feed(logged_in_client, user, channels):
+    chan = channels[3]
+    video = Video(title="구독 토글 영상", video_path="t.mp4", user_id=chan.id)
+    db.session.add(video)
+    db.session.commit()
+    video_id, user_id = video.id, user.id
+
+    data = logged_in_client.post(f"/user/{chan.username}/subscribe").get_json()
+    assert data == {"ok": True, "is_subscribed": True, "subscriber_count": 1}
+    inbox = select(feed_items.c.video_id).where(feed_items.c.user_id == user_id)
+    assert db.session.execute(inbox).scalars().all() == [video_id]
+
+    data = logged_in_client.post(f"/user/{chan.username}/subscribe").get_json()
+    assert data == {"ok": True, "is_subscribed": False, "subscriber_count": 0}
+    assert db.session.execute(inbox).scalars().all() == []
+    assert subscriber_counts(db.session, [chan.id]) == {chan.id: 0}
+
+
+def test_toggle_count_matches_subscription_rows(app_ctx, user, channels):
+    """토글을 반복해도 channel_stats 구독자 수가 실제 subscriptions 행 수와 같음."""
+    chan_id, user_id = channels[2].id, user.id
+    rows = text("SELECT COUNT(*) FROM subscriptions WHERE subscribed_to_id = :c")
+    for expected in [(True, 2), (False, 1), (True, 2)]:
+        assert toggle_subscription(db.session, user_id, chan_id) == expected
+        assert db.session.execute(rows, {"c": chan_id}).scalar() == expected[1]
+
+
+# ----- API -----
+def test_channels_state_endpoint(logged_in_client, user, channels):
+    logged_in_client.post(f"/user/{channels[0].username}/subscribe")
+    ids = ",".join(str(c.id) for c in channels[:3])
+    data = logged_in_client.get(f"/api/channels/state?ids={ids},x").get_json()
+    assert data["success"] is True
+    assert data["items"] == {
+        str(channels[0].id): {"subscriber_count": 3, "is_subscribed": True},
+        str(channels[1].id): {"subscriber_count": 2, "is_subscribed": False},
+        str(channels[2].id): {"subscriber_count": 1, "is_subscribed": False},
+    }
+
+
+def test_user_api_exposes_subscriber_count(logged_in_client, channels):
+    chan = channels[1]
+    item = logged_in_client.get(f"/api/users/{chan.username}").get_json()["item"]
+    assert (item["subscriber_count"], item["is_subscribed"]) == (2, False)
+    logged_in_client.post(f"/user/{chan.username}/subscribe")
+    item = logged_in_client.get(f"/api/users/{chan.username}").get_json()["item"]
+    assert (item["subscriber_count"], item["is_subscribed"]) == (3, True)
+    assert item["stats"]["subscriber_count"] == 3
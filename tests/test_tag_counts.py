@@ -0,0 +1,97 @@
+# 단위 테스트 – 태그 비디오 수(tags.video_count) 유지·인기 태그 캐시 (app/utils/tag_stats.py)
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import Tag, User, Video
+from app.utils.tag_stats import get_popular_tags, repair_tag_counts
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저."""
+    return db.session.get(User, 1)
+
+
+def _add_video(user, tags, title="태그카운트"):
+    v = Video(title=title, video_path="t.mp4", user_id=user.id)
+    db.session.add(v)
+    db.session.commit()
+    v.save_tags(tags)
+    return v
+
+
+def _count(name):
+    tag = Tag.query.filter_by(name=name).first()
+    db.session.refresh(tag)
+    return tag.video_count
+
+
+def test_save_tags_increments_and_decrements(app_ctx, user):
+    """save_tags: 새로 붙은 태그 + 1, 빠진 태그 - 1, 유지된 태그는 그대로."""
+    v1 = _add_video(user, "공통, 하나")
+    _add_video(user, "공통, 둘")
+    assert (_count("공통"), _count("하나"), _count("둘")) == (2, 1, 1)
+
+    v1.save_tags("공통, 셋")
+    assert (_count("공통"), _count("하나"), _count("셋")) == (2, 0, 1)
+
+    v1.save_tags("공통, 셋")
+    assert _count("셋") == 1
+
+
+def test_save_tags_commit_false_counts_new_video(app_ctx, user):
+    """flush 전 새 비디오 + commit=False 도 커밋 시 카운트 반영."""
+    v = Video(title="미저장", video_path="n.mp4", user_id=user.id)
+    db.session.add(v)
+    v.save_tags("미저장태그", commit=False)
+    db.session.commit()
+    assert _count("미저장태그") == 1
+
+
+def test_video_delete_decrements(logged_in_client, app_ctx, user):
+    """studio.delete 로 비디오 삭제 → 연결된 태그 카운트 감소."""
+    v = _add_video(user, "삭제태그, 남는태그")
+    _add_video(user, "남는태그")
+    logged_in_client.post(f"/studio/delete/{v.id}")
+    assert db.session.get(Video, v.id) is None
+    assert (_count("삭제태그"), _count("남는태그")) == (0, 1)
+
+
+def test_popular_tags_ordered_by_count_and_cached(app, app_ctx, user):
+    """video_count 내림차순, 0개 태그 제외. 커밋 시 캐시 무효화, 직접 SQL 변경은 TTL 동안 캐시 유지."""
+    app.config["POPULAR_TAGS_CACHE_TTL"] = 60
+    _add_video(user, "인기, 보통")
+    _add_video(user, "인기")
+    db.session.add(Tag(name="빈태그"))
+    db.session.commit()
+    assert [t.name for t in get_popular_tags(10)] == ["인기", "보통"]
+
+    _add_video(user, "보통")
+    _add_video(user, "보통")
+    assert [t.name for t in get_popular_tags(10)] == ["보통", "인기"]
+
+    db.session.execute(text("UPDATE tags SET video_count = 100 WHERE name = '빈태그'"))
+    db.session.commit()
+    assert "빈태그" not in [t.name for t in get_popular_tags(10)]
+
+
+def test_repair_tag_counts(app_ctx, user):
+    """어긋난 video_count 를 video_tags 기준으로 재계산, 고친 태그 수 반환."""
+    _add_video(user, "복구A, 복구B")
+    db.session.execute(text("UPDATE tags SET video_count = 7 WHERE name = '복구A'"))
+    db.session.commit()
+    assert repair_tag_counts(db) == 1
+    assert (_count("복구A"), _count("복구B")) == (1, 1)
+    assert repair_tag_counts(db) == 0
+
+
+def test_api_and_pages_use_counts(client, app_ctx, user):
+    """/api/tags/popular 에 video_count 포함, 태그 페이지 결과 수 표시."""
+    _add_video(user, "페이지태그")
+    _add_video(user, "페이지태그")
+    items = client.get("/api/tags/popular?limit=1").get_json()["items"]
+    assert items == [{"id": items[0]["id"], "name": "페이지태그", "video_count": 2}]
+    html = client.get("/tag/페이지태그").data.decode("utf-8")
+    assert "<strong>2</strong>개의 동영상" in html
@@ -0,0 +1,149 @@
+# 단위 테스트 – 태그 일괄 조회·생성·변경 (app/utils/tags.py, Video.save_tags, 관리자 일괄 변경)
+
+import pytest
+from sqlalchemy import event, text
+
+from app import db
+from app.models import Tag, User, Video
+from app.utils.tags import backfill_tag_keys, clear_tag_cache, parse_tag_names, resolve_tags, retag_videos
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저."""
+    return db.session.get(User, 1)
+
+
+def _videos(user, n):
+    items = [Video(title=f"일괄{i}", video_path="b.mp4", user_id=user.id) for i in range(n)]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+
+class _SqlLog:
+    """실행된 SQL 문 기록 (cursor 실행 단위)."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+def test_parse_tag_names_normalizes():
+    """공백 정리, 대소문자만 다른 중복 제거(처음 표기 유지), 50자 초과 제외."""
+    assert parse_tag_names("  Python ,python,  Web   개발 ,, " + "가" * 51) == ["Python", "Web 개발"]
+    assert parse_tag_names(["A", " a ", "B"]) == ["A", "B"]
+    assert parse_tag_names(None) == []
+
+
+def test_save_tags_reuses_case_insensitive(app_ctx, user):
+    """기존 'Flask' 태그가 있으면 'flask' 입력도 같은 태그로 연결 (새로 만들지 않음)."""
+    db.session.add(Tag(name="Flask"))
+    db.session.commit()
+    video = _videos(user, 1)[0]
+    before = Tag.query.count()
+    video.save_tags("flask,  FLASK , 새  태그")
+    assert sorted(t.name for t in video.tags) == ["Flask", "새 태그"]
+    assert Tag.query.count() == before + 1
+
+
+def test_save_tags_reuses_non_ascii_case_insensitive(app_ctx, user):
+    """비ASCII 대소문자('Été'/'été', 'STRASSE'/'straße')도 같은 태그 – DB lower() 가 아닌 casefold 키로 비교."""
+    db.session.add(Tag(name="Été"))
+    db.session.commit()
+    clear_tag_cache()
+    video = _videos(user, 1)[0]
+    before = Tag.query.count()
+    video.save_tags("été, STRASSE, straße")
+    assert sorted(t.name for t in video.tags) == ["STRASSE", "Été"]
+    assert Tag.query.count() == before + 1
+    assert Tag.query.filter_by(name="Été").one().name_key == "été"
+
+
+def test_backfill_tag_keys_merges_case_duplicates(app_ctx, user):
+    """name_key 없던 DB: 키를 채우고, 같은 키가 된 태그는 가장 먼저 만든 태그로 합침."""
+    v1, v2 = _videos(user, 2)
+    v1.save_tags("Ünïcode")
+    v2.save_tags("Ünïcode")
+    keep_id = Tag.query.filter_by(name="Ünïcode").one().id
+    # 예전 방식으로 따로 생긴 소문자 태그 (키 없음) + 두 비디오 중 하나에만 겹치게 연결
+    db.session.execute(text("DROP INDEX IF EXISTS ix_tags_name_key"))
+    dup_id = db.session.execute(
+        text("INSERT INTO tags (name, name_key, video_count) VALUES ('ünïcode', '', 1) RETURNING id")
+    ).scalar()
+    db.session.execute(text("INSERT INTO video_tags (video_id, tag_id) VALUES (:v, :t)"), {"v": v1.id, "t": dup_id})
+    assert backfill_tag_keys(db.session) == 1
+    db.session.commit()
+    assert db.session.get(Tag, dup_id) is None
+    links = db.session.execute(text("SELECT video_id FROM video_tags WHERE tag_id = :t"), {"t": keep_id}).scalars()
+    assert sorted(links) == [v1.id, v2.id]
+    assert db.session.get(Tag, keep_id).name_key == "ünïcode"
+    db.session.execute(text("CREATE UNIQUE INDEX ix_tags_name_key ON tags (name_key)"))
+
+
+def test_save_tags_statement_count_independent_of_tag_count(app_ctx, user):
+    """태그 20개 저장도 태그 조회·생성은 SELECT 2번 + INSERT 1번 (이름 수와 무관)."""
+    video = _videos(user, 1)[0]
+    names = ", ".join(f"대량{i}" for i in range(20))
+    with _SqlLog(db.engine) as log:
+        video.save_tags(names)
+    tag_selects = [s for s in log.statements if s.lstrip().upper().startswith("SELECT") and "FROM tags" in s]
+    assert len(tag_selects) == 2
+    assert sum(1 for s in log.statements if s.lstrip().upper().startswith("INSERT INTO TAGS")) == 1
+    assert len(video.tags) == 20
+
+
+def test_cache_skips_lookup_after_commit_only(app_ctx, user):
+    """커밋된 태그는 캐시로 재조회 없음. 롤백된 트랜잭션에서 만든 태그는 캐시에 남지 않음."""
+    clear_tag_cache()
+    v1, v2 = _videos(user, 2)
+    v1.save_tags("캐시A, 캐시B")
+    with _SqlLog(db.engine) as log:
+        v2.save_tags("캐시a, 캐시B")
+    assert not any("FROM tags" in s for s in log.statements if s.lstrip().upper().startswith("SELECT"))
+    assert sorted(t.name for t in v2.tags) == ["캐시A", "캐시B"]
+
+    resolve_tags(db.session, ["롤백태그"])
+    db.session.rollback()
+    assert Tag.query.filter_by(name="롤백태그").first() is None
+    v1.save_tags("롤백태그")
+    assert [t.name for t in v1.tags] == ["롤백태그"]
+
+
+def test_retag_videos_replace_and_add(app_ctx, user):
+    """여러 비디오 한 번에: replace 는 교체, replace=False 는 추가만. video_count 도 반영."""
+    v1, v2, v3 = _videos(user, 3)
+    v1.save_tags("유지, 제거")
+    result = retag_videos(db.session, {v1.id: "유지, 신규", v2.id: ["신규"], v3.id: "유지"})
+    assert result == {"added": 3, "removed": 1}
+    assert sorted(t.name for t in v1.tags) == ["신규", "유지"]
+
+    retag_videos(db.session, {v2.id: "추가만"}, replace=False)
+    assert sorted(t.name for t in v2.tags) == ["신규", "추가만"]
+    counts = {t.name: t.video_count for t in Tag.query.filter(Tag.name.in_(["유지", "제거", "신규", "추가만"]))}
+    assert counts == {"유지": 2, "제거": 0, "신규": 2, "추가만": 1}
+
+
+def test_admin_bulk_retag(logged_in_client, app_ctx, user):
+    """관리자 /admin/videos/retag → 입력한 비디오들에 태그 추가."""
+    user.is_admin = True
+    db.session.commit()
+    v1, v2 = _videos(user, 2)
+    resp = logged_in_client.post(
+        "/admin/videos/retag",
+        data={"video_ids": f"{v1.id}, {v2.id}, 999999", "tags": "관리자태그", "mode": "add"},
+        follow_redirects=True,
+    )
+    assert "동영상 2개 태그 변경" in resp.data.decode("utf-8")
+    assert [t.name for t in v1.tags] == ["관리자태그"]
+    assert Tag.query.filter_by(name="관리자태그").first().video_count == 2
@@ -0,0 +1,185 @@
+# 단위 테스트 – 썸네일 변형 (app/utils/thumbnails.py): WebP 축소본 생성·캐시, srcset, 프로세스 풀 생성
+
+import os
+import uuid
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app import db
+from app.models import Video
+
+
+@pytest.fixture
+def media_dirs(app, tmp_path):
+    """썸네일 원본·변형 폴더를 임시 폴더로."""
+    app.config["THUMBNAIL_FOLDER"] = str(tmp_path / "thumbs")
+    app.config["THUMBNAIL_VARIANT_FOLDER"] = str(tmp_path / "variants")
+    os.makedirs(app.config["THUMBNAIL_FOLDER"])
+    return tmp_path
+
+
+def _save_image(app, size=(1600, 900), fmt="PNG", ext="png"):
+    filename = f"{uuid.uuid4().hex}.{ext}"
+    Image.new("RGB", size, (200, 40, 40)).save(os.path.join(app.config["THUMBNAIL_FOLDER"], filename), fmt)
+    return filename
+
+
+def _variant_image(resp):
+    data = resp.get_data()
+    resp.close()
+    return Image.open(BytesIO(data))
+
+
+def test_srcset_lists_configured_widths(app, media_dirs):
+    filename = _save_image(app)
+    video = Video(title="srcset", video_path="v.mp4", thumbnail_path=filename, user_id=1)
+    with app.test_request_context():
+        assert video.get_thumbnail_srcset() == ", ".join(
+            f"/media/variants/thumbnails/webp/{w}/{filename} {w}w" for w in (320, 640, 1280)
+        )
+        assert video.get_thumbnail_url(640) == f"/media/variants/thumbnails/webp/640/{filename}"
+        assert video.get_thumbnail_url() == f"/media/thumbnails/{filename}"
+
+
+def test_variant_is_resized_webp_with_immutable_cache(app, client, media_dirs):
+    """요청한 너비의 WebP 생성·응답, 파일명은 원본 해시 기반이라 같은 원본이면 재사용."""
+    filename = _save_image(app)
+    resp = client.get(f"/media/variants/thumbnails/webp/640/{filename}")
+    assert resp.status_code == 200
+    assert resp.mimetype == "image/webp"
+    assert resp.cache_control.immutable
+    img = _variant_image(resp)
+    assert img.format == "WEBP" and img.size == (640, 360)
+    # 모든 너비가 한 번에 생성됨 (원본 1번 디코딩)
+    assert len(os.listdir(app.config["THUMBNAIL_VARIANT_FOLDER"])) == 3
+
+    # 같은 내용의 다른 파일명 → 같은 변형 파일 재사용
+    with open(os.path.join(app.config["THUMBNAIL_FOLDER"], filename), "rb") as f:
+        data = f.read()
+    copy_name = f"{uuid.uuid4().hex}.png"
+    with open(os.path.join(app.config["THUMBNAIL_FOLDER"], copy_name), "wb") as f:
+        f.write(data)
+    resp = client.get(f"/media/variants/thumbnails/webp/640/{copy_name}")
+    assert resp.status_code == 200
+    resp.close()
+    assert len(os.listdir(app.config["THUMBNAIL_VARIANT_FOLDER"])) == 3
+
+
+def test_small_source_is_not_upscaled(app, client, media_dirs):
+    filename = _save_image(app, size=(400, 300), fmt="JPEG", ext="jpg")
+    img = _variant_image(client.get(f"/media/variants/thumbnails/webp/1280/{filename}"))
+    assert img.size == (400, 300)
+
+
+def test_invalid_variant_requests(app, client, media_dirs):
+    """설정에 없는 너비·형식·원본 없음 → 404, 이미지가 아닌 원본 → 원본으로 redirect."""
+    filename = _save_image(app)
+    assert client.get(f"/media/variants/thumbnails/webp/500/{filename}").status_code == 404
+    assert client.get(f"/media/variants/thumbnails/bmp/640/{filename}").status_code == 404
+    assert client.get(f"/media/variants/videos/webp/640/{filename}").status_code == 404
+    assert client.get("/media/variants/thumbnails/webp/640/missing.png").status_code == 404
+
+    broken = f"{uuid.uuid4().hex}.png"
+    with open(os.path.join(app.config["THUMBNAIL_FOLDER"], broken), "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\nnot really")
+    resp = client.get(f"/media/variants/thumbnails/webp/640/{broken}")
+    assert resp.status_code == 302
+    assert resp.headers["Location"].endswith(f"/media/thumbnails/{broken}")
+
+
+def test_variant_of_replaceable_source_is_not_immutable(app, client, media_dirs):
+    """원본 파일명이 uuid 가 아니면(프로필 이미지 등 같은 이름으로 교체 가능) 변형도 짧은 캐시."""
+    name = _save_image(app)
+    replaceable = "20260101_120000_avatar.png"
+    os.rename(os.path.join(app.config["THUMBNAIL_FOLDER"], name), os.path.join(app.config["THUMBNAIL_FOLDER"], replaceable))
+    resp = client.get(f"/media/variants/thumbnails/webp/320/{replaceable}")
+    assert resp.status_code == 200
+    assert not resp.cache_control.immutable
+    assert resp.cache_control.max_age == app.config["MEDIA_MAX_AGE"]
+    resp.close()
+
+
+def test_failed_source_is_retried_after_ttl(app, client, media_dirs, monkeypatch):
+    """생성 실패한 원본은 THUMBNAIL_FAILED_TTL 동안 재시도하지 않고, 지나면 다시 시도 (일시적 오류 대비)."""
+    import app.utils.thumbnails as thumbnails
+
+    now = [1000.0]
+    calls = []
+    render = thumbnails.render_variants
+
+    def _flaky(*args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise OSError("디스크 가득 참")
+        return render(*args)
+
+    monkeypatch.setattr(thumbnails.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(thumbnails, "render_variants", _flaky)
+    url = f"/media/variants/thumbnails/webp/320/{_save_image(app)}"
+    assert client.get(url).status_code == 302
+    assert client.get(url).status_code == 302 and len(calls) == 1
+    now[0] += app.config["THUMBNAIL_FAILED_TTL"] + 1
+    resp = client.get(url)
+    assert resp.status_code == 200 and len(calls) == 2
+    resp.close()
+
+
+def test_cloudinary_thumbnail_uses_transform_urls(app_ctx):
+    video = Video(
+        title="cloud", video_path="v", user_id=1,
+        thumbnail_url="https://res.cloudinary.com/demo/image/upload/v1/wetube/thumbnails/abc.jpg",
+    )
+    assert video.get_thumbnail_url(320) == (
+        "https://res.cloudinary.com/demo/image/upload/c_limit,w_320,f_auto,q_auto/v1/wetube/thumbnails/abc.jpg"
+    )
+    assert "w_1280" in video.get_thumbnail_srcset()
+
+
+def test_upload_precomputes_variants(app, logged_in_client, media_dirs):
+    buf = BytesIO()
+    Image.new("RGB", (800, 450), (0, 90, 200)).save(buf, "PNG")
+    buf.seek(0)
+    resp = logged_in_client.post(
+        "/studio/upload",
+        data={"title": "변형 업로드", "video": (BytesIO(b"\x00\x00\x00\x20ftypmp42"), "a.mp4"),
+              "thumbnail": (buf, "t.png")},
+        content_type="multipart/form-data",
+    )
+    assert resp.status_code == 302
+    video = Video.query.filter_by(title="변형 업로드").one()
+    try:
+        assert sorted(os.listdir(app.config["THUMBNAIL_VARIANT_FOLDER"]))[0].endswith("_1280.webp")
+        assert len(os.listdir(app.config["THUMBNAIL_VARIANT_FOLDER"])) == 3
+    finally:
+        os.remove(os.path.join(app.config["VIDEO_FOLDER"], video.video_path))
+        db.session.delete(video)
+        db.session.commit()
+
+
+def test_process_pool_generates_without_blocking_request(app, client, media_dirs):
+    """워커 프로세스 모드(forkserver/spawn): 첫 요청은 생성만 요청하고 원본으로 redirect, 완료 후에는 변형 응답."""
+    app.config["THUMBNAIL_WORKERS"] = 1
+    filename = _save_image(app)
+    variants = app.extensions["image_variants"]
+    try:
+        resp = client.get(f"/media/variants/thumbnails/webp/320/{filename}")
+        assert resp.status_code == 302
+        variants.wait(timeout=60)
+        resp = client.get(f"/media/variants/thumbnails/webp/320/{filename}")
+        assert resp.status_code == 200
+        assert _variant_image(resp).size == (320, 180)
+    finally:
+        variants.shutdown()
+
+
+def test_exit_shutdown_registered_once_per_process(monkeypatch, app):
+    import app.utils.thumbnails as thumbnails
+
+    calls = []
+    monkeypatch.setattr(thumbnails, "_atexit_registered", False)
+    monkeypatch.setattr(thumbnails.atexit, "register", calls.append)
+    generators = [thumbnails.ImageVariants(app) for _ in range(3)]
+    assert calls == [thumbnails._shutdown_all]
+    assert all(variants in thumbnails._live_variants for variants in generators)
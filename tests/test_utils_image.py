@@ -100,3 +100,76 @@ def test_validate_image_file_preserves_stream_for_save(valid_png_file):
     valid_png_file.seek(0)
     data_after = valid_png_file.read()
     assert len(data_after) > 0
+
+
+# ----- 스트리밍 검증: 전체 읽기 없음·매직 넘버·압축 폭탄 -----
+class _TrackingStream(BytesIO):
+    """read 1번에 돌려준 최대 바이트 수를 기록."""
+
+    max_read = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.max_read = max(self.max_read, len(data))
+        return data
+
+
+def test_validate_image_file_streams_without_full_read():
+    """큰 PNG도 한 번에 전부 읽지 않고 검증 (크기는 seek/tell)."""
+    import os
+
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.frombytes("RGB", (700, 700), os.urandom(700 * 700 * 3)).save(buf, format="PNG")
+    data = buf.getvalue()
+    stream = _TrackingStream(data)
+    fs = FileStorage(stream=stream, filename="noise.png", content_type="image/png")
+    ok, msg = validate_image_file(fs, {"png"}, 5 * 1024 * 1024)
+    assert ok is True, msg
+    assert 0 < stream.max_read < len(data) // 4
+    assert stream.tell() == 0
+
+
+def test_validate_image_file_rejects_decompression_bomb():
+    """파일은 작아도 해상도가 상한을 넘으면 디코딩 전에 거부."""
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("1", (10000, 10000)).save(buf, format="PNG")
+    assert len(buf.getvalue()) < 100 * 1024
+    fs = FileStorage(stream=BytesIO(buf.getvalue()), filename="bomb.png", content_type="image/png")
+    ok, msg = validate_image_file(fs, {"png"}, 5 * 1024 * 1024)
+    assert ok is False
+    assert "해상도" in msg
+    fs.stream.seek(0)
+    ok, _ = validate_image_file(fs, {"png"}, 5 * 1024 * 1024, max_pixels=200_000_000)
+    assert ok is True
+
+
+def test_validate_image_file_magic_must_match_allowed_format(valid_jpg_file):
+    """확장자는 허용돼도 실제 내용(매직 넘버)이 허용 형식이 아니면 거부."""
+    valid_jpg_file.filename = "photo.png"
+    ok, msg = validate_image_file(valid_jpg_file, {"png"}, 5 * 1024 * 1024)
+    assert ok is False
+    assert "유효하지 않은" in msg
+
+
+def test_validate_image_file_non_seekable_stream(valid_png_file):
+    """seek 불가 스트림도 임시 파일로 옮겨 검증, 이후 save 가능."""
+    data = valid_png_file.read()
+
+    class _Pipe:
+        def __init__(self, payload):
+            self._buf = BytesIO(payload)
+
+        def read(self, size=-1):
+            return self._buf.read(size)
+
+    fs = FileStorage(stream=_Pipe(data), filename="pipe.png", content_type="image/png")
+    ok, msg = validate_image_file(fs, {"png"}, 5 * 1024 * 1024)
+    assert ok is True, msg
+    assert fs.read() == data
+    fs = FileStorage(stream=_Pipe(data), filename="pipe.png", content_type="image/png")
+    ok, msg = validate_image_file(fs, {"png"}, 10)
+    assert ok is False and "크기" in msg
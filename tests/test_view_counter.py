@@ -0,0 +1,139 @@
+# 단위 테스트 – 조회수 버퍼 (app/utils/view_counter.py, watch·API 조회수)
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.models import User, Video
+from app.utils.view_counter import ViewCounter
+
+
+@pytest.fixture
+def user(app_ctx):
+    """테스트용 기본 유저 (create_app에서 id=1 생성)."""
+    return db.session.get(User, 1)
+
+
+@pytest.fixture
+def buffered_app(app):
+    """조회수 버퍼 사용 + 자동 flush 비활성화 (수동 flush로 검증)."""
+    app.config["VIEW_COUNT_BUFFERED"] = True
+    app.config["VIEW_COUNT_FLUSH_INTERVAL"] = 3600
+    app.config["VIEW_COUNT_FLUSH_SIZE"] = 10**9
+    yield app
+    app.extensions["view_counter"].shutdown()
+
+
+@pytest.fixture
+def video(app_ctx, user):
+    v = Video(title="버퍼 테스트 영상", video_path="buf.mp4", user_id=user.id, views=5)
+    db.session.add(v)
+    db.session.commit()
+    return v
+
+
+def _db_views(video_id):
+    """ORM 캐시를 거치지 않고 DB의 views 값을 직접 조회."""
+    return db.session.execute(
+        text("SELECT views FROM videos WHERE id = :id"), {"id": video_id}
+    ).scalar()
+
+
+def test_watch_buffers_views_without_db_write(client, buffered_app, video):
+    """버퍼 모드: 시청해도 DB views 는 그대로, 화면에는 DB 값 + 미반영분 표시."""
+    client.get(f"/watch/{video.id}")
+    resp = client.get(f"/watch/{video.id}")
+    assert resp.status_code == 200
+    assert "조회수 7회" in resp.data.decode("utf-8")
+    assert _db_views(video.id) == 5
+    assert buffered_app.extensions["view_counter"].pending(video.id) == 2
+
+
+def test_flush_writes_batched_deltas(client, buffered_app, video, user):
+    """flush() → 누적 증가분이 DB에 한 번에 반영되고 버퍼는 비워짐."""
+    other = Video(title="다른 영상", video_path="buf2.mp4", user_id=user.id)
+    db.session.add(other)
+    db.session.commit()
+    for _ in range(3):
+        client.get(f"/watch/{video.id}")
+    client.get(f"/api/videos/{other.id}")
+
+    counter = buffered_app.extensions["view_counter"]
+    assert counter.flush() == 2
+    assert _db_views(video.id) == 8
+    assert _db_views(other.id) == 1
+    assert counter.pending(video.id) == 0
+    assert counter.flush() == 0
+
+
+def test_api_detail_shows_pending_views(client, buffered_app, video):
+    """API 상세 응답의 views 에도 미반영분이 포함됨."""
+    client.get(f"/api/videos/{video.id}")
+    data = client.get(f"/api/videos/{video.id}").get_json()
+    assert data["item"]["views"] == 7
+    assert _db_views(video.id) == 5
+
+
+def test_flush_size_wakes_flusher(buffered_app, video):
+    """누적 증가분이 VIEW_COUNT_FLUSH_SIZE 이상이면 백그라운드 스레드가 즉시 반영."""
+    buffered_app.config["VIEW_COUNT_FLUSH_SIZE"] = 3
+    counter = buffered_app.extensions["view_counter"]
+    for _ in range(3):
+        counter.increment(video.id)
+    counter._thread.join(timeout=0.01)
+    for _ in range(100):
+        if counter.pending(video.id) == 0:
+            break
+        counter._thread.join(timeout=0.05)
+    assert counter.pending(video.id) == 0
+    assert _db_views(video.id) == 8
+
+
+def test_unbuffered_mode_commits_immediately(client, app, video):
+    """VIEW_COUNT_BUFFERED=False → 요청마다 원자적 UPDATE 로 즉시 반영."""
+    client.get(f"/watch/{video.id}")
+    assert _db_views(video.id) == 6
+    assert app.extensions["view_counter"].pending(video.id) == 0
+
+
+def test_sqlite_store_shared_between_counters(buffered_app, video, tmp_path):
+    """VIEW_COUNT_STORE_PATH 지정 시 같은 파일을 쓰는 다른 카운터(워커)와 버퍼 공유."""
+    store_path = str(tmp_path / "pending_views.db")
+    buffered_app.config["VIEW_COUNT_STORE_PATH"] = store_path
+    counter_a = ViewCounter()
+    counter_a.init_app(buffered_app)
+    counter_a.increment(video.id, 2)
+
+    counter_b = ViewCounter()
+    counter_b.init_app(buffered_app)
+    counter_b.increment(video.id, 3)
+    assert counter_a.pending(video.id) == 5
+
+    assert counter_b.flush() == 1
+    assert _db_views(video.id) == 10
+    assert counter_a.pending(video.id) == 0
+    counter_a.shutdown()
+    counter_b.shutdown()
+
+
+def test_sqlite_store_keeps_running_total(tmp_path):
+    """증가마다 전체 SUM 없이 합계 행으로 누적, drain 후 0부터 다시."""
+    from app.utils.view_counter import _SqliteStore
+
+    path = str(tmp_path / "pending_total.db")
+    store = _SqliteStore(path)
+    assert [store.add(1, 2), store.add(2, 3), store.add(1, 1)] == [2, 5, 6]
+    assert _SqliteStore(path).add(3, 1) == 7  # 다른 워커도 같은 합계
+    assert store.drain() == {1: 3, 2: 3, 3: 1}
+    assert store.add(1, 1) == 1
+
+
+def test_exit_flush_registered_once_per_process(monkeypatch, buffered_app):
+    import app.utils.view_counter as view_counter
+
+    calls = []
+    monkeypatch.setattr(view_counter, "_atexit_registered", False)
+    monkeypatch.setattr(view_counter.atexit, "register", calls.append)
+    counters = [ViewCounter(buffered_app) for _ in range(3)]
+    assert calls == [view_counter._shutdown_all]
+    assert all(counter in view_counter._live_counters for counter in counters)
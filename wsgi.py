@@ -1,6 +1,6 @@
 """
 Python Anywhere / WSGI 서버용 진입점.
-flask run 과 동일하게 app 패키지를 로드합니다.
+flask run 과 동일하게 app 패키지의 create_app() 으로 앱을 만듭니다.
 PA Manual config 시 WSGI 파일에 이 내용을 참고해 작성하세요.
 """
 import sys
@@ -16,4 +16,5 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(path, '.env'))
 
 os.environ['FLASK_APP'] = 'app'
-from app import app as application
+from app import create_app
+application = create_app()